@@ -359,6 +359,23 @@ class Gradient(PointwiseTensorFieldOperator):
                             out=out_arr)
         return out
 
+    def _apply_batch(self, x, out):
+        """Implement ``out[i] <-- self(x[i])`` with one call per axis."""
+        if x.buffer is None:
+            super(Gradient, self)._apply_batch(x, out)
+            return
+
+        dx = self.domain.cell_sides
+        tmp = np.empty(x.buffer.shape, dtype=self.range[0].dtype)
+        for axis in range(self.domain.ndim):
+            # Differences of all inputs at once, with the axis shifted
+            # by the leading batch axis
+            finite_diff(x.buffer, axis=axis + 1, dx=dx[axis],
+                        method=self.method, pad_mode=self.pad_mode,
+                        pad_const=self.pad_const, out=tmp)
+            for out_i, tmp_i in zip(out, tmp):
+                out_i[axis][:] = tmp_i
+
     def derivative(self, point=None):
         """Return the derivative operator.
 
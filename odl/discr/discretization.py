@@ -180,6 +180,14 @@ class DiscretizedSpace(TensorSpace):
             return self.element_type(self,
                                      self.tspace.element(inp, order=order))
 
+    def _new_temporary(self):
+        """Return a new element for the `pool`, see `tspace`.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+        """
+        return self.element_type(self, self.tspace._new_temporary())
+
     def __eq__(self, other):
         """Return ``self == other``.
 
@@ -254,6 +262,11 @@ class DiscretizedSpace(TensorSpace):
         """Raw linear combination."""
         self.tspace._lincomb(a, x1.tensor, b, x2.tensor, out.tensor)
 
+    def _lincomb_many(self, coeffs, elements, out):
+        """Raw linear combination of many elements."""
+        self.tspace._lincomb_many(coeffs, [x.tensor for x in elements],
+                                  out.tensor)
+
     def _dist(self, x1, x2):
         """Raw distance between two elements."""
         return self.tspace._dist(x1.tensor, x2.tensor)
@@ -22,6 +22,7 @@ from odl.discr.partition import (
 from odl.set import RealNumbers, ComplexNumbers, IntervalProd
 from odl.space import FunctionSpace, ProductSpace
 from odl.space.entry_points import tensor_space_impl
+from odl.space.lazy_tensors import LazyTensorExpression
 from odl.space.weighting import ConstWeighting
 from odl.util import (
     apply_on_boundary, is_real_dtype, is_complex_floating_dtype, is_string,
@@ -354,6 +355,9 @@ class DiscreteLp(DiscretizedSpace):
         """
         if inp is None:
             return self.element_type(self, self.tspace.element(order=order))
+        elif isinstance(inp, LazyTensorExpression):
+            return self.element_type(
+                self, self.tspace.element(inp, order=order))
         elif inp in self and order is None:
             return inp
         elif inp in self.tspace and order is None:
@@ -558,6 +562,15 @@ class DiscreteLp(DiscretizedSpace):
             if self.dtype in (float, complex, int, bool):
                 optmod[3] = '!s'
 
+            compute_dtype = getattr(self.tspace, 'compute_dtype', self.dtype)
+            if compute_dtype != self.dtype:
+                optargs.append(('compute_dtype', dtype_str(compute_dtype),
+                                ''))
+                if compute_dtype in (float, complex):
+                    optmod.append('!s')
+                else:
+                    optmod.append('')
+
             with npy_printoptions(precision=4):
                 inner_str = signature_string(posargs, optargs,
                                              mod=[posmod, optmod])
@@ -975,11 +988,12 @@ class DiscreteLpElement(DiscretizedSpaceElement):
                 "need 0 or 1 `out` arguments for `method={!r}`, "
                 'got {}'.format(method, len(out_tuple)))
 
-        # We allow our own element type, tensors and their data containers
-        # as `out`
+        # We allow our own element type, tensors, their data containers
+        # and Numpy arrays as `out`
         valid_out_types = (type(self),
                            type(self.tensor),
-                           type(self.tensor.data))
+                           type(self.tensor.data),
+                           np.ndarray)
         if not all(isinstance(o, valid_out_types) or o is None
                    for o in out_tuple):
             return NotImplemented
@@ -1422,8 +1436,13 @@ def uniform_discr_frompartition(partition, dtype=None, impl='numpy', **kwargs):
         else:
             weighting = partition.cell_volume
 
+    tspace_kwargs = {}
+    compute_dtype = kwargs.pop('compute_dtype', None)
+    if compute_dtype is not None:
+        tspace_kwargs['compute_dtype'] = compute_dtype
+
     tspace = ds_type(partition.shape, dtype, exponent=exponent,
-                     weighting=weighting)
+                     weighting=weighting, **tspace_kwargs)
     return DiscreteLp(fspace, partition, tspace, **kwargs)
 
 
@@ -1593,6 +1612,11 @@ def uniform_discr(min_pt, max_pt, shape, dtype=None, impl='numpy', **kwargs):
             - array-like: Point-wise weighting by an array.
             - `Weighting`: Use weighting class as-is. Compatibility
               with this space's elements is not checked during init.
+    compute_dtype : optional
+        Floating point data type in which linear combinations, inner
+        products, norms and distances are computed, e.g., ``'float32'``
+        for ``dtype='float16'``, see `NumpyTensorSpace`. For ``None``,
+        ``dtype`` is used.
 
     Returns
     -------
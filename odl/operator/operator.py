@@ -12,14 +12,17 @@ from __future__ import print_function, division, absolute_import
 from builtins import object
 import inspect
 from numbers import Number, Integral
+import numpy as np
 import sys
 
 from odl.set import LinearSpace, Set, Field
+from odl.set.pool import ElementPool
 from odl.set.space import LinearSpaceElement
 from odl.util import cache_arguments
 
 
-__all__ = ('Operator', 'OperatorComp', 'OperatorSum', 'OperatorVectorSum',
+__all__ = ('Operator', 'OperatorComp', 'OperatorSum', 'OperatorLinComb',
+           'OperatorVectorSum',
            'OperatorLeftScalarMult', 'OperatorRightScalarMult',
            'FunctionalLeftVectorMult',
            'OperatorLeftVectorMult', 'OperatorRightVectorMult',
@@ -46,7 +49,11 @@ def _default_call_out_of_place(op, x, **kwargs):
         An object in the operator range. The result of an operator
         evaluation.
     """
-    out = op.range.element()
+    if isinstance(op.range, LinearSpace):
+        # Recycle a temporary if possible, it is not returned to the pool
+        out = op.range.pool.acquire()
+    else:
+        out = op.range.element()
     result = op._call_in_place(x, out, **kwargs)
     if result is not None and result is not out:
         raise ValueError('`op` returned a different value than `out`.'
@@ -74,6 +81,40 @@ def _default_call_in_place(op, x, out, **kwargs):
     out.assign(op.range.element(op._call_out_of_place(x, **kwargs)))
 
 
+def _workspace(space, tmp=None, size=1):
+    """Return a pool of temporaries for an operator expression.
+
+    The pool keeps up to ``size`` elements of ``space``, which are
+    allocated in the first call and reused in all later calls. It is
+    passed on to derived operators like the adjoint, such that they
+    reuse the same elements.
+
+    Parameters
+    ----------
+    space : `LinearSpace`
+        Space of the temporaries.
+    tmp : ``space`` element or `ElementPool`, optional
+        An element is put into the new pool, such that it is used as
+        the first temporary. A pool is returned as-is.
+    size : positive int, optional
+        Number of temporaries needed in one call.
+
+    Returns
+    -------
+    workspace : `ElementPool`
+    """
+    if isinstance(tmp, ElementPool):
+        if tmp.space != space:
+            raise OpTypeError('pool {!r} does not hold elements of {!r}'
+                              ''.format(tmp, space))
+        return tmp
+
+    workspace = ElementPool(space, max_size=size)
+    if tmp is not None:
+        workspace.release(tmp)
+    return workspace
+
+
 def _function_signature(func):
     """Return the signature of a callable as a string.
 
@@ -407,6 +448,9 @@ class Operator(object):
 
     - The term "element-like" means that an object must be convertible
       to an element by the ``domain.element()`` method.
+
+    - Subclasses that can evaluate a whole batch of inputs at once
+      can override `Operator._apply_batch`, see `Operator.apply_batch`.
     """
 
     def __new__(cls, *args, **kwargs):
@@ -694,6 +738,97 @@ class Operator(object):
                         'the range {!r}'.format(out, self.range))
         return out
 
+    def apply_batch(self, x, out=None):
+        """Return the results of evaluating this operator on a batch.
+
+        The operator is applied to each of the ``n`` parts of ``x``,
+        which is an element of ``domain.batched(n)``, see
+        `LinearSpace.batched`. Operators with a vectorized
+        implementation process the whole batch in one call, and all
+        others evaluate the parts one by one.
+
+        Parameters
+        ----------
+        x : ``domain.batched(n)`` `element-like`
+            Batch of ``n`` inputs, e.g., a sequence of `domain`
+            elements or an array with a leading batch axis.
+        out : ``range.batched(n)`` element, optional
+            Batch to which the results are written.
+
+        Returns
+        -------
+        out : ``range.batched(n)`` element or `numpy.ndarray`
+            Batch of results, with ``out[i] == self(x[i])``. If ``out``
+            was provided, the returned object is a reference to it.
+            For functionals, an array of the ``n`` scalar results
+            is returned.
+
+        Examples
+        --------
+        >>> space = odl.rn(3)
+        >>> op = odl.ScalingOperator(space, 2.0)
+        >>> result = op.apply_batch([[1, 2, 3], [0, 1, 0]])
+        >>> result.buffer
+        array([[ 2.,  4.,  6.],
+               [ 0.,  2.,  0.]])
+
+        Functionals return an array:
+
+        >>> func = odl.solvers.L1Norm(space)
+        >>> func.apply_batch([[1, 2, 3], [0, 1, 0]])
+        array([ 6.,  1.])
+        """
+        if not isinstance(self.domain, LinearSpace):
+            raise TypeError('batch evaluation requires a `LinearSpace` as '
+                            'domain, got {!r}'.format(self.domain))
+
+        batch_domain = self.domain.batched(len(x))
+        if x not in batch_domain:
+            try:
+                x = batch_domain.element(x)
+            except (TypeError, ValueError):
+                raise OpDomainError(
+                    'unable to cast {!r} to an element of '
+                    'the domain {!r}'.format(x, batch_domain))
+
+        if self.is_functional:
+            if out is not None:
+                raise TypeError('`out` parameter cannot be used '
+                                'when range is a field')
+            return np.array([self(xi) for xi in x])
+
+        batch_range = self.range.batched(len(x))
+        if out is None:
+            out = batch_range.element()
+        elif out not in batch_range:
+            raise OpRangeError('`out` {!r} not an element of the range '
+                               '{!r} of the batched {!r}'
+                               ''.format(out, batch_range, self))
+
+        self._apply_batch(x, out)
+        return out
+
+    def _apply_batch(self, x, out):
+        """Implement ``out[i] <-- self(x[i])`` for all parts of a batch.
+
+        This default implementation evaluates the operator on the parts
+        one by one. Subclasses with a vectorized implementation should
+        override this method, and fall back to it if the batches have
+        no `ProductSpaceElement.buffer`.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Parameters
+        ----------
+        x : ``domain.batched(n)`` element
+            Batch of inputs.
+        out : ``range.batched(n)`` element
+            Batch to which the results are written.
+        """
+        for xi, out_i in zip(x, out):
+            self(xi, out=out_i)
+
     def norm(self, estimate=False, **kwargs):
         """Return the operator norm of this operator.
 
@@ -1077,6 +1212,8 @@ class OperatorSum(Operator):
     The sum is only well-defined for `Operator` instances where
     `Operator.range` is a `LinearSpace`.
 
+    The temporary needed for the evaluation is allocated in the first
+    call and reused afterwards, also by the `adjoint` and `derivative`.
     """
 
     def __init__(self, left, right, tmp_ran=None, tmp_dom=None):
@@ -1090,10 +1227,11 @@ class OperatorSum(Operator):
         right : `Operator`
             Second summand. Must have the same `Operator.domain` and
             `Operator.range` as ``left``.
-        tmp_ran : `Operator.range` element, optional
+        tmp_ran : `Operator.range` element or `ElementPool`, optional
             Used to avoid the creation of a temporary when applying the
-            operator.
-        tmp_dom : `Operator.domain` element, optional
+            operator. A pool of `Operator.range` elements is used for
+            all temporaries, which allows sharing it between operators.
+        tmp_dom : `Operator.domain` element or `ElementPool`, optional
             Used to avoid the creation of a temporary when applying the
             operator adjoint.
 
@@ -1120,10 +1258,12 @@ class OperatorSum(Operator):
             raise OpTypeError('operator domains {!r} and {!r} do not match'
                               ''.format(left.domain, right.domain))
 
-        if tmp_ran is not None and tmp_ran not in left.range:
+        if (tmp_ran is not None and not isinstance(tmp_ran, ElementPool) and
+                tmp_ran not in left.range):
             raise OpRangeError('`tmp_ran` {!r} not an element of the operator '
                                'range {!r}'.format(tmp_ran, left.range))
-        if tmp_dom is not None and tmp_dom not in left.domain:
+        if (tmp_dom is not None and not isinstance(tmp_dom, ElementPool) and
+                tmp_dom not in left.domain):
             raise OpDomainError('`tmp_dom` {!r} not an element of the '
                                 'operator domain {!r}'
                                 ''.format(tmp_dom, left.domain))
@@ -1133,8 +1273,8 @@ class OperatorSum(Operator):
             linear=left.is_linear and right.is_linear)
         self.__left = left
         self.__right = right
-        self.__tmp_ran = tmp_ran
-        self.__tmp_dom = tmp_dom
+        self.__tmp_ran = _workspace(left.range, tmp_ran)
+        self.__tmp_dom = _workspace(left.domain, tmp_dom)
 
     @property
     def left(self):
@@ -1151,13 +1291,12 @@ class OperatorSum(Operator):
         if out is None:
             return self.left(x) + self.right(x)
         else:
-            tmp = (self.__tmp_ran if self.__tmp_ran is not None
-                   else self.range.element())
-            # Write to `tmp` first, otherwise aliased `x` and `out` lead
-            # to wrong result
-            self.left(x, out=tmp)
-            self.right(x, out=out)
-            out += tmp
+            with self.__tmp_ran.temporary() as tmp:
+                # Write to `tmp` first, otherwise aliased `x` and `out`
+                # lead to wrong result
+                self.left(x, out=tmp)
+                self.right(x, out=out)
+                out += tmp
 
     def derivative(self, x):
         """Return the operator derivative at ``x``.
@@ -1175,7 +1314,7 @@ class OperatorSum(Operator):
         else:
             return OperatorSum(self.left.derivative(x),
                                self.right.derivative(x),
-                               self.__tmp_dom, self.__tmp_ran)
+                               self.__tmp_ran, self.__tmp_dom)
 
     @property
     def adjoint(self):
@@ -1212,6 +1351,179 @@ class OperatorSum(Operator):
         return '({} + {})'.format(self.left, self.right)
 
 
+class OperatorLinComb(Operator):
+
+    """Expression type for a linear combination of operators.
+
+        ``OperatorLinComb([op1, op2, ...], [a1, a2, ...])(x) ==
+        a1 * op1(x) + a2 * op2(x) + ...``
+
+    In contrast to nested `OperatorSum` and `OperatorLeftScalarMult`
+    expressions, the results of the operators are combined in a single
+    call to `LinearSpace.lincomb_many`, and `IdentityOperator` terms are
+    not evaluated at all. This type is usually created by `optimize`.
+
+    The temporaries needed for the evaluation are allocated in the first
+    call and reused afterwards, also by the `adjoint` and `derivative`.
+    """
+
+    def __init__(self, operators, coeffs, tmp_ran=None, tmp_dom=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        operators : sequence of `Operator`
+            Operators in the linear combination. They must have the same
+            `Operator.domain` and `Operator.range`, which must be a
+            `LinearSpace`.
+        coeffs : sequence of ``range.field`` elements
+            Coefficients of the operators, of the same length as
+            ``operators``.
+        tmp_ran : `ElementPool`, optional
+            Pool of `Operator.range` elements used for the temporaries
+            when applying the operator.
+        tmp_dom : `ElementPool`, optional
+            Pool of `Operator.domain` elements used for the temporaries
+            when applying the operator adjoint.
+
+        Examples
+        --------
+        >>> r3 = odl.rn(3)
+        >>> op = odl.IdentityOperator(r3)
+        >>> scal = odl.ScalingOperator(r3, 2)
+        >>> lincomb_op = OperatorLinComb([op, scal], [3, -1])
+        >>> lincomb_op([1, 2, 3])
+        rn(3).element([ 1.,  2.,  3.])
+        """
+        operators = list(operators)
+        coeffs = list(coeffs)
+        if not operators:
+            raise ValueError('`operators` cannot be empty')
+        if len(operators) != len(coeffs):
+            raise ValueError('`operators` and `coeffs` must have the same '
+                             'length, got {} != {}'
+                             ''.format(len(operators), len(coeffs)))
+
+        first = operators[0]
+        if not isinstance(first.range, LinearSpace):
+            raise OpTypeError('range {!r} not a `LinearSpace` instance'
+                              ''.format(first.range))
+        for op in operators[1:]:
+            if op.range != first.range:
+                raise OpTypeError('operator ranges {!r} and {!r} do not '
+                                  'match'.format(first.range, op.range))
+            if op.domain != first.domain:
+                raise OpTypeError('operator domains {!r} and {!r} do not '
+                                  'match'.format(first.domain, op.domain))
+        for coeff in coeffs:
+            if coeff not in first.range.field:
+                raise TypeError('coefficient {!r} not in the field {!r} of '
+                                'the operator range {!r}'
+                                ''.format(coeff, first.range.field,
+                                          first.range))
+
+        super(OperatorLinComb, self).__init__(
+            first.domain, first.range,
+            linear=all(op.is_linear for op in operators))
+        self.__operators = tuple(operators)
+        self.__coeffs = tuple(coeffs)
+        self.__tmp_ran = _workspace(self.range, tmp_ran, len(operators))
+        self.__tmp_dom = _workspace(self.domain, tmp_dom, len(operators))
+
+    @property
+    def operators(self):
+        """The operators of this linear combination."""
+        return self.__operators
+
+    @property
+    def coeffs(self):
+        """The coefficients of this linear combination."""
+        return self.__coeffs
+
+    def _call(self, x, out=None):
+        """Implement ``self(x[, out])``."""
+        # Lazy import to avoid circular import
+        from odl.operator.default_ops import IdentityOperator
+
+        if out is None:
+            out = self.range.element()
+
+        # Indices of the operators that need to be evaluated. Unless
+        # `x` and `out` are aligned, the last of these writes to `out`.
+        evaluate = [i for i, op in enumerate(self.operators)
+                    if not isinstance(op, IdentityOperator)]
+        direct = evaluate[-1] if evaluate and out is not x else None
+
+        results = [x] * len(self.operators)
+        temporaries = []
+        try:
+            for i in evaluate:
+                if i == direct:
+                    results[i] = out
+                else:
+                    results[i] = self.__tmp_ran.acquire()
+                    temporaries.append(results[i])
+                self.operators[i](x, out=results[i])
+
+            self.range.lincomb_many(self.coeffs, results, out=out)
+        finally:
+            for tmp in temporaries:
+                self.__tmp_ran.release(tmp)
+
+        return out
+
+    def derivative(self, x):
+        """Return the operator derivative at ``x``.
+
+        The derivative of a linear combination of operators is the
+        linear combination of the derivatives.
+
+        Parameters
+        ----------
+        x : `domain` `element-like`
+            Evaluation point of the derivative
+        """
+        if self.is_linear:
+            return self
+        else:
+            return OperatorLinComb([op.derivative(x) for op in self.operators],
+                                   self.coeffs, self.__tmp_ran, self.__tmp_dom)
+
+    @property
+    def adjoint(self):
+        """Adjoint of this operator.
+
+        The adjoint is the linear combination of the operator adjoints
+        with the complex conjugates of the coefficients.
+
+        Returns
+        -------
+        adjoint : `OperatorLinComb`
+
+        Raises
+        ------
+        OpNotImplementedError
+            If any of the underlying operators is non-linear.
+        """
+        if not self.is_linear:
+            raise OpNotImplementedError('nonlinear operators have no adjoint')
+
+        return OperatorLinComb([op.adjoint for op in self.operators],
+                               [coeff.conjugate() for coeff in self.coeffs],
+                               self.__tmp_dom, self.__tmp_ran)
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({!r}, {!r})'.format(self.__class__.__name__,
+                                       list(self.operators), list(self.coeffs))
+
+    def __str__(self):
+        """Return ``str(self)``."""
+        return '({})'.format(' + '.join(
+            '{} * {}'.format(coeff, op)
+            for coeff, op in zip(self.coeffs, self.operators)))
+
+
 class OperatorVectorSum(Operator):
 
     """Operator that computes ``op(x) + y``.
@@ -1313,6 +1625,10 @@ class OperatorComp(Operator):
         ``OperatorComp(left, right)(x) == left(right(x))``
 
     The composition is only well-defined if ``left.domain == right.range``.
+
+    The temporary needed for the evaluation is allocated in the first
+    call and reused afterwards, also by the `adjoint`, `inverse` and
+    `derivative`.
     """
 
     def __init__(self, left, right, tmp=None):
@@ -1325,9 +1641,10 @@ class OperatorComp(Operator):
         right : `Operator`
             The right ("inner") operator. Its range must coincide with the
             domain of ``left``.
-        tmp : element of the range of ``right``, optional
+        tmp : element of the range of ``right`` or `ElementPool`, optional
             Used to avoid the creation of a temporary when applying the
-            operator.
+            operator. A pool of such elements is used for all
+            temporaries, which allows sharing it between operators.
         """
         if right.range != left.domain:
             raise OpTypeError('`range` {!r} of the right operator {!r} not '
@@ -1336,7 +1653,8 @@ class OperatorComp(Operator):
                               ''.format(right.range, right,
                                         left.domain, left))
 
-        if tmp is not None and tmp not in left.domain:
+        if (tmp is not None and not isinstance(tmp, ElementPool) and
+                tmp not in left.domain):
             raise OpDomainError('`tmp` {!r} not an element of the left '
                                 'operator domain {!r}'
                                 ''.format(tmp, left.domain))
@@ -1346,7 +1664,7 @@ class OperatorComp(Operator):
             linear=left.is_linear and right.is_linear)
         self.__left = left
         self.__right = right
-        self.__tmp = tmp
+        self.__tmp = _workspace(left.domain, tmp)
 
     @property
     def left(self):
@@ -1363,10 +1681,9 @@ class OperatorComp(Operator):
         if out is None:
             return self.left(self.right(x))
         else:
-            tmp = (self.__tmp if self.__tmp is not None
-                   else self.right.range.element())
-            self.right(x, out=tmp)
-            return self.left(tmp, out=out)
+            with self.__tmp.temporary() as tmp:
+                self.right(x, out=tmp)
+                return self.left(tmp, out=out)
 
     @property
     def inverse(self):
@@ -1476,6 +1793,7 @@ class OperatorPointwiseProduct(Operator):
             left.domain, left.range, linear=False)
         self.__left = left
         self.__right = right
+        self.__tmp = _workspace(right.range)
 
     @property
     def left(self):
@@ -1492,12 +1810,12 @@ class OperatorPointwiseProduct(Operator):
         if out is None:
             return self.left(x) * self.right(x)
         else:
-            tmp = self.right.range.element()
-            # Write to `tmp` first, otherwise aliased `x` and `out` lead
-            # to wrong result
-            self.left(x, out=tmp)
-            self.right(x, out=out)
-            out *= tmp
+            with self.__tmp.temporary() as tmp:
+                # Write to `tmp` first, otherwise aliased `x` and `out`
+                # lead to wrong result
+                self.left(x, out=tmp)
+                self.right(x, out=out)
+                out *= tmp
 
     def derivative(self, x):
         """Return the derivative at ``x``."""
@@ -1702,9 +2020,10 @@ class OperatorRightScalarMult(Operator):
         scalar : ``operator.range.field`` element
             A real or complex number, depending on the field of
             the operator domain.
-        tmp : `domain` element, optional
+        tmp : `domain` element or `ElementPool`, optional
             Used to avoid the creation of a temporary when applying the
-            operator.
+            operator. A pool of `domain` elements is used for all
+            temporaries, which allows sharing it between operators.
 
         Examples
         --------
@@ -1724,7 +2043,8 @@ class OperatorRightScalarMult(Operator):
                             ''.format(scalar, operator.domain.field,
                                       operator.domain))
 
-        if tmp is not None and tmp not in operator.domain:
+        if (tmp is not None and not isinstance(tmp, ElementPool) and
+                tmp not in operator.domain):
             raise OpDomainError('`tmp` {!r} not an element of the '
                                 'operator domain {!r}'
                                 ''.format(tmp, operator.domain))
@@ -1738,7 +2058,7 @@ class OperatorRightScalarMult(Operator):
             operator.domain, operator.range, operator.is_linear)
         self.__operator = operator
         self.__scalar = scalar
-        self.__tmp = tmp
+        self.__tmp = _workspace(operator.domain, tmp)
 
     @property
     def operator(self):
@@ -1755,12 +2075,9 @@ class OperatorRightScalarMult(Operator):
         if out is None:
             return self.operator(self.scalar * x)
         else:
-            if self.__tmp is not None:
-                tmp = self.__tmp
-            else:
-                tmp = self.domain.element()
-            tmp.lincomb(self.scalar, x)
-            self.operator(tmp, out=out)
+            with self.__tmp.temporary() as tmp:
+                tmp.lincomb(self.scalar, x)
+                self.operator(tmp, out=out)
 
     def __mul__(self, other):
         """Implement ``self * other``.
@@ -2123,6 +2440,7 @@ class OperatorRightVectorMult(Operator):
             operator.domain, operator.range, linear=operator.is_linear)
         self.__operator = operator
         self.__vector = vector
+        self.__tmp = _workspace(operator.domain)
 
     @property
     def operator(self):
@@ -2139,9 +2457,9 @@ class OperatorRightVectorMult(Operator):
         if out is None:
             return self.operator(x * self.vector)
         else:
-            tmp = self.domain.element()
-            x.multiply(self.vector, out=tmp)
-            self.operator(tmp, out=out)
+            with self.__tmp.temporary() as tmp:
+                x.multiply(self.vector, out=tmp)
+                self.operator(tmp, out=out)
 
     @property
     def inverse(self):
@@ -12,16 +12,35 @@ from __future__ import print_function, division, absolute_import
 from future.utils import native
 import numpy as np
 
+from odl.operator.default_ops import (
+    IdentityOperator, ScalingOperator, ZeroOperator)
+from odl.operator.operator import (
+    Operator, OperatorComp, OperatorSum, OperatorLinComb, OperatorVectorSum,
+    OperatorLeftScalarMult, OperatorRightScalarMult, OperatorPointwiseProduct,
+    FunctionalLeftVectorMult, OperatorLeftVectorMult, OperatorRightVectorMult)
+from odl.set import LinearSpace
 from odl.space.base_tensors import TensorSpace
 from odl.space import ProductSpace
-from odl.util import nd_iterator
 from odl.util.testutils import noise_element
 
 __all__ = ('matrix_representation', 'power_method_opnorm', 'as_scipy_operator',
-           'as_scipy_functional', 'as_proximal_lang_operator')
+           'as_scipy_functional', 'as_proximal_lang_operator', 'optimize')
 
 
-def matrix_representation(op):
+# Memory in bytes used by the probes and results of one batch in
+# `matrix_representation` if no ``batch_size`` is given
+PROBE_BATCH_NBYTES = 2 ** 24
+
+# Maximum number of entries per column of a detected local sparsity
+# pattern, and maximum average number of conflicting columns per column
+# for which a given pattern is colored. Beyond that, compressed probing
+# does not pay off.
+_MAX_STENCIL_SIZE = 1024
+_MAX_COLUMN_CONFLICTS = 256
+
+
+def matrix_representation(op, sparse=False, pattern=None, batch_size=None,
+                          executor=None, max_workers=None):
     """Return a matrix representation of a linear operator.
 
     Parameters
@@ -29,14 +48,35 @@ def matrix_representation(op):
     op : `Operator`
         The linear operator of which one wants a matrix representation.
         If the domain or range is a `ProductSpace`, it must be a power-space.
+    sparse : bool, optional
+        If ``True``, return a ``scipy.sparse.csr_matrix`` and use
+        compressed probing for operators with local support, see Notes.
+    pattern : array-like or ``scipy.sparse`` matrix, optional
+        Known sparsity pattern of the flat matrix, i.e., a matrix of shape
+        ``(op.range.size, op.domain.size)`` whose nonzero entries include
+        all nonzero entries of the matrix representation. A previously
+        computed sparse matrix representation can be used. Only used
+        if ``sparse=True``.
+    batch_size : positive int, optional
+        Number of probe vectors evaluated together with
+        `Operator.apply_batch`. For ``None``, it is chosen such that
+        a batch uses about `PROBE_BATCH_NBYTES` bytes.
+    executor : {None, 'thread', 'process'}, optional
+        How to evaluate the batches of probes concurrently, see
+        `odl.util.parallel.executor_map`.
+    max_workers : positive int, optional
+        Number of threads or processes evaluating batches.
 
     Returns
     -------
-    matrix : `numpy.ndarray`
+    matrix : `numpy.ndarray` or ``scipy.sparse.csr_matrix``
         The matrix representation of the operator.
 
-        The shape will be ``op.domain.shape + op.range.shape`` and the dtype
-        is the promoted (greatest) dtype of the domain and range.
+        For ``sparse=False``, the shape will be
+        ``op.range.shape + op.domain.shape``, otherwise it is
+        ``(op.range.size, op.domain.size)`` for the flattened (C order)
+        domain and range. The dtype is the promoted (greatest) dtype of
+        the domain and range.
 
     Examples
     --------
@@ -80,10 +120,44 @@ def matrix_representation(op):
            [[ 4.  , -4.75],
             [ 4.  , -6.75]]])
 
+    Operators with local support are best represented by sparse
+    matrices, which act on flattened elements:
+
+    >>> space = odl.uniform_discr(0, 5, 5)
+    >>> lap = odl.Laplacian(space)
+    >>> matrix = odl.matrix_representation(lap, sparse=True)
+    >>> matrix.shape, matrix.nnz
+    ((5, 5), 13)
+    >>> matrix.toarray()
+    array([[-2.,  1.,  0.,  0.,  0.],
+           [ 1., -2.,  1.,  0.,  0.],
+           [ 0.,  1., -2.,  1.,  0.],
+           [ 0.,  0.,  1., -2.,  1.],
+           [ 0.,  0.,  0.,  1., -2.]])
+
     Notes
+    -----
+    In the dense case, the algorithm works by letting the operator act
+    on all unit vectors, and stacking the output as a matrix.
+
+    In the sparse case, columns of the matrix that have no nonzero row
+    in common are determined together by applying the operator to the
+    sum of their unit vectors. The columns are grouped by a greedy
+    coloring of the column intersection graph of the sparsity pattern
+    [CPR1974]. If no ``pattern`` is given and the domain and range are
+    (powers of) spaces of the same shape, the pattern is detected by
+    probing a few unit vectors and assuming that each input entry only
+    influences output entries within the same distance along each axis.
+    The result is checked with a random vector, and for operators where
+    this fails or the detection is not applicable, e.g., ray transforms,
+    all unit vectors are probed. Each probe result is only kept in
+    sparse form.
+
+    References
     ----------
-    The algorithm works by letting the operator act on all unit vectors, and
-    stacking the output as a matrix.
+    [CPR1974] Curtis, A R, Powell, M J D, and Reid, J K. *On the
+    estimation of sparse Jacobian matrices*. IMA Journal of Applied
+    Mathematics, 13 (1974), pp 117--119.
     """
 
     if not op.is_linear:
@@ -105,23 +179,260 @@ def matrix_representation(op):
                         'nor `ProductSpace` with only equal `TensorSpace` '
                         'components'.format(op.range))
 
-    # Generate the matrix
     dtype = np.promote_types(op.domain.dtype, op.range.dtype)
-    matrix = np.zeros(op.range.shape + op.domain.shape, dtype=dtype)
-    tmp_ran = op.range.element()  # Store for reuse in loop
-    tmp_dom = op.domain.zero()  # Store for reuse in loop
+    if batch_size is None:
+        probe_nbytes = dtype.itemsize * (op.domain.size + op.range.size)
+        batch_size = max(1, PROBE_BATCH_NBYTES // max(probe_nbytes, 1))
+    else:
+        batch_size, batch_size_in = int(batch_size), batch_size
+        if batch_size <= 0:
+            raise ValueError('`batch_size` must be positive, got {!r}'
+                             ''.format(batch_size_in))
 
-    for j in nd_iterator(op.domain.shape):
-        tmp_dom[j] = 1.0
+    def evaluate(make_probes, num_probes):
+        return _evaluate_probes(op, make_probes, num_probes, batch_size,
+                                executor, max_workers)
 
-        op(tmp_dom, out=tmp_ran)
-        matrix[(Ellipsis,) + j] = tmp_ran.asarray()
+    def unit_probes(start, stop):
+        return _unit_probes(op.domain, start, stop)
 
-        tmp_dom[j] = 0.0
+    if not sparse:
+        # Generate the matrix
+        matrix = np.zeros((op.range.size, op.domain.size), dtype=dtype)
+        for start, results in evaluate(unit_probes, op.domain.size):
+            matrix[:, start:start + len(results)] = results.T
+        return matrix.reshape(op.range.shape + op.domain.shape)
+
+    # Lazy import to improve `import odl` time
+    import scipy.sparse
+
+    shape = (op.range.size, op.domain.size)
+    matrix = None
+    if pattern is not None:
+        pattern = scipy.sparse.coo_matrix(pattern)
+        if pattern.shape != shape:
+            raise ValueError('`pattern` has shape {}, expected {}'
+                             ''.format(pattern.shape, shape))
+        pattern = pattern.astype(bool).tocsc()
+        pattern.eliminate_zeros()
+        colors = _color_columns(pattern)
+        detected = False
+    else:
+        pattern, colors = _local_pattern(op)
+        detected = True
+
+    if pattern is not None:
+        num_colors = colors.max() + 1 if colors.size else 0
+
+        def color_probes(start, stop):
+            probes = np.equal.outer(np.arange(start, stop), colors)
+            return probes.astype(op.domain.dtype)
+
+        results = np.empty((num_colors, shape[0]), dtype=dtype)
+        for start, res in evaluate(color_probes, num_colors):
+            results[start:start + len(res)] = res
+
+        # In each probe, every row belongs to at most one column
+        pattern = pattern.tocoo()
+        values = results[colors[pattern.col], pattern.row]
+        matrix = scipy.sparse.csr_matrix(
+            (values, (pattern.row, pattern.col)), shape=shape)
+        matrix.eliminate_zeros()
+
+        if detected and not _matches_operator(op, matrix):
+            matrix = None
+
+    if matrix is None:
+        # Rows of the transposed matrix, one block per batch
+        blocks = [scipy.sparse.csr_matrix(res, dtype=dtype)
+                  for _, res in evaluate(unit_probes, op.domain.size)]
+        if blocks:
+            matrix_t = scipy.sparse.vstack(blocks, format='csr')
+            del blocks
+            matrix = matrix_t.T.tocsr()
+        else:
+            matrix = scipy.sparse.csr_matrix(shape, dtype=dtype)
 
     return matrix
 
 
+def _unit_probes(space, start, stop):
+    """Return the flat unit vectors ``start, ..., stop - 1`` of ``space``."""
+    probes = np.zeros((stop - start, space.size), dtype=space.dtype)
+    probes[np.arange(stop - start), np.arange(start, stop)] = 1
+    return probes
+
+
+def _apply_to_probes(args):
+    """Return ``op`` applied to flat probes as rows of an array.
+
+    ``args`` is a tuple ``(op, probes)``, where ``probes`` is an array
+    of shape ``(n, op.domain.size)``.
+    """
+    op, probes = args
+    batch = op.domain.batched(len(probes)).element(
+        probes.reshape((len(probes),) + op.domain.shape))
+    results = op.apply_batch(batch)
+    if results.buffer is None:
+        results = np.array([res.asarray() for res in results])
+    else:
+        results = results.buffer
+    return results.reshape(len(probes), op.range.size)
+
+
+def _evaluate_probes(op, make_probes, num_probes, batch_size,
+                     executor=None, max_workers=None):
+    """Yield ``op`` applied to probes, in batches.
+
+    The probes ``start, ..., stop - 1`` are created by
+    ``make_probes(start, stop)``. For each batch, a tuple
+    ``(start, results)`` is yielded, where ``results`` has the flat
+    results as rows. With an ``executor``, as many batches as there
+    are workers are evaluated concurrently.
+    """
+    # Lazy import to improve `import odl` time
+    from odl.util.parallel import executor_map, num_threads
+
+    if executor is None:
+        num_workers = 1
+    elif max_workers is None:
+        num_workers = num_threads()
+    else:
+        num_workers = max(1, int(max_workers))
+
+    starts = list(range(0, num_probes, batch_size))
+    for i in range(0, len(starts), num_workers):
+        round_starts = starts[i:i + num_workers]
+        args = [(op, make_probes(start, min(start + batch_size, num_probes)))
+                for start in round_starts]
+        results = executor_map(_apply_to_probes, args, executor=executor,
+                               max_workers=max_workers)
+        for start, res in zip(round_starts, results):
+            yield start, res
+
+
+def _grid_shape(space):
+    """Return ``(num_components, shape)`` of a (power of a) tensor space."""
+    if isinstance(space, ProductSpace):
+        return len(space), space[0].shape
+    else:
+        return 1, space.shape
+
+
+def _local_pattern(op, num_samples=3):
+    """Return a sparsity pattern and column coloring assuming local support.
+
+    The maximum distance between an input entry and the output entries
+    it influences is measured along each axis for the unit vectors at
+    the center and at random positions of the grid. The pattern connects
+    each input entry to all output entries within that distance, for
+    all components. Columns get the same color if their positions are
+    equal modulo the stencil width along each axis and they belong to
+    the same component.
+
+    ``(None, None)`` is returned if the domain and range grids differ
+    or if the measured support is not local, i.e., reaches half of an
+    axis or exceeds `_MAX_STENCIL_SIZE` entries per column.
+    """
+    # Lazy import to improve `import odl` time
+    import scipy.sparse
+
+    num_dom, grid = _grid_shape(op.domain)
+    num_ran, ran_grid = _grid_shape(op.range)
+    if grid != ran_grid or len(grid) == 0:
+        return None, None
+
+    rng = np.random.RandomState(0)
+    positions = [tuple(n // 2 for n in grid)]
+    positions += [tuple(rng.randint(n) for n in grid)
+                  for _ in range(num_samples - 1)]
+    columns = [np.ravel_multi_index((comp,) + pos, (num_dom,) + grid)
+               for comp in range(num_dom) for pos in positions]
+    probes = np.zeros((len(columns), op.domain.size), dtype=op.domain.dtype)
+    probes[np.arange(len(columns)), columns] = 1
+
+    results = _apply_to_probes((op, probes))
+    radius = np.zeros(len(grid), dtype=int)
+    for res, col in zip(results, columns):
+        pos = np.unravel_index(col, (num_dom,) + grid)[1:]
+        idcs = np.nonzero(res.reshape((num_ran,) + grid))[1:]
+        for axis, (idx, p) in enumerate(zip(idcs, pos)):
+            if idx.size:
+                radius[axis] = max(radius[axis], np.abs(idx - p).max())
+
+    width = 2 * radius + 1
+    if (any(2 * r >= n for r, n in zip(radius, grid) if n > 1) or
+            num_ran * np.prod(width) > _MAX_STENCIL_SIZE):
+        return None, None
+
+    size = int(np.prod(grid))
+    in_pos = np.unravel_index(np.arange(size), grid)
+    colors = np.ravel_multi_index([p % w for p, w in zip(in_pos, width)],
+                                  width)
+    colors = (np.arange(num_dom)[:, None] * np.prod(width) +
+              colors).ravel()
+
+    # All output positions within the radius of each input position
+    rows, cols = [], []
+    for offset in np.ndindex(*width):
+        out_pos = [p + o - r for p, o, r in zip(in_pos, offset, radius)]
+        valid = np.all([(p >= 0) & (p < n) for p, n in zip(out_pos, grid)],
+                       axis=0)
+        out_idx = np.ravel_multi_index([p[valid] for p in out_pos], grid)
+        in_idx = np.nonzero(valid)[0]
+        row, col = np.broadcast_arrays(
+            np.arange(num_ran)[:, None, None] * size + out_idx,
+            np.arange(num_dom)[None, :, None] * size + in_idx)
+        rows.append(row.ravel())
+        cols.append(col.ravel())
+
+    rows = np.concatenate(rows)
+    cols = np.concatenate(cols)
+    pattern = scipy.sparse.coo_matrix(
+        (np.ones(rows.size, dtype=bool), (rows, cols)),
+        shape=(op.range.size, op.domain.size))
+    return pattern, colors
+
+
+def _color_columns(pattern):
+    """Return a greedy coloring of the columns of a sparsity pattern.
+
+    Columns with a nonzero row in common get different colors, which
+    are numbered ``0, 1, ...``. Columns are colored in order, each with
+    the smallest color not used by a conflicting column. If the columns
+    have more than `_MAX_COLUMN_CONFLICTS` conflicts on average, each
+    column gets its own color.
+    """
+    num_cols = pattern.shape[1]
+    row_counts = np.diff(pattern.tocsr().indptr).astype('int64')
+    if np.sum(row_counts ** 2) > _MAX_COLUMN_CONFLICTS * num_cols:
+        return np.arange(num_cols)
+
+    pattern = pattern.astype(np.int32)
+    conflicts = pattern.T.dot(pattern).tocsr()
+    indptr = conflicts.indptr.tolist()
+    indices = conflicts.indices.tolist()
+    colors = [-1] * num_cols
+    for j in range(num_cols):
+        used = set(colors[k] for k in indices[indptr[j]:indptr[j + 1]])
+        color = 0
+        while color in used:
+            color += 1
+        colors[j] = color
+    return np.array(colors, dtype=int)
+
+
+def _matches_operator(op, matrix):
+    """Return whether ``matrix`` acts like ``op`` on a random vector."""
+    rng = np.random.RandomState(0)
+    x = rng.randint(1, 10, size=op.domain.size).astype(op.domain.dtype)
+    expected = _apply_to_probes((op, x[None, :]))[0]
+    dtype = np.promote_types(op.domain.dtype, op.range.dtype)
+    eps = np.finfo(np.promote_types(dtype, np.float32)).eps
+    error = np.linalg.norm(matrix.dot(x) - expected)
+    return error <= np.sqrt(eps) * np.linalg.norm(expected)
+
+
 def power_method_opnorm(op, xstart=None, maxiter=100, rtol=1e-05, atol=1e-08,
                         callback=None):
     """Estimate the operator norm with the power method.
@@ -430,6 +741,221 @@ def as_proximal_lang_operator(op, norm_bound=None):
                                  norm_bound=norm_bound)
 
 
+def optimize(op):
+    """Return a simplified operator that evaluates like ``op``.
+
+    Operator arithmetic with ``+``, ``*`` and ``@`` creates nested
+    expression types like `OperatorSum`, `OperatorComp` and
+    `OperatorLeftScalarMult`, which are evaluated node by node. This
+    function rewrites such expression trees into equivalent ones that
+    need fewer passes over memory:
+
+    - Scalar multiplications and `ScalingOperator`'s in compositions are
+      merged and moved through linear operators to the outermost
+      position, or folded into the coefficients of a linear combination.
+    - `IdentityOperator`'s in compositions and scalings with 1 are
+      dropped.
+    - Sums of (scaled) operators are turned into an `OperatorLinComb`,
+      which combines all results in a single pass. Identity and scaling
+      terms are not evaluated there, and repeated terms are merged.
+
+    Since the adjoint of an adjoint is typically ``-1 * -1`` times a new
+    operator, or the operator itself, such double adjoints simplify to
+    a single operator evaluation.
+
+    Operators that are not expression types, including all functionals,
+    are left unchanged.
+
+    Parameters
+    ----------
+    op : `Operator`
+        The operator that should be simplified.
+
+    Returns
+    -------
+    optimized : `Operator`
+        Operator with the same domain and range, that evaluates to the
+        same result as ``op`` up to rounding errors.
+
+    Examples
+    --------
+    Scalings are merged and identities dropped:
+
+    >>> space = odl.rn(3)
+    >>> ident = odl.IdentityOperator(space)
+    >>> op = 2 * (ident * ident) * 3
+    >>> optimize(op)
+    ScalingOperator(rn(3), 6.0)
+
+    Sums of scaled operators are evaluated in one linear combination:
+
+    >>> mat_op = odl.MatrixOperator(np.eye(3))
+    >>> op = 2 * mat_op + (mat_op - ident) * 3
+    >>> lincomb_op = optimize(op)
+    >>> lincomb_op.operators[0] is mat_op
+    True
+    >>> lincomb_op.coeffs
+    (5, -3.0)
+    >>> lincomb_op([1, 2, 3]) == op([1, 2, 3])
+    True
+    """
+    if not isinstance(op, Operator):
+        raise TypeError('`op` {!r} is not an `Operator` instance'
+                        ''.format(op))
+
+    def is_sum(op):
+        """Return ``True`` if ``op`` can be rewritten as a sum."""
+        return (type(op) in (OperatorSum, OperatorLinComb) or
+                (type(op) is OperatorLeftScalarMult and
+                 is_sum(op.operator)))
+
+    def is_chain(op):
+        """Return ``True`` if ``op`` can be rewritten as a chain."""
+        return type(op) in (OperatorComp, OperatorLeftScalarMult,
+                            OperatorRightScalarMult)
+
+    def sum_terms(op, coeff):
+        """Return ``(coeff, op)`` pairs of the optimized summands.
+
+        For identity terms, ``op`` is ``None``.
+        """
+        if type(op) is OperatorSum:
+            return sum_terms(op.left, coeff) + sum_terms(op.right, coeff)
+        elif type(op) is OperatorLinComb:
+            return [term for c, sub_op in zip(op.coeffs, op.operators)
+                    for term in sum_terms(sub_op, coeff * c)]
+        elif type(op) is OperatorLeftScalarMult:
+            return sum_terms(op.operator, coeff * op.scalar)
+
+        op = optimize(op)
+        if isinstance(op, ScalingOperator):
+            return [(coeff * op.scalar, None)]
+        elif type(op) is OperatorLeftScalarMult:
+            return [(coeff * op.scalar, op.operator)]
+        elif type(op) is OperatorLinComb:
+            return [(coeff * c, None if isinstance(sub_op, IdentityOperator)
+                     else sub_op)
+                    for c, sub_op in zip(op.coeffs, op.operators)]
+        else:
+            return [(coeff, op)]
+
+    def optimize_sum(op):
+        """Return the optimized version of the sum ``op``."""
+        coeffs, ops = [], []
+        for coeff, term_op in sum_terms(op, 1):
+            for i, other in enumerate(ops):
+                if other is term_op:
+                    coeffs[i] += coeff
+                    break
+            else:
+                coeffs.append(coeff)
+                ops.append(term_op)
+
+        terms = [(c, term_op) for c, term_op in zip(coeffs, ops) if c != 0]
+        if not terms:
+            return ZeroOperator(op.domain, op.range)
+        elif len(terms) == 1:
+            coeff, term_op = terms[0]
+            if term_op is None:
+                return scaling(op.domain, coeff)
+            elif coeff == 1:
+                return term_op
+            else:
+                return OperatorLeftScalarMult(term_op, coeff)
+        else:
+            return OperatorLinComb(
+                [IdentityOperator(op.range) if term_op is None else term_op
+                 for _, term_op in terms],
+                [c for c, _ in terms])
+
+    def chain_links(op):
+        """Return the factors of ``op`` as operators and scalars."""
+        if type(op) is OperatorComp:
+            return chain_links(op.left) + chain_links(op.right)
+        elif type(op) is OperatorLeftScalarMult:
+            return [op.scalar] + chain_links(op.operator)
+        elif type(op) is OperatorRightScalarMult:
+            return chain_links(op.operator) + [op.scalar]
+
+        op = optimize(op)
+        if isinstance(op, ScalingOperator):
+            return [op.scalar]
+        elif type(op) is OperatorLeftScalarMult:
+            return [op.scalar, op.operator]
+        else:
+            return [op]
+
+    def commutes(scalar, op):
+        """Return ``True`` if ``op(scalar * x) == scalar * op(x)``."""
+        return (op.is_linear and
+                isinstance(op.domain, LinearSpace) and
+                isinstance(op.range, LinearSpace) and
+                (complex(scalar).imag == 0 or
+                 op.domain.field == op.range.field))
+
+    def optimize_chain(op):
+        """Return the optimized version of the composition ``op``."""
+        # Go from right to left and move scalars as far left as possible
+        ops = []
+        scalar = 1
+        for link in reversed(chain_links(op)):
+            if not isinstance(link, Operator):
+                scalar = scalar * link
+                if complex(scalar).imag == 0:
+                    # Allow moving through real spaces
+                    scalar = scalar.real
+            elif scalar == 1 or commutes(scalar, link):
+                if scalar != 1 and type(link) is OperatorLinComb:
+                    link = OperatorLinComb(
+                        link.operators, [scalar * c for c in link.coeffs])
+                    scalar = 1
+                ops.insert(0, link)
+            else:
+                ops.insert(0, OperatorRightScalarMult(link, scalar))
+                scalar = 1
+
+        if scalar == 0:
+            return ZeroOperator(op.domain, op.range)
+        elif not ops:
+            return scaling(op.domain, scalar)
+        elif scalar != 1 and type(ops[0]) is OperatorLinComb:
+            ops[0] = OperatorLinComb(
+                ops[0].operators, [scalar * c for c in ops[0].coeffs])
+            scalar = 1
+
+        result = ops[-1]
+        for left in reversed(ops[:-1]):
+            result = OperatorComp(left, result)
+        if scalar != 1:
+            result = OperatorLeftScalarMult(result, scalar)
+        return result
+
+    def scaling(space, scalar):
+        """Return the scaling operator on ``space`` with ``scalar``."""
+        if scalar == 1:
+            return IdentityOperator(space)
+        else:
+            return ScalingOperator(space, scalar)
+
+    if is_sum(op) and isinstance(op.range, LinearSpace):
+        return optimize_sum(op)
+    elif is_chain(op):
+        return optimize_chain(op)
+    elif isinstance(op, ScalingOperator) and op.scalar == 1:
+        return IdentityOperator(op.domain)
+    elif type(op) is OperatorVectorSum:
+        return OperatorVectorSum(optimize(op.operator), op.vector)
+    elif type(op) is OperatorPointwiseProduct:
+        return OperatorPointwiseProduct(optimize(op.left),
+                                        optimize(op.right))
+    elif type(op) is FunctionalLeftVectorMult:
+        return FunctionalLeftVectorMult(optimize(op.functional), op.vector)
+    elif type(op) in (OperatorLeftVectorMult, OperatorRightVectorMult):
+        return type(op)(optimize(op.operator), op.vector)
+    else:
+        return op
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
@@ -15,6 +15,7 @@ import numpy as np
 from odl.operator.operator import Operator
 from odl.operator.default_ops import ZeroOperator
 from odl.space import ProductSpace
+from odl.util.parallel import EXECUTORS, executor_map
 
 
 __all__ = ('ProductSpaceOperator',
@@ -22,6 +23,12 @@ __all__ = ('ProductSpaceOperator',
            'BroadcastOperator', 'ReductionOperator', 'DiagonalOperator')
 
 
+def _evaluate_operator(op_and_arg):
+    """Return ``op(arg)``, used for evaluation in worker processes."""
+    op, arg = op_and_arg
+    return op(arg)
+
+
 class ProductSpaceOperator(Operator):
 
     """A "matrix of operators" on product spaces.
@@ -81,6 +88,11 @@ class ProductSpaceOperator(Operator):
     .. math::
         [\mathcal{A}(x)]_i = \sum_{j=1}^m \mathcal{A}_{ij}(x_j).
 
+    The component operators are independent of each other, hence they
+    can be evaluated concurrently by threads or processes, see the
+    ``executor`` parameter. The results in each row are summed up in the
+    order of the components, independently of the evaluation order.
+
     See Also
     --------
     BroadcastOperator : Case when a single argument is used by several ops.
@@ -88,7 +100,8 @@ class ProductSpaceOperator(Operator):
     DiagonalOperator : Case where the 'matrix' is diagonal.
     """
 
-    def __init__(self, operators, domain=None, range=None):
+    def __init__(self, operators, domain=None, range=None, executor=None,
+                 max_workers=None):
         """Initialize a new instance.
 
         Parameters
@@ -103,6 +116,21 @@ class ProductSpaceOperator(Operator):
             Range of the operator. If not provided, it is tried to be
             inferred from the operators. This requires each **row**
             to contain at least one operator.
+        executor : {None, 'thread', 'process'}, optional
+            How to evaluate the component operators:
+
+            - ``None``: One after the other.
+            - ``'thread'``: Concurrently in worker threads. This speeds
+              up operators that release the global interpreter lock,
+              like most NumPy-based operators on large arrays.
+            - ``'process'``: Concurrently in worker processes. The
+              operators and the parts of the arguments are pickled and
+              sent to the processes, and the results are sent back.
+
+            The executor is inherited by the `derivative` and `adjoint`.
+        max_workers : positive int, optional
+            Maximum number of threads or processes used for evaluation.
+            For ``None``, `odl.util.parallel.num_threads` is used.
 
         Examples
         --------
@@ -153,6 +181,17 @@ class ProductSpaceOperator(Operator):
         import scipy.sparse
 
         # Validate input data
+        if executor not in EXECUTORS:
+            raise ValueError('`executor` must be one of {}, got {!r}'
+                             ''.format(EXECUTORS, executor))
+        if max_workers is not None:
+            max_workers, max_workers_in = int(max_workers), max_workers
+            if max_workers <= 0:
+                raise ValueError('`max_workers` must be positive, got {!r}'
+                                 ''.format(max_workers_in))
+        self.__executor = executor
+        self.__max_workers = max_workers
+
         if domain is not None:
             if not isinstance(domain, ProductSpace):
                 raise TypeError('`domain` {!r} not a ProductSpace instance'
@@ -287,8 +326,21 @@ class ProductSpaceOperator(Operator):
         """The sparse operator matrix representing this operator."""
         return self.__ops
 
+    @property
+    def executor(self):
+        """How the component operators are evaluated."""
+        return self.__executor
+
+    @property
+    def max_workers(self):
+        """Maximum number of threads or processes used for evaluation."""
+        return self.__max_workers
+
     def _call(self, x, out=None):
         """Call the operators on the parts of ``x``."""
+        if self.executor is not None:
+            return self._call_concurrent(x, out)
+
         # TODO: add optimization in case an operator appears repeatedly in a
         # row
         if out is None:
@@ -312,6 +364,56 @@ class ProductSpaceOperator(Operator):
 
         return out
 
+    def _call_concurrent(self, x, out=None):
+        """Call the operators concurrently on the parts of ``x``."""
+        if out is None:
+            out = self.range.element()
+        entries = list(zip(self.ops.row, self.ops.col, self.ops.data))
+
+        temporaries = []
+        try:
+            if self.executor == 'process':
+                results = executor_map(_evaluate_operator,
+                                       [(op, x[j]) for _, j, op in entries],
+                                       'process', self.max_workers)
+            else:
+                # The first operator in a row writes to `out` directly,
+                # unless `x` and `out` are aligned. The others write to
+                # temporaries.
+                targets = []
+                for i, _, _ in entries:
+                    if (out is not x and
+                            not any(out[i] is tgt for tgt in targets)):
+                        targets.append(out[i])
+                    else:
+                        targets.append(self.range[i].pool.acquire())
+                        temporaries.append((i, targets[-1]))
+
+                def evaluate(k):
+                    _, j, op = entries[k]
+                    return op(x[j], out=targets[k])
+
+                results = executor_map(evaluate, range(len(entries)),
+                                       'thread', self.max_workers)
+
+            # Sum up in a fixed order for reproducible results
+            has_evaluated_row = np.zeros(len(self.range), dtype=bool)
+            for (i, _, _), result in zip(entries, results):
+                if has_evaluated_row[i]:
+                    out[i] += result
+                elif result is not out[i]:
+                    out[i].assign(result)
+                has_evaluated_row[i] = True
+
+            for i, evaluated in enumerate(has_evaluated_row):
+                if not evaluated:
+                    out[i].set_zero()
+        finally:
+            for i, tmp in temporaries:
+                self.range[i].pool.release(tmp)
+
+        return out
+
     def derivative(self, x):
         """Derivative of the product space operator.
 
@@ -383,7 +485,9 @@ class ProductSpaceOperator(Operator):
         indices = [self.ops.row, self.ops.col]
         shape = self.ops.shape
         deriv_matrix = scipy.sparse.coo_matrix((data, indices), shape)
-        return ProductSpaceOperator(deriv_matrix, self.domain, self.range)
+        return ProductSpaceOperator(deriv_matrix, self.domain, self.range,
+                                    executor=self.executor,
+                                    max_workers=self.max_workers)
 
     @property
     def adjoint(self):
@@ -432,7 +536,9 @@ class ProductSpaceOperator(Operator):
         indices = [self.ops.col, self.ops.row]  # Swap col/row -> transpose
         shape = (self.ops.shape[1], self.ops.shape[0])
         adj_matrix = scipy.sparse.coo_matrix((data, indices), shape)
-        return ProductSpaceOperator(adj_matrix, self.range, self.domain)
+        return ProductSpaceOperator(adj_matrix, self.range, self.domain,
+                                    executor=self.executor,
+                                    max_workers=self.max_workers)
 
     def __getitem__(self, index):
         """Get sub-operator by index.
@@ -495,7 +601,8 @@ class ProductSpaceOperator(Operator):
                 if ops[i] is None:
                     ops[i] = ZeroOperator(self.domain[i])
 
-            return ReductionOperator(*ops)
+            return ReductionOperator(*ops, executor=self.executor,
+                                     max_workers=self.max_workers)
 
     @property
     def shape(self):
@@ -731,7 +838,7 @@ class BroadcastOperator(Operator):
     ReductionOperator : Calculates sum of operator results.
     DiagonalOperator : Case where each operator should have its own argument.
     """
-    def __init__(self, *operators):
+    def __init__(self, *operators, **kwargs):
         """Initialize a new instance
 
         Parameters
@@ -740,6 +847,11 @@ class BroadcastOperator(Operator):
             The individual operators that should be evaluated.
             Can also be given as ``operator, n`` with ``n`` integer,
             in which case ``operator`` is repeated ``n`` times.
+        executor : {None, 'thread', 'process'}, optional
+            How to evaluate the operators, see `ProductSpaceOperator`.
+            The executor is inherited by the `derivative` and `adjoint`.
+        max_workers : positive int, optional
+            Maximum number of threads or processes used for evaluation.
 
         Examples
         --------
@@ -774,7 +886,8 @@ class BroadcastOperator(Operator):
             operators = (operators[0],) * operators[1]
 
         self.__operators = operators
-        self.__prod_op = ProductSpaceOperator([[op] for op in operators])
+        self.__prod_op = ProductSpaceOperator([[op] for op in operators],
+                                              **kwargs)
         super(BroadcastOperator, self).__init__(
             self.prod_op.domain[0], self.prod_op.range,
             linear=self.prod_op.is_linear)
@@ -846,7 +959,9 @@ class BroadcastOperator(Operator):
         ])
         """
         return BroadcastOperator(*[op.derivative(x) for op in
-                                   self.operators])
+                                   self.operators],
+                                 executor=self.prod_op.executor,
+                                 max_workers=self.prod_op.max_workers)
 
     @property
     def adjoint(self):
@@ -863,7 +978,9 @@ class BroadcastOperator(Operator):
         >>> op.adjoint([[1, 2, 3], [2, 3, 4]])
         rn(3).element([  5.,   8.,  11.])
         """
-        return ReductionOperator(*[op.adjoint for op in self.operators])
+        return ReductionOperator(*[op.adjoint for op in self.operators],
+                                 executor=self.prod_op.executor,
+                                 max_workers=self.prod_op.max_workers)
 
     def __repr__(self):
         """Return ``repr(self)``.
@@ -900,7 +1017,7 @@ class ReductionOperator(Operator):
     BroadcastOperator : Calls several operators with same argument.
     DiagonalOperator : Case where each operator should have its own argument.
     """
-    def __init__(self, *operators):
+    def __init__(self, *operators, **kwargs):
         """Initialize a new instance.
 
         Parameters
@@ -909,6 +1026,11 @@ class ReductionOperator(Operator):
             The individual operators that should be evaluated and summed.
             Can also be given as ``operator, n`` with ``n`` integer,
             in which case ``operator`` is repeated ``n`` times.
+        executor : {None, 'thread', 'process'}, optional
+            How to evaluate the operators, see `ProductSpaceOperator`.
+            The executor is inherited by the `derivative` and `adjoint`.
+        max_workers : positive int, optional
+            Maximum number of threads or processes used for evaluation.
 
         Examples
         --------
@@ -949,7 +1071,7 @@ class ReductionOperator(Operator):
             operators = (operators[0],) * operators[1]
 
         self.__operators = operators
-        self.__prod_op = ProductSpaceOperator([operators])
+        self.__prod_op = ProductSpaceOperator([operators], **kwargs)
 
         super(ReductionOperator, self).__init__(
             self.prod_op.domain, self.prod_op.range[0],
@@ -1030,7 +1152,9 @@ class ReductionOperator(Operator):
         rn(3).element([  9.,  14.,  19.])
         """
         return ReductionOperator(*[op.derivative(xi)
-                                   for op, xi in zip(self.operators, x)])
+                                   for op, xi in zip(self.operators, x)],
+                                 executor=self.prod_op.executor,
+                                 max_workers=self.prod_op.max_workers)
 
     @property
     def adjoint(self):
@@ -1050,7 +1174,9 @@ class ReductionOperator(Operator):
             [ 2.,  4.,  6.]
         ])
         """
-        return BroadcastOperator(*[op.adjoint for op in self.operators])
+        return BroadcastOperator(*[op.adjoint for op in self.operators],
+                                 executor=self.prod_op.executor,
+                                 max_workers=self.prod_op.max_workers)
 
     def __repr__(self):
         """Return ``repr(self)``.
@@ -1200,7 +1326,9 @@ class DiagonalOperator(ProductSpaceOperator):
 
         derivs = [op.derivative(p) for op, p in zip(self.operators, point)]
         return DiagonalOperator(*derivs,
-                                domain=self.domain, range=self.range)
+                                domain=self.domain, range=self.range,
+                                executor=self.executor,
+                                max_workers=self.max_workers)
 
     @property
     def adjoint(self):
@@ -1229,7 +1357,9 @@ class DiagonalOperator(ProductSpaceOperator):
         """
         adjoints = [op.adjoint for op in self.operators]
         return DiagonalOperator(*adjoints,
-                                domain=self.range, range=self.domain)
+                                domain=self.range, range=self.domain,
+                                executor=self.executor,
+                                max_workers=self.max_workers)
 
     @property
     def inverse(self):
@@ -1258,7 +1388,9 @@ class DiagonalOperator(ProductSpaceOperator):
         """
         inverses = [op.inverse for op in self.operators]
         return DiagonalOperator(*inverses,
-                                domain=self.range, range=self.domain)
+                                domain=self.range, range=self.domain,
+                                executor=self.executor,
+                                max_workers=self.max_workers)
 
     def __repr__(self):
         """Return ``repr(self)``.
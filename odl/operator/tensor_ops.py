@@ -224,7 +224,10 @@ class PointwiseNorm(PointwiseTensorFieldOperator):
 
     def _call(self, f, out):
         """Implement ``self(f, out)``."""
-        if self.exponent == 1.0:
+        if f.buffer is not None and not self.is_weighted:
+            # All components in one array, reduce over the first axis
+            out[:] = np.linalg.norm(f.buffer, ord=self.exponent, axis=0)
+        elif self.exponent == 1.0:
             self._call_vecfield_1(f, out)
         elif self.exponent == float('inf'):
             self._call_vecfield_inf(f, out)
@@ -943,6 +946,22 @@ class MatrixOperator(Operator):
 
         return out
 
+    def _apply_batch(self, x, out):
+        """Implement ``out[i] <-- self(x[i])`` with one matrix product."""
+        # Lazy import to improve `import odl` time
+        import scipy.sparse
+
+        if x.buffer is None or out.buffer is None:
+            super(MatrixOperator, self)._apply_batch(x, out)
+        elif scipy.sparse.isspmatrix(self.matrix):
+            # The matrix acts on the only axis after the batch axis
+            out.buffer[:] = self.matrix.dot(x.buffer.T).T
+        else:
+            # Contract along `axis`, shifted by the leading batch axis
+            dot = np.tensordot(self.matrix, x.buffer,
+                               axes=(1, self.axis + 1))
+            out.buffer[:] = moveaxis(dot, 0, self.axis + 1)
+
     def __repr__(self):
         """Return ``repr(self)``."""
         # Lazy import to improve `import odl` time
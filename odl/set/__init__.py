@@ -20,3 +20,6 @@ __all__ += domain.__all__
 
 from .space import *
 __all__ += space.__all__
+
+from .pool import *
+__all__ += pool.__all__
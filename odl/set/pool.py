@@ -0,0 +1,325 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Pools of recycled space elements for temporaries."""
+
+from __future__ import print_function, division, absolute_import
+from builtins import object
+import threading
+import weakref
+
+
+__all__ = ('ElementPool', 'recycle_temporaries')
+
+
+# Number of elements kept per space inside `recycle_temporaries`
+DEFAULT_POOL_SIZE = 4
+
+_POOL_STATE = threading.local()
+
+# All pools that currently hold elements, to free them after
+# `recycle_temporaries` ends
+_FILLED_POOLS = weakref.WeakSet()
+_FILLED_POOLS_LOCK = threading.Lock()
+
+
+def default_pool_size():
+    """Return the pool size for pools without own ``max_size``.
+
+    This is 0 (no recycling) outside of `recycle_temporaries`.
+    """
+    sizes = getattr(_POOL_STATE, 'sizes', [])
+    return sizes[-1] if sizes else 0
+
+
+class recycle_temporaries(object):
+
+    """Context manager to recycle temporary elements of spaces.
+
+    Within this context, elements returned to the `ElementPool` of a
+    space, e.g., temporaries of `LinearSpace.temporary` used by
+    operators and solvers, are kept and handed out again instead of
+    allocating new memory. This avoids the cost of allocating and
+    page-faulting fresh memory for each temporary in long runs.
+
+    When the outermost context ends, all kept elements are freed,
+    except for pools that have their own `ElementPool.max_size`. The
+    setting is local to the current thread.
+
+    Examples
+    --------
+    >>> space = odl.rn(3)
+    >>> with odl.recycle_temporaries():
+    ...     with space.temporary() as tmp:
+    ...         tmp_id = id(tmp)
+    ...     with space.temporary() as tmp:
+    ...         id(tmp) == tmp_id
+    True
+    >>> space.pool.stats['hits']
+    1
+    """
+
+    def __init__(self, max_size=DEFAULT_POOL_SIZE):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        max_size : nonnegative int, optional
+            Maximum number of elements kept per space.
+        """
+        max_size, max_size_in = int(max_size), max_size
+        if max_size < 0:
+            raise ValueError('`max_size` must be nonnegative, got {!r}'
+                             ''.format(max_size_in))
+        self.__max_size = max_size
+
+    def __enter__(self):
+        """Called by ``with recycle_temporaries():``."""
+        if not hasattr(_POOL_STATE, 'sizes'):
+            _POOL_STATE.sizes = []
+        _POOL_STATE.sizes.append(self.__max_size)
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Called when ``with recycle_temporaries():`` ends."""
+        _POOL_STATE.sizes.pop()
+        if not _POOL_STATE.sizes:
+            with _FILLED_POOLS_LOCK:
+                pools = list(_FILLED_POOLS)
+            for pool in pools:
+                if pool.own_max_size is None:
+                    pool.clear()
+
+
+class ElementPool(object):
+
+    """Pool of recycled elements of a `LinearSpace`.
+
+    The pool hands out elements with `acquire` and takes them back with
+    `release`. Released elements are kept up to `max_size` and handed
+    out again by later calls of `acquire`, which saves the allocation
+    of new elements. Elements are created with the
+    ``_new_temporary`` method of the space, which, e.g., allocates
+    memory aligned to cache lines for `NumpyTensorSpace`.
+
+    The state of acquired elements is arbitrary, as for
+    ``space.element()``. Pools can be used from several threads.
+
+    Normally, the pool of a space is used via `LinearSpace.temporary`.
+    """
+
+    def __init__(self, space, max_size=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        space : `LinearSpace`
+            Space whose elements are pooled.
+        max_size : nonnegative int, optional
+            Maximum number of elements kept in the pool. For ``None``,
+            the size set by `recycle_temporaries` is used, i.e., no
+            elements are kept outside of that context.
+        """
+        self.__space = space
+        self.__free = []
+        self.__lock = threading.Lock()
+        self.__stats = {'hits': 0, 'misses': 0, 'returns': 0, 'discards': 0}
+        self.max_size = max_size
+
+    @property
+    def space(self):
+        """Space whose elements are pooled."""
+        return self.__space
+
+    @property
+    def own_max_size(self):
+        """Maximum number of elements set for this pool, or ``None``."""
+        return self.__max_size
+
+    @property
+    def max_size(self):
+        """Maximum number of elements kept in the pool."""
+        if self.__max_size is None:
+            return default_pool_size()
+        else:
+            return self.__max_size
+
+    @max_size.setter
+    def max_size(self, max_size):
+        """Set the maximum number of elements kept in the pool."""
+        if max_size is not None:
+            max_size, max_size_in = int(max_size), max_size
+            if max_size < 0:
+                raise ValueError('`max_size` must be nonnegative, got {!r}'
+                                 ''.format(max_size_in))
+        self.__max_size = max_size
+        if max_size is not None:
+            self._shrink(max_size)
+
+    def acquire(self):
+        """Return an element of `space`, recycled if possible.
+
+        Examples
+        --------
+        >>> pool = odl.rn(3).pool
+        >>> x = pool.acquire()
+        >>> x in pool.space
+        True
+        """
+        with self.__lock:
+            if self.__free:
+                self.__stats['hits'] += 1
+                return self.__free.pop()
+            self.__stats['misses'] += 1
+        return self.space._new_temporary()
+
+    def release(self, x):
+        """Return ``x`` to the pool for recycling.
+
+        ``x`` must not be used by the caller afterwards. Elements that
+        do not fit into the pool are left to the garbage collector.
+
+        Examples
+        --------
+        >>> pool = odl.rn(3).pool
+        >>> pool.max_size = 1
+        >>> x = pool.acquire()
+        >>> pool.release(x)
+        >>> pool.acquire() is x
+        True
+        """
+        if x not in self.space:
+            raise TypeError('`x` {!r} is not an element of the pooled space '
+                            '{!r}'.format(x, self.space))
+        max_size = self.max_size
+        with self.__lock:
+            if (len(self.__free) < max_size and
+                    not any(y is x for y in self.__free)):
+                self.__free.append(x)
+                self.__stats['returns'] += 1
+                filled = True
+            else:
+                self.__stats['discards'] += 1
+                filled = False
+        if filled:
+            with _FILLED_POOLS_LOCK:
+                _FILLED_POOLS.add(self)
+
+    def temporary(self, tmp=None):
+        """Return a context manager providing a temporary element.
+
+        The element is acquired from this pool and released at the end
+        of the ``with`` block, after which it must not be used anymore.
+
+        Parameters
+        ----------
+        tmp : optional
+            Element that is handed out instead of a pooled one. It is
+            not released to the pool.
+
+        Examples
+        --------
+        >>> pool = odl.set.pool.ElementPool(odl.rn(3), max_size=1)
+        >>> with pool.temporary() as tmp:
+        ...     tmp_id = id(tmp)
+        >>> with pool.temporary() as tmp:
+        ...     id(tmp) == tmp_id
+        True
+        """
+        return _Temporary(self, tmp)
+
+    def _shrink(self, size):
+        """Keep at most ``size`` elements in the pool."""
+        with self.__lock:
+            del self.__free[size:]
+
+    def clear(self):
+        """Free all elements kept in the pool."""
+        self._shrink(0)
+
+    def __len__(self):
+        """Return ``len(self)``, the number of elements kept."""
+        return len(self.__free)
+
+    @property
+    def stats(self):
+        """Statistics of the pool usage as a dictionary.
+
+        The entries are:
+
+        - ``'hits'``: Number of acquired elements that were recycled.
+        - ``'misses'``: Number of acquired elements that were created.
+        - ``'returns'``: Number of released elements that were kept.
+        - ``'discards'``: Number of released elements that were dropped.
+        - ``'size'``: Number of elements currently kept.
+        - ``'nbytes'``: Total size in bytes of the kept elements, if
+          the elements have an ``nbytes`` attribute.
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['size'] = len(self.__free)
+            stats['nbytes'] = sum(getattr(x, 'nbytes', 0)
+                                  for x in self.__free)
+        return stats
+
+    def reset_stats(self):
+        """Set all usage counters in `stats` to 0."""
+        with self.__lock:
+            for key in self.__stats:
+                self.__stats[key] = 0
+
+    def __getstate__(self):
+        """Return the state for pickling, without kept elements."""
+        return {'space': self.space, 'max_size': self.own_max_size}
+
+    def __setstate__(self, state):
+        """Restore the state after unpickling."""
+        self.__init__(state['space'], state['max_size'])
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({!r}, max_size={!r})'.format(self.__class__.__name__,
+                                                self.space, self.own_max_size)
+
+
+class _Temporary(object):
+
+    """Context manager handing out a temporary element from a pool."""
+
+    def __init__(self, pool, tmp=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        pool : `ElementPool`
+            Pool from which the element is acquired.
+        tmp : optional
+            Element that is handed out instead of a pooled one. It is
+            not released to the pool.
+        """
+        self.__pool = pool
+        self.__tmp = tmp
+        self.__elem = None
+
+    def __enter__(self):
+        """Acquire the element."""
+        if self.__tmp is not None:
+            return self.__tmp
+        self.__elem = self.__pool.acquire()
+        return self.__elem
+
+    def __exit__(self, type, value, traceback):
+        """Release the element."""
+        elem, self.__elem = self.__elem, None
+        if elem is not None:
+            self.__pool.release(elem)
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
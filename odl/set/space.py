@@ -10,14 +10,19 @@
 
 from __future__ import print_function, division, absolute_import
 from builtins import object
+import threading
 import numpy as np
 
+from odl.set.pool import ElementPool
 from odl.set.sets import Field, Set, UniversalSet
 
 
 __all__ = ('LinearSpace', 'UniversalSpace')
 
 
+_POOL_LOCK = threading.Lock()
+
+
 class LinearSpace(Set):
     """Abstract linear vector space.
 
@@ -89,6 +94,24 @@ class LinearSpace(Set):
         """
         raise NotImplementedError('abstract method')
 
+    def _lincomb_many(self, coeffs, elements, out):
+        """Implement ``out[:] = sum(a * x for a, x in zip(coeffs, elements))``.
+
+        The default implementation chains calls to `_lincomb`.
+
+        This method is intended to be private. Public callers should
+        resort to `lincomb_many` which is type-checked and guarantees
+        that ``elements`` is non-empty, contains no element twice and that
+        ``out`` is not one of ``elements[1:]``.
+        """
+        if len(elements) == 1:
+            self._lincomb(coeffs[0], elements[0], 0, elements[0], out)
+            return
+
+        self._lincomb(coeffs[0], elements[0], coeffs[1], elements[1], out)
+        for a, x in zip(coeffs[2:], elements[2:]):
+            self._lincomb(1, out, a, x, out)
+
     def _dist(self, x1, x2):
         """Return the distance between ``x1`` and ``x2``.
 
@@ -135,6 +158,65 @@ class LinearSpace(Set):
         self.lincomb(0, tmp, 0, tmp, tmp)
         return tmp
 
+    @property
+    def pool(self):
+        """`ElementPool` of recycled temporary elements of this space.
+
+        By default, elements are only recycled inside of
+        `recycle_temporaries`. Setting ``space.pool.max_size`` enables
+        recycling for this space permanently.
+        """
+        try:
+            return self.__pool
+        except AttributeError:
+            with _POOL_LOCK:
+                if '_LinearSpace__pool' not in self.__dict__:
+                    self.__pool = ElementPool(self)
+            return self.__pool
+
+    def temporary(self, tmp=None):
+        """Return a context manager providing a temporary element.
+
+        The element is acquired from the `pool` of this space and
+        returned to it at the end of the ``with`` block, after which it
+        must not be used anymore. Its initial state is arbitrary, as for
+        ``space.element()``.
+
+        Parameters
+        ----------
+        tmp : `LinearSpaceElement`, optional
+            Element provided by the caller, which is handed out instead
+            of a pooled element and not returned to the pool.
+
+        Examples
+        --------
+        >>> space = odl.rn(3)
+        >>> x = space.element([1, 2, 3])
+        >>> with space.temporary() as tmp:
+        ...     tmp[:] = x
+        ...     tmp *= 3
+        ...     print(tmp.norm() == 3 * x.norm())
+        True
+        """
+        return self.pool.temporary(tmp)
+
+    def _new_temporary(self):
+        """Return a new element for the `pool`.
+
+        Subclasses can override this method to allocate elements that
+        are better suited for repeated use, e.g., with aligned memory.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+        """
+        return self.element()
+
+    def __getstate__(self):
+        """Return the state for pickling, without the `pool`."""
+        state = self.__dict__.copy()
+        state.pop('_LinearSpace__pool', None)
+        return state
+
     def __contains__(self, other):
         """Return ``other in self``.
 
@@ -225,6 +307,94 @@ class LinearSpace(Set):
 
         return out
 
+    def lincomb_many(self, coeffs, elements, out=None):
+        """Implement ``out[:] = sum(a * x for a, x in zip(coeffs, elements))``.
+
+        Compared to chained calls to `lincomb`, spaces can evaluate
+        this linear combination of arbitrarily many elements in a single
+        pass over memory.
+
+        Parameters
+        ----------
+        coeffs : sequence of `field` elements
+            Scalars to multiply ``elements`` with.
+        elements : sequence of `LinearSpaceElement`
+            Space elements in the linear combination, of the same length
+            as ``coeffs``.
+        out : `LinearSpaceElement`, optional
+            Element to which the result is written.
+
+        Returns
+        -------
+        out : `LinearSpaceElement`
+            Result of the linear combination. If ``out`` was provided,
+            the returned object is a reference to it.
+
+        Notes
+        -----
+        The elements ``out`` and ``elements`` may be aligned, e.g., a call
+
+            ``space.lincomb_many([1, 2, -2], [x, y, z], out=x)``
+
+        is (mathematically) equivalent to
+
+            ``x += 2 * (y - z)``.
+
+        Examples
+        --------
+        >>> space = odl.rn(3)
+        >>> x = space.element([1, 2, 3])
+        >>> y = space.element([0, 1, 0])
+        >>> space.lincomb_many([1, 2, -1], [x, y, x])
+        rn(3).element([ 0.,  2.,  0.])
+        """
+        if out is None:
+            out = self.element()
+        elif out not in self:
+            raise LinearSpaceTypeError('`out` {!r} is not an element of {!r}'
+                                       ''.format(out, self))
+
+        coeffs = list(coeffs)
+        elements = list(elements)
+        if len(coeffs) != len(elements):
+            raise ValueError('`coeffs` and `elements` must have the same '
+                             'length, got {} != {}'
+                             ''.format(len(coeffs), len(elements)))
+        for a in coeffs:
+            if self.field is not None and a not in self.field:
+                raise LinearSpaceTypeError('coefficient {!r} not an element '
+                                           'of the field {!r} of {!r}'
+                                           ''.format(a, self.field, self))
+        for x in elements:
+            if x not in self:
+                raise LinearSpaceTypeError('{!r} is not an element of {!r}'
+                                           ''.format(x, self))
+
+        # Merge coefficients of aligned elements, keeping the order
+        merged_coeffs, merged_elems = [], []
+        for a, x in zip(coeffs, elements):
+            for i, y in enumerate(merged_elems):
+                if y is x:
+                    merged_coeffs[i] += a
+                    break
+            else:
+                merged_coeffs.append(a)
+                merged_elems.append(x)
+
+        if not merged_elems:
+            self._lincomb(0, out, 0, out, out)
+            return out
+
+        # Put `out` in front to avoid overwriting it before it is read
+        for i, x in enumerate(merged_elems):
+            if x is out:
+                merged_coeffs.insert(0, merged_coeffs.pop(i))
+                merged_elems.insert(0, merged_elems.pop(i))
+                break
+
+        self._lincomb_many(merged_coeffs, merged_elems, out)
+        return out
+
     def dist(self, x1, x2):
         """Return the distance between ``x1`` and ``x2``.
 
@@ -358,6 +528,43 @@ class LinearSpace(Set):
         """Type of elements of this space (`LinearSpaceElement`)."""
         return LinearSpaceElement
 
+    def batched(self, n):
+        """Return the space of batches of ``n`` elements of this space.
+
+        A batch is an element of the power space ``self ** n``, whose
+        parts can be processed together, see `Operator.apply_batch`.
+        If the elements of this space store their data in NumPy arrays,
+        all parts of a batch share one array with a leading batch axis
+        of length ``n``, see `ProductSpace.is_contiguous`.
+
+        Parameters
+        ----------
+        n : nonnegative int
+            Number of elements in a batch.
+
+        Returns
+        -------
+        batch_space : `ProductSpace`
+            Power space of ``n`` copies of this space.
+
+        Examples
+        --------
+        >>> batch_space = odl.rn(2).batched(3)
+        >>> batch_space
+        ProductSpace(rn(2), 3, contiguous=True)
+        >>> batch_space.one().buffer.shape
+        (3, 2)
+        """
+        from odl.space.pspace import ProductSpace, _numpy_tspace
+
+        n, n_in = int(n), n
+        if n != n_in or n < 0:
+            raise ValueError('`n` must be a nonnegative integer, got {!r}'
+                             ''.format(n_in))
+
+        contiguous = n > 0 and _numpy_tspace(self) is not None
+        return ProductSpace(self, n, contiguous=contiguous)
+
     def __pow__(self, shape):
         """Return ``self ** shape``.
 
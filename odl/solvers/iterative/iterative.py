@@ -103,21 +103,21 @@ def landweber(op, x, rhs, niter, omega=None, projection=None, callback=None):
     if omega is None:
         omega = 1 / op.norm(estimate=True) ** 2
 
-    # Reusable temporaries
-    tmp_ran = op.range.element()
-    tmp_dom = op.domain.element()
+    # Reusable temporaries, recycled from the pools of the spaces, see
+    # `odl.recycle_temporaries`
+    with op.range.temporary() as tmp_ran, \
+            op.domain.temporary() as tmp_dom:
+        for _ in range(niter):
+            op(x, out=tmp_ran)
+            tmp_ran -= rhs
+            op.derivative(x).adjoint(tmp_ran, out=tmp_dom)
+            x.lincomb(1, x, -omega, tmp_dom)
 
-    for _ in range(niter):
-        op(x, out=tmp_ran)
-        tmp_ran -= rhs
-        op.derivative(x).adjoint(tmp_ran, out=tmp_dom)
-        x.lincomb(1, x, -omega, tmp_dom)
-
-        if projection is not None:
-            projection(x)
+            if projection is not None:
+                projection(x)
 
-        if callback is not None:
-            callback(x)
+            if callback is not None:
+                callback(x)
 
 
 def conjugate_gradient(op, x, rhs, niter, callback=None):
@@ -378,7 +378,7 @@ def gauss_newton(op, x, rhs, niter, zero_seq=exp_zero_seq(2.0),
 
         # Solve equation Tikhonov regularized system
         # (deriv.T o deriv + tm * id_op)^-1 u = dx
-        tikh_op = OperatorSum(OperatorComp(deriv.adjoint, deriv),
+        tikh_op = OperatorSum(OperatorComp(deriv.adjoint, deriv, tmp_ran),
                               tm * id_op, tmp_dom)
 
         # TODO: allow user to select other method
@@ -9,13 +9,92 @@
 """Maximum Likelihood Expectation Maximization algorithm."""
 
 from __future__ import print_function, division, absolute_import
+import os
+import weakref
 import numpy as np
 
-__all__ = ('mlem', 'osmlem', 'loglikelihood')
+__all__ = ('mlem', 'osmlem', 'loglikelihood', 'sensitivity_image')
 
 
 AVAILABLE_MLEM_NOISE = ('poisson',)
 
+# Sensitivity images of operators without an implementation cache, kept
+# alive as long as the operators
+_SENSITIVITY_CACHE = weakref.WeakKeyDictionary()
+
+
+def sensitivity_image(op, use_cache=True, fname=None):
+    """Return the sensitivity image ``op.adjoint(op.range.one())``.
+
+    The sensitivity image is computed once and then cached. For operators
+    with a ``geometry`` that has an ``implementation_cache``, e.g.,
+    `RayTransform`, it is stored in that cache and thus shared between
+    all such operators with the same geometry, spaces and back-end.
+    Otherwise, it is stored as long as ``op`` exists.
+
+    Parameters
+    ----------
+    op : `Operator`
+        Linear operator whose sensitivity image should be computed.
+    use_cache : bool, optional
+        If ``False``, neither look up nor store the result in the cache.
+    fname : str, optional
+        Name of a file in NumPy ``.npy`` format. If it exists, the
+        sensitivity image is loaded from it instead of being computed,
+        otherwise the computed image is saved to it. Note that the
+        file is not checked for consistency with ``op`` beyond its
+        shape.
+
+    Returns
+    -------
+    sensitivity : ``op.domain`` element
+        The sensitivity image. It is shared with the cache and should
+        not be modified.
+
+    Examples
+    --------
+    >>> space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))
+    >>> geometry = odl.tomo.parallel_beam_geometry(space, num_angles=5)
+    >>> ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+    >>> sens = sensitivity_image(ray_trafo)
+    >>> sens is sensitivity_image(ray_trafo)
+    True
+
+    The cache is shared with new ray transforms on the same geometry:
+
+    >>> ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+    >>> sens is sensitivity_image(ray_trafo)
+    True
+    """
+    geometry = getattr(op, 'geometry', None)
+    cache = getattr(geometry, 'implementation_cache', None)
+    if cache is not None:
+        key = ('sensitivity', type(op), getattr(op, 'impl', None), op.domain,
+               op.range)
+    else:
+        cache = _SENSITIVITY_CACHE.setdefault(op, {})
+        key = 'sensitivity'
+
+    sensitivity = cache.get(key, None) if use_cache else None
+    if sensitivity is not None:
+        return sensitivity
+
+    if fname is not None and os.path.isfile(fname):
+        arr = np.load(fname)
+        if arr.shape != op.domain.shape:
+            raise ValueError('sensitivity image in {!r} has shape {}, '
+                             'expected {}'.format(fname, arr.shape,
+                                                  op.domain.shape))
+        sensitivity = op.domain.element(arr)
+    else:
+        sensitivity = op.adjoint(op.range.one())
+        if fname is not None:
+            np.save(fname, sensitivity.asarray())
+
+    if use_cache:
+        cache[key] = sensitivity
+    return sensitivity
+
 
 def mlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
 
@@ -57,7 +136,11 @@ def mlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
     sensitivities : float or ``op.domain`` `element-like`, optional
         Usable with ``noise='poisson'``. The algorithm contains a ``A^T 1``
         term, if this parameter is given, it is replaced by it.
-        Default: ``op.adjoint(op.range.one())``
+        Default: ``sensitivity_image(op)``, i.e.,
+        ``op.adjoint(op.range.one())``, which is cached for reuse.
+    cache_sensitivities : bool, optional
+        If ``False``, compute the default sensitivities without using
+        the cache of `sensitivity_image`.
 
     Notes
     -----
@@ -76,6 +159,7 @@ def mlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
     --------
     osmlem : Ordered subsets MLEM
     loglikelihood : Function for calculating the logarithm of the likelihood
+    sensitivity_image : Cached computation of the sensitivities
     """
     osmlem([op], x, [data], niter=niter, noise=noise, callback=callback,
            **kwargs)
@@ -119,8 +203,14 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
     ----------------
     sensitivities : float or ``op.domain`` `element-like`, optional
         Usable with ``noise='poisson'``. The algorithm contains an ``A^T 1``
-        term, if this parameter is given, it is replaced by it.
-        Default: ``op[i].adjoint(op[i].range.one())``
+        term, if this parameter is given, it is replaced by it. A
+        sequence of such values, one for each operator, can also be
+        given, e.g., images loaded with `sensitivity_image`.
+        Default: ``sensitivity_image(op[i])``, i.e.,
+        ``op[i].adjoint(op[i].range.one())``, which is cached for reuse.
+    cache_sensitivities : bool, optional
+        If ``False``, compute the default sensitivities without using
+        the cache of `sensitivity_image`.
 
     Notes
     -----
@@ -150,6 +240,7 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
     --------
     mlem : Ordinary MLEM algorithm without subsets.
     loglikelihood : Function for calculating the logarithm of the likelihood
+    sensitivity_image : Cached computation of the sensitivities
     """
     noise, noise_in = str(noise).lower(), noise
     if noise not in AVAILABLE_MLEM_NOISE:
@@ -176,9 +267,11 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
 
         # Extract the sensitivites parameter
         sensitivities = kwargs.pop('sensitivities', None)
+        use_cache = kwargs.pop('cache_sensitivities', True)
         if sensitivities is None:
-            sensitivities = [np.maximum(opi.adjoint(opi.range.one()), eps)
-                             for opi in op]
+            sensitivities = [
+                np.maximum(sensitivity_image(opi, use_cache=use_cache), eps)
+                for opi in op]
         else:
             # Make sure the sensitivities is a list of the correct size.
             try:
@@ -186,22 +279,31 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
             except TypeError:
                 sensitivities = [sensitivities] * n_ops
 
-        tmp_dom = op[0].domain.element()
-        tmp_ran = [opi.range.element() for opi in op]
+        # Temporaries are recycled from the pools of the spaces, see
+        # `odl.recycle_temporaries`
+        tmp_ran = []
+        with op[0].domain.temporary() as tmp_dom:
+            try:
+                for opi in op:
+                    tmp_ran.append(opi.range.pool.acquire())
+
+                for _ in range(niter):
+                    for i in range(n_ops):
+                        op[i](x, out=tmp_ran[i])
+                        tmp_ran[i].ufuncs.maximum(eps, out=tmp_ran[i])
+                        data[i].divide(tmp_ran[i], out=tmp_ran[i])
 
-        for _ in range(niter):
-            for i in range(n_ops):
-                op[i](x, out=tmp_ran[i])
-                tmp_ran[i].ufuncs.maximum(eps, out=tmp_ran[i])
-                data[i].divide(tmp_ran[i], out=tmp_ran[i])
+                        op[i].adjoint(tmp_ran[i], out=tmp_dom)
+                        tmp_dom /= sensitivities[i]
 
-                op[i].adjoint(tmp_ran[i], out=tmp_dom)
-                tmp_dom /= sensitivities[i]
+                        x *= tmp_dom
 
-                x *= tmp_dom
+                        if callback is not None:
+                            callback(x)
+            finally:
+                for opi, tmp in zip(op, tmp_ran):
+                    opi.range.pool.release(tmp)
 
-                if callback is not None:
-                    callback(x)
         if callback is not None:
             callback.final()
     else:
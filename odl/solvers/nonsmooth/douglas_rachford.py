@@ -206,8 +206,7 @@ def douglas_rachford_pd(x, f, g, L, niter, tau=None, sigma=None,
         z1.lincomb(1.0, w1, - (tau / 2.0), tmp_domain)
 
         # Compute x += lam(k) * (z1 - p1)
-        x.lincomb(1, x, lam_k, z1)
-        x.lincomb(1, x, -lam_k, p1)
+        x.space.lincomb_many([1, lam_k, -lam_k], [x, z1, p1], out=x)
 
         tmp_domain.lincomb(2, z1, -1, w1)
         for i in range(m):
@@ -222,8 +221,8 @@ def douglas_rachford_pd(x, f, g, L, niter, tau=None, sigma=None,
                 z2[i].lincomb(1, w2[i], sigma[i] / 2.0, L[i](tmp_domain))
 
             # Compute v[i] += lam(k) * (z2[i] - p2[i])
-            v[i].lincomb(1, v[i], lam_k, z2[i])
-            v[i].lincomb(1, v[i], -lam_k, p2[i])
+            v[i].space.lincomb_many([1, lam_k, -lam_k], [v[i], z2[i], p2[i]],
+                                    out=v[i])
 
         if callback is not None:
             callback(p1)
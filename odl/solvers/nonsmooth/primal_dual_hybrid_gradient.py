@@ -256,53 +256,52 @@ def pdhg(x, f, g, L, niter, tau=None, sigma=None, **kwargs):
         proximal_dual_sigma = proximal_dual(sigma)
         proximal_primal_tau = proximal_primal(tau)
 
-    # Temporary copy to store previous iterate
-    x_old = x.space.element()
-
-    # Temporaries
-    dual_tmp = L.range.element()
-    primal_tmp = L.domain.element()
-
-    for _ in range(niter):
-        # Copy required for relaxation
-        x_old.assign(x)
-
-        # Gradient ascent in the dual variable y
-        # Compute dual_tmp = y + sigma * L(x_relax)
-        L(x_relax, out=dual_tmp)
-        dual_tmp.lincomb(1, y, sigma, dual_tmp)
-
-        # Apply the dual proximal
-        if not proximal_constant:
-            proximal_dual_sigma = proximal_dual(sigma)
-        proximal_dual_sigma(dual_tmp, out=y)
-
-        # Gradient descent in the primal variable x
-        # Compute primal_tmp = x + (- tau) * L.derivative(x).adjoint(y)
-        L.derivative(x).adjoint(y, out=primal_tmp)
-        primal_tmp.lincomb(1, x, -tau, primal_tmp)
-
-        # Apply the primal proximal
-        if not proximal_constant:
-            proximal_primal_tau = proximal_primal(tau)
-        proximal_primal_tau(primal_tmp, out=x)
-
-        # Acceleration
-        if gamma_primal is not None:
-            theta = float(1 / np.sqrt(1 + 2 * gamma_primal * tau))
-            tau *= theta
-            sigma /= theta
-
-        if gamma_dual is not None:
-            theta = float(1 / np.sqrt(1 + 2 * gamma_dual * sigma))
-            tau /= theta
-            sigma *= theta
-
-        # Over-relaxation in the primal variable x
-        x_relax.lincomb(1 + theta, x, -theta, x_old)
-
-        if callback is not None:
-            callback(x)
+    # Temporary copy to store previous iterate, and temporaries for the
+    # iteration, recycled from the pools of the spaces, see
+    # `odl.recycle_temporaries`
+    with x.space.temporary() as x_old, \
+            L.range.temporary() as dual_tmp, \
+            L.domain.temporary() as primal_tmp:
+        for _ in range(niter):
+            # Copy required for relaxation
+            x_old.assign(x)
+
+            # Gradient ascent in the dual variable y
+            # Compute dual_tmp = y + sigma * L(x_relax)
+            L(x_relax, out=dual_tmp)
+            dual_tmp.lincomb(1, y, sigma, dual_tmp)
+
+            # Apply the dual proximal
+            if not proximal_constant:
+                proximal_dual_sigma = proximal_dual(sigma)
+            proximal_dual_sigma(dual_tmp, out=y)
+
+            # Gradient descent in the primal variable x
+            # Compute primal_tmp = x + (- tau) * L.derivative(x).adjoint(y)
+            L.derivative(x).adjoint(y, out=primal_tmp)
+            primal_tmp.lincomb(1, x, -tau, primal_tmp)
+
+            # Apply the primal proximal
+            if not proximal_constant:
+                proximal_primal_tau = proximal_primal(tau)
+            proximal_primal_tau(primal_tmp, out=x)
+
+            # Acceleration
+            if gamma_primal is not None:
+                theta = float(1 / np.sqrt(1 + 2 * gamma_primal * tau))
+                tau *= theta
+                sigma /= theta
+
+            if gamma_dual is not None:
+                theta = float(1 / np.sqrt(1 + 2 * gamma_dual * sigma))
+                tau /= theta
+                sigma *= theta
+
+            # Over-relaxation in the primal variable x
+            x_relax.lincomb(1 + theta, x, -theta, x_old)
+
+            if callback is not None:
+                callback(x)
 
     if callback is not None:
         callback.final()
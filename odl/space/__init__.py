@@ -16,9 +16,21 @@ from . import base_tensors
 from . import entry_points
 from . import weighting
 
+from .lazy_tensors import *
+__all__ += lazy_tensors.__all__
+
 from .npy_tensors import *
 __all__ += npy_tensors.__all__
 
+from .npy_memmap_tensors import *
+__all__ += npy_memmap_tensors.__all__
+
+from .npy_shared_tensors import *
+__all__ += npy_shared_tensors.__all__
+
+from .npy_chunked_tensors import *
+__all__ += npy_chunked_tensors.__all__
+
 from .pspace import *
 __all__ += pspace.__all__
 
@@ -15,6 +15,8 @@ import numpy as np
 
 from odl.set.sets import RealNumbers, ComplexNumbers
 from odl.set.space import LinearSpace, LinearSpaceElement
+from odl.space.lazy_tensors import (
+    LazyTensorExpression, lazy_binary, lazy_unary, supports_lazy)
 from odl.util import (
     is_numeric_dtype, is_real_dtype, is_floating_dtype,
     is_real_floating_dtype, is_complex_floating_dtype, safe_int_conv,
@@ -888,6 +890,125 @@ numpy.ufunc.reduceat.html
             # Return result (may be scalar, raw array or space element)
             return res
 
+    # Arithmetic, lazy inside ``with odl.lazy():``, see `lazy`
+
+    def assign(self, other):
+        """Assign the values of ``other`` to ``self``."""
+        if (isinstance(other, LazyTensorExpression) and
+                supports_lazy(self)):
+            other.evaluate(out=self)
+            return self
+        else:
+            return super(Tensor, self).assign(other)
+
+    def __iadd__(self, other):
+        """Implement ``self += other``."""
+        expr = lazy_binary(np.add, self, other)
+        if expr is None:
+            return super(Tensor, self).__iadd__(other)
+        else:
+            return expr.evaluate(out=self)
+
+    def __add__(self, other):
+        """Return ``self + other``."""
+        expr = lazy_binary(np.add, self, other)
+        if expr is None:
+            return super(Tensor, self).__add__(other)
+        else:
+            return expr
+
+    def __radd__(self, other):
+        """Return ``other + self``."""
+        expr = lazy_binary(np.add, self, other, reverse=True)
+        if expr is None:
+            return super(Tensor, self).__radd__(other)
+        else:
+            return expr
+
+    def __isub__(self, other):
+        """Implement ``self -= other``."""
+        expr = lazy_binary(np.subtract, self, other)
+        if expr is None:
+            return super(Tensor, self).__isub__(other)
+        else:
+            return expr.evaluate(out=self)
+
+    def __sub__(self, other):
+        """Return ``self - other``."""
+        expr = lazy_binary(np.subtract, self, other)
+        if expr is None:
+            return super(Tensor, self).__sub__(other)
+        else:
+            return expr
+
+    def __rsub__(self, other):
+        """Return ``other - self``."""
+        expr = lazy_binary(np.subtract, self, other, reverse=True)
+        if expr is None:
+            return super(Tensor, self).__rsub__(other)
+        else:
+            return expr
+
+    def __imul__(self, other):
+        """Implement ``self *= other``."""
+        expr = lazy_binary(np.multiply, self, other)
+        if expr is None:
+            return super(Tensor, self).__imul__(other)
+        else:
+            return expr.evaluate(out=self)
+
+    def __mul__(self, other):
+        """Return ``self * other``."""
+        expr = lazy_binary(np.multiply, self, other)
+        if expr is None:
+            return super(Tensor, self).__mul__(other)
+        else:
+            return expr
+
+    def __rmul__(self, other):
+        """Return ``other * self``."""
+        expr = lazy_binary(np.multiply, self, other, reverse=True)
+        if expr is None:
+            return super(Tensor, self).__rmul__(other)
+        else:
+            return expr
+
+    def __itruediv__(self, other):
+        """Implement ``self /= other``."""
+        expr = lazy_binary(np.true_divide, self, other)
+        if expr is None:
+            return super(Tensor, self).__itruediv__(other)
+        else:
+            return expr.evaluate(out=self)
+
+    def __truediv__(self, other):
+        """Return ``self / other``."""
+        expr = lazy_binary(np.true_divide, self, other)
+        if expr is None:
+            return super(Tensor, self).__truediv__(other)
+        else:
+            return expr
+
+    def __rtruediv__(self, other):
+        """Return ``other / self``."""
+        expr = lazy_binary(np.true_divide, self, other, reverse=True)
+        if expr is None:
+            return super(Tensor, self).__rtruediv__(other)
+        else:
+            return expr
+
+    __idiv__ = __itruediv__
+    __div__ = __truediv__
+    __rdiv__ = __rtruediv__
+
+    def __neg__(self):
+        """Return ``-self``."""
+        expr = lazy_unary(np.negative, self)
+        if expr is None:
+            return super(Tensor, self).__neg__()
+        else:
+            return expr
+
     # Old ufuncs interface, will be deprecated when Numpy 1.13 becomes minimum
 
     @property
@@ -18,17 +18,31 @@ This is used with functions such as `rn`, `cn`, `tensor_space` or
 See Also
 --------
 NumpyTensorSpace : Numpy-based implementation of `TensorSpace`
+NumpyMemmapTensorSpace :
+    Numpy-based implementation of `TensorSpace` using memory-mapped files
+NumpySharedTensorSpace :
+    Numpy-based implementation of `TensorSpace` using shared memory
+NumpyChunkedTensorSpace :
+    Numpy-based implementation of `TensorSpace` using grids of blocks
 """
 
 from __future__ import print_function, division, absolute_import
 
 from odl.space.npy_tensors import NumpyTensorSpace
+from odl.space.npy_memmap_tensors import NumpyMemmapTensorSpace
+from odl.space.npy_shared_tensors import (
+    NumpySharedTensorSpace, SHARED_MEMORY_AVAILABLE)
+from odl.space.npy_chunked_tensors import NumpyChunkedTensorSpace
 
 # We don't expose anything to odl.space
 __all__ = ()
 
 IS_INITIALIZED = False
-TENSOR_SPACE_IMPLS = {'numpy': NumpyTensorSpace}
+TENSOR_SPACE_IMPLS = {'numpy': NumpyTensorSpace,
+                      'numpy_memmap': NumpyMemmapTensorSpace,
+                      'numpy_chunked': NumpyChunkedTensorSpace}
+if SHARED_MEMORY_AVAILABLE:
+    TENSOR_SPACE_IMPLS['numpy_shared'] = NumpySharedTensorSpace
 
 
 def _initialize_if_needed():
@@ -72,7 +86,8 @@ def tensor_space_impl(impl):
     ValueError
         If ``impl`` is not a valid name of a tensor space imlementation.
     """
-    if impl != 'numpy':
+    if impl not in ('numpy', 'numpy_memmap', 'numpy_shared',
+                    'numpy_chunked'):
         # Shortcut to improve "import odl" times since most users do not use
         # non-numpy backends
         _initialize_if_needed()
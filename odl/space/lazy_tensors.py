@@ -0,0 +1,405 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Lazy evaluation of arithmetic expressions of NumPy-based tensors.
+
+Inside a ``with lazy():`` block, arithmetic of tensors and discretized
+functions backed by NumPy arrays does not compute anything. Instead, a
+`LazyTensorExpression` is returned, which is evaluated in a single pass
+over the data, block by block, when it is assigned to an element or read.
+"""
+
+from __future__ import print_function, division, absolute_import
+from numbers import Number
+import threading
+import numpy as np
+
+from odl.util import is_floating_dtype
+
+
+__all__ = ('lazy', 'LazyTensorExpression')
+
+
+# Number of entries per evaluated block. Each inner node of an expression
+# uses a temporary of this size, which should stay in the L1/L2 cache
+BLOCK_SIZE_LAZY = 4096
+
+_LAZY_STATE = threading.local()
+
+
+def is_lazy():
+    """Return ``True`` inside a ``with lazy():`` block of this thread."""
+    return getattr(_LAZY_STATE, 'depth', 0) > 0
+
+
+class lazy(object):
+
+    """Context manager to evaluate tensor arithmetic lazily.
+
+    Within this context, the arithmetic operators ``+, -, *, /`` applied
+    to elements of a `NumpyTensorSpace` or of a discretized space backed
+    by one return a `LazyTensorExpression`. Scalars and elements of the
+    same space can be combined. The expression is evaluated in one pass
+    without full-size temporaries when
+
+    - it is passed to ``space.element()``,
+    - it is assigned with ``x.assign(expr)`` or used in an in-place
+      operation like ``x += expr``,
+    - it is read, e.g., with ``np.asarray(expr)``, or explicitly with
+      `LazyTensorExpression.evaluate`.
+
+    Elements are read at evaluation time, not when the expression is
+    built. Spaces with non-floating data type are not affected.
+    The setting is local to the current thread.
+    """
+
+    def __enter__(self):
+        """Called by ``with lazy():``."""
+        _LAZY_STATE.depth = getattr(_LAZY_STATE, 'depth', 0) + 1
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Called when ``with lazy():`` ends."""
+        _LAZY_STATE.depth -= 1
+
+
+def _leaf_data(x):
+    """Return the array holding the data of a tensor-like element ``x``."""
+    x = getattr(x, 'tensor', x)
+    return getattr(x, 'data', None)
+
+
+def _is_scalar(x):
+    """Return ``True`` if ``x`` can be used as scalar in expressions."""
+    return isinstance(x, Number) or (np.isscalar(x) and
+                                     np.issubdtype(np.result_type(x),
+                                                   np.number))
+
+
+def supports_lazy(x):
+    """Return ``True`` if ``x`` can be a leaf of a `LazyTensorExpression`."""
+    return (isinstance(_leaf_data(x), np.ndarray) and
+            is_floating_dtype(x.space.dtype))
+
+
+class LazyTensorExpression(object):
+
+    """Unevaluated arithmetic expression of tensors.
+
+    Expressions are created by arithmetic of tensors inside a
+    ``with lazy():`` block, see `lazy`. They support the same arithmetic
+    operators, which build larger expressions.
+    """
+
+    __array_priority__ = 1000000.0
+
+    def __init__(self, space, ufunc, operands):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        space : `TensorSpace`
+            Space of the result of the expression.
+        ufunc : `numpy.ufunc`
+            Function applied to the values of ``operands``.
+        operands : sequence
+            Arguments of ``ufunc``. They can be scalars, elements of
+            ``space`` or other expressions in ``space``.
+        """
+        self.__space = space
+        self.__ufunc = ufunc
+        self.__operands = tuple(operands)
+
+    @property
+    def space(self):
+        """Space of the result of this expression."""
+        return self.__space
+
+    @property
+    def ufunc(self):
+        """Function applied in the root node of this expression."""
+        return self.__ufunc
+
+    @property
+    def operands(self):
+        """Arguments of `ufunc`."""
+        return self.__operands
+
+    @property
+    def shape(self):
+        """Shape of the result of this expression."""
+        return self.space.shape
+
+    @property
+    def dtype(self):
+        """Data type of the result of this expression."""
+        return self.space.dtype
+
+    def _nodes(self):
+        """Return all expressions in this tree, including ``self``."""
+        nodes = [self]
+        for op in self.operands:
+            if isinstance(op, LazyTensorExpression):
+                nodes.extend(op._nodes())
+        return nodes
+
+    def _leaves(self):
+        """Return the arrays of all elements in this tree."""
+        return [_leaf_data(op) for node in self._nodes()
+                for op in node.operands
+                if not isinstance(op, LazyTensorExpression) and
+                not _is_scalar(op)]
+
+    def evaluate(self, out=None):
+        """Evaluate this expression blockwise.
+
+        Parameters
+        ----------
+        out : element of `space`, optional
+            Element to which the result is written. It may also be an
+            element of a different space with the same shape, e.g., the
+            `DiscretizedSpaceElement.tensor` of a discretized function.
+            It may appear in the expression itself.
+
+        Returns
+        -------
+        out : element of `space`
+            The evaluated expression. If ``out`` was provided, the
+            returned object is a reference to it.
+
+        Examples
+        --------
+        >>> space = odl.rn(3)
+        >>> x = space.element([1, 2, 3])
+        >>> y = space.element([1, 0, 1])
+        >>> with odl.lazy():
+        ...     expr = x + 2 * y - x * y
+        >>> expr.evaluate()
+        rn(3).element([ 2.,  2.,  2.])
+
+        The elements are read at evaluation time:
+
+        >>> x[0] = 0
+        >>> expr.evaluate(out=y)
+        rn(3).element([ 2.,  2.,  2.])
+        >>> y
+        rn(3).element([ 2.,  2.,  2.])
+        """
+        if out is None:
+            out = self.space.element()
+        out_arr = _leaf_data(out)
+        if out_arr is None or out_arr.shape != self.shape:
+            raise ValueError('`out` {!r} is not an array-based element of '
+                             'shape {}'.format(out, self.shape))
+
+        leaves = self._leaves()
+        if any(np.may_share_memory(out_arr, arr) and
+               not _same_layout(out_arr, arr) for arr in leaves):
+            # Blocks of `out` do not correspond to blocks of the leaves,
+            # hence we would overwrite values before reading them
+            tmp = self.space.element()
+            self.evaluate(out=tmp)
+            out_arr[:] = _leaf_data(tmp)
+            return out
+
+        arrays = leaves + [out_arr]
+        if all(arr.flags.c_contiguous for arr in arrays):
+            order = 'C'
+        elif all(arr.flags.f_contiguous for arr in arrays):
+            order = 'F'
+        else:
+            order = None
+
+        if order is None:
+            # Evaluate in one block, using the arrays as they are
+            self._evaluate_block(Ellipsis, None, out_arr, {})
+            return out
+
+        size = out_arr.size
+        out_flat = out_arr.ravel(order)
+        flat = {id(arr): arr.ravel(order) for arr in leaves}
+        block_size = min(size, BLOCK_SIZE_LAZY)
+        tmps = {id(node): np.empty(block_size, dtype=self.dtype)
+                for node in self._nodes()[1:]}
+        for start in range(0, size, BLOCK_SIZE_LAZY):
+            slc = slice(start, min(start + BLOCK_SIZE_LAZY, size))
+            self._evaluate_block(slc, flat, out_flat[slc], tmps)
+
+        return out
+
+    def _evaluate_block(self, slc, flat, out, tmps):
+        """Evaluate a block of this expression and write it to ``out``.
+
+        ``slc`` selects the block from the flat leaf arrays in ``flat``,
+        which map ``id`` of the original arrays to their flat versions.
+        For ``flat=None``, the original arrays are used as they are.
+        ``tmps`` maps ``id`` of inner nodes to temporary storage, or is
+        empty if temporaries should be allocated on the fly.
+        """
+        args = []
+        for op in self.operands:
+            if isinstance(op, LazyTensorExpression):
+                if id(op) in tmps:
+                    tmp = tmps[id(op)][:out.size]
+                else:
+                    tmp = np.empty_like(out)
+                op._evaluate_block(slc, flat, tmp, tmps)
+                args.append(tmp)
+            elif _is_scalar(op):
+                args.append(op)
+            else:
+                arr = _leaf_data(op)
+                if flat is None:
+                    args.append(arr)
+                else:
+                    args.append(flat[id(arr)][slc])
+        self.ufunc(*args, out=out)
+
+    def __array__(self, dtype=None):
+        """Return ``np.asarray(self)``, evaluating the expression."""
+        arr = _leaf_data(self.evaluate())
+        if dtype is None:
+            return arr
+        else:
+            return arr.astype(dtype, copy=False)
+
+    def _binary(self, ufunc, other, reverse=False):
+        """Return a new expression ``ufunc(self, other)``."""
+        other = _operand(self.space, other)
+        if other is None:
+            return NotImplemented
+        operands = (other, self) if reverse else (self, other)
+        return LazyTensorExpression(self.space, ufunc, operands)
+
+    def __add__(self, other):
+        """Return ``self + other``."""
+        return self._binary(np.add, other)
+
+    def __radd__(self, other):
+        """Return ``other + self``."""
+        return self._binary(np.add, other, reverse=True)
+
+    def __sub__(self, other):
+        """Return ``self - other``."""
+        return self._binary(np.subtract, other)
+
+    def __rsub__(self, other):
+        """Return ``other - self``."""
+        return self._binary(np.subtract, other, reverse=True)
+
+    def __mul__(self, other):
+        """Return ``self * other``."""
+        return self._binary(np.multiply, other)
+
+    def __rmul__(self, other):
+        """Return ``other * self``."""
+        return self._binary(np.multiply, other, reverse=True)
+
+    def __truediv__(self, other):
+        """Return ``self / other``."""
+        return self._binary(np.true_divide, other)
+
+    __div__ = __truediv__
+
+    def __rtruediv__(self, other):
+        """Return ``other / self``."""
+        return self._binary(np.true_divide, other, reverse=True)
+
+    __rdiv__ = __rtruediv__
+
+    def __neg__(self):
+        """Return ``-self``."""
+        return LazyTensorExpression(self.space, np.negative, [self])
+
+    def __pos__(self):
+        """Return ``+self``."""
+        return self
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        def _repr(op):
+            if isinstance(op, LazyTensorExpression):
+                args = ', '.join(_repr(o) for o in op.operands)
+                return '{}({})'.format(op.ufunc.__name__, args)
+            elif _is_scalar(op):
+                return repr(op)
+            else:
+                return '<{}>'.format(op.__class__.__name__)
+
+        return '{}({!r}, {})'.format(self.__class__.__name__, self.space,
+                                     _repr(self))
+
+
+def _operand(space, other):
+    """Return ``other`` as operand of an expression in ``space``, or ``None``.
+    """
+    if _is_scalar(other):
+        return other
+    elif isinstance(other, LazyTensorExpression):
+        return other if other.space == space else None
+    elif getattr(other, 'space', None) == space and supports_lazy(other):
+        return other
+    else:
+        return None
+
+
+def _same_layout(arr1, arr2):
+    """Return ``True`` if two arrays have identical memory layout."""
+    return (arr1.__array_interface__['data'][0] ==
+            arr2.__array_interface__['data'][0] and
+            arr1.shape == arr2.shape and
+            arr1.strides == arr2.strides)
+
+
+def lazy_binary(ufunc, x, other, reverse=False):
+    """Return ``ufunc(x, other)`` as `LazyTensorExpression`, or ``None``.
+
+    Parameters
+    ----------
+    ufunc : `numpy.ufunc`
+        Binary function of the expression.
+    x : `Tensor`
+        Element whose arithmetic method is called.
+    other :
+        Second operand of the arithmetic method.
+    reverse : bool, optional
+        If ``True``, return the expression ``ufunc(other, x)``.
+
+    Returns
+    -------
+    expr : `LazyTensorExpression` or None
+        The expression if the operation should be lazy, i.e., inside
+        ``with lazy():`` or if ``other`` is an expression, and both
+        operands can be used in expressions. Otherwise ``None``, which
+        means that the caller should evaluate eagerly.
+    """
+    if not ((is_lazy() or isinstance(other, LazyTensorExpression)) and
+            supports_lazy(x)):
+        return None
+    other = _operand(x.space, other)
+    if other is None:
+        return None
+    operands = (other, x) if reverse else (x, other)
+    return LazyTensorExpression(x.space, ufunc, operands)
+
+
+def lazy_unary(ufunc, x):
+    """Return ``ufunc(x)`` as `LazyTensorExpression`, or ``None``.
+
+    The expression is returned inside ``with lazy():`` if ``x`` can be
+    used in expressions, otherwise ``None``.
+    """
+    if is_lazy() and supports_lazy(x):
+        return LazyTensorExpression(x.space, ufunc, [x])
+    else:
+        return None
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -0,0 +1,1309 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""NumPy implementation of tensor spaces stored as grids of blocks.
+
+Elements of these spaces store their data in a regular grid of NumPy
+arrays, the blocks. Element-wise operations, linear combinations and
+reductions are evaluated block by block, where independent blocks are
+processed in parallel by a pool of threads, see `odl.util.parallel`.
+Blocks can be spilled to memory-mapped files, such that the operating
+system can page them out to disk, which allows working with tensors
+that do not fit into main memory.
+"""
+
+from __future__ import print_function, division, absolute_import
+from builtins import object
+from numbers import Integral
+import tempfile
+import numpy as np
+
+from odl.set.space import LinearSpaceTypeError
+from odl.space.base_tensors import Tensor
+from odl.space.lazy_tensors import LazyTensorExpression
+from odl.space.npy_memmap_tensors import default_scratch_dir, is_file_backed
+from odl.space.npy_tensors import (
+    NumpyTensorSpace, NumpyTensorSpaceArrayWeighting,
+    NumpyTensorSpaceConstWeighting, BLOCK_SIZE_LINCOMB, _block_inner,
+    _block_pnorm, _finalize_pnorm, _lincomb_blocked)
+from odl.util import (
+    is_floating_dtype, is_numeric_dtype, is_real_dtype, pairwise_sum,
+    parallel_map)
+
+
+__all__ = ('NumpyChunkedTensorSpace',)
+
+
+# Default number of bytes per block, large enough to amortize the
+# scheduling overhead per block
+CHUNK_NBYTES = 2 ** 22
+
+
+# Ufuncs whose reductions can be computed from reductions of blocks
+_REORDERABLE_UFUNCS = (np.add, np.multiply, np.maximum, np.minimum, np.fmax,
+                       np.fmin, np.logical_and, np.logical_or)
+
+
+def default_chunks(shape, itemsize, nbytes=CHUNK_NBYTES):
+    """Return a block shape for arrays of given shape and item size.
+
+    The blocks extend over full trailing axes as far as possible, such
+    that each block is contiguous in the C-ordered full array, and have
+    at most ``nbytes`` bytes (but at least one entry).
+
+    Examples
+    --------
+    >>> default_chunks((1000, 1000), itemsize=8)
+    (524, 1000)
+    >>> default_chunks((10, 10), itemsize=8)
+    (10, 10)
+    >>> default_chunks((4, 3000), itemsize=8, nbytes=8000)
+    (1, 1000)
+    """
+    chunks = []
+    max_size = max(1, nbytes // itemsize)
+    for n in reversed(shape):
+        if max_size >= n:
+            chunks.append(n)
+            max_size //= max(n, 1)
+        else:
+            chunks.append(max(1, max_size))
+            max_size = 1
+    return tuple(reversed(chunks))
+
+
+def _grid_slices(shape, chunks):
+    """Return the index slices of all blocks, in C order of the grid."""
+    slices = [()]
+    for n, c in zip(shape, chunks):
+        slices = [slc + (slice(start, min(start + c, n)),)
+                  for slc in slices
+                  for start in range(0, n, c)]
+    return slices
+
+
+def _index_ranges(indices, shape):
+    """Return positions per axis for a basic index, or ``None``.
+
+    For each axis, the result contains an integer or a `numpy.ndarray`
+    of the selected positions. ``None`` is returned for indices that
+    are not made of integers, slices and ``Ellipsis``.
+    """
+    if not isinstance(indices, tuple):
+        indices = (indices,)
+    if any(idx is Ellipsis for idx in indices):
+        i = [idx is Ellipsis for idx in indices].index(True)
+        num_fill = len(shape) - len(indices) + 1
+        indices = (indices[:i] + (slice(None),) * num_fill +
+                   indices[i + 1:])
+    if len(indices) > len(shape):
+        return None
+    indices = indices + (slice(None),) * (len(shape) - len(indices))
+
+    ranges = []
+    for idx, n in zip(indices, shape):
+        if isinstance(idx, slice):
+            ranges.append(np.arange(n)[idx])
+        elif (isinstance(idx, Integral) and
+              not isinstance(idx, (bool, np.bool_))):
+            idx = int(idx)
+            if not -n <= idx < n:
+                raise IndexError('index {} is out of bounds for axis with '
+                                 'size {}'.format(idx, n))
+            ranges.append(idx % n)
+        else:
+            return None
+    return ranges
+
+
+def _local_index(positions, start, stop):
+    """Return indices in a block and in the selection, or ``None``.
+
+    ``positions`` is an integer or an array of equidistant positions,
+    and ``start`` and ``stop`` bound the block along the axis.
+    """
+    if np.isscalar(positions):
+        if start <= positions < stop:
+            return positions - start, None
+        else:
+            return None
+
+    inside = np.nonzero((positions >= start) & (positions < stop))[0]
+    if inside.size == 0:
+        return None
+    first, last = positions[inside[0]] - start, positions[inside[-1]] - start
+    if inside.size == 1:
+        local = slice(first, first + 1)
+    else:
+        step = positions[inside[1]] - positions[inside[0]]
+        stop_local = last + (1 if step > 0 else -1)
+        local = slice(first, stop_local if stop_local >= 0 else None, step)
+    return local, slice(inside[0], inside[-1] + 1)
+
+
+class BlockArray(object):
+
+    """Multi-dimensional array stored as a regular grid of NumPy blocks.
+
+    All blocks have the shape `chunks`, except for those at the end of
+    an axis, which contain the remaining entries. Each block is a
+    C-contiguous `numpy.ndarray`, possibly a `numpy.memmap` of a file
+    if the block was spilled to disk.
+
+    Indexing with integers and slices only accesses the blocks covered
+    by the index expression. Indexing returns copies, not views.
+    """
+
+    def __init__(self, shape, dtype, chunks, blocks=None, spill_dir=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        shape : sequence of ints
+            Shape of the full array.
+        dtype :
+            Data type of the array.
+        chunks : sequence of positive ints
+            Shape of the blocks, except at the ends of the axes.
+        blocks : sequence of `numpy.ndarray`, optional
+            Blocks of the array, in C order of the block grid. For
+            ``None``, new blocks filled with zeros are created.
+        spill_dir : str, optional
+            If given, new blocks are created in memory-mapped files in
+            this directory instead of in main memory.
+        """
+        self.__shape = tuple(int(n) for n in shape)
+        self.__dtype = np.dtype(dtype)
+        self.__chunks = tuple(int(c) for c in chunks)
+        self.__slices = _grid_slices(self.shape, self.chunks)
+        if blocks is None:
+            blocks = [_new_block(_slice_shape(slc), self.dtype, spill_dir)
+                      for slc in self.__slices]
+        else:
+            blocks = list(blocks)
+            if len(blocks) != len(self.__slices):
+                raise ValueError('expected {} blocks, got {}'
+                                 ''.format(len(self.__slices), len(blocks)))
+        self.__blocks = blocks
+
+    @property
+    def shape(self):
+        """Shape of the full array."""
+        return self.__shape
+
+    @property
+    def dtype(self):
+        """Data type of the array."""
+        return self.__dtype
+
+    @property
+    def chunks(self):
+        """Shape of the blocks, except at the ends of the axes."""
+        return self.__chunks
+
+    @property
+    def ndim(self):
+        """Number of axes of the array."""
+        return len(self.shape)
+
+    @property
+    def size(self):
+        """Total number of entries of the array."""
+        return int(np.prod(self.shape, dtype='int64'))
+
+    @property
+    def grid_shape(self):
+        """Number of blocks per axis."""
+        return tuple(-(-n // c) for n, c in zip(self.shape, self.chunks))
+
+    @property
+    def blocks(self):
+        """List of all blocks, in C order of the block grid."""
+        return list(self.__blocks)
+
+    @property
+    def block_slices(self):
+        """Index slices of all blocks in the full array, in grid order."""
+        return list(self.__slices)
+
+    @property
+    def is_spilled(self):
+        """``True`` if all blocks are stored in memory-mapped files."""
+        return all(is_file_backed(blk) for blk in self.__blocks)
+
+    def region(self, slices):
+        """Return the entries at the position given by ``slices``.
+
+        Parameters
+        ----------
+        slices : tuple of slices
+            Slices with step 1 defining a rectangular region.
+
+        Returns
+        -------
+        region : `numpy.ndarray`
+            View of a block if the region coincides with it, otherwise
+            a copy of the entries.
+        """
+        slices = tuple(slices)
+        try:
+            i = self.__slices.index(slices)
+        except ValueError:
+            return self[slices]
+        else:
+            return self.__blocks[i]
+
+    def map_blocks(self, func):
+        """Call ``func(block, slices)`` for all blocks in parallel.
+
+        Returns
+        -------
+        results : list
+            Return values of ``func``, in grid order of the blocks.
+        """
+        return parallel_map(lambda i: func(self.__blocks[i],
+                                           self.__slices[i]),
+                            range(len(self.__blocks)))
+
+    def _selected_blocks(self, ranges):
+        """Yield blocks and index pairs for the positions in ``ranges``."""
+        for blk, slc in zip(self.__blocks, self.__slices):
+            block_idx, sel_idx = [], []
+            for pos, s in zip(ranges, slc):
+                local = _local_index(pos, s.start, s.stop)
+                if local is None:
+                    break
+                block_idx.append(local[0])
+                if local[1] is not None:
+                    sel_idx.append(local[1])
+            else:
+                yield blk, tuple(block_idx), tuple(sel_idx)
+
+    def __array__(self, dtype=None):
+        """Return the full array as `numpy.ndarray`."""
+        arr = np.empty(self.shape, dtype=self.dtype)
+        self.map_blocks(lambda blk, slc: arr.__setitem__(slc, blk))
+        if dtype is None:
+            return arr
+        else:
+            return arr.astype(dtype, copy=False)
+
+    def __getitem__(self, indices):
+        """Return ``self[indices]`` as array or scalar (copy)."""
+        ranges = _index_ranges(indices, self.shape)
+        if ranges is None:
+            # Advanced indexing on the full array
+            return np.asarray(self)[indices]
+
+        sel_shape = tuple(np.size(pos) for pos in ranges
+                          if not np.isscalar(pos))
+        result = np.empty(sel_shape, dtype=self.dtype)
+        for blk, block_idx, sel_idx in self._selected_blocks(ranges):
+            result[sel_idx] = blk[block_idx]
+        if result.ndim == 0:
+            return result[()]
+        else:
+            return result
+
+    def __setitem__(self, indices, values):
+        """Implement ``self[indices] = values``."""
+        ranges = _index_ranges(indices, self.shape)
+        if ranges is None:
+            # Advanced indexing on the full array, then write back
+            arr = np.asarray(self)
+            arr[indices] = values
+            self[...] = arr
+            return
+
+        sel_shape = tuple(np.size(pos) for pos in ranges
+                          if not np.isscalar(pos))
+        values = np.asarray(values)
+        if values.shape != sel_shape:
+            values = np.broadcast_to(values, sel_shape)
+        for blk, block_idx, sel_idx in self._selected_blocks(ranges):
+            blk[block_idx] = values[sel_idx]
+
+    def copy(self, spill_dir=None):
+        """Return a copy of this array with copies of the blocks."""
+        def copy_block(blk, slc):
+            new_blk = _new_block(blk.shape, self.dtype, spill_dir)
+            new_blk[...] = blk
+            return new_blk
+
+        return BlockArray(self.shape, self.dtype, self.chunks,
+                          self.map_blocks(copy_block))
+
+    def spill(self, spill_dir=None):
+        """Move all blocks to memory-mapped files.
+
+        Parameters
+        ----------
+        spill_dir : str, optional
+            Directory in which the files are created. For ``None``,
+            `default_scratch_dir` is used.
+        """
+        if spill_dir is None:
+            spill_dir = default_scratch_dir()
+
+        def spill_block(blk, slc):
+            if is_file_backed(blk):
+                return blk
+            new_blk = _new_block(blk.shape, self.dtype, spill_dir)
+            new_blk[...] = blk
+            return new_blk
+
+        self.__blocks = self.map_blocks(spill_block)
+
+    def load(self):
+        """Move all blocks to main memory."""
+        def load_block(blk, slc):
+            if is_file_backed(blk):
+                return np.array(blk)
+            else:
+                return blk
+
+        self.__blocks = self.map_blocks(load_block)
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}(shape={}, dtype={}, chunks={})'.format(
+            self.__class__.__name__, self.shape, self.dtype, self.chunks)
+
+
+def _slice_shape(slices):
+    """Return the shape of the region given by step-1 ``slices``."""
+    return tuple(s.stop - s.start for s in slices)
+
+
+def _new_block(shape, dtype, spill_dir=None):
+    """Return a new block filled with zeros, in a file if ``spill_dir``."""
+    if spill_dir is None or np.prod(shape) == 0:
+        return np.zeros(shape, dtype=dtype)
+    # Anonymous file, removed when the mapping is garbage collected
+    with tempfile.TemporaryFile(prefix='odl_', suffix='.dat',
+                                dir=spill_dir) as f:
+        return np.memmap(f, dtype=dtype, mode='w+', shape=shape)
+
+
+def _is_full_reduction(axis, ndim):
+    """Return ``True`` if ``axis`` contains all axes of ``ndim`` axes."""
+    if axis is None:
+        return True
+    try:
+        axes = [int(i) % ndim for i in np.atleast_1d(axis)]
+    except (TypeError, ValueError, ZeroDivisionError):
+        return False
+    return sorted(set(axes)) == list(range(ndim))
+
+
+def _region(x, slices):
+    """Return the region ``slices`` of a tensor, array or scalar ``x``."""
+    if isinstance(x, NumpyChunkedTensor):
+        return x.data.region(slices)
+    elif isinstance(x, BlockArray):
+        return x.region(slices)
+    elif isinstance(x, np.ndarray) and x.ndim > 0:
+        return x[slices]
+    else:
+        return x
+
+
+class NumpyChunkedTensorSpace(NumpyTensorSpace):
+
+    """Tensor space whose elements are stored as grids of blocks.
+
+    Each element stores its data in a `BlockArray`, a grid of NumPy
+    arrays of shape `chunks`. Linear combinations, element-wise
+    products and quotients, inner products, norms, distances and
+    element-wise NumPy ufuncs are evaluated block by block, with
+    independent blocks being processed in parallel by a thread pool
+    of `odl.util.parallel.num_threads` threads. Other operations, like
+    indexing with arrays or ufunc methods other than ``__call__`` and
+    full reductions, work on the assembled full array. In contrast to
+    `NumpyTensorSpace`, indexing an element always returns a copy, so
+    writing to a slice does not change the element it was taken from.
+
+    The blocks can be spilled to memory-mapped files with
+    `NumpyChunkedTensor.spill`. If `spill` is ``True``, all elements of
+    the space are created with their blocks in files in `scratch_dir`,
+    so that the size of elements is only limited by the disk space.
+
+    Since the block structure does not change the mathematical
+    properties of a space, `chunks`, `scratch_dir` and `spill` do not
+    take part in comparisons of spaces.
+    """
+
+    def __init__(self, shape, dtype=None, chunks=None, spill=False,
+                 scratch_dir=None, **kwargs):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        shape : positive int or sequence of positive ints
+            Number of entries per axis for elements in this space.
+        dtype : optional
+            Data type of each element. For ``None``, the `default_dtype`
+            of this space (``float64``) is used.
+        chunks : positive int or sequence of positive ints, optional
+            Shape of the blocks. A single integer is used for all axes.
+            For ``None``, `default_chunks` is used.
+        spill : bool, optional
+            If ``True``, new elements store their blocks in memory-mapped
+            files instead of main memory.
+        scratch_dir : str, optional
+            Directory in which spilled blocks are stored. For ``None``,
+            `default_scratch_dir` is used at the time a block is spilled.
+        kwargs :
+            Further keyword arguments are passed to `NumpyTensorSpace`.
+
+        Examples
+        --------
+        >>> space = NumpyChunkedTensorSpace((4, 5), chunks=(2, 5))
+        >>> space
+        rn((4, 5), impl='numpy_chunked')
+        >>> space.chunks, space.grid_shape
+        ((2, 5), (2, 1))
+        >>> x = space.one()
+        >>> len(x.data.blocks)
+        2
+
+        The ``impl`` name can be used with all space factory functions:
+
+        >>> space = odl.uniform_discr(0, 1, 4, impl='numpy_chunked')
+        >>> space.impl
+        'numpy_chunked'
+        >>> space.one().norm()
+        1.0
+        """
+        super(NumpyChunkedTensorSpace, self).__init__(shape, dtype, **kwargs)
+
+        if chunks is None:
+            chunks = default_chunks(self.shape, self.dtype.itemsize)
+        else:
+            chunks_in = chunks
+            try:
+                iter(chunks)
+            except TypeError:
+                chunks = [chunks] * self.ndim
+            chunks = tuple(int(c) for c in chunks)
+            if (len(chunks) != self.ndim or
+                    any(c <= 0 for c in chunks)):
+                raise ValueError('`chunks` must be a positive integer or '
+                                 'a sequence of {} positive integers, got '
+                                 '{!r}'.format(self.ndim, chunks_in))
+            # Blocks do not need to be larger than the array
+            chunks = tuple(min(c, max(n, 1))
+                           for c, n in zip(chunks, self.shape))
+
+        self.__chunks = chunks
+        self.__spill = bool(spill)
+        self.__scratch_dir = scratch_dir
+
+    @property
+    def impl(self):
+        """Name of the implementation back-end: ``'numpy_chunked'``."""
+        return 'numpy_chunked'
+
+    @property
+    def chunks(self):
+        """Shape of the blocks of elements in this space."""
+        return self.__chunks
+
+    @property
+    def grid_shape(self):
+        """Number of blocks per axis."""
+        return tuple(-(-n // c) for n, c in zip(self.shape, self.chunks))
+
+    @property
+    def spill(self):
+        """``True`` if new elements store their blocks in files."""
+        return self.__spill
+
+    @property
+    def scratch_dir(self):
+        """Directory in which spilled blocks are stored."""
+        if self.__scratch_dir is None:
+            return default_scratch_dir()
+        else:
+            return self.__scratch_dir
+
+    def _block_array(self):
+        """Return a new block array with zero entries."""
+        return BlockArray(self.shape, self.dtype, self.chunks,
+                          spill_dir=self.scratch_dir if self.spill else None)
+
+    def element(self, inp=None, data_ptr=None, order=None):
+        """Create a new element.
+
+        Parameters
+        ----------
+        inp : `array-like`, optional
+            Input used to initialize the new element.
+
+            If ``inp`` is `None`, a new element with zero entries is
+            created. If ``inp`` is a `BlockArray` with the `shape`,
+            `dtype` and `chunks` of this space, it is wrapped without
+            copy. Otherwise, its values are copied into new blocks.
+
+        data_ptr : int, optional
+            Pointer to the start memory address of a contiguous array.
+            The memory is copied into new blocks. For this option,
+            ``order`` must be either ``'C'`` or ``'F'``.
+        order : {None, 'C', 'F'}, optional
+            Storage order of the array given by ``data_ptr``. It is
+            ignored otherwise since blocks are always stored in C order.
+
+        Returns
+        -------
+        element : `NumpyChunkedTensor`
+            The new element, created from ``inp`` or from scratch.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_chunked')
+        >>> x = space.element([1, 2, 3])
+        >>> x
+        rn(3, impl='numpy_chunked').element([ 1.,  2.,  3.])
+        """
+        if order is not None and str(order).upper() not in ('C', 'F'):
+            raise ValueError("`order` {!r} not understood".format(order))
+
+        if isinstance(inp, LazyTensorExpression):
+            inp = inp.evaluate()
+
+        if inp is None and data_ptr is None:
+            return self.element_type(self, self._block_array())
+
+        elif inp is None and data_ptr is not None:
+            npy_space = NumpyTensorSpace(self.shape, self.dtype)
+            arr = npy_space.element(data_ptr=data_ptr, order=order).data
+            return self.element(arr)
+
+        elif inp is not None and data_ptr is None:
+            if inp in self:
+                return inp
+
+            if isinstance(inp, NumpyChunkedTensor):
+                inp = inp.data
+            if isinstance(inp, BlockArray):
+                if (inp.shape == self.shape and
+                        inp.dtype == self.dtype and
+                        inp.chunks == self.chunks):
+                    return self.element_type(self, inp)
+            else:
+                inp = np.array(inp, copy=False, dtype=self.dtype,
+                               ndmin=self.ndim)
+
+            if inp.shape != self.shape:
+                raise ValueError('shape of `inp` not equal to space shape: '
+                                 '{} != {}'.format(inp.shape, self.shape))
+            data = self._block_array()
+            data.map_blocks(
+                lambda blk, slc: blk.__setitem__(Ellipsis,
+                                                 _region(inp, slc)))
+            return self.element_type(self, data)
+
+        else:
+            raise TypeError('cannot provide both `inp` and `data_ptr`')
+
+    def zero(self):
+        """Return a tensor of all zeros.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_chunked')
+        >>> space.zero()
+        rn(3, impl='numpy_chunked').element([ 0.,  0.,  0.])
+        """
+        # New blocks are filled with zeros
+        return self.element()
+
+    def one(self):
+        """Return a tensor of all ones.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_chunked')
+        >>> space.one()
+        rn(3, impl='numpy_chunked').element([ 1.,  1.,  1.])
+        """
+        x = self.element()
+        x.data.map_blocks(lambda blk, slc: blk.fill(1))
+        return x
+
+    def _map_out_blocks(self, func, out, *inputs):
+        """Call ``func(out_block, *input_regions)`` for all blocks."""
+        def block_func(blk, slc):
+            func(blk, *[_region(x, slc) for x in inputs])
+
+        out.data.map_blocks(block_func)
+
+    def _lincomb(self, a, x1, b, x2, out):
+        """Implement the linear combination of ``x1`` and ``x2``.
+
+        Compute ``out = a*x1 + b*x2`` block by block.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_chunked', chunks=2)
+        >>> x = space.element([0, 1, 1])
+        >>> y = space.element([0, 0, 1])
+        >>> space.lincomb(1, x, 2, y)
+        rn(3, impl='numpy_chunked').element([ 0.,  1.,  3.])
+        """
+        compute_dtype = self.compute_dtype
+
+        def lincomb_block(out_blk, x1_blk, x2_blk):
+            # Blocks of real and imaginary parts are not contiguous
+            if (is_floating_dtype(self.dtype) and
+                    out_blk.flags.c_contiguous):
+                _lincomb_blocked(a, x1_blk.ravel(), b, x2_blk.ravel(),
+                                 out_blk.ravel(), BLOCK_SIZE_LINCOMB,
+                                 compute_dtype)
+            else:
+                out_blk[...] = a * x1_blk + b * x2_blk
+
+        self._map_out_blocks(lincomb_block, out, x1, x2)
+
+    def _lincomb_many(self, coeffs, elements, out):
+        """Implement ``out = sum(c * x for c, x in zip(coeffs, elements))``.
+
+        The sum is accumulated in `compute_dtype` block by block.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_chunked', chunks=2)
+        >>> x, y, z = space.one(), space.element([1, 2, 3]), space.one()
+        >>> space.lincomb_many([1, 2, -1], [x, y, z])
+        rn(3, impl='numpy_chunked').element([ 2.,  4.,  6.])
+        """
+        dtype = self.compute_dtype
+
+        def lincomb_many_block(out_blk, *blks):
+            acc = np.multiply(blks[0], coeffs[0], dtype=dtype)
+            for c, blk in zip(coeffs[1:], blks[1:]):
+                acc += np.multiply(blk, c, dtype=dtype)
+            out_blk[...] = acc
+
+        self._map_out_blocks(lincomb_many_block, out, *elements)
+
+    def _multiply(self, x1, x2, out):
+        """Compute the entry-wise product ``out = x1 * x2`` by blocks.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_chunked', chunks=2)
+        >>> x = space.element([1, 0, 3])
+        >>> y = space.element([-1, 4, 2])
+        >>> x * y
+        rn(3, impl='numpy_chunked').element([-1.,  0.,  6.])
+        """
+        self._map_out_blocks(
+            lambda out_blk, blk1, blk2: np.multiply(blk1, blk2, out=out_blk),
+            out, x1, x2)
+
+    def _divide(self, x1, x2, out):
+        """Compute the entry-wise quotient ``x1 / x2`` by blocks.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_chunked', chunks=2)
+        >>> x = space.element([2, 0, 4])
+        >>> y = space.element([1, 1, 2])
+        >>> x / y
+        rn(3, impl='numpy_chunked').element([ 2.,  0.,  2.])
+        """
+        self._map_out_blocks(
+            lambda out_blk, blk1, blk2: np.divide(blk1, blk2, out=out_blk),
+            out, x1, x2)
+
+    def _block_weights(self):
+        """Return the constant and weighting array for blockwise sums.
+
+        Returns ``None`` if the weighting is not supported blockwise.
+        """
+        weighting = self.weighting
+        if isinstance(weighting, NumpyTensorSpaceConstWeighting):
+            return float(weighting.const), None
+        elif isinstance(weighting, NumpyTensorSpaceArrayWeighting):
+            array = np.asarray(weighting.array)
+            if array.shape != self.shape:
+                return None
+            return 1.0, array
+        else:
+            return None
+
+    def _pnorm_blockwise(self, x1, x2=None):
+        """Return the norm of ``x1`` or ``x1 - x2``, or ``None``."""
+        weights = self._block_weights()
+        p = float(self.weighting.exponent)
+        if (weights is None or p <= 0 or
+                not is_floating_dtype(self.compute_dtype)):
+            return None
+        const, array = weights
+        dtype = self.compute_dtype
+
+        def block_pnorm(blk, slc):
+            return _block_pnorm(p, dtype, blk, _region(x2, slc),
+                                _region(array, slc))
+
+        partial = x1.data.map_blocks(block_pnorm)
+        if p == float('inf'):
+            acc = max(partial) if partial else 0.0
+        else:
+            acc = pairwise_sum(partial)
+        return _finalize_pnorm(acc, p, const, dtype)
+
+    def _dist(self, x1, x2):
+        """Return the distance between ``x1`` and ``x2``.
+
+        The difference ``x1 - x2`` is computed block by block and never
+        stored as a whole.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, exponent=1, impl='numpy_chunked', chunks=2)
+        >>> x = space.element([-1, -1, 2])
+        >>> y = space.one()
+        >>> space.dist(x, y)
+        5.0
+        """
+        dist = self._pnorm_blockwise(x1, x2)
+        if dist is None:
+            return self.weighting.dist(x1, x2)
+        else:
+            return dist
+
+    def _norm(self, x):
+        """Return the norm of ``x``, computed block by block.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, weighting=[2, 1, 1], impl='numpy_chunked',
+        ...                chunks=2)
+        >>> x = space.element([2, 0, 1])
+        >>> space.norm(x)
+        3.0
+        """
+        norm = self._pnorm_blockwise(x)
+        if norm is None:
+            return self.weighting.norm(x)
+        else:
+            return norm
+
+    def _inner(self, x1, x2):
+        """Return the inner product of ``x1`` and ``x2``.
+
+        The inner product is accumulated block by block.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, weighting=[2, 1, 1], impl='numpy_chunked',
+        ...                chunks=2)
+        >>> x = space.element([1, 0, 3])
+        >>> y = space.one()
+        >>> space.inner(x, y)
+        5.0
+        """
+        weights = self._block_weights()
+        if (weights is None or
+                self.weighting.exponent != 2.0 or
+                not is_floating_dtype(self.compute_dtype)):
+            return self.weighting.inner(x1, x2)
+        const, array = weights
+        dtype = self.compute_dtype
+
+        inner = const * pairwise_sum(x1.data.map_blocks(
+            lambda blk, slc: _block_inner(dtype, blk, _region(x2, slc),
+                                          _region(array, slc))))
+        if is_real_dtype(self.dtype):
+            return float(inner.real)
+        else:
+            return complex(inner)
+
+    def _astype(self, dtype):
+        """Internal helper for `astype`, keeping the block structure."""
+        space = super(NumpyChunkedTensorSpace, self)._astype(dtype)
+        space.__chunks = self.__chunks
+        space.__spill = self.__spill
+        space.__scratch_dir = self.__scratch_dir
+        return space
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        # Same as for `NumpyTensorSpace`, with the implementation added
+        # as last argument
+        npy_repr = super(NumpyChunkedTensorSpace, self).__repr__()
+        return "{}, impl='{}')".format(npy_repr[:-1], self.impl)
+
+    @property
+    def element_type(self):
+        """Type of elements in this space: `NumpyChunkedTensor`."""
+        return NumpyChunkedTensor
+
+
+class NumpyChunkedTensor(Tensor):
+
+    """Representation of a `NumpyChunkedTensorSpace` element."""
+
+    def __init__(self, space, data):
+        """Initialize a new instance."""
+        Tensor.__init__(self, space)
+        self.__data = data
+
+    @property
+    def data(self):
+        """The `BlockArray` holding the data of ``self``."""
+        return self.__data
+
+    def asarray(self, out=None):
+        """Extract the data of this tensor as a ``numpy.ndarray``.
+
+        The blocks are copied to a new array or to ``out``.
+
+        Examples
+        --------
+        >>> space = odl.rn((2, 3), impl='numpy_chunked', chunks=(1, 3))
+        >>> space.one().asarray()
+        array([[ 1.,  1.,  1.],
+               [ 1.,  1.,  1.]])
+        """
+        if out is None:
+            return np.asarray(self.data)
+        else:
+            self.data.map_blocks(lambda blk, slc: out.__setitem__(slc, blk))
+            return out
+
+    def astype(self, dtype):
+        """Return a copy of this element with new ``dtype``.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_chunked')
+        >>> space.element([1.5, 2, 3]).astype(int)
+        tensor_space(3, dtype=int, impl='numpy_chunked').element([1, 2, 3])
+        """
+        return self.space.astype(dtype).element(self.data)
+
+    def __eq__(self, other):
+        """Return ``self == other``.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_chunked', chunks=2)
+        >>> x = space.element([1, 2, 3])
+        >>> x == x.copy(), x == space.zero()
+        (True, False)
+        """
+        if other is self:
+            return True
+        elif other not in self.space:
+            return False
+        else:
+            return all(self.data.map_blocks(
+                lambda blk, slc: np.array_equal(blk, _region(other, slc))))
+
+    def copy(self):
+        """Return an identical (deep) copy of this tensor.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_chunked')
+        >>> x = space.element([1, 2, 3])
+        >>> y = x.copy()
+        >>> y == x, y is x
+        (True, False)
+        """
+        spill_dir = self.space.scratch_dir if self.space.spill else None
+        return self.space.element(self.data.copy(spill_dir))
+
+    def __copy__(self):
+        """Return ``copy(self)``."""
+        return self.copy()
+
+    def spill(self, scratch_dir=None):
+        """Move the blocks of this tensor to memory-mapped files.
+
+        Parameters
+        ----------
+        scratch_dir : str, optional
+            Directory in which the files are created. For ``None``,
+            `NumpyChunkedTensorSpace.scratch_dir` is used.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_chunked')
+        >>> x = space.element([1, 2, 3])
+        >>> x.spill()
+        >>> x.data.is_spilled
+        True
+        >>> x
+        rn(3, impl='numpy_chunked').element([ 1.,  2.,  3.])
+        >>> x.load()
+        >>> x.data.is_spilled
+        False
+        """
+        if scratch_dir is None:
+            scratch_dir = self.space.scratch_dir
+        self.data.spill(scratch_dir)
+
+    def load(self):
+        """Move the blocks of this tensor to main memory."""
+        self.data.load()
+
+    def __getitem__(self, indices):
+        """Return ``self[indices]``.
+
+        In contrast to `NumpyTensor`, the result is always a copy.
+
+        Examples
+        --------
+        >>> space = odl.rn((2, 3), impl='numpy_chunked', chunks=1)
+        >>> x = space.element([[1, 2, 3], [4, 5, 6]])
+        >>> x[1, 2]
+        6.0
+        >>> x[:, 1:]
+        rn((2, 2), impl='numpy_chunked').element(
+            [[ 2.,  3.],
+             [ 5.,  6.]]
+        )
+        """
+        if isinstance(indices, Tensor):
+            indices = indices.asarray()
+        arr = self.data[indices]
+
+        if np.isscalar(arr):
+            if self.space.field is not None:
+                return self.space.field.element(arr)
+            else:
+                return arr
+        else:
+            if is_numeric_dtype(self.dtype):
+                weighting = self.space.weighting
+            else:
+                weighting = None
+            space = type(self.space)(
+                arr.shape, dtype=self.dtype, exponent=self.space.exponent,
+                weighting=weighting)
+            return space.element(arr)
+
+    def __setitem__(self, indices, values):
+        """Implement ``self[indices] = values``.
+
+        Only the blocks covered by ``indices`` are accessed if
+        ``indices`` consists of integers and slices.
+
+        Examples
+        --------
+        >>> space = odl.rn((2, 3), impl='numpy_chunked', chunks=1)
+        >>> x = space.zero()
+        >>> x[:, ::2] = [1, 2]
+        >>> x
+        rn((2, 3), impl='numpy_chunked').element(
+            [[ 1.,  0.,  2.],
+             [ 1.,  0.,  2.]]
+        )
+        """
+        if isinstance(indices, Tensor):
+            indices = indices.asarray()
+        if isinstance(values, Tensor):
+            values = values.asarray()
+        self.data[indices] = values
+
+    @property
+    def real(self):
+        """Real part of ``self``, sharing the blocks with ``self``.
+
+        Examples
+        --------
+        >>> space = odl.cn(3, impl='numpy_chunked')
+        >>> x = space.element([1 + 1j, 2, 3 - 3j])
+        >>> x.real
+        rn(3, impl='numpy_chunked').element([ 1.,  2.,  3.])
+        """
+        if self.space.is_real:
+            return self
+        elif self.space.is_complex:
+            real_space = self.space.astype(self.space.real_dtype)
+            return real_space.element(BlockArray(
+                self.shape, real_space.dtype, self.data.chunks,
+                [blk.real for blk in self.data.blocks]))
+        else:
+            raise NotImplementedError('`real` not defined for non-numeric '
+                                      'dtype {}'.format(self.dtype))
+
+    @real.setter
+    def real(self, newreal):
+        """Setter for the real part."""
+        self.real[:] = newreal
+
+    @property
+    def imag(self):
+        """Imaginary part of ``self``, sharing the blocks with ``self``.
+
+        Examples
+        --------
+        >>> space = odl.cn(3, impl='numpy_chunked')
+        >>> x = space.element([1 + 1j, 2, 3 - 3j])
+        >>> x.imag
+        rn(3, impl='numpy_chunked').element([ 1.,  0., -3.])
+        """
+        if self.space.is_real:
+            return self.space.zero()
+        elif self.space.is_complex:
+            real_space = self.space.astype(self.space.real_dtype)
+            return real_space.element(BlockArray(
+                self.shape, real_space.dtype, self.data.chunks,
+                [blk.imag for blk in self.data.blocks]))
+        else:
+            raise NotImplementedError('`imag` not defined for non-numeric '
+                                      'dtype {}'.format(self.dtype))
+
+    @imag.setter
+    def imag(self, newimag):
+        """Setter for the imaginary part."""
+        if self.space.is_real:
+            raise ValueError('cannot set imaginary part in real spaces')
+        self.imag[:] = newimag
+
+    def conj(self, out=None):
+        """Return the complex conjugate of ``self``.
+
+        Examples
+        --------
+        >>> space = odl.cn(2, impl='numpy_chunked')
+        >>> space.element([1 + 1j, 2 - 1j]).conj()
+        cn(2, impl='numpy_chunked').element([ 1.-1.j,  2.+1.j])
+        """
+        if self.space.is_real:
+            if out is None:
+                return self
+            else:
+                out[:] = self
+                return out
+
+        if not is_numeric_dtype(self.space.dtype):
+            raise NotImplementedError('`conj` not defined for non-numeric '
+                                      'dtype {}'.format(self.dtype))
+
+        if out is None:
+            out = self.space.element()
+        elif out not in self.space:
+            raise LinearSpaceTypeError('`out` {!r} not in space {!r}'
+                                       ''.format(out, self.space))
+        return np.conj(self, out=(out,))
+
+    def __ipow__(self, p):
+        """Implement ``self **= p``, block by block."""
+        # Integer powers of integer tensors need the generic implementation
+        if isinstance(p, Integral) and not is_floating_dtype(self.dtype):
+            return super(NumpyChunkedTensor, self).__ipow__(p)
+        np.power(self, p, out=(self,))
+        return self
+
+    def __int__(self):
+        """Return ``int(self)``."""
+        return int(self.asarray())
+
+    def __float__(self):
+        """Return ``float(self)``."""
+        return float(self.asarray())
+
+    def __complex__(self):
+        """Return ``complex(self)``."""
+        if self.size != 1:
+            raise TypeError('only size-1 tensors can be converted to '
+                            'Python scalars')
+        return complex(self.asarray().ravel()[0])
+
+    def _result_space(self, dtype, shape=None):
+        """Return a space of this type for results of ufuncs."""
+        if shape is None:
+            shape = self.shape
+        if is_floating_dtype(dtype) and shape == self.shape:
+            # Weighting contains exponent
+            kwargs = {'weighting': self.space.weighting}
+        elif is_floating_dtype(dtype):
+            kwargs = {'exponent': self.space.exponent}
+        else:
+            # No `exponent` or `weighting` applicable
+            kwargs = {}
+        if shape == self.shape:
+            kwargs['chunks'] = self.space.chunks
+        return type(self.space)(shape, dtype, spill=self.space.spill,
+                                scratch_dir=self.space.scratch_dir,
+                                **kwargs)
+
+    def _blockwise_ufunc(self, ufunc, inputs, outs, kwargs):
+        """Evaluate ``ufunc`` by blocks, return ``None`` if impossible."""
+        for x in tuple(inputs) + tuple(outs):
+            if x is None or np.isscalar(x):
+                continue
+            if isinstance(x, (NumpyChunkedTensor, BlockArray, np.ndarray)):
+                if x.shape == self.shape:
+                    continue
+                if isinstance(x, np.ndarray) and x.ndim == 0:
+                    continue
+            return None
+        if any(key in kwargs for key in ('where', 'axes', 'axis')):
+            return None
+
+        # Determine the result data types from empty arrays
+        empty_inputs = [np.empty(0, dtype=np.result_type(x))
+                        if not np.isscalar(x) and np.ndim(x) > 0 else x
+                        for x in inputs]
+        empty_res = ufunc(*empty_inputs, **kwargs)
+        if ufunc.nout == 1:
+            empty_res = (empty_res,)
+
+        results = []
+        for out, res in zip(outs, empty_res):
+            if out is None:
+                out = self._result_space(res.dtype).element()
+            results.append(out)
+
+        def ufunc_block(i):
+            slc = self.data.block_slices[i]
+            out_blks = tuple(_region(out, slc) for out in results)
+            ufunc(*[_region(x, slc) for x in inputs], out=out_blks,
+                  **kwargs)
+            # Regions of outputs with other block structure are copies
+            for out, out_blk in zip(results, out_blks):
+                if not isinstance(out, np.ndarray):
+                    data = getattr(out, 'data', out)
+                    if not any(blk is out_blk for blk in data.blocks):
+                        data[slc] = out_blk
+
+        parallel_map(ufunc_block, range(len(self.data.blocks)))
+
+        if ufunc.nout == 1:
+            return results[0]
+        else:
+            return tuple(results)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """Interface to Numpy's ufunc machinery.
+
+        Calls of ufuncs on tensors of the same shape and scalars, as
+        well as ``reduce`` over all axes, are evaluated block by block
+        in parallel. All other cases are evaluated on the full arrays,
+        with results wrapped in spaces of the same type as ``self.space``
+        as for `NumpyTensor.__array_ufunc__`.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_chunked', chunks=2)
+        >>> x = space.element([1, 2, 3])
+        >>> np.add(x, 1)
+        rn(3, impl='numpy_chunked').element([ 2.,  3.,  4.])
+        >>> out = space.element()
+        >>> result = np.exp(space.zero(), out=out)
+        >>> result is out, out
+        (True, rn(3, impl='numpy_chunked').element([ 1.,  1.,  1.]))
+        >>> np.add.reduce(x)
+        6.0
+        >>> np.add.accumulate(x)
+        rn(3, impl='numpy_chunked').element([ 1.,  3.,  6.])
+        """
+        out_tuple = kwargs.pop('out', ())
+        if method == '__call__' and len(out_tuple) not in (0, ufunc.nout):
+            raise ValueError(
+                "ufunc {}: need 0 or {} `out` arguments for "
+                "`method='__call__'`, got {}"
+                ''.format(ufunc.__name__, ufunc.nout, len(out_tuple)))
+        elif method != '__call__' and len(out_tuple) not in (0, 1):
+            raise ValueError(
+                'ufunc {}: need 0 or 1 `out` arguments for `method={!r}`, '
+                'got {}'.format(ufunc.__name__, method, len(out_tuple)))
+
+        valid_types = (type(self), BlockArray, np.ndarray)
+        if not all(isinstance(o, valid_types) or o is None
+                   for o in out_tuple):
+            return NotImplemented
+        if not out_tuple:
+            out_tuple = (None,) * (ufunc.nout if method == '__call__' else 1)
+
+        # Blockwise evaluation
+        if method == '__call__':
+            result = self._blockwise_ufunc(ufunc, inputs, out_tuple, kwargs)
+            if result is not None:
+                return result
+        elif (method == 'reduce' and ufunc in _REORDERABLE_UFUNCS and
+              len(inputs) == 1 and out_tuple[0] is None and self.size > 0 and
+              set(kwargs) <= {'axis', 'dtype', 'keepdims'} and
+              not kwargs.get('keepdims', False) and
+              _is_full_reduction(kwargs.get('axis', 0), self.ndim)):
+            kwargs['axis'] = None
+            partial = self.data.map_blocks(
+                lambda blk, slc: ufunc.reduce(blk, **kwargs))
+            return ufunc.reduce(np.array(partial), **kwargs)
+
+        # Evaluation on full arrays
+        arr_inputs = tuple(np.asarray(x)
+                           if isinstance(x, (Tensor, BlockArray)) else x
+                           for x in inputs)
+        arr_outs = tuple(None if o is None else
+                         (o if isinstance(o, np.ndarray) else np.asarray(o))
+                         for o in out_tuple)
+
+        if method == 'at':
+            ufunc.at(*arr_inputs, **kwargs)
+            if isinstance(inputs[0], valid_types[:2]):
+                inputs[0][...] = arr_inputs[0]
+            return None
+
+        if method == '__call__':
+            kwargs['out'] = arr_outs
+        else:
+            kwargs['out'] = arr_outs[0]
+        res = getattr(ufunc, method)(*arr_inputs, **kwargs)
+        res_tuple = res if isinstance(res, tuple) else (res,)
+
+        results = []
+        for out, res_arr in zip(out_tuple, res_tuple):
+            if out is None:
+                if np.isscalar(res_arr) or np.ndim(res_arr) == 0:
+                    results.append(res_arr)
+                else:
+                    space = self._result_space(res_arr.dtype, res_arr.shape)
+                    results.append(space.element(res_arr))
+            else:
+                if not isinstance(out, np.ndarray):
+                    out[...] = res_arr
+                results.append(out)
+
+        if len(results) == 1:
+            return results[0]
+        else:
+            return tuple(results)
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -0,0 +1,423 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""NumPy implementation of tensor spaces backed by memory-mapped files.
+
+Elements of these spaces store their data in `numpy.memmap` arrays in
+anonymous temporary files, such that the operating system can page them
+out to disk. Together with reductions and linear combinations that
+process the data in small chunks, this allows existing algorithms to
+run on data that does not fit into main memory.
+"""
+
+from __future__ import print_function, division, absolute_import
+import os
+import tempfile
+import numpy as np
+
+from odl.space.lazy_tensors import LazyTensorExpression
+from odl.space.npy_tensors import (
+    NumpyTensorSpace, NumpyTensor, _block_slices, _flat_views,
+    _inner_blocked, _lincomb_blocked, _pnorm_blocked)
+from odl.util import is_floating_dtype
+
+
+__all__ = ('NumpyMemmapTensorSpace',)
+
+
+# Default number of bytes per processed chunk, chosen such that the
+# chunks of a few operands fit into a typical L2 cache
+CHUNK_NBYTES = 2 ** 18
+
+
+def default_scratch_dir():
+    """Return the default directory for memory-mapped files.
+
+    This is the value of the environment variable ``ODL_SCRATCH_DIR``
+    if set, otherwise the default temporary directory of the system,
+    see `tempfile.gettempdir`.
+    """
+    return os.environ.get('ODL_SCRATCH_DIR', tempfile.gettempdir())
+
+
+def is_file_backed(arr):
+    """Return ``True`` if ``arr`` is a view into a memory-mapped file.
+
+    Examples
+    --------
+    >>> arr = np.memmap(tempfile.TemporaryFile(), dtype=float, shape=(3,))
+    >>> is_file_backed(arr), is_file_backed(arr[1:])
+    (True, True)
+    >>> is_file_backed(arr.copy()), is_file_backed(np.zeros(3))
+    (False, False)
+    """
+    return (isinstance(arr, np.memmap) and
+            getattr(arr, '_mmap', None) is not None)
+
+
+class NumpyMemmapTensorSpace(NumpyTensorSpace):
+
+    """Tensor space whose elements are backed by memory-mapped files.
+
+    Each element created by this space stores its data in a
+    `numpy.memmap` array in an anonymous temporary file in
+    `scratch_dir`. The file is removed by the operating system as soon
+    as the element's data is no longer referenced.
+
+    Linear combinations, inner products, norms and distances are
+    computed in chunks of `chunk_size` entries, which keeps temporary
+    arrays small and the data access sequential. All other operations
+    are inherited from `NumpyTensorSpace`.
+
+    Since the storage location does not change the mathematical
+    properties of a space, `scratch_dir` and `chunk_size` do not take
+    part in comparisons of spaces.
+    """
+
+    def __init__(self, shape, dtype=None, scratch_dir=None, chunk_size=None,
+                 **kwargs):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        shape : positive int or sequence of positive ints
+            Number of entries per axis for elements in this space.
+        dtype : optional
+            Data type of each element. For ``None``, the `default_dtype`
+            of this space (``float64``) is used.
+        scratch_dir : str, optional
+            Directory in which the memory-mapped files are created.
+            For ``None``, `default_scratch_dir` is used at the time
+            an element is created.
+        chunk_size : positive int, optional
+            Number of entries processed at once in chunked operations.
+            For ``None``, it is chosen such that a chunk has a size
+            of 256 KiB.
+        kwargs :
+            Further keyword arguments are passed to `NumpyTensorSpace`.
+
+        Examples
+        --------
+        >>> space = NumpyMemmapTensorSpace(3)
+        >>> space
+        rn(3, impl='numpy_memmap')
+        >>> x = space.one()
+        >>> x
+        rn(3, impl='numpy_memmap').element([ 1.,  1.,  1.])
+        >>> isinstance(x.data, np.memmap)
+        True
+
+        The ``impl`` name can be used with all space factory functions:
+
+        >>> space = odl.uniform_discr(0, 1, 4, impl='numpy_memmap')
+        >>> space.impl
+        'numpy_memmap'
+        >>> space.one().norm()
+        1.0
+        """
+        super(NumpyMemmapTensorSpace, self).__init__(shape, dtype, **kwargs)
+
+        if chunk_size is None:
+            chunk_size = max(1, CHUNK_NBYTES // self.dtype.itemsize)
+        else:
+            chunk_size, chunk_size_in = int(chunk_size), chunk_size
+            if chunk_size != chunk_size_in or chunk_size <= 0:
+                raise ValueError('`chunk_size` must be a positive integer, '
+                                 'got {!r}'.format(chunk_size_in))
+
+        self.__scratch_dir = scratch_dir
+        self.__chunk_size = chunk_size
+
+    @property
+    def impl(self):
+        """Name of the implementation back-end: ``'numpy_memmap'``."""
+        return 'numpy_memmap'
+
+    @property
+    def scratch_dir(self):
+        """Directory in which the memory-mapped files are created."""
+        if self.__scratch_dir is None:
+            return default_scratch_dir()
+        else:
+            return self.__scratch_dir
+
+    @property
+    def chunk_size(self):
+        """Number of entries processed at once in chunked operations."""
+        return self.__chunk_size
+
+    def _memmap(self, order=None):
+        """Return a new memory-mapped array with zero entries."""
+        order = self.default_order if order is None else str(order).upper()
+        if self.nbytes == 0:
+            # Empty files cannot be mapped
+            return np.zeros(self.shape, dtype=self.dtype, order=order)
+
+        # The file is anonymous (or deleted on close), and the mapping
+        # keeps it alive until the array is garbage collected
+        with tempfile.TemporaryFile(prefix='odl_', suffix='.dat',
+                                    dir=self.scratch_dir) as f:
+            return np.memmap(f, dtype=self.dtype, mode='w+',
+                             shape=self.shape, order=order)
+
+    def element(self, inp=None, data_ptr=None, order=None):
+        """Create a new element.
+
+        Parameters
+        ----------
+        inp : `array-like`, optional
+            Input used to initialize the new element.
+
+            If ``inp`` is `None`, a new memory-mapped array is
+            created. If ``inp`` already is a memory-mapped array of
+            correct `shape` and `dtype`, it is wrapped without copy.
+            Otherwise, its values are copied into a new memory-mapped
+            array.
+
+        data_ptr : int, optional
+            Pointer to the start memory address of a contiguous array.
+            The memory is wrapped as-is, i.e., it is not copied into a
+            memory-mapped file. For this option, ``order`` must be
+            either ``'C'`` or ``'F'``.
+        order : {None, 'C', 'F'}, optional
+            Storage order of the returned element. For ``'C'`` and ``'F'``,
+            contiguous memory in the respective ordering is enforced.
+            The default ``None`` enforces no contiguousness.
+
+        Returns
+        -------
+        element : `NumpyMemmapTensor`
+            The new element, created from ``inp`` or from scratch.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_memmap')
+        >>> x = space.element([1, 2, 3])
+        >>> x
+        rn(3, impl='numpy_memmap').element([ 1.,  2.,  3.])
+        >>> is_file_backed(x.data)
+        True
+
+        Views into file-backed elements share memory with them:
+
+        >>> y = space.element(x.data[:])
+        >>> y[0] = 0
+        >>> x
+        rn(3, impl='numpy_memmap').element([ 0.,  2.,  3.])
+        """
+        if order is not None and str(order).upper() not in ('C', 'F'):
+            raise ValueError("`order` {!r} not understood".format(order))
+
+        if isinstance(inp, LazyTensorExpression):
+            return inp.evaluate(out=self.element(order=order))
+
+        if inp is None and data_ptr is None:
+            return self.element_type(self, self._memmap(order))
+
+        elif inp is not None and data_ptr is None:
+            if inp in self and order is None:
+                # Short-circuit for space elements and no enforced ordering
+                return inp
+
+            if isinstance(inp, NumpyTensor):
+                inp = inp.data
+            if (is_file_backed(inp) and
+                    inp.shape == self.shape and
+                    inp.dtype == self.dtype and
+                    (order is None or
+                     inp.flags[str(order).upper() + '_CONTIGUOUS'])):
+                return self.element_type(self, inp)
+
+            arr = np.array(inp, copy=False, dtype=self.dtype, ndmin=self.ndim)
+            if arr.shape != self.shape:
+                raise ValueError('shape of `inp` not equal to space shape: '
+                                 '{} != {}'.format(arr.shape, self.shape))
+            mmap = self._memmap(order)
+            mmap[...] = arr
+            return self.element_type(self, mmap)
+
+        else:
+            return super(NumpyMemmapTensorSpace, self).element(
+                inp, data_ptr, order)
+
+    def zero(self):
+        """Return a tensor of all zeros.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_memmap')
+        >>> space.zero()
+        rn(3, impl='numpy_memmap').element([ 0.,  0.,  0.])
+        """
+        # New files are filled with zeros, hence writing to the file (and
+        # thus touching its pages) can be avoided
+        return self.element()
+
+    def one(self):
+        """Return a tensor of all ones.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_memmap')
+        >>> space.one()
+        rn(3, impl='numpy_memmap').element([ 1.,  1.,  1.])
+        """
+        x = self.element()
+        x.data.fill(1)
+        return x
+
+    def _astype(self, dtype):
+        """Internal helper for `astype`, keeping the storage options."""
+        space = super(NumpyMemmapTensorSpace, self)._astype(dtype)
+        space.__scratch_dir = self.__scratch_dir
+        return space
+
+    def _lincomb(self, a, x1, b, x2, out):
+        """Implement the linear combination of ``x1`` and ``x2``.
+
+        Compute ``out = a*x1 + b*x2`` chunk by chunk.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_memmap', chunk_size=2)
+        >>> x = space.element([0, 1, 1])
+        >>> y = space.element([0, 0, 1])
+        >>> space.lincomb(1, x, 2, y)
+        rn(3, impl='numpy_memmap').element([ 0.,  1.,  3.])
+        """
+        flat = _flat_views(x1.data, x2.data, out.data)
+        if flat is None:
+            super(NumpyMemmapTensorSpace, self)._lincomb(a, x1, b, x2, out)
+            return
+
+        x1_flat, x2_flat, out_flat = flat
+        if is_floating_dtype(self.dtype):
+            _lincomb_blocked(a, x1_flat, b, x2_flat, out_flat,
+                             self.chunk_size, self.compute_dtype)
+        else:
+            # Cast only the result to the (integer or boolean) data type
+            for slc in _block_slices(self.size, self.chunk_size):
+                out_flat[slc] = a * x1_flat[slc] + b * x2_flat[slc]
+
+    def _pnorm_chunked(self, x1, x2=None):
+        """Return the weighted norm of ``x1`` or ``x1 - x2``, or ``None``.
+
+        ``None`` is returned if the norm cannot be computed in chunks,
+        e.g., for custom weightings.
+        """
+        return _pnorm_blocked(self.weighting, x1, x2, self.compute_dtype,
+                              self.chunk_size)
+
+    def _dist(self, x1, x2):
+        """Return the distance between ``x1`` and ``x2``.
+
+        The difference ``x1 - x2`` is computed chunk by chunk and never
+        stored as a whole.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, exponent=1, impl='numpy_memmap')
+        >>> x = space.element([-1, -1, 2])
+        >>> y = space.one()
+        >>> space.dist(x, y)
+        5.0
+        """
+        dist = self._pnorm_chunked(x1, x2)
+        if dist is None:
+            return super(NumpyMemmapTensorSpace, self)._dist(x1, x2)
+        else:
+            return dist
+
+    def _norm(self, x):
+        """Return the norm of ``x``, computed chunk by chunk.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, weighting=[2, 1, 1], impl='numpy_memmap')
+        >>> x = space.element([2, 0, 1])
+        >>> space.norm(x)
+        3.0
+        """
+        norm = self._pnorm_chunked(x)
+        if norm is None:
+            return super(NumpyMemmapTensorSpace, self)._norm(x)
+        else:
+            return norm
+
+    def _inner(self, x1, x2):
+        """Return the inner product of ``x1`` and ``x2``.
+
+        The inner product is accumulated chunk by chunk.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, weighting=[2, 1, 1], impl='numpy_memmap')
+        >>> x = space.element([1, 0, 3])
+        >>> y = space.one()
+        >>> space.inner(x, y)
+        5.0
+        """
+        inner = _inner_blocked(self.weighting, x1, x2, self.compute_dtype,
+                               self.chunk_size)
+        if inner is None:
+            return super(NumpyMemmapTensorSpace, self)._inner(x1, x2)
+        else:
+            return inner
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        # Same as for `NumpyTensorSpace`, with the implementation added
+        # as last argument
+        npy_repr = super(NumpyMemmapTensorSpace, self).__repr__()
+        return "{}, impl='{}')".format(npy_repr[:-1], self.impl)
+
+    @property
+    def element_type(self):
+        """Type of elements in this space: `NumpyMemmapTensor`."""
+        return NumpyMemmapTensor
+
+
+class NumpyMemmapTensor(NumpyTensor):
+
+    """Representation of a `NumpyMemmapTensorSpace` element."""
+
+    def copy(self):
+        """Return an identical (deep) copy of this tensor.
+
+        The data is copied directly into a new memory-mapped file.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_memmap')
+        >>> x = space.element([1, 2, 3])
+        >>> y = x.copy()
+        >>> y == x
+        True
+        >>> is_file_backed(y.data)
+        True
+        """
+        out = self.space.element()
+        out.data[...] = self.data
+        return out
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
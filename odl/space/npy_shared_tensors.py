@@ -0,0 +1,400 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""NumPy implementation of tensor spaces backed by shared memory.
+
+Elements of these spaces store their data in blocks of
+`multiprocessing.shared_memory`. When pickled, e.g., for sending them to
+a worker process of a `multiprocessing.Pool`, only a handle to the
+shared memory is transferred instead of the data. The unpickled element
+in the other process is a view of the same memory, which allows worker
+processes to read from and write to (slices of) large tensors without
+copies.
+"""
+
+from __future__ import print_function, division, absolute_import
+import threading
+import weakref
+import numpy as np
+try:
+    from multiprocessing import shared_memory
+    SHARED_MEMORY_AVAILABLE = True
+except ImportError:
+    SHARED_MEMORY_AVAILABLE = False
+
+from odl.space.lazy_tensors import LazyTensorExpression
+from odl.space.npy_tensors import NumpyTensorSpace, NumpyTensor
+
+
+__all__ = ('NumpySharedTensorSpace',)
+
+
+# Maps ``id(root)`` of arrays covering a whole shared memory block to
+# the name of the block, for all blocks mapped into this process
+_SHARED_BLOCKS = {}
+_SHARED_BLOCKS_LOCK = threading.Lock()
+
+
+def _release_block(key, shm, owner):
+    """Remove a block from the registry, close it and unlink it if owned."""
+    with _SHARED_BLOCKS_LOCK:
+        _SHARED_BLOCKS.pop(key, None)
+    shm.close()
+    if owner:
+        try:
+            shm.unlink()
+        except OSError:
+            pass
+
+
+def _map_block(shm, owner):
+    """Return a flat byte array wrapping ``shm`` and register it.
+
+    The block is closed, and unlinked for the ``owner`` process, as soon
+    as the returned array and all views of it are garbage collected.
+    Views of the array keep it alive since NumPy does not collapse the
+    base of a view to an object of a different type than `numpy.ndarray`.
+    """
+    root = np.ndarray((shm.size,), dtype='uint8', buffer=shm.buf)
+    key = id(root)
+    with _SHARED_BLOCKS_LOCK:
+        _SHARED_BLOCKS[key] = shm.name
+    # The finalizer also keeps `shm` alive, which must not be closed
+    # before the array is gone
+    weakref.finalize(root, _release_block, key, shm, owner)
+    return root
+
+
+def _attach_block(name):
+    """Return a flat byte array wrapping an existing shared memory block."""
+    # Processes started by `multiprocessing` share the resource tracker
+    # with their parent, so attaching does not change the tracked blocks
+    return _map_block(shared_memory.SharedMemory(name=name), owner=False)
+
+
+def shared_block(arr):
+    """Return the shared memory block of ``arr`` and the offset of ``arr``.
+
+    Parameters
+    ----------
+    arr : `numpy.ndarray`
+        Array whose memory location is determined.
+
+    Returns
+    -------
+    name : str or None
+        Name of the shared memory block in which ``arr`` stores its
+        data, or ``None`` if ``arr`` does not use shared memory.
+    offset : int or None
+        Offset in bytes of the first entry of ``arr`` from the start of
+        the block, or ``None`` if ``arr`` does not use shared memory.
+
+    Examples
+    --------
+    >>> space = odl.rn(4, impl='numpy_shared')
+    >>> x = space.one()
+    >>> name, offset = shared_block(x.data[1:])
+    >>> offset
+    8
+    >>> shared_block(np.ones(4))
+    (None, None)
+    """
+    root = arr
+    while isinstance(root.base, np.ndarray):
+        root = root.base
+
+    with _SHARED_BLOCKS_LOCK:
+        name = _SHARED_BLOCKS.get(id(root), None)
+    if name is None:
+        return None, None
+
+    offset = (arr.__array_interface__['data'][0] -
+              root.__array_interface__['data'][0])
+    return name, offset
+
+
+def is_shared(arr):
+    """Return ``True`` if ``arr`` is a view into shared memory.
+
+    Examples
+    --------
+    >>> space = odl.rn(3, impl='numpy_shared')
+    >>> x = space.one()
+    >>> is_shared(x.data), is_shared(x.data[1:])
+    (True, True)
+    >>> is_shared(x.data.copy()), is_shared(np.zeros(3))
+    (False, False)
+    """
+    return shared_block(arr)[0] is not None
+
+
+class NumpySharedTensorSpace(NumpyTensorSpace):
+
+    """Tensor space whose elements are backed by shared memory.
+
+    Each element created by this space stores its data in a
+    `multiprocessing.shared_memory.SharedMemory` block. Pickling an
+    element only stores a handle to the block, and unpickling, in the
+    same or another process, creates an element that shares the data
+    with the original one.
+
+    The process that creates an element owns its memory and frees it
+    when the element's data is no longer referenced there. Handles are
+    hence only valid as long as the owning process keeps the data alive,
+    which is why results of worker processes should be written to
+    elements created by the parent process, e.g., with ``out``
+    parameters of operators.
+
+    All operations are inherited from `NumpyTensorSpace`. Since the
+    storage location does not change the mathematical properties of
+    a space, it does not take part in comparisons of spaces.
+    """
+
+    def __init__(self, shape, dtype=None, **kwargs):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        shape : positive int or sequence of positive ints
+            Number of entries per axis for elements in this space.
+        dtype : optional
+            Data type of each element. For ``None``, the `default_dtype`
+            of this space (``float64``) is used.
+        kwargs :
+            Further keyword arguments are passed to `NumpyTensorSpace`.
+
+        Examples
+        --------
+        >>> space = NumpySharedTensorSpace(3)
+        >>> space
+        rn(3, impl='numpy_shared')
+        >>> x = space.one()
+        >>> x
+        rn(3, impl='numpy_shared').element([ 1.,  1.,  1.])
+
+        Pickled elements share memory with the original element:
+
+        >>> import pickle
+        >>> y = pickle.loads(pickle.dumps(x))
+        >>> y[0] = 0
+        >>> x
+        rn(3, impl='numpy_shared').element([ 0.,  1.,  1.])
+
+        The ``impl`` name can be used with all space factory functions:
+
+        >>> space = odl.uniform_discr(0, 1, 4, impl='numpy_shared')
+        >>> space.impl
+        'numpy_shared'
+        >>> space.one().norm()
+        1.0
+        """
+        if not SHARED_MEMORY_AVAILABLE:
+            raise RuntimeError('shared memory tensors require '
+                               '`multiprocessing.shared_memory` '
+                               '(Python 3.8 or later)')
+        super(NumpySharedTensorSpace, self).__init__(shape, dtype, **kwargs)
+
+    @property
+    def impl(self):
+        """Name of the implementation back-end: ``'numpy_shared'``."""
+        return 'numpy_shared'
+
+    def _shared_array(self, order=None):
+        """Return a new array in shared memory with zero entries."""
+        order = self.default_order if order is None else str(order).upper()
+        if self.nbytes == 0:
+            # Shared memory blocks cannot be empty
+            return np.zeros(self.shape, dtype=self.dtype, order=order)
+
+        # New blocks are filled with zeros
+        root = _map_block(
+            shared_memory.SharedMemory(create=True, size=self.nbytes),
+            owner=True)
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=root,
+                          order=order)
+
+    def element(self, inp=None, data_ptr=None, order=None):
+        """Create a new element.
+
+        Parameters
+        ----------
+        inp : `array-like`, optional
+            Input used to initialize the new element.
+
+            If ``inp`` is `None`, a new array in shared memory is
+            created. If ``inp`` already is an array in shared memory
+            with correct `shape` and `dtype`, it is wrapped without
+            copy. Otherwise, its values are copied into a new array in
+            shared memory.
+
+        data_ptr : int, optional
+            Pointer to the start memory address of a contiguous array.
+            The memory is wrapped as-is, i.e., it is not copied into
+            shared memory. For this option, ``order`` must be either
+            ``'C'`` or ``'F'``.
+        order : {None, 'C', 'F'}, optional
+            Storage order of the returned element. For ``'C'`` and ``'F'``,
+            contiguous memory in the respective ordering is enforced.
+            The default ``None`` enforces no contiguousness.
+
+        Returns
+        -------
+        element : `NumpySharedTensor`
+            The new element, created from ``inp`` or from scratch.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_shared')
+        >>> x = space.element([1, 2, 3])
+        >>> x
+        rn(3, impl='numpy_shared').element([ 1.,  2.,  3.])
+        >>> is_shared(x.data)
+        True
+
+        Views into shared elements share memory with them:
+
+        >>> y = space.element(x.data[:])
+        >>> y[0] = 0
+        >>> x
+        rn(3, impl='numpy_shared').element([ 0.,  2.,  3.])
+        """
+        if order is not None and str(order).upper() not in ('C', 'F'):
+            raise ValueError("`order` {!r} not understood".format(order))
+
+        if isinstance(inp, LazyTensorExpression):
+            return inp.evaluate(out=self.element(order=order))
+
+        if inp is None and data_ptr is None:
+            return self.element_type(self, self._shared_array(order))
+
+        elif inp is not None and data_ptr is None:
+            if inp in self and order is None:
+                # Short-circuit for space elements and no enforced ordering
+                return inp
+
+            if isinstance(inp, NumpyTensor):
+                inp = inp.data
+            if (isinstance(inp, np.ndarray) and
+                    is_shared(inp) and
+                    inp.shape == self.shape and
+                    inp.dtype == self.dtype and
+                    (order is None or
+                     inp.flags[str(order).upper() + '_CONTIGUOUS'])):
+                return self.element_type(self, inp)
+
+            arr = np.array(inp, copy=False, dtype=self.dtype, ndmin=self.ndim)
+            if arr.shape != self.shape:
+                raise ValueError('shape of `inp` not equal to space shape: '
+                                 '{} != {}'.format(arr.shape, self.shape))
+            shared = self._shared_array(order)
+            shared[...] = arr
+            return self.element_type(self, shared)
+
+        else:
+            return super(NumpySharedTensorSpace, self).element(
+                inp, data_ptr, order)
+
+    def zero(self):
+        """Return a tensor of all zeros.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_shared')
+        >>> space.zero()
+        rn(3, impl='numpy_shared').element([ 0.,  0.,  0.])
+        """
+        # New shared memory blocks are filled with zeros
+        return self.element()
+
+    def one(self):
+        """Return a tensor of all ones.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_shared')
+        >>> space.one()
+        rn(3, impl='numpy_shared').element([ 1.,  1.,  1.])
+        """
+        x = self.element()
+        x.data.fill(1)
+        return x
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        # Same as for `NumpyTensorSpace`, with the implementation added
+        # as last argument
+        npy_repr = super(NumpySharedTensorSpace, self).__repr__()
+        return "{}, impl='{}')".format(npy_repr[:-1], self.impl)
+
+    @property
+    def element_type(self):
+        """Type of elements in this space: `NumpySharedTensor`."""
+        return NumpySharedTensor
+
+
+def _rebuild_shared_tensor(space, name, offset, shape, strides):
+    """Return an element of ``space`` viewing an existing shared block."""
+    root = _attach_block(name)
+    arr = np.ndarray(shape, dtype=space.dtype, buffer=root, offset=offset,
+                     strides=strides)
+    return space.element_type(space, arr)
+
+
+class NumpySharedTensor(NumpyTensor):
+
+    """Representation of a `NumpySharedTensorSpace` element."""
+
+    def copy(self):
+        """Return an identical (deep) copy of this tensor.
+
+        The data is copied directly into a new shared memory block.
+
+        Examples
+        --------
+        >>> space = odl.rn(3, impl='numpy_shared')
+        >>> x = space.element([1, 2, 3])
+        >>> y = x.copy()
+        >>> y == x
+        True
+        >>> is_shared(y.data)
+        True
+        """
+        out = self.space.element()
+        out.data[...] = self.data
+        return out
+
+    def __reduce__(self):
+        """Return a handle to the shared data for pickling.
+
+        Tensors whose data does not live in shared memory, e.g., those
+        wrapping memory given by pointer, are pickled with their data.
+
+        Examples
+        --------
+        >>> import pickle
+        >>> space = odl.rn((2, 3), impl='numpy_shared')
+        >>> x = space.element([[1, 2, 3], [4, 5, 6]])
+        >>> y = space.element(x.data[:, ::-1])
+        >>> pickle.loads(pickle.dumps(y))
+        rn((2, 3), impl='numpy_shared').element(
+            [[ 3.,  2.,  1.],
+             [ 6.,  5.,  4.]]
+        )
+        """
+        name, offset = shared_block(self.data)
+        if name is None:
+            return (type(self), (self.space, self.data))
+        else:
+            return (_rebuild_shared_tensor,
+                    (self.space, name, offset, self.data.shape,
+                     self.data.strides))
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -18,12 +18,14 @@ import numpy as np
 from odl.set.sets import RealNumbers, ComplexNumbers
 from odl.set.space import LinearSpaceTypeError
 from odl.space.base_tensors import TensorSpace, Tensor
+from odl.space.lazy_tensors import LazyTensorExpression
 from odl.space.weighting import (
     Weighting, ArrayWeighting, ConstWeighting,
     CustomInner, CustomNorm, CustomDist)
 from odl.util import (
     dtype_str, signature_string, is_real_dtype, is_numeric_dtype,
-    writable_array, is_floating_dtype)
+    writable_array, is_floating_dtype, real_dtype, complex_dtype)
+from odl.util.parallel import blocked_reduce
 
 
 __all__ = ('NumpyTensorSpace',)
@@ -36,6 +38,20 @@ _BLAS_DTYPES = (np.dtype('float32'), np.dtype('float64'),
 THRESHOLD_SMALL = 100
 THRESHOLD_MEDIUM = 50000
 
+# Number of entries per block in `NumpyTensorSpace.lincomb_many`, chosen such
+# that a block of the output and a temporary fit into a typical L1 cache
+BLOCK_SIZE_LINCOMB = 2048
+
+# Number of entries per block in blocked reductions (inner, norm, dist).
+# Blocks are reduced in parallel, so they need to be large enough to
+# amortize the thread overhead, but small enough to keep the per-block
+# temporaries cheap.
+BLOCK_SIZE_REDUCTION = 2 ** 15
+
+# Alignment in bytes of pooled temporaries, a cache line and the width of
+# the widest vector registers
+ALIGNMENT = 64
+
 
 class NumpyTensorSpace(TensorSpace):
 
@@ -95,6 +111,19 @@ class NumpyTensorSpace(TensorSpace):
 
             Default: 2.0
 
+        compute_dtype : optional
+            Floating point data type in which linear combinations, inner
+            products, norms and distances are computed. It must be of
+            the same kind (real or complex) as ``dtype`` and at least as
+            precise, e.g., ``'float32'`` for ``dtype='float16'``.
+            Elements are stored in ``dtype``, and their values are
+            converted block by block during computations. For ``None``,
+            ``dtype`` is used.
+
+            This option cannot be combined with ``dist``, ``norm`` or
+            ``inner``, and it cannot be used in case of non-floating
+            ``dtype``.
+
         Other Parameters
         ----------------
         weighting : optional
@@ -217,6 +246,15 @@ class NumpyTensorSpace(TensorSpace):
         >>> space = odl.tensor_space((2, 3), dtype=int)
         >>> space
         tensor_space((2, 3), dtype=int)
+
+        Elements can be stored in half precision while reductions are
+        computed in single precision:
+
+        >>> space = odl.rn(3, dtype='float16', compute_dtype='float32')
+        >>> space
+        rn(3, dtype='float16', compute_dtype='float32')
+        >>> space.one().data.dtype
+        dtype('float16')
         """
         super(NumpyTensorSpace, self).__init__(shape, dtype)
         if self.dtype.char not in self.available_dtypes():
@@ -228,6 +266,7 @@ class NumpyTensorSpace(TensorSpace):
         inner = kwargs.pop('inner', None)
         weighting = kwargs.pop('weighting', None)
         exponent = kwargs.pop('exponent', getattr(weighting, 'exponent', 2.0))
+        compute_dtype = kwargs.pop('compute_dtype', None)
 
         if (not is_numeric_dtype(self.dtype) and
                 any(x is not None for x in (dist, norm, inner, weighting))):
@@ -285,6 +324,30 @@ class NumpyTensorSpace(TensorSpace):
             # No weighting, i.e., weighting with constant 1.0
             self.__weighting = NumpyTensorSpaceConstWeighting(1.0, exponent)
 
+        # Set the compute data type
+        if compute_dtype is None:
+            self.__compute_dtype = self.dtype
+        else:
+            self.__compute_dtype = np.dtype(compute_dtype)
+
+        if self.compute_dtype != self.dtype:
+            if not is_floating_dtype(self.dtype):
+                raise ValueError('cannot use `compute_dtype` for '
+                                 'non-floating `dtype` {}'
+                                 ''.format(dtype_str(self.dtype)))
+            if any(x is not None for x in (dist, norm, inner)):
+                raise ValueError('cannot use any of `dist`, `norm` or '
+                                 '`inner` with `compute_dtype`')
+            if (not is_floating_dtype(self.compute_dtype) or
+                    is_real_dtype(self.compute_dtype) !=
+                    is_real_dtype(self.dtype) or
+                    not np.can_cast(self.dtype, self.compute_dtype)):
+                raise ValueError(
+                    '`compute_dtype` {} is not a floating point data type '
+                    'of the same kind and at least the precision of `dtype` '
+                    '{}'.format(dtype_str(self.compute_dtype),
+                                dtype_str(self.dtype)))
+
         # Make sure there are no leftover kwargs
         if kwargs:
             raise TypeError('got unknown keyword arguments {}'.format(kwargs))
@@ -299,6 +362,23 @@ class NumpyTensorSpace(TensorSpace):
         """Default storage order for new elements in this space: ``'C'``."""
         return 'C'
 
+    @property
+    def compute_dtype(self):
+        """Data type used for computations with elements of this space.
+
+        This data type is used in linear combinations, inner products,
+        norms and distances, while the elements store their values in
+        `dtype`.
+
+        Examples
+        --------
+        >>> odl.rn(3, dtype='float16').compute_dtype
+        dtype('float16')
+        >>> odl.rn(3, dtype='float16', compute_dtype='float32').compute_dtype
+        dtype('float32')
+        """
+        return self.__compute_dtype
+
     @property
     def weighting(self):
         """This space's weighting scheme."""
@@ -398,6 +478,9 @@ class NumpyTensorSpace(TensorSpace):
         if order is not None and str(order).upper() not in ('C', 'F'):
             raise ValueError("`order` {!r} not understood".format(order))
 
+        if isinstance(inp, LazyTensorExpression):
+            return inp.evaluate(out=self.element(order=order))
+
         if inp is None and data_ptr is None:
             if order is None:
                 arr = np.empty(self.shape, dtype=self.dtype,
@@ -466,6 +549,25 @@ class NumpyTensorSpace(TensorSpace):
         return self.element(np.ones(self.shape, dtype=self.dtype,
                                     order=self.default_order))
 
+    def _new_temporary(self):
+        """Return a new element for the `pool`, aligned to `ALIGNMENT`.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Examples
+        --------
+        >>> space = odl.rn((3, 4))
+        >>> tmp = space._new_temporary()
+        >>> tmp.data.ctypes.data % ALIGNMENT
+        0
+        """
+        if self.element_type is not NumpyTensor:
+            # Backends storing their data elsewhere would copy the array
+            return super(NumpyTensorSpace, self)._new_temporary()
+        return self.element(_aligned_empty(self.shape, self.dtype,
+                                           self.default_order))
+
     @staticmethod
     def available_dtypes():
         """Return the set of data types available in this implementation.
@@ -545,8 +647,82 @@ class NumpyTensorSpace(TensorSpace):
         >>> result is out
         True
         """
+        if self.compute_dtype != self.dtype:
+            flat = _flat_views(x1.data, x2.data, out.data)
+            if flat is not None:
+                _lincomb_blocked(a, flat[0], b, flat[1], flat[2],
+                                 BLOCK_SIZE_LINCOMB, self.compute_dtype)
+                return
+
         _lincomb_impl(a, x1, b, x2, out)
 
+    def _lincomb_many(self, coeffs, elements, out):
+        """Implement a linear combination of many tensors.
+
+        Compute ``out = sum(a * x for a, x in zip(coeffs, elements))`` in
+        blocks, such that each block of ``out`` stays in cache until all
+        terms have been added. Linear combinations of one or two terms
+        use `_lincomb`.
+
+        This function is part of the subclassing API. Do not
+        call it directly.
+
+        Examples
+        --------
+        >>> space = odl.rn(3)
+        >>> x = space.element([0, 1, 1])
+        >>> y = space.element([0, 0, 1])
+        >>> z = space.element([1, 1, 1])
+        >>> space.lincomb_many([1, 2, -1], [x, y, z])
+        rn(3).element([-1.,  0.,  2.])
+        """
+        arrays = [x.data for x in elements]
+        if len(elements) <= 2 or not is_floating_dtype(self.dtype):
+            super(NumpyTensorSpace, self)._lincomb_many(
+                coeffs, elements, out)
+            return
+
+        if any(np.may_share_memory(out.data, arr) for arr in arrays[1:]):
+            # `out` overlaps with a later term, use a temporary
+            tmp = self.element()
+            self._lincomb_many(coeffs, elements, tmp)
+            out.data[:] = tmp.data
+            return
+
+        # Flat views, no copies since all arrays are contiguous
+        flat = _flat_views(*(arrays + [out.data]))
+        if flat is None:
+            super(NumpyTensorSpace, self)._lincomb_many(
+                coeffs, elements, out)
+            return
+
+        out_flat = flat.pop()
+        size = out_flat.size
+        dtype = self.compute_dtype
+        upcast = dtype != self.dtype
+        tmp = np.empty(min(size, BLOCK_SIZE_LINCOMB), dtype=dtype)
+        # Accumulate in a separate block if the compute data type differs
+        acc = np.empty_like(tmp) if upcast else None
+
+        for slc in _block_slices(size, BLOCK_SIZE_LINCOMB):
+            out_blk = out_flat[slc]
+            acc_blk = acc[:out_blk.size] if upcast else out_blk
+            tmp_blk = tmp[:out_blk.size]
+            np.multiply(flat[0][slc], coeffs[0], out=acc_blk, dtype=dtype)
+            for a, x_flat in zip(coeffs[1:], flat[1:]):
+                if a == 0:
+                    continue
+                elif a == 1:
+                    np.add(acc_blk, x_flat[slc], out=acc_blk, dtype=dtype)
+                elif a == -1:
+                    np.subtract(acc_blk, x_flat[slc], out=acc_blk,
+                                dtype=dtype)
+                else:
+                    np.multiply(x_flat[slc], a, out=tmp_blk, dtype=dtype)
+                    acc_blk += tmp_blk
+            if upcast:
+                out_blk[:] = acc_blk
+
     def _dist(self, x1, x2):
         """Return the distance between ``x1`` and ``x2``.
 
@@ -587,6 +763,12 @@ class NumpyTensorSpace(TensorSpace):
         >>> space_1_w.dist(x, y)
         7.0
         """
+        if self.compute_dtype != self.dtype:
+            dist = _pnorm_blocked(self.weighting, x1, x2,
+                                  dtype=self.compute_dtype)
+            if dist is not None:
+                return dist
+
         return self.weighting.dist(x1, x2)
 
     def _norm(self, x):
@@ -625,6 +807,12 @@ class NumpyTensorSpace(TensorSpace):
         >>> space_1_w.norm(x)
         10.0
         """
+        if self.compute_dtype != self.dtype:
+            norm = _pnorm_blocked(self.weighting, x,
+                                  dtype=self.compute_dtype)
+            if norm is not None:
+                return norm
+
         return self.weighting.norm(x)
 
     def _inner(self, x1, x2):
@@ -659,6 +847,12 @@ class NumpyTensorSpace(TensorSpace):
         >>> space_w.inner(x, y)
         5.0
         """
+        if self.compute_dtype != self.dtype:
+            inner = _inner_blocked(self.weighting, x1, x2,
+                                   dtype=self.compute_dtype)
+            if inner is not None:
+                return inner
+
         return self.weighting.inner(x1, x2)
 
     def _multiply(self, x1, x2, out):
@@ -748,6 +942,9 @@ class NumpyTensorSpace(TensorSpace):
         >>> diff_space = odl.rn(3, dtype='float32')
         >>> diff_space == space
         False
+        >>> diff_space = odl.rn(3, compute_dtype='longdouble')
+        >>> diff_space == space
+        False
         >>> space == object
         False
         """
@@ -755,12 +952,33 @@ class NumpyTensorSpace(TensorSpace):
             return True
 
         return (super(NumpyTensorSpace, self).__eq__(other) and
-                self.weighting == other.weighting)
+                self.weighting == other.weighting and
+                self.compute_dtype == other.compute_dtype)
 
     def __hash__(self):
         """Return ``hash(self)``."""
         return hash((super(NumpyTensorSpace, self).__hash__(),
-                     self.weighting))
+                     self.weighting, self.compute_dtype))
+
+    def _astype(self, dtype):
+        """Internal helper for `astype`, keeping the compute precision."""
+        kwargs = {}
+        if is_floating_dtype(dtype):
+            # Use weighting only for floating-point types, otherwise, e.g.,
+            # `space.astype(bool)` would fail
+            kwargs['weighting'] = self.weighting
+
+            # Keep computing in higher precision if possible, with the
+            # compute data type adapted to the kind of `dtype`
+            if self.compute_dtype != self.dtype:
+                if is_real_dtype(dtype):
+                    compute_dtype = real_dtype(self.compute_dtype)
+                else:
+                    compute_dtype = complex_dtype(self.compute_dtype)
+                if np.can_cast(dtype, compute_dtype):
+                    kwargs['compute_dtype'] = compute_dtype
+
+        return type(self)(self.shape, dtype=dtype, **kwargs)
 
     @property
     def byaxis(self):
@@ -803,7 +1021,8 @@ class NumpyTensorSpace(TensorSpace):
                 else:
                     weighting = space.weighting
 
-                return type(space)(newshape, space.dtype, weighting=weighting)
+                return type(space)(newshape, space.dtype, weighting=weighting,
+                                   compute_dtype=space.compute_dtype)
 
             def __repr__(self):
                 """Return ``repr(self)``."""
@@ -830,12 +1049,20 @@ class NumpyTensorSpace(TensorSpace):
                 self.dtype != self.default_dtype(self.field)):
             optargs = [('dtype', dtype_str(self.dtype), '')]
             if self.dtype in (float, complex, int, bool):
-                optmod = '!s'
+                optmod = ['!s']
             else:
-                optmod = ''
+                optmod = ['']
         else:
             optargs = []
-            optmod = ''
+            optmod = []
+
+        if self.compute_dtype != self.dtype:
+            optargs.append(('compute_dtype', dtype_str(self.compute_dtype),
+                            ''))
+            if self.compute_dtype in (float, complex):
+                optmod.append('!s')
+            else:
+                optmod.append('')
 
         inner_str = signature_string(posargs, optargs, mod=['', optmod])
         weight_str = self.weighting.repr_part
@@ -1186,10 +1413,10 @@ class NumpyTensor(Tensor):
              [-2.,  7., -2.]]
         )
         """
-        if isinstance(indices, type(self)):
-            indices = indices.data
-        if isinstance(values, type(self)):
-            values = values.data
+        if isinstance(indices, Tensor):
+            indices = indices.asarray()
+        if isinstance(values, Tensor):
+            values = values.asarray()
 
         self.data[indices] = values
 
@@ -1903,6 +2130,222 @@ def _lincomb_impl(a, x1, b, x2, out):
                 axpy(x1_arr, out_arr, size, a)
 
 
+def _aligned_empty(shape, dtype, order='C', alignment=ALIGNMENT):
+    """Return a new array whose data starts at a multiple of ``alignment``."""
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape, dtype='int64')) * dtype.itemsize
+    buffer = np.empty(nbytes + alignment, dtype='uint8')
+    offset = -buffer.ctypes.data % alignment
+    arr = buffer[offset:offset + nbytes].view(dtype)
+    return arr.reshape(shape, order=order)
+
+
+def _block_slices(size, block_size):
+    """Yield slices partitioning ``range(size)`` into blocks."""
+    for start in range(0, size, block_size):
+        yield slice(start, min(start + block_size, size))
+
+
+def _flat_views(*arrays):
+    """Return flat views of ``arrays`` in a common order, or ``None``.
+
+    ``None`` is returned if the arrays are not all C- or all
+    F-contiguous, in which case raveling would create copies.
+    """
+    if all(arr.flags.c_contiguous for arr in arrays):
+        order = 'C'
+    elif all(arr.flags.f_contiguous for arr in arrays):
+        order = 'F'
+    else:
+        return None
+    return [arr.ravel(order) for arr in arrays]
+
+
+def _lincomb_blocked(a, x1_flat, b, x2_flat, out_flat, block_size, dtype):
+    """Compute ``out = a*x1 + b*x2`` block by block for flat arrays.
+
+    All arithmetic is done in ``dtype``, and each block of the result
+    is converted to the data type of ``out_flat`` once at the end.
+    Blocks are independent, so aliasing of the operands does not matter
+    since the inputs are read before ``out`` is written.
+    """
+    size = out_flat.size
+    upcast = np.dtype(dtype) != out_flat.dtype
+    tmp = np.empty(min(block_size, size), dtype=dtype)
+    acc = np.empty_like(tmp) if upcast else None
+
+    for slc in _block_slices(size, block_size):
+        out_blk = out_flat[slc]
+        acc_blk = acc[:out_blk.size] if upcast else out_blk
+        if a == 0 and b == 0:
+            acc_blk.fill(0)
+        elif b == 0:
+            np.multiply(x1_flat[slc], a, out=acc_blk, dtype=dtype)
+        elif a == 0:
+            np.multiply(x2_flat[slc], b, out=acc_blk, dtype=dtype)
+        else:
+            tmp_blk = tmp[:out_blk.size]
+            np.multiply(x1_flat[slc], a, out=tmp_blk, dtype=dtype)
+            np.multiply(x2_flat[slc], b, out=acc_blk, dtype=dtype)
+            acc_blk += tmp_blk
+        if upcast:
+            out_blk[:] = acc_blk
+
+
+def _blocked_operands(weighting, arrays):
+    """Return flat views of ``arrays`` and the flat weights, or ``None``.
+
+    The weights are ``None`` for constant weighting. ``None`` is returned
+    instead of the tuple if the weighting is not supported or raveling
+    would create copies.
+    """
+    if isinstance(weighting, NumpyTensorSpaceConstWeighting):
+        weights = None
+    elif isinstance(weighting, NumpyTensorSpaceArrayWeighting):
+        weights = weighting.array
+    else:
+        return None
+
+    flat = _flat_views(*arrays)
+    if flat is None:
+        return None
+    if weights is not None:
+        order = 'F' if arrays[0].flags.f_contiguous else 'C'
+        weights = np.asarray(weights).ravel(order)
+        if weights.size != flat[0].size:
+            return None
+    return flat, weights
+
+
+def _block_pnorm(p, dtype, x1_blk, x2_blk=None, w_blk=None):
+    """Return the unnormalized p-norm of one block of ``x1`` or ``x1 - x2``.
+
+    This is the sum of ``w * |x|^p``, or the maximum of ``w * |x|`` for
+    ``p = inf``, computed in ``dtype``. The partial results of blocks are
+    combined and normalized with `_finalize_pnorm`.
+    """
+    if x2_blk is None:
+        blk = x1_blk.astype(dtype, copy=False)
+    else:
+        blk = np.subtract(x1_blk, x2_blk, dtype=dtype)
+
+    if p == 2.0:
+        if w_blk is None:
+            return float(np.vdot(blk, blk).real)
+        else:
+            return float(np.vdot(blk, w_blk * blk).real)
+
+    values = np.abs(blk)
+    if p != float('inf'):
+        values = np.power(values, p, out=values)
+    if w_blk is not None:
+        values *= w_blk
+    if p == float('inf'):
+        return float(np.max(values)) if values.size else 0.0
+    else:
+        return float(np.sum(values))
+
+
+def _finalize_pnorm(acc, p, const, dtype):
+    """Return the p-norm from the combined block results ``acc``."""
+    if p == float('inf'):
+        norm = const * acc
+    elif p == 2.0:
+        norm = np.sqrt(const * max(acc, 0.0))
+    else:
+        norm = (const * acc) ** (1 / p)
+
+    # Round to the precision of the computation, as the non-blocked version
+    return float(real_dtype(dtype).type(norm))
+
+
+def _block_inner(dtype, x1_blk, x2_blk, w_blk=None):
+    """Return the (array-weighted) inner product of one block in ``dtype``."""
+    x1_blk = x1_blk.astype(dtype, copy=False)
+    x2_blk = x2_blk.astype(dtype, copy=False)
+    if w_blk is not None:
+        x1_blk = w_blk * x1_blk
+    # x2 as first argument because we want linearity in x1
+    inner = np.vdot(x2_blk, x1_blk)
+    if is_real_dtype(dtype):
+        return float(inner)
+    else:
+        return complex(inner)
+
+
+def _pnorm_blocked(weighting, x1, x2=None, dtype=None,
+                   block_size=BLOCK_SIZE_REDUCTION):
+    """Return the weighted norm of ``x1`` or ``x1 - x2``, or ``None``.
+
+    The norm is accumulated block by block, with each block converted
+    to ``dtype`` (default: data type of ``x1``). Blocks are reduced in
+    parallel for large tensors, see `blocked_reduce`. ``None`` is
+    returned if the norm cannot be computed in blocks, e.g., for custom
+    weightings or non-floating data types.
+    """
+    dtype = x1.dtype if dtype is None else np.dtype(dtype)
+    p = float(weighting.exponent)
+    if not is_floating_dtype(dtype) or p <= 0:
+        return None
+
+    arrays = [_tensor_data(x) for x in (x1, x2) if x is not None]
+    operands = _blocked_operands(weighting, arrays)
+    if operands is None:
+        return None
+    flat, weights = operands
+    if weights is None:
+        const = float(weighting.const)
+    else:
+        const = 1.0
+        flat.append(weights)
+
+    def block_pnorm(*blocks):
+        """Return the unnormalized norm of one block."""
+        return _block_pnorm(p, dtype, blocks[0],
+                            None if x2 is None else blocks[1],
+                            None if weights is None else blocks[-1])
+
+    reduction = 'max' if p == float('inf') else 'sum'
+    acc = blocked_reduce(block_pnorm, flat, block_size, reduction=reduction)
+    return _finalize_pnorm(acc, p, const, dtype)
+
+
+def _inner_blocked(weighting, x1, x2, dtype=None,
+                   block_size=BLOCK_SIZE_REDUCTION):
+    """Return the weighted inner product of ``x1`` and ``x2``, or ``None``.
+
+    The inner product is accumulated block by block, with each block
+    converted to ``dtype`` (default: data type of ``x1``). Blocks are
+    reduced in parallel for large tensors, see `blocked_reduce`.
+    ``None`` is returned if the inner product cannot be computed in
+    blocks, e.g., for custom weightings or non-floating data types.
+    """
+    dtype = x1.dtype if dtype is None else np.dtype(dtype)
+    if not is_floating_dtype(dtype) or weighting.exponent != 2.0:
+        return None
+
+    operands = _blocked_operands(weighting,
+                                 [_tensor_data(x1), _tensor_data(x2)])
+    if operands is None:
+        return None
+    flat, weights = operands
+    if weights is not None:
+        flat.append(weights)
+
+    def block_inner(*blocks):
+        """Return the unweighted or array-weighted inner of one block."""
+        return _block_inner(dtype, blocks[0], blocks[1],
+                            None if weights is None else blocks[2])
+
+    inner = blocked_reduce(block_inner, flat, block_size)
+    if weights is None:
+        inner = weighting.const * inner
+    if is_real_dtype(x1.dtype):
+        return float(inner.real)
+    else:
+        return complex(inner)
+
+
 def _weighting(weights, exponent):
     """Return a weighting whose type is inferred from the arguments."""
     if np.isscalar(weights):
@@ -1991,32 +2434,46 @@ def npy_weighted_dist(weights, exponent=2.0):
     return _weighting(weights, exponent=exponent).dist
 
 
+def _tensor_data(x):
+    """Return the data of the tensor ``x`` as `numpy.ndarray`.
+
+    Tensors that do not store their data in a single array, e.g., in
+    blocks, are converted with ``asarray``.
+    """
+    if isinstance(x.data, np.ndarray):
+        return x.data
+    else:
+        return x.asarray()
+
+
 def _norm_default(x):
     """Default Euclidean norm implementation."""
     # Lazy import to improve `import odl` time
     import scipy.linalg
 
-    if _blas_is_applicable(x.data):
+    data = _tensor_data(x)
+    if _blas_is_applicable(data):
         nrm2 = scipy.linalg.blas.get_blas_funcs('nrm2', dtype=x.dtype)
         norm = partial(nrm2, n=native(x.size))
     else:
         norm = np.linalg.norm
-    return norm(x.data.ravel())
+    return norm(data.ravel())
 
 
 def _pnorm_default(x, p):
     """Default p-norm implementation."""
-    return np.linalg.norm(x.data.ravel(), ord=p)
+    return np.linalg.norm(_tensor_data(x).ravel(), ord=p)
 
 
 def _pnorm_diagweight(x, p, w):
     """Diagonally weighted p-norm implementation."""
+    data = _tensor_data(x)
     # Ravel both in the same order (w is a numpy array)
-    order = 'F' if all(a.flags.f_contiguous for a in (x.data, w)) else 'C'
+    order = 'F' if all(a.flags.f_contiguous for a in (data, w)) else 'C'
 
     # This is faster than first applying the weights and then summing with
     # BLAS dot or nrm2
-    xp = np.abs(x.data.ravel(order))
+    xp = np.abs(data.ravel(order))
     if p == float('inf'):
         xp *= w.ravel(order)
         return np.max(xp)
@@ -2028,21 +2485,20 @@ def _pnorm_diagweight(x, p, w):
 
 def _inner_default(x1, x2):
     """Default Euclidean inner product implementation."""
+    data1, data2 = _tensor_data(x1), _tensor_data(x2)
     # Ravel both in the same order
-    order = 'F' if all(a.data.flags.f_contiguous for a in (x1, x2)) else 'C'
+    order = 'F' if all(a.flags.f_contiguous for a in (data1, data2)) else 'C'
 
     if is_real_dtype(x1.dtype):
         if x1.size > THRESHOLD_MEDIUM:
             # This is as fast as BLAS dotc
-            return np.tensordot(x1, x2, [range(x1.ndim)] * 2)
+            return np.tensordot(data1, data2, [range(x1.ndim)] * 2)
         else:
             # Several times faster for small arrays
-            return np.dot(x1.data.ravel(order),
-                          x2.data.ravel(order))
+            return np.dot(data1.ravel(order), data2.ravel(order))
     else:
         # x2 as first argument because we want linearity in x1
-        return np.vdot(x2.data.ravel(order),
-                       x1.data.ravel(order))
+        return np.vdot(data2.ravel(order), data1.ravel(order))
 
 
 # TODO: implement intermediate weighting schemes with arrays that are
@@ -2144,12 +2600,16 @@ class NumpyTensorSpaceArrayWeighting(ArrayWeighting):
             raise NotImplementedError('no inner product defined for '
                                       'exponent != 2 (got {})'
                                       ''.format(self.exponent))
+        elif x1.size > THRESHOLD_MEDIUM:
+            inner = _inner_blocked(self, x1, x2)
+            if inner is not None:
+                return inner
+
+        inner = _inner_default(x1 * self.array, x2)
+        if is_real_dtype(x1.dtype):
+            return float(inner)
         else:
-            inner = _inner_default(x1 * self.array, x2)
-            if is_real_dtype(x1.dtype):
-                return float(inner)
-            else:
-                return complex(inner)
+            return complex(inner)
 
     def norm(self, x):
         """Return the weighted norm of ``x``.
@@ -2164,6 +2624,11 @@ class NumpyTensorSpaceArrayWeighting(ArrayWeighting):
         norm : float
             The norm of the provided tensor.
         """
+        if x.size > THRESHOLD_MEDIUM:
+            norm = _pnorm_blocked(self, x)
+            if norm is not None:
+                return norm
+
         if self.exponent == 2.0:
             norm_squared = self.inner(x, x).real  # TODO: optimize?!
             if norm_squared < 0:
@@ -2172,6 +2637,29 @@ class NumpyTensorSpaceArrayWeighting(ArrayWeighting):
         else:
             return float(_pnorm_diagweight(x, self.exponent, self.array))
 
+    def dist(self, x1, x2):
+        """Return the weighted distance between ``x1`` and ``x2``.
+
+        For large tensors, the difference ``x1 - x2`` is computed block
+        by block and never stored as a whole.
+
+        Parameters
+        ----------
+        x1, x2 : `NumpyTensor`
+            Tensors whose mutual distance is calculated.
+
+        Returns
+        -------
+        dist : float
+            The distance between the tensors.
+        """
+        if x1.size > THRESHOLD_MEDIUM:
+            dist = _pnorm_blocked(self, x1, x2)
+            if dist is not None:
+                return dist
+
+        return self.norm(x1 - x2)
+
 
 class NumpyTensorSpaceConstWeighting(ConstWeighting):
 
@@ -2250,12 +2738,16 @@ class NumpyTensorSpaceConstWeighting(ConstWeighting):
             raise NotImplementedError('no inner product defined for '
                                       'exponent != 2 (got {})'
                                       ''.format(self.exponent))
-        else:
-            inner = self.const * _inner_default(x1, x2)
-            if x1.space.field is None:
+        elif x1.size > THRESHOLD_MEDIUM:
+            inner = _inner_blocked(self, x1, x2)
+            if inner is not None:
                 return inner
-            else:
-                return x1.space.field.element(inner)
+
+        inner = self.const * _inner_default(x1, x2)
+        if x1.space.field is None:
+            return inner
+        else:
+            return x1.space.field.element(inner)
 
     def norm(self, x):
         """Return the weighted norm of ``x``.
@@ -2270,6 +2762,11 @@ class NumpyTensorSpaceConstWeighting(ConstWeighting):
         norm : float
             The norm of the tensor.
         """
+        if x.size > THRESHOLD_MEDIUM:
+            norm = _pnorm_blocked(self, x)
+            if norm is not None:
+                return norm
+
         if self.exponent == 2.0:
             return float(np.sqrt(self.const) * _norm_default(x))
         elif self.exponent == float('inf'):
@@ -2291,6 +2788,11 @@ class NumpyTensorSpaceConstWeighting(ConstWeighting):
         dist : float
             The distance between the tensors.
         """
+        if x1.size > THRESHOLD_MEDIUM:
+            dist = _pnorm_blocked(self, x1, x2)
+            if dist is not None:
+                return dist
+
         if self.exponent == 2.0:
             return float(np.sqrt(self.const) * _norm_default(x1 - x2))
         elif self.exponent == float('inf'):
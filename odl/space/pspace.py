@@ -15,6 +15,8 @@ import numpy as np
 
 from odl.set import LinearSpace
 from odl.set.space import LinearSpaceElement
+from odl.space.npy_tensors import (
+    NumpyTensorSpace, NumpyTensorSpaceConstWeighting)
 from odl.space.weighting import (
     Weighting, ArrayWeighting, ConstWeighting,
     CustomInner, CustomNorm, CustomDist)
@@ -78,6 +80,21 @@ class ProductSpace(LinearSpace):
 
             float : same weighting factor in each component
 
+        contiguous : bool, optional
+            If ``True``, elements store the data of all components in
+            a single array of shape ``(len(self),) + space.shape``, and
+            the component elements are views into this array. Linear
+            combinations, pointwise products, inner products and norms
+            are then evaluated with one vectorized call each, and
+            `ProductSpaceElement.asarray` returns the array without
+            copying.
+
+            This option is only available for power spaces whose
+            factor is a `NumpyTensorSpace` or a discretized space
+            backed by one, see `is_contiguous`.
+
+            Default: ``False``
+
         Other Parameters
         ----------------
         dist : callable, optional
@@ -133,6 +150,15 @@ class ProductSpace(LinearSpace):
 
         >>> r2x2x2 = ProductSpace(odl.rn(2), 3)
 
+        Power space storing its elements in a single array:
+
+        >>> r2x2x2 = ProductSpace(odl.rn(2), 3, contiguous=True)
+        >>> x = r2x2x2.one()
+        >>> x.asarray()
+        array([[ 1.,  1.],
+               [ 1.,  1.],
+               [ 1.,  1.]])
+
         Notes
         -----
         Inner product, norm and distance are evaluated by collecting
@@ -198,6 +224,7 @@ class ProductSpace(LinearSpace):
         inner = kwargs.pop('inner', None)
         weighting = kwargs.pop('weighting', None)
         exponent = float(kwargs.pop('exponent', 2.0))
+        contiguous = bool(kwargs.pop('contiguous', False))
         if kwargs:
             raise TypeError('got unexpected keyword arguments: {}'
                             ''.format(kwargs))
@@ -233,6 +260,13 @@ class ProductSpace(LinearSpace):
         self.__is_power_space = all(spc == self.spaces[0]
                                     for spc in self.spaces[1:])
 
+        if contiguous and not (len(self) > 0 and self.is_power_space and
+                               _numpy_tspace(self.spaces[0]) is not None):
+            raise ValueError("`contiguous=True` requires a power space of a "
+                             "space with `impl='numpy'`, got {!r}"
+                             "".format(spaces))
+        self.__is_contiguous = contiguous
+
         # Assing or infer field
         if field is None:
             if len(self) == 0:
@@ -346,6 +380,19 @@ class ProductSpace(LinearSpace):
         """``True`` if all member spaces are equal."""
         return self.__is_power_space
 
+    @property
+    def is_contiguous(self):
+        """``True`` if elements store all components in one array.
+
+        Examples
+        --------
+        >>> odl.ProductSpace(odl.rn(2), 3).is_contiguous
+        False
+        >>> odl.ProductSpace(odl.rn(2), 3, contiguous=True).is_contiguous
+        True
+        """
+        return self.__is_contiguous
+
     @property
     def exponent(self):
         """Exponent of the product space norm/dist, ``None`` for custom."""
@@ -427,6 +474,9 @@ class ProductSpace(LinearSpace):
 
         if dtype == current_dtype:
             return self
+        elif self.is_contiguous:
+            return ProductSpace(self.spaces[0].astype(dtype), len(self),
+                                contiguous=True)
         else:
             return ProductSpace(*[space.astype(dtype)
                                   for space in self.spaces])
@@ -443,6 +493,11 @@ class ProductSpace(LinearSpace):
             Otherwise, a new element is created from the
             components by calling the ``element()`` methods
             in the component spaces.
+
+            For spaces with `is_contiguous` set, the components are
+            always copied into a new array, except for a C-contiguous
+            `numpy.ndarray` of correct `shape` and `dtype`, which is
+            wrapped without copy.
         cast : bool, optional
             If ``True``, casting is allowed. Otherwise, a ``TypeError``
             is raised for input that is not a sequence of elements of
@@ -477,6 +532,9 @@ class ProductSpace(LinearSpace):
             [ 1.,  2.,  3.]
         ])
         """
+        if self.is_contiguous:
+            return self._contiguous_element(inp, cast)
+
         # If data is given as keyword arg, prefer it over arg list
         if inp is None:
             inp = [space.element() for space in self.spaces]
@@ -501,6 +559,36 @@ class ProductSpace(LinearSpace):
 
         return self.element_type(self, parts)
 
+    def _contiguous_element(self, inp, cast):
+        """Create an element whose components share one array."""
+        if inp in self:
+            return inp
+
+        dtype = self.spaces[0].dtype
+        if (isinstance(inp, np.ndarray) and
+                inp.shape == self.shape and
+                inp.dtype == dtype and
+                inp.flags.c_contiguous):
+            buffer = inp
+        else:
+            buffer = np.empty(self.shape, dtype=dtype)
+            if inp is not None:
+                if len(inp) != len(self):
+                    raise ValueError('length of `inp` {} does not match '
+                                     'length of space {}'
+                                     ''.format(len(inp), len(self)))
+                if not cast and not all(
+                        isinstance(v, LinearSpaceElement) and v.space == space
+                        for v, space in zip(inp, self.spaces)):
+                    raise TypeError('input {!r} not a sequence of elements '
+                                    'of the component spaces'.format(inp))
+                for i, (arg, space) in enumerate(zip(inp, self.spaces)):
+                    buffer[i] = space.element(arg)
+
+        parts = [space.element(buffer[i])
+                 for i, space in enumerate(self.spaces)]
+        return self.element_type(self, parts, buffer=buffer)
+
     @property
     def examples(self):
         """Return examples from all sub-spaces."""
@@ -535,6 +623,10 @@ class ProductSpace(LinearSpace):
         >>> zero_3 == zero_2x3[1]
         True
         """
+        if self.is_contiguous:
+            zero = self.element()
+            zero.buffer.fill(0)
+            return zero
         return self.element([space.zero() for space in self.spaces])
 
     def one(self):
@@ -563,14 +655,54 @@ class ProductSpace(LinearSpace):
         >>> one_3 == one_2x3[1]
         True
         """
+        if self.is_contiguous:
+            one = self.element()
+            one.buffer.fill(1)
+            return one
         return self.element([space.one() for space in self.spaces])
 
+    def _buffer_tensors(self, *elems):
+        """Return the buffers of ``elems`` as `NumpyTensor`'s.
+
+        Identical elements are mapped to identical tensors, such that
+        the aliasing checks of `NumpyTensorSpace` keep working.
+        """
+        try:
+            buffer_space = self.__buffer_space
+        except AttributeError:
+            buffer_space = NumpyTensorSpace(self.shape, self.spaces[0].dtype)
+            self.__buffer_space = buffer_space
+
+        tensors = {}
+        for elem in elems:
+            if id(elem) not in tensors:
+                tensors[id(elem)] = buffer_space.element(elem.buffer)
+        return [tensors[id(elem)] for elem in elems]
+
     def _lincomb(self, a, x, b, y, out):
         """Linear combination ``out = a*x + b*y``."""
+        if _all_contiguous(x, y, out):
+            x_buf, y_buf, out_buf = self._buffer_tensors(x, y, out)
+            out_buf.space._lincomb(a, x_buf, b, y_buf, out_buf)
+            return
+
         for space, xp, yp, outp in zip(self.spaces, x.parts, y.parts,
                                        out.parts):
             space._lincomb(a, xp, b, yp, outp)
 
+    def _lincomb_many(self, coeffs, elements, out):
+        """Linear combination ``out = sum(a * x for a, x in ...)``."""
+        if _all_contiguous(out, *elements):
+            tensors = self._buffer_tensors(out, *elements)
+            tensors[0].space._lincomb_many(coeffs, tensors[1:], tensors[0])
+            return
+
+        # Parts may be shared between elements, hence we need the
+        # alignment checks of the public method
+        for i, space in enumerate(self.spaces):
+            space.lincomb_many(coeffs, [x.parts[i] for x in elements],
+                               out=out.parts[i])
+
     def _dist(self, x1, x2):
         """Distance between two elements."""
         return self.weighting.dist(x1, x2)
@@ -585,12 +717,20 @@ class ProductSpace(LinearSpace):
 
     def _multiply(self, x1, x2, out):
         """Product ``out = x1 * x2``."""
+        if _all_contiguous(x1, x2, out):
+            np.multiply(x1.buffer, x2.buffer, out=out.buffer)
+            return
+
         for spc, xp, yp, outp in zip(self.spaces, x1.parts, x2.parts,
                                      out.parts):
             spc._multiply(xp, yp, outp)
 
     def _divide(self, x1, x2, out):
         """Quotient ``out = x1 / x2``."""
+        if _all_contiguous(x1, x2, out):
+            np.divide(x1.buffer, x2.buffer, out=out.buffer)
+            return
+
         for spc, xp, yp, outp in zip(self.spaces, x1.parts, x2.parts,
                                      out.parts):
             spc._divide(xp, yp, outp)
@@ -731,6 +871,9 @@ class ProductSpace(LinearSpace):
         """Return ``str(self)``."""
         if len(self) == 0:
             return '{}'
+        elif self.is_power_space and self.is_contiguous:
+            return '({}) ** {}, contiguous=True'.format(self.spaces[0],
+                                                        len(self))
         elif self.is_power_space:
             return '({}) ** {}'.format(self.spaces[0], len(self))
         else:
@@ -748,7 +891,7 @@ class ProductSpace(LinearSpace):
         elif self.is_power_space:
             posargs = [self.spaces[0], len(self)]
             posmod = '!r'
-            optargs = []
+            optargs = [('contiguous', self.is_contiguous, False)]
             oneline = True
         elif self.size <= 2 * edgeitems:
             posargs = self.spaces
@@ -789,16 +932,35 @@ class ProductSpaceElement(LinearSpaceElement):
 
     """Elements of a `ProductSpace`."""
 
-    def __init__(self, space, parts):
+    def __init__(self, space, parts, buffer=None):
         """Initialize a new instance."""
         super(ProductSpaceElement, self).__init__(space)
         self.__parts = tuple(parts)
+        self.__buffer = buffer
 
     @property
     def parts(self):
         """Parts of this product space element."""
         return self.__parts
 
+    @property
+    def buffer(self):
+        """Array holding the data of all parts, or ``None``.
+
+        The buffer is only present for elements of spaces with
+        `ProductSpace.is_contiguous` set, and the parts are views into it.
+
+        Examples
+        --------
+        >>> spc = odl.ProductSpace(odl.rn(2), 2, contiguous=True)
+        >>> x = spc.zero()
+        >>> x[1][0] = 1
+        >>> x.buffer
+        array([[ 0.,  0.],
+               [ 1.,  0.]])
+        """
+        return self.__buffer
+
     @property
     def shape(self):
         """Number of values per axis in ``self``, computed recursively.
@@ -999,6 +1161,9 @@ class ProductSpaceElement(LinearSpaceElement):
 
             self[ind].asarray() == self.asarray()[ind]
 
+        For elements with a `buffer`, that array is returned if
+        ``out`` is not given, i.e., no copy is made.
+
         Parameters
         ----------
         out : `numpy.ndarray`, optional
@@ -1023,6 +1188,11 @@ class ProductSpaceElement(LinearSpaceElement):
         if not self.space.is_power_space:
             raise ValueError('cannot use `asarray` if `space.is_power_space` '
                              'is `False`')
+        elif self.buffer is not None:
+            if out is None:
+                return self.buffer
+            out[:] = self.buffer
+            return out
         else:
             if out is None:
                 out = np.empty(self.shape, self.dtype)
@@ -1600,9 +1770,7 @@ class ProductSpaceArrayWeighting(ArrayWeighting):
                                       'exponent != 2 (got {})'
                                       ''.format(self.exponent))
 
-        inners = np.fromiter(
-            (x1i.inner(x2i) for x1i, x2i in zip(x1, x2)),
-            dtype=x1[0].space.dtype, count=len(x1))
+        inners = _inner_vector(x1, x2)
 
         inner = np.dot(inners, self.array)
         if is_real_dtype(x1[0].dtype):
@@ -1627,8 +1795,7 @@ class ProductSpaceArrayWeighting(ArrayWeighting):
             norm_squared = self.inner(x, x).real  # TODO: optimize?!
             return np.sqrt(norm_squared)
         else:
-            norms = np.fromiter(
-                (xi.norm() for xi in x), dtype=np.float64, count=len(x))
+            norms = _norm_vector(x)
             if self.exponent in (1.0, float('inf')):
                 norms *= self.array
             else:
@@ -1708,9 +1875,7 @@ class ProductSpaceConstWeighting(ConstWeighting):
                                       'exponent != 2 (got {})'
                                       ''.format(self.exponent))
 
-        inners = np.fromiter(
-            (x1i.inner(x2i) for x1i, x2i in zip(x1, x2)),
-            dtype=x1[0].space.dtype, count=len(x1))
+        inners = _inner_vector(x1, x2)
 
         inner = self.const * np.sum(inners)
         return x1.space.field.element(inner)
@@ -1732,8 +1897,7 @@ class ProductSpaceConstWeighting(ConstWeighting):
             norm_squared = self.inner(x, x).real  # TODO: optimize?!
             return np.sqrt(norm_squared)
         else:
-            norms = np.fromiter(
-                (xi.norm() for xi in x), dtype=np.float64, count=len(x))
+            norms = _norm_vector(x)
 
             if self.exponent in (1.0, float('inf')):
                 return (self.const *
@@ -1755,9 +1919,7 @@ class ProductSpaceConstWeighting(ConstWeighting):
         dist : float
             The distance between the elements.
         """
-        dnorms = np.fromiter(
-            ((x1i - x2i).norm() for x1i, x2i in zip(x1, x2)),
-            dtype=np.float64, count=len(x1))
+        dnorms = _dist_vector(x1, x2)
 
         if self.exponent == float('inf'):
             return self.const * np.linalg.norm(dnorms, ord=self.exponent)
@@ -1842,6 +2004,105 @@ class ProductSpaceCustomDist(CustomDist):
         super(ProductSpaceCustomDist, self).__init__(dist, impl='numpy')
 
 
+def _numpy_tspace(space):
+    """Return the `NumpyTensorSpace` storing the data of ``space``.
+
+    ``None`` is returned if ``space`` is neither a `NumpyTensorSpace`
+    with ``impl='numpy'`` nor a discretized space backed by one.
+    """
+    tspace = getattr(space, 'tspace', space)
+    if isinstance(tspace, NumpyTensorSpace) and tspace.impl == 'numpy':
+        return tspace
+    else:
+        return None
+
+
+def _all_contiguous(*elems):
+    """Return ``True`` if all ``elems`` have a `buffer`."""
+    return all(elem.buffer is not None for elem in elems)
+
+
+def _const_weighting(space):
+    """Return the constant weighting of the data of ``space``, or ``None``.
+
+    ``None`` is returned if inner product, norm and distance in ``space``
+    are not given by a `NumpyTensorSpaceConstWeighting`.
+    """
+    if (getattr(space, 'is_uniform', False) and
+            not getattr(space, 'is_uniformly_weighted', True)):
+        # Boundary cells in `DiscreteLp` need extra weights
+        return None
+    tspace = _numpy_tspace(space)
+    if tspace is None:
+        return None
+    weighting = tspace.weighting
+    if isinstance(weighting, NumpyTensorSpaceConstWeighting):
+        return weighting
+    else:
+        return None
+
+
+def _flat_buffers(*elems):
+    """Return buffers of ``elems`` with one flat row per part, or ``None``.
+
+    ``None`` is returned if an element has no `buffer`, or if inner
+    products and norms in the parts are not given by a constant weighting.
+    """
+    if not _all_contiguous(*elems):
+        return None
+    weighting = _const_weighting(elems[0].space.spaces[0])
+    if weighting is None:
+        return None
+    return weighting, [elem.buffer.reshape(len(elem), -1) for elem in elems]
+
+
+def _inner_vector(x1, x2):
+    """Return the array of inner products of the parts of ``x1, x2``."""
+    flat = _flat_buffers(x1, x2)
+    if flat is None or flat[0].exponent != 2.0:
+        return np.fromiter(
+            (x1i.inner(x2i) for x1i, x2i in zip(x1, x2)),
+            dtype=x1[0].space.dtype, count=len(x1))
+
+    weighting, (x1_flat, x2_flat) = flat
+    # x2 conjugated since we want linearity in x1
+    inners = np.einsum('ij,ij->i', x1_flat, x2_flat.conj())
+    return weighting.const * inners
+
+
+def _pnorm_rows(weighting, arr):
+    """Return the weighted norms of the rows of ``arr``."""
+    p = weighting.exponent
+    norms = np.linalg.norm(arr, ord=p, axis=1)
+    if p == float('inf'):
+        return weighting.const * norms
+    else:
+        return weighting.const ** (1 / p) * norms
+
+
+def _norm_vector(x):
+    """Return the array of norms of the parts of ``x``."""
+    flat = _flat_buffers(x)
+    if flat is None:
+        return np.fromiter(
+            (xi.norm() for xi in x), dtype=np.float64, count=len(x))
+
+    weighting, (x_flat,) = flat
+    return _pnorm_rows(weighting, x_flat).astype(np.float64)
+
+
+def _dist_vector(x1, x2):
+    """Return the array of distances of the parts of ``x1, x2``."""
+    flat = _flat_buffers(x1, x2)
+    if flat is None:
+        return np.fromiter(
+            ((x1i - x2i).norm() for x1i, x2i in zip(x1, x2)),
+            dtype=np.float64, count=len(x1))
+
+    weighting, (x1_flat, x2_flat) = flat
+    return _pnorm_rows(weighting, x1_flat - x2_flat).astype(np.float64)
+
+
 def _strip_space(x):
     """Strip the SPACE.element( ... ) part from a repr."""
     r = repr(x)
@@ -359,6 +359,23 @@ def test_gradient(space, method, padding):
                         pad_const=pad_const)
         grad(dom_vec)
 
+
+def test_gradient_apply_batch(space, method, padding):
+    """Validate batch evaluation of the gradient against calls."""
+    if isinstance(padding, tuple):
+        pad_mode, pad_const = padding
+    else:
+        pad_mode, pad_const = padding, 0
+
+    grad = Gradient(space, method=method, pad_mode=pad_mode,
+                    pad_const=pad_const)
+    x = noise_element(space.batched(3))
+    result = grad.apply_batch(x)
+    for x_i, result_i in zip(x, result):
+        for result_ij, true_ij in zip(result_i, grad(x_i)):
+            assert all_almost_equal(result_ij.asarray(), true_ij.asarray())
+
+
 # --- Divergence --- #
 
 
@@ -187,7 +187,8 @@ def test_uniform_discr_init_real(odl_tspace_impl):
 def test_uniform_discr_init_complex(odl_tspace_impl):
     """Test initialization and basic properties with uniform_discr, complex."""
     impl = odl_tspace_impl
-    if impl != 'numpy':
+    if impl not in ('numpy', 'numpy_memmap', 'numpy_shared',
+                    'numpy_chunked'):
         pytest.xfail(reason='complex dtypes not supported')
 
     discr = odl.uniform_discr(0, 1, 10, dtype='complex', impl=impl)
@@ -195,6 +196,20 @@ def test_uniform_discr_init_complex(odl_tspace_impl):
     assert discr.dtype == discr.tspace.default_dtype(odl.ComplexNumbers())
 
 
+def test_uniform_discr_compute_dtype():
+    """Test uniform_discr with a compute dtype."""
+    discr = odl.uniform_discr([0, 0, 0], [1, 1, 1], (2, 3, 4),
+                              dtype='float16', compute_dtype='float32')
+    assert discr.dtype == np.dtype('float16')
+    assert discr.tspace.compute_dtype == np.dtype('float32')
+    assert discr.tspace.weighting.const == discr.cell_volume
+    assert discr != odl.uniform_discr([0, 0, 0], [1, 1, 1], (2, 3, 4),
+                                      dtype='float16')
+
+    assert 'compute_dtype' in repr(discr)
+    assert eval(repr(discr), {'uniform_discr': odl.uniform_discr}) == discr
+
+
 # --- DiscreteLp methods --- #
 
 
@@ -14,7 +14,8 @@ import numpy as np
 from pkg_resources import parse_version
 
 import odl
-from odl.util.testutils import skip_if_no_largescale, simple_fixture
+from odl.util.testutils import (
+    skip_if_no_largescale, simple_fixture, never_skip)
 from odl.tomo.util.testutils import (skip_if_no_astra, skip_if_no_astra_cuda,
                                      skip_if_no_skimage)
 
@@ -46,7 +47,9 @@ projectors = [skip_if_no_astra('par2d astra_cpu uniform'),
               skip_if_no_astra_cuda('cone3d astra_cuda nonuniform'),
               skip_if_no_astra_cuda('cone3d astra_cuda random'),
               skip_if_no_astra_cuda('helical astra_cuda uniform'),
-              skip_if_no_skimage('par2d skimage uniform')]
+              skip_if_no_skimage('par2d skimage uniform'),
+              never_skip('par2d numpy uniform'),
+              never_skip('cone2d numpy uniform')]
 
 projector_ids = [" geom='{}' - impl='{}' - angles='{}' "
                  ''.format(*p.args[1].split()) for p in projectors]
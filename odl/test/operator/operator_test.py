@@ -7,6 +7,7 @@
 # obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import division
+import copy
 import pytest
 import numpy as np
 import sys
@@ -18,9 +19,10 @@ from odl import (Operator, OperatorSum, OperatorComp,
                  MatrixOperator, OperatorLeftVectorMult,
                  OpTypeError, OpDomainError, OpRangeError)
 from odl.operator.operator import _function_signature, _dispatch_call_args
+from odl.set.pool import ElementPool
 from odl.util.testutils import (
-    almost_equal, all_almost_equal, noise_element, noise_elements,
-    simple_fixture)
+    almost_equal, all_almost_equal, noise_array, noise_element,
+    noise_elements, simple_fixture)
 from odl.util.utility import getargspec
 
 
@@ -551,6 +553,54 @@ class ConstantVector(Operator):
         return SumFunctional(self.range)
 
 
+def test_composite_temporaries():
+    """Verify reuse of temporaries in operator expressions."""
+    space = odl.rn(5)
+    A = MatrixOperator(np.random.rand(5, 5))
+    B = MatrixOperator(np.random.rand(5, 5))
+    pool = ElementPool(space, max_size=1)
+    x = noise_element(space)
+    out = space.element()
+
+    comp = OperatorComp(A, B, tmp=pool)
+    for _ in range(3):
+        comp(x, out=out)
+        assert all_almost_equal(out, A(B(x)))
+    assert pool.stats['misses'] == 1
+    assert pool.stats['hits'] == 2
+
+    # Derived operators share the temporaries
+    comp.adjoint(x, out=out)
+    assert all_almost_equal(out, B.adjoint(A.adjoint(x)))
+    comp.inverse(x, out=out)
+    assert all_almost_equal(out, B.inverse(A.inverse(x)))
+    sum_op = OperatorSum(A, B, tmp_ran=pool, tmp_dom=pool)
+    sum_op.adjoint(x, out=out)
+    assert all_almost_equal(out, A.adjoint(x) + B.adjoint(x))
+    assert pool.stats['misses'] == 1
+    assert pool.stats['hits'] == 5
+
+    # Aliased input and output
+    for op in [comp, sum_op, A * B * A, A * 2, A + B + A]:
+        expected = op(x)
+        y = x.copy()
+        op(y, out=y)
+        assert all_almost_equal(y, expected)
+
+    # Given elements are used as temporaries
+    tmp = space.element()
+    comp = OperatorComp(A, B, tmp=tmp)
+    comp(x, out=out)
+    assert all_almost_equal(tmp, B(x))
+
+    with pytest.raises(OpTypeError):
+        OperatorComp(A, B, tmp=ElementPool(odl.rn(3)))
+
+    # Expressions can be copied
+    comp_copy = copy.deepcopy(comp)
+    assert all_almost_equal(comp_copy(x), comp(x))
+
+
 def test_functional():
     r3 = odl.rn(3)
     x = r3.element([1, 2, 3])
@@ -572,6 +622,39 @@ def test_functional_out():
         op(x, out=out)
 
 
+def test_apply_batch():
+    """Test evaluation of operators and functionals on batches."""
+    space = odl.rn((3, 4))
+    op = odl.ScalingOperator(space, 2.0) * odl.ufunc_ops.exp(space)
+    x_arr = noise_array(space.batched(5))
+    true_result = 2 * np.exp(x_arr)
+
+    result = op.apply_batch(x_arr)
+    assert result in space.batched(5)
+    assert all_almost_equal(result.buffer, true_result)
+
+    out = space.batched(5).element()
+    assert op.apply_batch(list(x_arr), out=out) is out
+    assert all_almost_equal(out.buffer, true_result)
+
+    # Spaces without contiguous batches
+    space = odl.rn(3) ** 2
+    op = odl.ScalingOperator(space, 2.0)
+    x = noise_element(space.batched(3))
+    assert all_almost_equal(op.apply_batch(x), 2 * x)
+
+    # Functionals return an array of results
+    space = odl.rn(3)
+    func = SumFunctional(space)
+    assert all_almost_equal(func.apply_batch([[1, 2, 3], [0, 1, 0]]), [6, 1])
+
+    with pytest.raises(OpDomainError):
+        op.apply_batch([[1, 2, 3]])
+    with pytest.raises(OpRangeError):
+        odl.IdentityOperator(space).apply_batch(
+            [[1, 2, 3]], out=space.batched(2).element())
+
+
 def test_functional_adjoint():
     r3 = odl.rn(3)
 
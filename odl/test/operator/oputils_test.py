@@ -11,10 +11,12 @@ import numpy as np
 import pytest
 
 import odl
-from odl.operator.oputils import matrix_representation, power_method_opnorm
+from odl.operator.oputils import (
+    matrix_representation, power_method_opnorm, optimize, _local_pattern)
 from odl.space.pspace import ProductSpace
 from odl.operator.pspace_ops import ProductSpaceOperator
-from odl.util.testutils import almost_equal
+from odl.util.testutils import (
+    almost_equal, all_almost_equal, noise_element)
 
 
 def test_matrix_representation():
@@ -142,6 +144,57 @@ def test_matrix_representation_wrong_range():
         matrix_representation(nonlin_op)
 
 
+def test_matrix_representation_sparse():
+    """Verify the sparse matrix repr against the dense one."""
+    space = odl.uniform_discr([0, 0], [1, 1], (6, 7))
+    ops = [odl.Gradient(space),
+           odl.Laplacian(space),
+           odl.Gradient(space).adjoint,
+           odl.PartialDerivative(space, axis=1, pad_mode='periodic'),
+           odl.MatrixOperator(np.random.rand(4, 5))]
+
+    for op in ops:
+        dense = matrix_representation(op)
+        dense = dense.reshape(op.range.size, op.domain.size)
+
+        sparse = matrix_representation(op, sparse=True)
+        assert sparse.shape == dense.shape
+        assert sparse.nnz == np.count_nonzero(dense)
+        assert all_almost_equal(sparse.toarray(), dense)
+
+        sparse = matrix_representation(op, sparse=True, batch_size=4,
+                                       executor='thread', max_workers=2)
+        assert all_almost_equal(sparse.toarray(), dense)
+
+        # Reuse of the result as sparsity pattern
+        sparse = matrix_representation(op, sparse=True, pattern=sparse)
+        assert all_almost_equal(sparse.toarray(), dense)
+
+    with pytest.raises(ValueError):
+        matrix_representation(odl.Laplacian(space), sparse=True,
+                              pattern=np.ones((3, 3)))
+    with pytest.raises(ValueError):
+        matrix_representation(odl.Laplacian(space), batch_size=0)
+
+
+def test_matrix_representation_sparse_probes():
+    """Verify that operators with local support need few probes."""
+    space = odl.uniform_discr([0, 0], [1, 1], (20, 30))
+    op = odl.Laplacian(space)
+
+    with odl.util.profile() as prof:
+        matrix = matrix_representation(op, sparse=True)
+    assert matrix.nnz == 5 * space.size - 2 * (20 + 30)
+
+    # 3 probes for the detection of the pattern, 9 compressed probes and
+    # 1 probe to check the result
+    assert prof.stats(op)['calls'] == 13
+
+    # No local pattern for operators with global support
+    mat_op = odl.MatrixOperator(np.random.rand(10, 10))
+    assert _local_pattern(mat_op) == (None, None)
+
+
 def test_power_method_opnorm_symm():
     """Test the power method on a symmetrix matrix operator"""
     # Test matrix with eigenvalues 1 and -2
@@ -213,5 +266,102 @@ def test_power_method_opnorm_exceptions():
         power_method_opnorm(op, maxiter=1, xstart=op.domain.one())
 
 
+def test_optimize_evaluation():
+    """Verify that optimized operators give the same results."""
+    space = odl.uniform_discr([0, 0], [1, 1], (4, 5))
+    grad = odl.Gradient(space)
+    lap = odl.Laplacian(space)
+    ident = odl.IdentityOperator(space)
+    scal = odl.ScalingOperator(space, 2)
+    square = odl.PowerOperator(space, 2)
+
+    ops = [2 * (lap * 3) * scal,
+           lap + 2 * lap - ident + scal * (ident * 0.5),
+           grad.adjoint * grad + 0.1 * ident,
+           (lap - ident) * (lap + 2 * ident),
+           square * (2 * lap) * 3 + square,
+           3 * (square * 2) - ident,
+           -(lap + square) * (ident * 2),
+           grad.adjoint.adjoint * lap * 3]
+
+    x = noise_element(space)
+    for op in ops:
+        opt_op = optimize(op)
+        assert opt_op.domain == op.domain
+        assert opt_op.range == op.range
+        assert opt_op.is_linear == op.is_linear
+
+        expected = op(x)
+        assert all_almost_equal(opt_op(x), expected)
+        out = opt_op.range.element()
+        opt_op(x, out=out)
+        assert all_almost_equal(out, expected)
+        if isinstance(opt_op, odl.OperatorLinComb):
+            # Aliased input and output
+            y = x.copy()
+            opt_op(y, out=y)
+            assert all_almost_equal(y, expected)
+        if op.is_linear:
+            z = noise_element(op.range)
+            assert all_almost_equal(opt_op.adjoint(z), op.adjoint(z))
+
+
+def test_optimize_structure():
+    """Verify the simplifications of operator expressions."""
+    space = odl.rn(3)
+    cspace = odl.cn(3)
+    ident = odl.IdentityOperator(space)
+    mat_op = odl.MatrixOperator(np.random.rand(3, 3))
+    square = odl.PowerOperator(space, 2)
+
+    # Scalings are merged, identities dropped
+    op = optimize(2 * (ident * ident) * odl.ScalingOperator(space, 3))
+    assert isinstance(op, odl.ScalingOperator)
+    assert op.scalar == 6
+    assert isinstance(optimize(0.5 * (ident * 2)), odl.IdentityOperator)
+    assert optimize(mat_op * ident * ident) is mat_op
+    grad = odl.Gradient(odl.uniform_discr(0, 1, 5))
+    assert isinstance(optimize(grad.adjoint.adjoint), odl.Gradient)
+
+    # Scalars move through linear operators, not nonlinear ones
+    op = optimize(2 * (mat_op * (3 * mat_op)))
+    assert isinstance(op, odl.OperatorLeftScalarMult)
+    assert op.scalar == 6
+    assert isinstance(op.operator, odl.OperatorComp)
+    op = optimize(square * 2)
+    assert isinstance(op, odl.OperatorRightScalarMult)
+
+    # Complex scalars do not move through real-linear operators
+    real_part = odl.RealPart(cspace)
+    op = optimize(real_part * (1j * odl.IdentityOperator(cspace)))
+    assert isinstance(op, odl.OperatorRightScalarMult)
+    op = optimize(2 * real_part * odl.ScalingOperator(cspace, 2))
+    assert isinstance(op, odl.OperatorLeftScalarMult)
+    assert op.scalar == 4
+
+    # Sums become one linear combination with merged terms
+    op = optimize(mat_op + 2 * mat_op - ident + square + ident * 3)
+    assert isinstance(op, odl.OperatorLinComb)
+    assert op.operators[0] is mat_op
+    assert op.operators[2] is square
+    assert isinstance(op.operators[1], odl.IdentityOperator)
+    assert op.coeffs == (3, 2, 1)
+
+    # Scalars are folded into linear combinations
+    op = optimize(2 * (mat_op + ident) * mat_op)
+    assert isinstance(op, odl.OperatorComp)
+    assert isinstance(op.left, odl.OperatorLinComb)
+    assert op.left.coeffs == (2, 2)
+
+    # Vanishing expressions
+    assert isinstance(optimize(mat_op - mat_op), odl.ZeroOperator)
+    assert isinstance(optimize(0 * (mat_op * 2)), odl.ZeroOperator)
+
+    # Functionals are left alone
+    func = odl.solvers.L2Norm(space)
+    func_sum = func + func
+    assert optimize(func_sum) is func_sum
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -7,10 +7,11 @@
 # obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import division
+import numpy as np
 import pytest
 
 import odl
-from odl.util.testutils import all_almost_equal, simple_fixture
+from odl.util.testutils import all_almost_equal, noise_element, simple_fixture
 
 
 base_op = simple_fixture(
@@ -21,6 +22,7 @@ base_op = simple_fixture(
      odl.DiagonalOperator(odl.IdentityOperator(odl.rn(3)), 2),
      ],
     fmt=' {name}={value.__class__.__name__}')
+executor = simple_fixture('executor', ['thread', 'process'])
 
 
 def test_pspace_op_init(base_op):
@@ -162,6 +164,50 @@ def test_pspace_op_swap_call():
     assert result == op(z, out=op.range.element())
 
 
+def test_pspace_op_executor(executor):
+    """Test concurrent evaluation of the components."""
+    r3 = odl.rn(3)
+    A = odl.ScalingOperator(r3, 2)
+    B = odl.MatrixOperator(np.random.rand(3, 3))
+    matrix = [[A, B], [0, A], [0, 0]]
+    op = odl.ProductSpaceOperator(matrix, range=r3 ** 3, executor=executor,
+                                  max_workers=2)
+    serial_op = odl.ProductSpaceOperator(matrix, range=r3 ** 3)
+    assert op.executor == executor
+    assert op.adjoint.executor == executor
+    assert op.derivative(op.domain.zero()).executor == executor
+    assert op[0].prod_op.executor == executor
+
+    x = noise_element(op.domain)
+    assert all_almost_equal(op(x), serial_op(x))
+    out = op.range.element()
+    assert op(x, out=out) is out
+    assert all_almost_equal(out, serial_op(x))
+    y = noise_element(op.range)
+    assert all_almost_equal(op.adjoint(y), serial_op.adjoint(y))
+
+    # Aliased input and output
+    op = odl.DiagonalOperator(A, B, executor=executor)
+    assert op.adjoint.executor == executor
+    x = noise_element(op.domain)
+    expected = [A(x[0]), B(x[1])]
+    op(x, out=x)
+    assert all_almost_equal(x, expected)
+
+    # Broadcasting and reduction
+    op = odl.BroadcastOperator(A, B, executor=executor)
+    red_op = op.adjoint
+    assert red_op.prod_op.executor == executor
+    assert red_op.adjoint.prod_op.executor == executor
+    x = noise_element(r3)
+    assert all_almost_equal(op(x), [A(x), B(x)])
+    y = noise_element(op.range)
+    assert all_almost_equal(red_op(y), A(y[0]) + B.adjoint(y[1]))
+
+    with pytest.raises(ValueError):
+        odl.ProductSpaceOperator(matrix, executor='gpu')
+
+
 def test_comp_proj():
     r3 = odl.rn(3)
     r3xr3 = odl.ProductSpace(r3, 2)
@@ -162,6 +162,26 @@ def test_pointwise_norm_complex(exponent):
     assert all_almost_equal(out, true_norm)
 
 
+def test_pointwise_norm_contiguous(exponent):
+    fspace = odl.uniform_discr([0, 0], [1, 1], (2, 2), dtype=complex)
+    vfspace = ProductSpace(fspace, 3, contiguous=True)
+    pwnorm = PointwiseNorm(vfspace, exponent)
+
+    testarr = np.array([[[1 + 1j, 2],
+                         [3, 4 - 2j]],
+                        [[0, -1],
+                         [0, 1]],
+                        [[1j, 1j],
+                         [1j, 1j]]])
+
+    true_norm = np.linalg.norm(testarr, ord=exponent, axis=0)
+
+    func = vfspace.element(testarr)
+    assert func.buffer is not None
+    func_pwnorm = pwnorm(func)
+    assert all_almost_equal(func_pwnorm, true_norm)
+
+
 def test_pointwise_norm_weighted(exponent):
     fspace = odl.uniform_discr([0, 0], [1, 1], (2, 2))
     vfspace = ProductSpace(fspace, 3)
@@ -659,6 +679,21 @@ def test_matrix_op_call(matrix):
     assert all_almost_equal(out, true_result)
 
 
+def test_matrix_op_apply_batch(matrix):
+    """Validate batch evaluation of matrix operators against calls."""
+    dense_matrix = matrix
+    sparse_matrix = scipy.sparse.coo_matrix(dense_matrix)
+
+    for mat_op in [MatrixOperator(dense_matrix),
+                   MatrixOperator(sparse_matrix),
+                   MatrixOperator(dense_matrix, odl.rn((2, 2, 4)), axis=2)]:
+        x = noise_element(mat_op.domain.batched(3))
+        result = mat_op.apply_batch(x)
+        assert result in mat_op.range.batched(3)
+        for x_i, result_i in zip(x, result):
+            assert all_almost_equal(result_i, mat_op(x_i))
+
+
 def test_matrix_op_call_explicit():
     """Validate result from call to matrix op against explicit calculation."""
     mat = np.ones((3, 2))
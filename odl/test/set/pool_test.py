@@ -0,0 +1,176 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Unit tests for pools of recycled temporaries."""
+
+from __future__ import division
+import pickle
+import pytest
+
+import odl
+from odl.set.pool import ElementPool
+from odl.util.testutils import all_almost_equal, noise_element
+
+
+def test_pool_acquire_release():
+    """Test recycling and statistics of a pool."""
+    space = odl.rn(10)
+    pool = ElementPool(space, max_size=2)
+
+    x = pool.acquire()
+    y = pool.acquire()
+    z = pool.acquire()
+    assert x in space and y in space and z in space
+    pool.release(x)
+    pool.release(x)  # ignored, already in the pool
+    pool.release(y)
+    pool.release(z)  # pool full
+    assert len(pool) == 2
+    assert pool.acquire() in (x, y)
+
+    stats = pool.stats
+    assert stats['hits'] == 1
+    assert stats['misses'] == 3
+    assert stats['returns'] == 2
+    assert stats['discards'] == 2
+    assert stats['size'] == 1
+    assert stats['nbytes'] == x.nbytes
+
+    pool.reset_stats()
+    assert pool.stats['hits'] == 0
+    pool.clear()
+    assert len(pool) == 0
+
+    with pytest.raises(TypeError):
+        pool.release(odl.rn(3).zero())
+    with pytest.raises(ValueError):
+        pool.max_size = -1
+
+
+def test_recycle_temporaries():
+    """Test that recycling is only active in the context."""
+    space = odl.uniform_discr(0, 1, 10)
+    pool = space.pool
+    assert pool is space.pool
+
+    # No recycling by default
+    with space.temporary() as tmp:
+        pass
+    assert len(pool) == 0
+
+    with odl.recycle_temporaries(max_size=1):
+        with space.temporary() as tmp:
+            assert tmp in space
+        assert len(pool) == 1
+        with space.temporary() as tmp2:
+            assert tmp2 is tmp
+        with odl.recycle_temporaries(max_size=0):
+            with space.temporary() as tmp3:
+                assert tmp3 is tmp
+        assert len(pool) == 0
+        assert pool.stats['discards'] == 2
+
+    # Pools are emptied at the end, unless they have their own size
+    assert len(pool) == 0
+    pool.max_size = 2
+    with odl.recycle_temporaries():
+        with space.temporary():
+            pass
+    assert len(pool) == 1
+    pool.max_size = None
+    assert len(pool) == 1
+    pool.clear()
+
+    # Given elements are handed out and not pooled
+    given = space.element()
+    with space.temporary(given) as tmp:
+        assert tmp is given
+    assert len(pool) == 0
+
+
+def test_temporary_alignment():
+    """Test that NumPy-based temporaries are aligned."""
+    from odl.space.npy_tensors import ALIGNMENT
+
+    for space in [odl.rn((3, 5), dtype='float32'), odl.cn(7),
+                  odl.uniform_discr([0, 0], [1, 1], (4, 3))]:
+        with space.temporary() as tmp:
+            assert tmp in space
+            data = getattr(tmp, 'tensor', tmp).data
+            assert data.shape == space.shape
+            assert data.ctypes.data % ALIGNMENT == 0
+
+
+def test_pickle_space_with_pool():
+    """Test that spaces can be pickled after using their pool."""
+    space = odl.rn(3)
+    space.pool.max_size = 1
+    with space.temporary():
+        pass
+    space_copy = pickle.loads(pickle.dumps(space))
+    assert space_copy == space
+    assert len(space_copy.pool) == 0
+
+
+def test_operators_recycle():
+    """Test operator evaluation with recycled temporaries."""
+    space = odl.uniform_discr(0, 1, 10)
+    op = odl.ScalingOperator(space, 2)
+    op_sum = op + op * op
+    x = noise_element(space)
+    expected = 2 * x + 4 * x
+
+    with odl.recycle_temporaries():
+        out = space.element()
+        for _ in range(3):
+            op_sum(x, out=out)
+            assert all_almost_equal(out, expected)
+        # In-place with aliased input and output
+        y = x.copy()
+        op_sum(y, out=y)
+        assert all_almost_equal(y, expected)
+        # Expressions keep their own temporaries
+        assert space.pool.stats['misses'] == 0
+
+    # Landweber with and without recycling
+    x1 = space.zero()
+    x2 = space.zero()
+    odl.solvers.landweber(op, x1, x, niter=3, omega=0.1)
+    with odl.recycle_temporaries():
+        odl.solvers.landweber(op, x2, x, niter=3, omega=0.1)
+    assert all_almost_equal(x1, x2)
+
+
+def test_solvers_release_on_error():
+    """Test that solvers return their temporaries if an error occurs."""
+    space = odl.uniform_discr(0, 1, 10)
+    op = odl.ScalingOperator(space, 2)
+    f = odl.solvers.ZeroFunctional(space)
+
+    def callback(x):
+        raise RuntimeError
+
+    solvers = [
+        lambda x: odl.solvers.landweber(op, x, x.copy(), niter=3, omega=0.1,
+                                        callback=callback),
+        lambda x: odl.solvers.pdhg(x, f, f, op, niter=3, tau=0.1, sigma=0.1,
+                                   callback=callback),
+        lambda x: odl.solvers.osmlem([op, op], x, [x.copy(), x.copy()],
+                                     niter=3, callback=callback)]
+
+    for solver in solvers:
+        with odl.recycle_temporaries(max_size=5):
+            with pytest.raises(RuntimeError):
+                solver(space.one())
+            stats = space.pool.stats
+            assert stats['returns'] + stats['discards'] == stats['misses']
+        space.pool.reset_stats()
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
@@ -139,5 +139,38 @@ def test_steepst_descent():
     assert all_almost_equal(x, [1, 1, 1], places=2)
 
 
+def test_sensitivity_image(tmpdir):
+    """Test caching, saving and loading of sensitivity images."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=6)
+    ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+    matrix_op = odl.MatrixOperator(np.random.rand(4, 3))
+
+    for op in [ray_trafo, matrix_op]:
+        expected = op.adjoint(op.range.one())
+        sens = odl.solvers.sensitivity_image(op)
+        assert all_almost_equal(sens, expected)
+        assert odl.solvers.sensitivity_image(op) is sens
+        assert odl.solvers.sensitivity_image(op, use_cache=False) is not sens
+
+    # Different operators on the same geometry share the cache
+    other_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+    assert (odl.solvers.sensitivity_image(other_trafo) is
+            odl.solvers.sensitivity_image(ray_trafo))
+
+    # Save to and load from a file
+    fname = str(tmpdir.join('sens.npy'))
+    sens = odl.solvers.sensitivity_image(matrix_op, use_cache=False,
+                                         fname=fname)
+    matrix_op.matrix[:] = 0  # make sure the file is used
+    loaded = odl.solvers.sensitivity_image(matrix_op, use_cache=False,
+                                           fname=fname)
+    assert all_almost_equal(loaded, sens)
+
+    with pytest.raises(ValueError):
+        odl.solvers.sensitivity_image(odl.IdentityOperator(odl.rn(2)),
+                                      fname=fname)
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -0,0 +1,172 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Unit tests for tensor spaces stored as grids of blocks."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.space.npy_chunked_tensors import BlockArray
+from odl.util.testutils import (
+    all_almost_equal, all_equal, noise_array, noise_elements, simple_fixture)
+
+
+# Blocks not dividing the shape, single block
+chunks = simple_fixture('chunks', [(2, 3), (5, 7)])
+exponent = simple_fixture('exponent', [2.0, 1.0, float('inf'), 1.5])
+
+
+def test_element(chunks):
+    """Test creation of elements from arrays, elements and pointers."""
+    space = odl.rn((5, 7), impl='numpy_chunked', chunks=chunks)
+    arr = noise_array(space)
+
+    x = space.element(arr)
+    assert isinstance(x.data, BlockArray)
+    assert x.data.chunks == chunks
+    assert all_equal(x, arr)
+    # Arrays are copied into the blocks
+    assert not any(np.may_share_memory(blk, arr) for blk in x.data.blocks)
+
+    y = space.element(x.data)
+    assert y.data is x.data
+    assert space.element(x) is x
+    assert all_equal(space.element(np.asfortranarray(arr)), arr)
+    assert all_equal(space.element(data_ptr=arr.ctypes.data, order='C'), arr)
+
+    with pytest.raises(ValueError):
+        space.element(np.ones((7, 5)))
+
+
+def test_indexing(chunks):
+    """Test getitem and setitem against NumPy."""
+    space = odl.rn((5, 7), impl='numpy_chunked', chunks=chunks)
+    x_arr, x = noise_elements(space)
+
+    indices_list = [(1, 2), (-1, slice(None)), (slice(1, 4), slice(None, 5)),
+                    (slice(None, None, 2), slice(6, 0, -3)), Ellipsis,
+                    (Ellipsis, 3), [0, 4], x_arr > 0]
+    for indices in indices_list:
+        assert all_equal(x[indices], x_arr[indices])
+
+        x[indices] = -1
+        x_arr[indices] = -1
+        assert all_equal(x, x_arr)
+
+    with pytest.raises(IndexError):
+        x[5, 0]
+
+
+def test_arithmetic(chunks):
+    """Test blockwise arithmetic and ufuncs against NumPy."""
+    space = odl.rn((5, 7), impl='numpy_chunked', chunks=chunks)
+    [x_arr, y_arr, z_arr], [x, y, z] = noise_elements(space, 3)
+
+    assert all_almost_equal(space.lincomb(2, x, -1, y), 2 * x_arr - y_arr)
+    space.lincomb_many([1, 2, 3], [x, y, z], out=z)
+    assert all_almost_equal(z, x_arr + 2 * y_arr + 3 * z_arr)
+    assert all_almost_equal(x * y / (1 + y ** 2),
+                            x_arr * y_arr / (1 + y_arr ** 2))
+
+    # Ufuncs with elements, arrays and scalars, also in-place
+    assert all_almost_equal(np.maximum(x, y_arr), np.maximum(x_arr, y_arr))
+    assert all_almost_equal(np.sin(x), np.sin(x_arr))
+    out = space.element()
+    assert np.add(x, 1, out=out) is out
+    assert all_almost_equal(out, x_arr + 1)
+    out_arr = np.empty(space.shape)
+    assert np.add(x, y, out=out_arr) is out_arr
+    assert all_almost_equal(out_arr, x_arr + y_arr)
+    res = np.greater(x, 0)
+    assert res.space.impl == 'numpy_chunked'
+    assert all_equal(res, x_arr > 0)
+
+    # Reductions, blockwise and on full arrays
+    assert np.add.reduce(x, axis=None) == pytest.approx(np.sum(x_arr))
+    assert np.maximum.reduce(x, axis=(0, 1)) == np.max(x_arr)
+    assert all_almost_equal(np.add.reduce(x, axis=1), np.sum(x_arr, axis=1))
+    assert all_almost_equal(np.subtract.reduce(x, axis=0),
+                            np.subtract.reduce(x_arr, axis=0))
+
+
+def test_complex_parts():
+    """Test real and imaginary parts sharing the blocks."""
+    space = odl.cn((4, 3), impl='numpy_chunked', chunks=(3, 2))
+    x_arr, x = noise_elements(space)
+
+    assert all_equal(x.real, x_arr.real)
+    assert all_equal(x.imag, x_arr.imag)
+    assert all_equal(x.conj(), x_arr.conj())
+
+    x.real = 1
+    x.imag[:] = x.imag * 2
+    assert all_equal(x, 1 + 2j * x_arr.imag)
+
+
+def test_norms(chunks, exponent):
+    """Test blockwise inner products, norms and distances."""
+    weighting = noise_array(odl.rn((5, 7))) ** 2 + 0.1
+    space = odl.rn((5, 7), exponent=exponent, weighting=weighting,
+                   impl='numpy_chunked', chunks=chunks)
+    npy_space = odl.rn((5, 7), exponent=exponent, weighting=weighting)
+    [x_arr, y_arr], [x, y] = noise_elements(space, 2)
+    x_npy, y_npy = npy_space.element(x_arr), npy_space.element(y_arr)
+
+    assert x.norm() == pytest.approx(x_npy.norm())
+    assert x.dist(y) == pytest.approx(x_npy.dist(y_npy))
+    if exponent == 2.0:
+        assert x.inner(y) == pytest.approx(x_npy.inner(y_npy))
+
+
+def test_spill(tmpdir):
+    """Test moving blocks to files and back."""
+    space = odl.rn((5, 7), impl='numpy_chunked', chunks=3,
+                   scratch_dir=str(tmpdir))
+    x_arr, x = noise_elements(space)
+
+    x.spill()
+    assert x.data.is_spilled
+    assert all_equal(x, x_arr)
+    x *= 2
+    assert all_almost_equal(x, 2 * x_arr)
+    x.load()
+    assert not x.data.is_spilled
+    assert all_almost_equal(x, 2 * x_arr)
+
+    # Spilling spaces create all elements in files
+    space = odl.rn((5, 7), impl='numpy_chunked', chunks=3, spill=True,
+                   scratch_dir=str(tmpdir))
+    x = space.one()
+    assert x.data.is_spilled
+    assert x.copy().data.is_spilled
+    assert (x + x).data.is_spilled
+    assert all_equal(x + x, 2 * np.ones(space.shape))
+
+
+def test_discr_pointwise_norm():
+    """Test discretized spaces and pointwise operators with blocked data."""
+    space = odl.uniform_discr([0, 0], [1, 1], (10, 12),
+                              impl='numpy_chunked')
+    assert space.tspace.impl == 'numpy_chunked'
+    vfspace = space ** 2
+    [x_arr, y_arr], [x, y] = noise_elements(space, 2)
+
+    pw_norm = odl.PointwiseNorm(vfspace)
+    result = pw_norm([x, y])
+    assert result.tensor.space.impl == 'numpy_chunked'
+    assert all_almost_equal(result, np.hypot(x_arr, y_arr))
+
+    grad = odl.Gradient(space)
+    npy_grad = odl.Gradient(odl.uniform_discr([0, 0], [1, 1], (10, 12)))
+    assert all_almost_equal(grad(x), npy_grad(x_arr))
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
@@ -0,0 +1,84 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Unit tests for lazy evaluation of tensor arithmetic."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.space.lazy_tensors import LazyTensorExpression
+from odl.util.testutils import all_almost_equal, noise_elements, simple_fixture
+
+
+# Small shape for a single block, large shape for several blocks
+shape = simple_fixture('shape', [(3, 4), (200, 30)])
+
+
+@pytest.fixture(scope='module', params=['tspace', 'discr'])
+def space(request, shape):
+    if request.param == 'tspace':
+        return odl.rn(shape)
+    else:
+        return odl.uniform_discr([0, 0], [1, 1], shape)
+
+
+def test_lazy_expression(space):
+    """Test building and evaluating expressions."""
+    [x_arr, y_arr, z_arr], [x, y, z] = noise_elements(space, 3)
+
+    # Powers are not lazy, but their results can be used as operands
+    with odl.lazy():
+        expr = x + 2 * y - z * x / (1 + y ** 2) - (-z)
+
+    assert isinstance(expr, LazyTensorExpression)
+    assert expr.space == space
+    true_arr = x_arr + 2 * y_arr - z_arr * x_arr / (1 + y_arr ** 2) + z_arr
+
+    assert all_almost_equal(expr.evaluate(), true_arr)
+    assert all_almost_equal(np.asarray(expr), true_arr)
+    elem = space.element(expr)
+    assert elem in space
+    assert all_almost_equal(elem, true_arr)
+
+    # Outside of the context, arithmetic is eager
+    assert not isinstance(x + y, LazyTensorExpression)
+
+
+def test_lazy_assign_aliased(space):
+    """Test evaluation into elements that appear in the expression."""
+    [x_arr, y_arr], [x, y] = noise_elements(space, 2)
+
+    with odl.lazy():
+        x += 3 * y * x
+    x_arr += 3 * y_arr * x_arr
+    assert all_almost_equal(x, x_arr)
+
+    with odl.lazy():
+        expr = y - x
+    y.assign(expr)
+    y_arr = y_arr - x_arr
+    assert all_almost_equal(y, y_arr)
+
+
+def test_lazy_unsupported():
+    """Test that non-floating spaces and other spaces stay eager."""
+    space = odl.tensor_space(3, dtype=int)
+    x = space.one()
+    with odl.lazy():
+        assert not isinstance(x + x, LazyTensorExpression)
+
+    x = odl.rn(3).one()
+    with odl.lazy():
+        with pytest.raises(TypeError):
+            x + odl.rn(2).one()
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
@@ -577,6 +577,56 @@ def test_power_in_place_modify():
     assert all_almost_equal(z, [z1, z2])
 
 
+def test_power_contiguous():
+    """Test elements of power spaces with contiguous storage."""
+    H = odl.uniform_discr([0, 0], [1, 1], (3, 4))
+    HxH = odl.ProductSpace(H, 2, contiguous=True)
+    assert HxH.is_contiguous
+    assert HxH == odl.ProductSpace(H, 2)
+    assert 'contiguous=True' in repr(HxH)
+    assert 'contiguous=True' in str(HxH)
+
+    # Parts are views into the buffer, and `asarray` does not copy
+    x = HxH.element()
+    assert x.buffer.shape == (2, 3, 4)
+    assert np.may_share_memory(x[1].asarray(), x.buffer)
+    assert x.asarray() is x.buffer
+
+    arr = np.random.rand(2, 3, 4)
+    assert HxH.element(arr).buffer is arr
+    x = HxH.element([H.one(), 2 * H.one()])
+    assert all_equal(x.buffer, [np.ones((3, 4)), 2 * np.ones((3, 4))])
+
+    # Not possible for non-power spaces
+    with pytest.raises(ValueError):
+        odl.ProductSpace(odl.rn(2), odl.rn(3), contiguous=True)
+
+
+def test_power_contiguous_arithmetic(exponent):
+    """Test contiguous power spaces against component-wise evaluation."""
+    H = odl.uniform_discr([0, 0], [1, 1], (30, 40), exponent=exponent)
+    HxH_cont = odl.ProductSpace(H, 3, exponent=exponent, contiguous=True)
+    HxH = odl.ProductSpace(H, 3, exponent=exponent)
+
+    [x_arr, y_arr] = noise_elements(HxH, n=2)[0]
+    x_cont, y_cont = HxH_cont.element(x_arr), HxH_cont.element(y_arr)
+    x, y = HxH.element(x_arr), HxH.element(y_arr)
+
+    assert all_almost_equal(3 * x_cont - y_cont, 3 * x - y)
+    x_cont.lincomb(2, y_cont, 1, x_cont)
+    x.lincomb(2, y, 1, x)
+    assert all_almost_equal(x_cont, x)
+    HxH_cont.lincomb_many([1, -2, 3], [y_cont, x_cont, y_cont], out=x_cont)
+    HxH.lincomb_many([1, -2, 3], [y, x, y], out=x)
+    assert all_almost_equal(x_cont, x)
+    assert all_almost_equal(x_cont * y_cont, x * y)
+    assert all_almost_equal(x_cont / (y_cont + 1), x / (y + 1))
+    assert almost_equal(x_cont.norm(), x.norm())
+    assert almost_equal(x_cont.dist(y_cont), x.dist(y))
+    if exponent == 2.0:
+        assert almost_equal(x_cont.inner(y_cont), x.inner(y))
+
+
 def test_getitem_single():
     r1 = odl.rn(1)
     r2 = odl.rn(2)
@@ -17,6 +17,7 @@ import sys
 
 import odl
 from odl.set.space import LinearSpaceTypeError
+from odl.space.npy_chunked_tensors import NumpyChunkedTensor
 from odl.space.npy_tensors import (
     NumpyTensor, NumpyTensorSpace,
     NumpyTensorSpaceConstWeighting, NumpyTensorSpaceArrayWeighting,
@@ -45,7 +46,7 @@ def _pos_array(space):
 
 def _array_cls(impl):
     """Return the array class for given impl."""
-    if impl == 'numpy':
+    if impl in ('numpy', 'numpy_memmap', 'numpy_shared', 'numpy_chunked'):
         return np.ndarray
     else:
         assert False
@@ -53,15 +54,17 @@ def _array_cls(impl):
 
 def _odl_tensor_cls(impl):
     """Return the ODL tensor class for given impl."""
-    if impl == 'numpy':
+    if impl in ('numpy', 'numpy_memmap', 'numpy_shared'):
         return NumpyTensor
+    elif impl == 'numpy_chunked':
+        return NumpyChunkedTensor
     else:
         assert False
 
 
 def _weighting_cls(impl, kind):
     """Return the weighting class for given impl and kind."""
-    if impl == 'numpy':
+    if impl in ('numpy', 'numpy_memmap', 'numpy_shared', 'numpy_chunked'):
         if kind == 'array':
             return NumpyTensorSpaceArrayWeighting
         elif kind == 'const':
@@ -166,7 +169,7 @@ def test_init_tspace_weighting(weight, exponent, odl_tspace_impl):
     space = odl.tensor_space((3, 4), weighting=weight, exponent=exponent,
                              impl=impl)
 
-    if impl == 'numpy':
+    if impl in ('numpy', 'numpy_memmap', 'numpy_shared', 'numpy_chunked'):
         if isinstance(weight, np.ndarray):
             weighting_cls = _weighting_cls(impl, 'array')
         else:
@@ -188,7 +191,7 @@ def test_init_tspace_weighting(weight, exponent, odl_tspace_impl):
         badly_sized = np.ones((2, 4))
         odl.tensor_space((3, 4), weighting=badly_sized, impl=impl)
 
-    if impl == 'numpy':
+    if impl in ('numpy', 'numpy_memmap', 'numpy_shared', 'numpy_chunked'):
         with pytest.raises(ValueError):
             bad_dtype = np.ones((3, 4), dtype=complex)
             odl.tensor_space((3, 4), weighting=bad_dtype)
@@ -232,6 +235,9 @@ def test_size(odl_tspace_impl):
 
 def test_element(tspace, odl_elem_order):
     """Test creation of space elements."""
+    if tspace.impl == 'numpy_chunked':
+        pytest.skip('blocked data has no memory layout, see '
+                    'chunked_tensors_test.py')
     order = odl_elem_order
     # From scratch
     elem = tspace.element(order=order)
@@ -255,7 +261,10 @@ def test_element(tspace, odl_elem_order):
     assert all_equal(elem, arr_c)
     assert elem.shape == elem.data.shape
     assert elem.dtype == tspace.dtype == elem.data.dtype
-    if order is None or order == 'C':
+    if tspace.impl in ('numpy_memmap', 'numpy_shared'):
+        # Arrays in private memory are always copied
+        assert not np.may_share_memory(elem.data, arr_c)
+    elif order is None or order == 'C':
         # None or same order should not lead to copy
         assert np.may_share_memory(elem.data, arr_c)
     if order is not None:
@@ -268,7 +277,10 @@ def test_element(tspace, odl_elem_order):
     assert all_equal(elem, arr_f)
     assert elem.shape == elem.data.shape
     assert elem.dtype == tspace.dtype == elem.data.dtype
-    if order is None or order == 'F':
+    if tspace.impl in ('numpy_memmap', 'numpy_shared'):
+        # Arrays in private memory are always copied
+        assert not np.may_share_memory(elem.data, arr_f)
+    elif order is None or order == 'F':
         # None or same order should not lead to copy
         assert np.may_share_memory(elem.data, arr_f)
     if order is not None:
@@ -448,6 +460,81 @@ def test_lincomb_discontig(odl_tspace_impl):
             _test_lincomb(tspace, a, b, discontig=True)
 
 
+def test_lincomb_many(odl_tspace_impl):
+    """Validate lincomb_many against direct result using arrays."""
+    impl = odl_tspace_impl
+    coeffs = [2, 1, -1, 0, 3.41]
+
+    # Small size for one block, medium size for several blocks
+    for shape in [(3, 4), (300, 40)]:
+        tspace = odl.rn(shape, impl=impl)
+        arrs, elems = noise_elements(tspace, 5)
+        elems = list(elems)
+        out_arr = sum(a * arr for a, arr in zip(coeffs, arrs))
+        out = tspace.lincomb_many(coeffs, elems)
+        assert all_almost_equal(out, out_arr)
+
+        # Output aliased with a term, and terms aliased with each other
+        out_arr = sum(a * arr for a, arr in zip(coeffs, arrs))
+        out_arr += 2 * arrs[1]
+        tspace.lincomb_many(coeffs + [2], elems + [elems[1]], out=elems[2])
+        assert all_almost_equal(elems[2], out_arr)
+
+        # No terms
+        tspace.lincomb_many([], [], out=elems[0])
+        assert all_equal(elems[0], tspace.zero())
+
+    with pytest.raises(ValueError):
+        tspace.lincomb_many([1, 2], elems)
+    with pytest.raises(LinearSpaceTypeError):
+        tspace.lincomb_many([1], [odl.rn(3).zero()])
+
+
+def test_compute_dtype(odl_tspace_impl):
+    """Test half-precision storage with single-precision computations."""
+    impl = odl_tspace_impl
+    shape = (300, 40)
+    tspace = odl.rn(shape, dtype='float16', compute_dtype='float32',
+                    impl=impl)
+    assert tspace.compute_dtype == np.dtype('float32')
+    assert tspace != odl.rn(shape, dtype='float16', impl=impl)
+    assert tspace.astype('float32') == odl.rn(shape, dtype='float32',
+                                              impl=impl)
+
+    [x_arr, y_arr, z_arr], [x, y, z] = noise_elements(tspace, 3)
+    assert x.data.dtype == np.dtype('float16')
+    # Exact values of the stored data, computed in double precision
+    x_arr, y_arr, z_arr = (arr.astype(float) for arr in (x_arr, y_arr, z_arr))
+
+    # Reductions are as accurate as single-precision computations
+    assert tspace.norm(x) == pytest.approx(np.linalg.norm(x_arr), rel=1e-5)
+    assert tspace.dist(x, y) == pytest.approx(np.linalg.norm(x_arr - y_arr),
+                                              rel=1e-5)
+    assert tspace.inner(x, y) == pytest.approx(np.vdot(x_arr, y_arr),
+                                               rel=1e-4)
+
+    # Linear combinations are rounded to half precision only once
+    out = tspace.lincomb(0.3, x, -1.7, y)
+    out_arr = (0.3 * x_arr - 1.7 * y_arr).astype('float16')
+    assert out.data.dtype == np.dtype('float16')
+    assert all_almost_equal(out, out_arr, places=2)
+    out = tspace.lincomb_many([0.3, -1.7, 2.1], [x, y, z])
+    out_arr = (0.3 * x_arr - 1.7 * y_arr + 2.1 * z_arr).astype('float16')
+    assert all_almost_equal(out, out_arr, places=2)
+
+    # In-place
+    tspace.lincomb(2, x, 1, y, out=x)
+    assert all_almost_equal(x, (2 * x_arr + y_arr).astype('float16'),
+                            places=2)
+
+    with pytest.raises(ValueError):
+        odl.rn(3, dtype='float32', compute_dtype='float16', impl=impl)
+    with pytest.raises(ValueError):
+        odl.rn(3, dtype='float32', compute_dtype='complex64', impl=impl)
+    with pytest.raises(ValueError):
+        odl.tensor_space(3, dtype=int, compute_dtype=float, impl=impl)
+
+
 def test_lincomb_raise(tspace):
     """Test if lincomb raises correctly for bad input."""
     other_space = odl.rn((4, 3), impl=tspace.impl)
@@ -742,10 +829,12 @@ def test_element_getitem(odl_tspace_impl, getitem_indices):
         assert sliced_spc.weighting == space.weighting
 
         # Check that we have a view that manipulates the original array
-        # (or not, depending on indexing style)
-        x_arr_sliced[:] = 0
-        x_sliced[:] = 0
-        assert all_equal(x_arr, x)
+        # (or not, depending on indexing style). Chunked tensors always
+        # return copies.
+        if impl != 'numpy_chunked':
+            x_arr_sliced[:] = 0
+            x_sliced[:] = 0
+            assert all_equal(x_arr, x)
 
 
 def test_element_setitem(odl_tspace_impl, setitem_indices):
@@ -903,6 +992,47 @@ def test_python_copy(odl_tspace_impl):
     assert x != z
 
 
+def _double_row(args):
+    """Double a row of a tensor in place, for use in worker processes."""
+    x, i = args
+    x[i] *= 2
+
+
+def test_pickle(odl_tspace_impl):
+    """Test pickling, and sharing of data for shared memory tensors."""
+    import pickle
+    impl = odl_tspace_impl
+    space = odl.rn((4, 5), weighting=2, impl=impl)
+    x_arr, x = noise_elements(space)
+
+    y = pickle.loads(pickle.dumps(x))
+    assert y in space
+    assert y == x
+    y *= 2
+    if impl == 'numpy_shared':
+        # Only a handle to the shared memory is pickled
+        assert all_equal(x, 2 * x_arr)
+    else:
+        assert all_equal(x, x_arr)
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='no fork on Windows')
+def test_shared_worker_processes():
+    """Test in-place updates of shared tensors in worker processes."""
+    import multiprocessing
+    space = odl.rn((4, 5), impl='numpy_shared')
+    x_arr, x = noise_elements(space)
+
+    pool = multiprocessing.get_context('fork').Pool(2)
+    try:
+        pool.map(_double_row, [(x, i) for i in range(space.shape[0])])
+    finally:
+        pool.close()
+        pool.join()
+
+    assert all_equal(x, 2 * x_arr)
+
+
 def test_conversion_to_scalar(odl_tspace_impl):
     """Test conversion of size-1 vectors/tensors to scalars."""
     impl = odl_tspace_impl
@@ -1046,9 +1176,14 @@ def test_array_weighting_array_is_valid(odl_tspace_impl):
 def test_array_weighting_equals(odl_tspace_impl):
     """Test the equality check method of array weightings."""
     impl = odl_tspace_impl
+    if impl == 'numpy_chunked':
+        pytest.skip('weightings assemble new arrays from blocked elements')
     space = odl.rn(5, impl=impl)
     weight_arr = _pos_array(space)
     weight_elem = space.element(weight_arr)
+    if impl in ('numpy_memmap', 'numpy_shared'):
+        # Element creation copies the array, use the copied one
+        weight_arr = weight_elem.data
 
     weighting_cls = _weighting_cls(impl, 'array')
     weighting_arr = weighting_cls(weight_arr)
@@ -1262,6 +1397,35 @@ def test_const_weighting_dist(tspace, exponent):
     assert w_const.dist(x, y) == pytest.approx(true_dist)
 
 
+def test_weighting_blocked_reductions(odl_tspace_impl, exponent):
+    """Test inner, norm and dist of large tensors, which use blocks."""
+    # Large enough for parallel reduction of several blocks
+    shape = (1100, 1000)
+    space = odl.rn(shape, exponent=exponent, impl=odl_tspace_impl)
+    [xarr, yarr], [x, y] = noise_elements(space, 2)
+    weight_arr = 1 + np.random.rand(*shape)
+
+    for weighting, weight in [
+            (NumpyTensorSpaceConstWeighting(1.5, exponent), 1.5),
+            (NumpyTensorSpaceArrayWeighting(weight_arr, exponent),
+             weight_arr)]:
+
+        if exponent == float('inf'):
+            true_norm = np.max(weight * np.abs(xarr))
+            true_dist = np.max(weight * np.abs(xarr - yarr))
+        else:
+            true_norm = np.sum(weight * np.abs(xarr) ** exponent)
+            true_norm **= 1 / exponent
+            true_dist = np.sum(weight * np.abs(xarr - yarr) ** exponent)
+            true_dist **= 1 / exponent
+
+        assert weighting.norm(x) == pytest.approx(true_norm)
+        assert weighting.dist(x, y) == pytest.approx(true_dist)
+        if exponent == 2.0:
+            true_inner = np.vdot(yarr, weight * xarr)
+            assert weighting.inner(x, y) == pytest.approx(true_inner)
+
+
 def test_custom_inner(tspace):
     """Test weighting with a custom inner product."""
     rtol = np.sqrt(np.finfo(tspace.dtype).resolution)
@@ -1661,7 +1825,7 @@ def testodl_reduction(tspace, odl_reduction):
     # Reduction along axes, produces element in reduced space
     result_npy = npy_reduction(x_arr, axis=0)
     result = x_reduction(axis=0)
-    assert isinstance(result, NumpyTensor)
+    assert isinstance(result, _odl_tensor_cls(tspace.impl))
     assert result.shape == result_npy.shape
     assert result.dtype == x.dtype
     assert np.allclose(result, result_npy)
@@ -0,0 +1,171 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test filtered back-projection with small problem sizes."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.tomo.analytic import fbp_chunked
+from odl.tomo.analytic.filtered_back_projection import _fbp_filter_op
+from odl.util.testutils import all_almost_equal, noise_element, simple_fixture
+
+
+# --- pytest fixtures --- #
+
+
+geometry_type = simple_fixture('geometry', ['par2d', 'fan2d', 'cone3d'])
+chunk_size = simple_fixture('chunk_size', [1, 7, None])
+
+
+def _ray_trafo(geometry_type):
+    """Return a small NumPy ray transform for ``geometry_type``."""
+    if geometry_type == 'par2d':
+        space = odl.uniform_discr([-10, -10], [10, 10], (16, 16))
+        apart = odl.uniform_partition(0, np.pi, 20)
+        dpart = odl.uniform_partition(-15, 15, 24)
+        geometry = odl.tomo.Parallel2dGeometry(apart, dpart)
+    elif geometry_type == 'fan2d':
+        space = odl.uniform_discr([-10, -10], [10, 10], (16, 16))
+        apart = odl.uniform_partition(0, np.pi + 1.0, 20)
+        dpart = odl.uniform_partition(-30, 30, 24)
+        geometry = odl.tomo.FanFlatGeometry(apart, dpart, src_radius=40,
+                                            det_radius=40)
+    elif geometry_type == 'cone3d':
+        space = odl.uniform_discr([-10, -10, -5], [10, 10, 5], (12, 12, 6))
+        apart = odl.uniform_partition(0, 2 * np.pi, 20)
+        dpart = odl.uniform_partition([-30, -15], [30, 15], (16, 8))
+        geometry = odl.tomo.ConeFlatGeometry(apart, dpart, src_radius=40,
+                                             det_radius=40)
+    else:
+        raise ValueError('geometry not valid')
+
+    return odl.tomo.RayTransform(space, geometry, impl='numpy')
+
+
+# --- FBP tests --- #
+
+
+def test_fbp_filter_op(geometry_type):
+    """The FBP filter is cached, self-adjoint and independent of threads."""
+    ray_trafo = _ray_trafo(geometry_type)
+    filter_op = odl.tomo.fbp_filter_op(ray_trafo, filter_type='Hann',
+                                       num_threads=1)
+    assert isinstance(filter_op, odl.tomo.FbpFilterOperator)
+
+    # The frequency response is reused for equal parameters
+    filter_op_threads = odl.tomo.fbp_filter_op(ray_trafo, filter_type='Hann',
+                                               num_threads=3)
+    assert filter_op_threads.kernel is filter_op.kernel
+    other_op = odl.tomo.fbp_filter_op(ray_trafo, filter_type='Hann',
+                                      frequency_scaling=0.5)
+    assert other_op.kernel is not filter_op.kernel
+
+    x = odl.phantom.white_noise(ray_trafo.range)
+    y = odl.phantom.white_noise(ray_trafo.range)
+    assert all_almost_equal(filter_op(x), filter_op_threads(x))
+    assert filter_op.adjoint is filter_op
+    assert pytest.approx(filter_op(x).inner(y)) == x.inner(filter_op(y))
+
+    # Filtering in blocks of angles gives the same result
+    sub = ray_trafo.subsets(3, order='contiguous')[1]
+    sub_filter = _fbp_filter_op(ray_trafo, sub.range, True, 'Hann', 1.0)
+    assert all_almost_equal(sub_filter(sub.subset_data(x)),
+                            sub.subset_data(filter_op(x)))
+
+
+def test_fbp_chunked(geometry_type, chunk_size):
+    """Chunked FBP gives the same result as the full FBP."""
+    ray_trafo = _ray_trafo(geometry_type)
+    phantom = odl.phantom.cuboid(ray_trafo.domain)
+    proj_data = ray_trafo(phantom)
+
+    fbp = odl.tomo.fbp_op(ray_trafo, filter_type='Hann')
+    expected = fbp(proj_data)
+
+    # Data from an array-like
+    reco = fbp_chunked(ray_trafo, proj_data.asarray(), chunk_size=chunk_size,
+                       filter_type='Hann')
+    assert all_almost_equal(reco, expected, places=4)
+
+    # Data from a callable, written to `out`
+    calls = []
+
+    def read_chunk(start, stop):
+        calls.append((start, stop))
+        return proj_data.asarray()[start:stop]
+
+    out = ray_trafo.domain.one()
+    result = fbp_chunked(ray_trafo, read_chunk, chunk_size=chunk_size,
+                         filter_type='Hann', out=out)
+    assert result is out
+    assert all_almost_equal(out, expected, places=4)
+
+    # All angles are read exactly once
+    assert calls[0][0] == 0
+    assert calls[-1][1] == ray_trafo.range.shape[0]
+    assert all(c1[1] == c2[0] for c1, c2 in zip(calls[:-1], calls[1:]))
+    if chunk_size is not None:
+        assert all(stop - start <= chunk_size for start, stop in calls)
+
+
+def test_fbp_chunked_sparse_matrix():
+    """Chunked FBP does not assemble the full system matrix."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (20, 20))
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=20)
+    ray_trafo = odl.tomo.RayTransform(space, geometry, impl='sparse_matrix')
+    proj_data = noise_element(ray_trafo.range)
+
+    reco = fbp_chunked(ray_trafo, proj_data, chunk_size=6)
+    assert all(key[0] != 'sparse_matrix'
+               for key in geometry.implementation_cache)
+    assert all_almost_equal(reco, odl.tomo.fbp_op(ray_trafo)(proj_data))
+
+
+def test_fbp_chunked_weighting(tmpdir):
+    """Chunked FBP with Parker weighting and memory-mapped data."""
+    ray_trafo = _ray_trafo('fan2d')
+    phantom = odl.phantom.cuboid(ray_trafo.domain)
+    proj_data = ray_trafo(phantom)
+
+    parker = odl.tomo.parker_weighting(ray_trafo)
+    expected = odl.tomo.fbp_op(ray_trafo)(parker * proj_data)
+
+    fname = str(tmpdir.join('proj_data.npy'))
+    np.save(fname, proj_data.asarray())
+    proj_memmap = np.load(fname, mmap_mode='r')
+
+    reco = fbp_chunked(ray_trafo, proj_memmap, chunk_size=6,
+                       weighting='parker')
+    assert all_almost_equal(reco, expected, places=4)
+
+    reco = fbp_chunked(ray_trafo, proj_memmap, chunk_size=6,
+                       weighting=parker.asarray())
+    assert all_almost_equal(reco, expected, places=4)
+
+    # Weights constant along the angles
+    weights = np.linspace(0, 1, ray_trafo.range.shape[1])
+    expected = odl.tomo.fbp_op(ray_trafo)(proj_data * weights)
+    reco = fbp_chunked(ray_trafo, proj_memmap, chunk_size=6,
+                       weighting=weights)
+    assert all_almost_equal(reco, expected, places=4)
+
+    with pytest.raises(ValueError):
+        fbp_chunked(ray_trafo, proj_memmap, weighting='unknown')
+    with pytest.raises(ValueError):
+        fbp_chunked(ray_trafo, proj_memmap, weighting=np.ones(3))
+    with pytest.raises(ValueError):
+        fbp_chunked(ray_trafo, proj_memmap[1:])
+    with pytest.raises(ValueError):
+        fbp_chunked(ray_trafo, proj_memmap, chunk_size=0)
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
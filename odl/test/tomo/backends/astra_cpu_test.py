@@ -15,8 +15,10 @@ import sys
 
 import odl
 from odl.tomo.backends.astra_cpu import (
-    astra_cpu_forward_projector, astra_cpu_back_projector)
+    astra_cpu_forward_projector, astra_cpu_back_projector,
+    AstraCpuProjectorImpl, AstraCpuBackProjectorImpl)
 from odl.tomo.util.testutils import skip_if_no_astra
+from odl.util.testutils import all_almost_equal
 
 # TODO: clean up and improve tests
 
@@ -81,5 +83,45 @@ def test_astra_cpu_projector_fanflat():
     assert backproj.norm() > 0
 
 
+@skip_if_no_astra
+def test_astra_cpu_projector_impl():
+    """ASTRA CPU wrappers with persistent objects, compared to functions."""
+
+    # Create reco space and a phantom
+    reco_space = odl.uniform_discr([-4, -5], [4, 5], (4, 5), dtype='float32')
+    phantom = odl.phantom.cuboid(reco_space, min_pt=[0, 0], max_pt=[4, 5])
+
+    # Create parallel geometry
+    angle_part = odl.uniform_partition(0, 2 * np.pi, 8)
+    det_part = odl.uniform_partition(-6, 6, 6)
+    geom = odl.tomo.Parallel2dGeometry(angle_part, det_part)
+
+    # Make projection space
+    proj_space = odl.uniform_discr_frompartition(geom.partition,
+                                                 dtype='float32')
+
+    # Forward evaluation, repeated to check reuse of the ASTRA objects
+    projector = AstraCpuProjectorImpl(geom, reco_space, proj_space)
+    proj_data = astra_cpu_forward_projector(phantom, geom, proj_space)
+    for _ in range(2):
+        assert all_almost_equal(projector.call_forward(phantom), proj_data)
+
+    out = proj_space.element()
+    assert projector.call_forward(phantom, out=out) is out
+    assert all_almost_equal(out, proj_data)
+
+    # Backward evaluation
+    back_projector = AstraCpuBackProjectorImpl(geom, reco_space, proj_space)
+    backproj = astra_cpu_back_projector(proj_data, geom, reco_space)
+    for _ in range(2):
+        assert all_almost_equal(back_projector.call_backward(proj_data),
+                                backproj)
+
+    # Objects are freed explicitly and only once
+    projector.delete_ids()
+    assert projector.algo_id is None
+    del projector
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
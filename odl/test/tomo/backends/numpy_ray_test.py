@@ -0,0 +1,86 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test NumPy back-end."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.tomo.backends.numpy_ray import (
+    numpy_forward_projector, numpy_back_projector)
+
+
+def test_numpy_projector_parallel2d():
+    """Parallel 2D forward and backward projectors with NumPy."""
+
+    # Create reco space and a phantom
+    reco_space = odl.uniform_discr([-4, -5], [4, 5], (4, 5))
+    phantom = odl.phantom.cuboid(reco_space, min_pt=[0, 0], max_pt=[4, 5])
+
+    # Create parallel geometry
+    angle_part = odl.uniform_partition(0, 2 * np.pi, 8)
+    det_part = odl.uniform_partition(-6, 6, 6)
+    geom = odl.tomo.Parallel2dGeometry(angle_part, det_part)
+
+    # Make projection space
+    proj_space = odl.uniform_discr_frompartition(geom.partition)
+
+    # Forward evaluation
+    proj_data = numpy_forward_projector(phantom, geom, proj_space)
+    assert proj_data.shape == proj_space.shape
+    assert proj_data.norm() > 0
+
+    # Backward evaluation
+    backproj = numpy_back_projector(proj_data, geom, reco_space)
+    assert backproj.shape == reco_space.shape
+    assert backproj.norm() > 0
+
+
+def test_numpy_projector_cone3d():
+    """Cone beam 3D forward and backward projectors with NumPy."""
+
+    # Create reco space and a phantom
+    reco_space = odl.uniform_discr([-4, -5, -6], [4, 5, 6], (4, 5, 6))
+    phantom = odl.phantom.cuboid(reco_space, min_pt=[0, 0, 0],
+                                 max_pt=[4, 5, 6])
+
+    # Create cone beam geometry with flat detector
+    angle_part = odl.uniform_partition(0, 2 * np.pi, 8)
+    det_part = odl.uniform_partition([-7, -7], [7, 7], (7, 7))
+    geom = odl.tomo.ConeFlatGeometry(angle_part, det_part, src_radius=100,
+                                     det_radius=10)
+
+    # Make projection space
+    proj_space = odl.uniform_discr_frompartition(geom.partition)
+
+    # Forward evaluation
+    proj_data = numpy_forward_projector(phantom, geom, proj_space)
+    assert proj_data.shape == proj_space.shape
+    assert proj_data.norm() > 0
+
+    # Backward evaluation
+    backproj = numpy_back_projector(proj_data, geom, reco_space)
+    assert backproj.shape == reco_space.shape
+    assert backproj.norm() > 0
+
+
+def test_numpy_projector_unsupported():
+    """Geometries with several angle parameters are not supported."""
+    reco_space = odl.uniform_discr([-4, -4, -4], [4, 4, 4], (4, 4, 4))
+    apart = odl.uniform_partition([0, 0], [np.pi, np.pi], (3, 3))
+    dpart = odl.uniform_partition([-6, -6], [6, 6], (6, 6))
+    geom = odl.tomo.Parallel3dEulerGeometry(apart, dpart)
+
+    with pytest.raises(ValueError):
+        odl.tomo.RayTransform(reco_space, geom, impl='numpy')
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
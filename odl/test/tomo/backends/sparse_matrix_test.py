@@ -0,0 +1,81 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test sparse matrix back-end."""
+
+from __future__ import division
+import numpy as np
+import os
+
+import odl
+from odl.tomo.backends.numpy_ray import (
+    numpy_forward_projector, numpy_back_projector)
+from odl.tomo.backends.sparse_matrix import (
+    sparse_matrix_forward_projector, sparse_matrix_back_projector,
+    ray_trafo_sparse_matrix)
+from odl.util.testutils import all_almost_equal
+
+
+def test_sparse_matrix_projector_fanflat():
+    """Sparse matrix projectors agree with the NumPy back-end."""
+
+    # Create reco space and a phantom
+    reco_space = odl.uniform_discr([-4, -5], [4, 5], (4, 5), dtype='float32')
+    phantom = odl.phantom.cuboid(reco_space, min_pt=[0, 0], max_pt=[4, 5])
+
+    # Create fan beam geometry with flat detector
+    angle_part = odl.uniform_partition(0, 2 * np.pi, 8)
+    det_part = odl.uniform_partition(-6, 6, 6)
+    geom = odl.tomo.FanFlatGeometry(angle_part, det_part, src_radius=100,
+                                    det_radius=10)
+
+    # Make projection space
+    proj_space = odl.uniform_discr_frompartition(geom.partition,
+                                                 dtype='float32')
+
+    # Forward evaluation
+    proj_data = sparse_matrix_forward_projector(phantom, geom, proj_space)
+    assert all_almost_equal(
+        proj_data, numpy_forward_projector(phantom, geom, proj_space),
+        places=5)
+
+    # Backward evaluation
+    backproj = sparse_matrix_back_projector(proj_data, geom, reco_space)
+    assert all_almost_equal(
+        backproj, numpy_back_projector(proj_data, geom, reco_space),
+        places=5)
+
+
+def test_sparse_matrix_cache(tmpdir):
+    """Check the in-memory and on-disk caching of the system matrix."""
+    reco_space = odl.uniform_discr([-1, -1], [1, 1], (8, 8))
+    geom = odl.tomo.parallel_beam_geometry(reco_space)
+    cache_dir = str(tmpdir.join('cache'))
+
+    matrix = ray_trafo_sparse_matrix(geom, reco_space, cache_dir=cache_dir)
+    assert matrix.shape == (geom.partition.size, reco_space.size)
+    assert ray_trafo_sparse_matrix(geom, reco_space) is matrix
+    assert len(os.listdir(cache_dir)) == 1
+
+    # A new but equal geometry has an empty cache, the matrix must be
+    # loaded from disk
+    geom_new = odl.tomo.parallel_beam_geometry(reco_space)
+    matrix_new = ray_trafo_sparse_matrix(geom_new, reco_space,
+                                         cache_dir=cache_dir)
+    assert matrix_new is not matrix
+    assert (matrix_new != matrix).nnz == 0
+    assert len(os.listdir(cache_dir)) == 1
+
+    # Another volume results in a different matrix
+    other_space = odl.uniform_discr([-1, -1], [1, 1], (9, 9))
+    ray_trafo_sparse_matrix(geom, other_space, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
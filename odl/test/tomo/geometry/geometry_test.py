@@ -746,5 +746,69 @@ def test_helical_geometry_helper():
     assert geometry.det_partition.cell_sides[1] <= delta_h
 
 
+def test_grid_evaluation():
+    """Test vectorized and cached evaluation on the geometry grid."""
+    apart = odl.uniform_partition(0, 2 * np.pi, 5)
+    dpart_1d = odl.uniform_partition(-1, 1, 4)
+    dpart_2d = odl.uniform_partition([-1, -1], [1, 1], (4, 3))
+    euler_apart = odl.uniform_partition([0, 0], [np.pi, np.pi], (2, 5))
+    geometries = [
+        odl.tomo.Parallel2dGeometry(apart, dpart_1d),
+        odl.tomo.Parallel3dAxisGeometry(apart, dpart_2d),
+        odl.tomo.Parallel3dEulerGeometry(euler_apart, dpart_2d),
+        odl.tomo.FanFlatGeometry(apart, dpart_1d, src_radius=2,
+                                 det_radius=3),
+        odl.tomo.ConeFlatGeometry(apart, dpart_2d, src_radius=2,
+                                  det_radius=3, pitch=1)]
+
+    for geom in geometries:
+        # All points of the partition grid, with parameters as columns
+        points = geom.grid.points()
+        nmotion = geom.motion_partition.ndim
+        mparams = [points[:, i] for i in range(nmotion)]
+        dparams = [points[:, i] for i in range(nmotion, points.shape[1])]
+        if nmotion == 1:
+            mparams = mparams[0]
+        if len(dparams) == 1:
+            dparams = dparams[0]
+
+        shape = geom.grid.shape + (geom.ndim,)
+        det_pts = geom.det_point_position_grid()
+        assert det_pts.shape == shape
+        assert all_almost_equal(det_pts.reshape(-1, geom.ndim),
+                                geom.det_point_position(mparams, dparams))
+
+        det_to_src = geom.det_to_src_grid()
+        assert det_to_src.shape == shape
+        assert all_almost_equal(det_to_src.reshape(-1, geom.ndim),
+                                geom.det_to_src(mparams, dparams))
+
+        # Evaluation at a single detector point
+        mid_pt = geom.det_params.mid_pt
+        motion_pts = geom.motion_grid.points()
+        if nmotion == 1:
+            angles = motion_pts[:, 0]
+        else:
+            angles = motion_pts.T
+        shape = geom.motion_grid.shape + (geom.ndim,)
+        mid_pts = geom.det_point_position_grid(mid_pt)
+        assert mid_pts.shape == shape
+        assert all_almost_equal(mid_pts.reshape(-1, geom.ndim),
+                                geom.det_point_position(angles, mid_pt))
+
+        rot = geom.rotation_matrix_grid()
+        assert rot.shape == geom.motion_grid.shape + (geom.ndim, geom.ndim)
+        if isinstance(geom, odl.tomo.DivergentBeamGeometry):
+            src_pts = geom.src_position_grid()
+            assert src_pts.shape == shape
+            assert all_almost_equal(src_pts, geom.src_position(angles))
+
+        # Results are cached and read-only
+        assert geom.det_point_position_grid() is det_pts
+        assert geom.det_to_src_grid() is det_to_src
+        with pytest.raises(ValueError):
+            det_pts[0] = 0
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -17,7 +17,8 @@ import odl
 from odl.tomo.backends import ASTRA_VERSION
 from odl.tomo.util.testutils import (skip_if_no_astra, skip_if_no_astra_cuda,
                                      skip_if_no_skimage)
-from odl.util.testutils import almost_equal, all_almost_equal, simple_fixture
+from odl.util.testutils import (
+    almost_equal, all_almost_equal, simple_fixture, never_skip)
 
 
 # --- pytest fixtures --- #
@@ -26,7 +27,9 @@ from odl.util.testutils import almost_equal, all_almost_equal, simple_fixture
 impl = simple_fixture(
     name='impl', params=[skip_if_no_astra('astra_cpu'),
                          skip_if_no_astra_cuda('astra_cuda'),
-                         skip_if_no_skimage('skimage')])
+                         skip_if_no_skimage('skimage'),
+                         never_skip('numpy'),
+                         never_skip('sparse_matrix')])
 
 geometry_params = ['par2d', 'par3d', 'cone2d', 'cone3d', 'helical']
 geometry_ids = [" geometry='{}' ".format(p) for p in geometry_params]
@@ -91,7 +94,14 @@ projectors = [skip_if_no_astra('par2d astra_cpu uniform'),
               skip_if_no_astra_cuda('cone3d astra_cuda random'),
               skip_if_no_astra_cuda('helical astra_cuda uniform'),
               skip_if_no_skimage('par2d skimage uniform'),
-              skip_if_no_skimage('par2d skimage half_uniform')]
+              skip_if_no_skimage('par2d skimage half_uniform'),
+              never_skip('par2d numpy uniform'),
+              never_skip('par2d numpy half_uniform'),
+              never_skip('par2d numpy nonuniform'),
+              never_skip('cone2d numpy uniform'),
+              never_skip('cone2d numpy random'),
+              never_skip('par2d sparse_matrix uniform'),
+              never_skip('cone2d sparse_matrix uniform')]
 
 
 projector_ids = [" geom='{}' - impl='{}' - angles='{}' "
@@ -355,6 +365,150 @@ def test_anisotropic_voxels(geometry):
         assert False
 
 
+def test_numpy_impl(geometry_type):
+    """Test the NumPy back-end with small 2d and 3d geometries."""
+    ndim = 2 if geometry_type.endswith('2d') else 3
+    space = odl.uniform_discr([-10] * ndim, [10] * ndim, [16] * ndim)
+    apart = odl.uniform_partition(0, 2 * np.pi, 12)
+    if ndim == 2:
+        dpart = odl.uniform_partition(-20, 20, 24)
+    else:
+        dpart = odl.uniform_partition([-20, -20], [20, 20], (24, 24))
+
+    if geometry_type == 'par2d':
+        geometry = odl.tomo.Parallel2dGeometry(apart, dpart)
+    elif geometry_type == 'par3d':
+        geometry = odl.tomo.Parallel3dAxisGeometry(apart, dpart)
+    elif geometry_type == 'cone2d':
+        geometry = odl.tomo.FanFlatGeometry(apart, dpart, src_radius=40,
+                                            det_radius=20)
+    else:
+        geometry = odl.tomo.ConeFlatGeometry(apart, dpart, src_radius=40,
+                                             det_radius=20)
+
+    ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+
+    # At the first angle (pi / 12), rays close to the center traverse the
+    # full square of side length 20 between two opposite sides
+    vol_one = space.one()
+    proj = ray_trafo(vol_one)
+    near_center = (0,) + (12,) * (ndim - 1)
+    assert proj[near_center] == pytest.approx(20 / np.cos(np.pi / 12),
+                                              rel=0.01)
+
+    # Forward and back-projection are exactly adjoint
+    vol = odl.phantom.shepp_logan(space, modified=True)
+    data = odl.phantom.white_noise(ray_trafo.range)
+    assert ray_trafo(vol).inner(data) == pytest.approx(
+        vol.inner(ray_trafo.adjoint(data)), rel=1e-4)
+
+
+subset_order = simple_fixture('order', ['interlaced', 'contiguous', 'random'])
+subset_impl = simple_fixture('impl', [never_skip('numpy'),
+                                      never_skip('sparse_matrix')])
+
+
+def test_subsets(subset_impl, subset_order):
+    """Test splitting of the ray transform into angle subsets."""
+    space = odl.uniform_discr([-10, -10], [10, 10], (16, 16))
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=10)
+    ray_trafo = odl.tomo.RayTransform(space, geometry, impl=subset_impl)
+    subsets = ray_trafo.subsets(3, order=subset_order, seed=42)
+
+    # Each angle is used exactly once
+    all_idcs = np.arange(10)
+    used_idcs = np.concatenate([all_idcs[sub.angle_indices]
+                                for sub in subsets])
+    assert sorted(used_idcs) == list(range(10))
+    assert [sub.range.shape[0] for sub in subsets] == [4, 3, 3]
+    assert all(sub.parent is ray_trafo for sub in subsets)
+
+    # Evaluation into the full data
+    vol = odl.phantom.shepp_logan(space, modified=True)
+    proj = ray_trafo(vol)
+    broadcast_op = odl.BroadcastOperator(*subsets)
+    sub_projs = broadcast_op(vol)
+    for sub, sub_proj in zip(subsets, sub_projs):
+        assert all_almost_equal(sub_proj, sub.subset_data(proj))
+
+    if subset_order != 'random':
+        # Data of slice subsets are views
+        result = ray_trafo.range.zero()
+        for sub in subsets:
+            sub(vol, out=sub.subset_data(result))
+        assert all_almost_equal(result, proj)
+
+    # The subset adjoints add up to the full adjoint
+    data = odl.phantom.white_noise(ray_trafo.range)
+    sub_data = broadcast_op.range.element(
+        [sub.subset_data(data) for sub in subsets])
+    assert all_almost_equal(broadcast_op.adjoint(sub_data),
+                            ray_trafo.adjoint(data), places=4)
+
+    if subset_impl == 'sparse_matrix':
+        # The subset matrices were taken from the full matrix
+        key = ('sparse_matrix', space)
+        assert key in ray_trafo.geometry.implementation_cache
+        assert all(key in sub.geometry.implementation_cache
+                   for sub in subsets)
+
+
+def test_subsets_random_seed():
+    """Check that random subsets are reproducible with a seed."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (8, 8))
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=12)
+    ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+
+    idcs1 = [sub.angle_indices for sub in ray_trafo.subsets(4, 'random', 1)]
+    idcs2 = [sub.angle_indices for sub in ray_trafo.subsets(4, 'random', 1)]
+    assert idcs1 == idcs2
+
+    with pytest.raises(ValueError):
+        ray_trafo.subsets(13)
+    with pytest.raises(ValueError):
+        ray_trafo.subsets(2, order='backwards')
+
+
+def test_gram(subset_impl):
+    """Test the FFT-based Gram operator of the ray transform."""
+    space = odl.uniform_discr([-10, -10], [10, 10], (32, 32))
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=20)
+    ray_trafo = odl.tomo.RayTransform(space, geometry, impl=subset_impl)
+    gram = ray_trafo.gram()
+    assert isinstance(gram, odl.tomo.RayTransformGram)
+    assert gram.domain == gram.range == space
+
+    vol = odl.phantom.shepp_logan(space, modified=True)
+    exact = ray_trafo.adjoint(ray_trafo(vol))
+    assert gram(vol).dist(exact) < 0.05 * exact.norm()
+    assert gram.relative_error(vol) < 0.05
+
+    # Kernel is computed once and shared between instances
+    kernel_ft = gram.kernel_ft
+    assert odl.tomo.RayTransformGram(ray_trafo).kernel_ft is kernel_ft
+
+    # Self-adjointness
+    x = odl.phantom.white_noise(space)
+    y = odl.phantom.white_noise(space)
+    assert gram(x).inner(y) == pytest.approx(x.inner(gram(y)), rel=1e-4)
+
+    # Explicit composition
+    assert isinstance(ray_trafo.gram(exact=True), odl.OperatorComp)
+
+
+def test_gram_fallback():
+    """Check that unsupported geometries use the explicit composition."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (8, 8))
+    geometry = odl.tomo.cone_beam_geometry(space, src_radius=5,
+                                           det_radius=5, num_angles=8)
+    ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+    gram = ray_trafo.gram()
+    assert isinstance(gram, odl.OperatorComp)
+
+    with pytest.raises(ValueError):
+        odl.tomo.RayTransformGram(ray_trafo)
+
+
 def test_shifted_volume(geometry_type):
     """Check that geometry shifts are handled correctly.
 
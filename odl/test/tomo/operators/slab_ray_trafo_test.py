@@ -0,0 +1,102 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test the slab-wise evaluation of ray transforms."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.tomo import SlabRayTransform
+from odl.util.testutils import all_almost_equal, simple_fixture
+
+
+# --- pytest fixtures --- #
+
+
+geometry_type = simple_fixture('geometry', ['par3d', 'cone3d', 'helical'])
+axis = simple_fixture('axis', [0, 2])
+num_threads = simple_fixture('num_threads', [1, 3])
+
+
+def _ray_trafo(geometry_type):
+    """Return a small NumPy ray transform for ``geometry_type``."""
+    space = odl.uniform_discr([-1, -1, -1], [1, 1, 1], (12, 12, 12))
+    apart = odl.uniform_partition(0, 2 * np.pi, 10)
+    dpart = odl.uniform_partition([-2, -2], [2, 2], (16, 16))
+    if geometry_type == 'par3d':
+        geometry = odl.tomo.Parallel3dAxisGeometry(apart, dpart)
+    elif geometry_type == 'cone3d':
+        geometry = odl.tomo.ConeFlatGeometry(apart, dpart, src_radius=5,
+                                             det_radius=5)
+    elif geometry_type == 'helical':
+        geometry = odl.tomo.ConeFlatGeometry(apart, dpart, src_radius=5,
+                                             det_radius=5, pitch=0.5)
+    else:
+        raise ValueError('geometry not valid')
+
+    return odl.tomo.RayTransform(space, geometry, impl='numpy')
+
+
+# --- SlabRayTransform tests --- #
+
+
+def test_slab_ray_trafo(geometry_type, axis, num_threads):
+    """Slab-wise evaluation gives the same result as the ray transform."""
+    ray_trafo = _ray_trafo(geometry_type)
+    slab_trafo = SlabRayTransform(ray_trafo, num_slabs=4, axis=axis,
+                                  num_threads=num_threads)
+    assert slab_trafo.domain == ray_trafo.domain
+    assert slab_trafo.range == ray_trafo.range
+    assert slab_trafo.geometry is ray_trafo.geometry
+    assert not any(slab_op.use_cache for slab_op in slab_trafo.slab_ops)
+
+    x = odl.phantom.shepp_logan(ray_trafo.domain, modified=True)
+    assert all_almost_equal(slab_trafo(x), ray_trafo(x))
+
+    y = odl.phantom.white_noise(ray_trafo.range)
+    assert all_almost_equal(slab_trafo.adjoint(y), ray_trafo.adjoint(y))
+    assert slab_trafo.adjoint.adjoint is slab_trafo
+
+    # Slabs along the rotation axis need only parts of the detector rows
+    if axis == 2:
+        for slab_op in slab_trafo.slab_ops:
+            assert slab_op.range.shape[2] < ray_trafo.range.shape[2]
+
+
+def test_slab_ray_trafo_fbp():
+    """The slab-wise ray transform can be used with `fbp_op`."""
+    ray_trafo = _ray_trafo('cone3d')
+    slab_trafo = SlabRayTransform(ray_trafo, num_slabs=3)
+    y = ray_trafo(odl.phantom.cuboid(ray_trafo.domain))
+    assert all_almost_equal(odl.tomo.fbp_op(slab_trafo)(y),
+                            odl.tomo.fbp_op(ray_trafo)(y))
+
+
+def test_slab_ray_trafo_errors():
+    """Invalid parameters raise errors."""
+    ray_trafo = _ray_trafo('cone3d')
+    with pytest.raises(ValueError):
+        SlabRayTransform(ray_trafo, num_slabs=0)
+    with pytest.raises(ValueError):
+        SlabRayTransform(ray_trafo, num_slabs=13)
+    with pytest.raises(ValueError):
+        SlabRayTransform(ray_trafo, num_slabs=2, axis=3)
+    with pytest.raises(ValueError):
+        SlabRayTransform(ray_trafo, num_slabs=2, num_threads=0)
+
+    space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))
+    geometry = odl.tomo.parallel_beam_geometry(space)
+    with pytest.raises(ValueError):
+        SlabRayTransform(odl.tomo.RayTransform(space, geometry, impl='numpy'),
+                         num_slabs=2)
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
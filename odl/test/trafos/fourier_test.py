@@ -474,6 +474,21 @@ def test_fourier_trafo_call(impl, odl_floating_dtype):
     assert np.allclose(ift(ft(one)), one)
 
 
+def test_fourier_trafo_apply_batch(impl):
+    """Validate batch evaluation of Fourier transforms against calls."""
+    space = odl.uniform_discr([0, 0], [1, 2], (4, 5))
+    cspace = space.astype(complex)
+    for op in [DiscreteFourierTransform(space, impl=impl),
+               FourierTransform(space, impl=impl),
+               FourierTransform(cspace, impl=impl, shift=False),
+               FourierTransform(cspace, impl=impl, axes=1).inverse]:
+        x = noise_element(op.domain.batched(3))
+        result = op.apply_batch(x)
+        assert result in op.range.batched(3)
+        for x_i, result_i in zip(x, result):
+            assert all_almost_equal(result_i, op(x_i))
+
+
 def test_fourier_trafo_charfun_1d():
     # Characteristic function of [0, 1], its Fourier transform is
     # given by exp(-1j * y / 2) * sinc(y/2)
@@ -0,0 +1,95 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.util.parallel import (
+    _thread_pool, blocked_reduce, executor_map, num_threads, pairwise_sum,
+    parallel_map)
+
+
+def test_num_threads(monkeypatch):
+    monkeypatch.delenv('ODL_NUM_THREADS', raising=False)
+    assert num_threads() >= 1
+
+    monkeypatch.setenv('ODL_NUM_THREADS', '3')
+    assert num_threads() == 3
+
+    monkeypatch.setenv('ODL_NUM_THREADS', '0')
+    with pytest.raises(ValueError):
+        num_threads()
+
+
+def test_parallel_map():
+    args = list(range(20))
+    assert parallel_map(lambda i: i ** 2, args, nthreads=4) == [
+        i ** 2 for i in args]
+
+    # Nested calls are evaluated serially in the worker threads
+    def nested(i):
+        return sum(parallel_map(lambda j: i * j, range(4), nthreads=4))
+
+    assert parallel_map(nested, args, nthreads=4) == [6 * i for i in args]
+
+
+def test_parallel_map_pool_reused():
+    # The shared pool is not replaced for different numbers of arguments
+    # or threads
+    pool = _thread_pool()
+    for nargs in [2, 5, 64, 3]:
+        args = list(range(nargs))
+        assert parallel_map(lambda i: i + 1, args) == [i + 1 for i in args]
+        assert parallel_map(lambda i: i + 1, args, nthreads=2) == [
+            i + 1 for i in args]
+        assert _thread_pool() is pool
+
+    x = odl.rn(2 ** 21).one()
+    y = odl.rn(2 ** 22).one()
+    for _ in range(3):
+        x.norm()
+        y.norm()
+    assert _thread_pool() is pool
+
+
+def test_executor_map():
+    args = list(range(20))
+    for executor in [None, 'thread', 'process']:
+        assert executor_map(abs, [-i for i in args], executor=executor,
+                            max_workers=3) == args
+
+    with pytest.raises(ValueError):
+        executor_map(abs, args, executor='gpu')
+
+
+def test_pairwise_sum():
+    values = [1e-3] * 10007
+    assert pairwise_sum(values) == pytest.approx(10.007, rel=1e-14)
+    assert pairwise_sum([3]) == 3
+
+
+def test_blocked_reduce():
+    # Large enough for parallel evaluation
+    x = np.random.rand(2 ** 21 + 13)
+    y = np.random.rand(x.size)
+
+    result = blocked_reduce(np.dot, [x, y], block_size=2 ** 14, nthreads=4)
+    assert result == pytest.approx(np.dot(x, y))
+
+    result = blocked_reduce(lambda a: np.max(np.abs(a)), [x - y],
+                            block_size=1000, reduction='max')
+    assert result == np.max(np.abs(x - y))
+
+    with pytest.raises(ValueError):
+        blocked_reduce(np.sum, [x], block_size=10, reduction='min')
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
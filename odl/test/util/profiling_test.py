@@ -0,0 +1,74 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import division
+
+import odl
+from odl.util.profiling import profile
+
+
+def test_profile_stats():
+    space = odl.uniform_discr(0, 1, 10)
+    scal = odl.ScalingOperator(space, 2)
+    grad = odl.Gradient(space)
+    op = grad.adjoint * grad + scal
+    x = space.one()
+
+    original_call = odl.Operator.__call__
+    with profile(op) as prof:
+        assert odl.Operator.__call__ is not original_call
+        op(x)
+        op(x, out=space.element())
+    assert odl.Operator.__call__ is original_call
+
+    stats = prof.stats(op)
+    assert stats['calls'] == 2
+    assert stats['in_place'] == 1
+    assert stats['out_of_place'] == 1
+    assert stats['nbytes'] == x.nbytes
+    assert stats['time'] >= stats['self_time'] >= 0
+
+    assert prof.stats(scal)['calls'] == 2
+    assert prof.stats(op.left)['calls'] == 2
+    assert prof.stats(op.left.right)['calls'] == 2
+    assert prof.stats(odl.IdentityOperator(space))['calls'] == 0
+
+    # Calls outside of the context are not recorded
+    op(x)
+    assert prof.stats(op)['calls'] == 2
+
+    lines = prof.report().splitlines()
+    names = ['OperatorSum', '  OperatorComp', '    OperatorLeftScalarMult',
+             '      Divergence', '    Gradient', '  ScalingOperator']
+    assert len(lines) == 1 + len(names)
+    for line, name in zip(lines[1:], names):
+        assert line.endswith('  ' + name)
+
+    prof.reset()
+    assert prof.stats(op)['calls'] == 0
+
+
+def test_profile_nested():
+    space = odl.rn(3)
+    op = odl.ScalingOperator(space, 3)
+    x = space.one()
+
+    with profile() as outer:
+        op(x)
+        with profile() as inner:
+            op(x)
+        op(x)
+
+    assert outer.stats(op)['calls'] == 3
+    assert inner.stats(op)['calls'] == 1
+    assert outer.operators == [op]
+    assert outer.report().splitlines()[1].endswith(' ScalingOperator')
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
@@ -7,14 +7,17 @@
 # obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import print_function, division, absolute_import
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
 import numpy as np
 
-from odl.discr import ResizingOperator
-from odl.trafos import FourierTransform, PYFFTW_AVAILABLE
+from odl.operator import Operator
+from odl.trafos import PYFFTW_AVAILABLE
+from odl.util import is_string
 
 
-__all__ = ('fbp_op', 'fbp_filter_op', 'tam_danielson_window',
-           'parker_weighting')
+__all__ = ('fbp_op', 'fbp_filter_op', 'fbp_chunked', 'FbpFilterOperator',
+           'tam_danielson_window', 'parker_weighting')
 
 
 def _axis_in_detector(geometry):
@@ -92,44 +95,11 @@ def _fbp_filter(norm_freq, filter_type, frequency_scaling):
     return filt
 
 
-def tam_danielson_window(ray_trafo, smoothing_width=0.05, n_half_rot=1):
-    """Create Tam-Danielson window from a `RayTransform`.
-
-    The Tam-Danielson window is an indicator function on the minimal set of
-    data needed to reconstruct a volume from given data. It is useful in
-    analytic reconstruction methods such as FBP to give a more accurate
-    reconstruction.
-
-    See TAM1998_ for more information.
-
-    Parameters
-    ----------
-    ray_trafo : `RayTransform`
-        The ray transform for which to compute the window.
-    smoothing_width : positive float, optional
-        Width of the smoothing applied to the window's edges given as a
-        fraction of the width of the full window.
-    n_half_rot : odd int, optional
-        Total number of half rotations to include in the window. Values larger
-        than 1 should be used if the pitch is much smaller than the detector
-        height.
-
-    Returns
-    -------
-    tam_danielson_window : ``ray_trafo.range`` element
-
-    See Also
-    --------
-    fbp_op : Filtered back-projection operator from `RayTransform`
-    tam_danielson_window : Weighting for short scan data
-    ConeFlatGeometry : Primary use case for this window function.
+def _tam_danielson_array(ray_trafo, smoothing_width, n_half_rot):
+    """Return the Tam-Danielson window as broadcastable array.
 
-    References
-    ----------
-    [TSS1998] Tam, K C, Samarasekera, S and Sauer, F.
-    *Exact cone beam CT with a spiral scan*.
-    Physics in Medicine & Biology 4 (1998), p 1015.
-    https://dx.doi.org/10.1088/0031-9155/43/4/028
+    The window does not depend on the angle, hence the returned array
+    has length 1 along the first axis.
     """
     # Extract parameters
     src_radius = ray_trafo.geometry.src_radius
@@ -190,43 +160,61 @@ def tam_danielson_window(ray_trafo, smoothing_width=0.05, n_half_rot=1):
 
         return lower_wndw * upper_wndw
 
-    return ray_trafo.range.element(window_fcn) / n_half_rot
+    return window_fcn(ray_trafo.range.meshgrid) / n_half_rot
 
 
-def parker_weighting(ray_trafo, q=0.25):
-    """Create parker weighting for a `RayTransform`.
+def tam_danielson_window(ray_trafo, smoothing_width=0.05, n_half_rot=1):
+    """Create Tam-Danielson window from a `RayTransform`.
 
-    Parker weighting is a weighting function that ensures that oversampled
-    fan/cone beam data are weighted such that each line has unit weight. It is
-    useful in analytic reconstruction methods such as FBP to give a more
-    accurate result and can improve convergence rates for iterative methods.
+    The Tam-Danielson window is an indicator function on the minimal set of
+    data needed to reconstruct a volume from given data. It is useful in
+    analytic reconstruction methods such as FBP to give a more accurate
+    reconstruction.
 
-    See the article `Parker weights revisited`_ for more information.
+    See TAM1998_ for more information.
 
     Parameters
     ----------
     ray_trafo : `RayTransform`
-        The ray transform for which to compute the weights.
-    q : float, optional
-        Parameter controlling the speed of the roll-off at the edges of the
-        weighting. 1.0 gives the classical Parker weighting, while smaller
-        values in general lead to lower noise but stronger discretization
-        artifacts.
+        The ray transform for which to compute the window.
+    smoothing_width : positive float, optional
+        Width of the smoothing applied to the window's edges given as a
+        fraction of the width of the full window.
+    n_half_rot : odd int, optional
+        Total number of half rotations to include in the window. Values larger
+        than 1 should be used if the pitch is much smaller than the detector
+        height.
 
     Returns
     -------
-    parker_weighting : ``ray_trafo.range`` element
+    tam_danielson_window : ``ray_trafo.range`` element
 
     See Also
     --------
     fbp_op : Filtered back-projection operator from `RayTransform`
-    tam_danielson_window : Indicator function for helical data
-    FanFlatGeometry : Use case in 2d
-    ConeFlatGeometry : Use case in 3d (for pitch 0)
+    tam_danielson_window : Weighting for short scan data
+    ConeFlatGeometry : Primary use case for this window function.
 
     References
     ----------
-    .. _Parker weights revisited: https://www.ncbi.nlm.nih.gov/pubmed/11929021
+    [TSS1998] Tam, K C, Samarasekera, S and Sauer, F.
+    *Exact cone beam CT with a spiral scan*.
+    Physics in Medicine & Biology 4 (1998), p 1015.
+    https://dx.doi.org/10.1088/0031-9155/43/4/028
+    """
+    return ray_trafo.range.element(
+        np.broadcast_to(
+            _tam_danielson_array(ray_trafo, smoothing_width, n_half_rot),
+            ray_trafo.range.shape))
+
+
+def _parker_array(ray_trafo, q, angles):
+    """Return the Parker weights for ``angles`` as broadcastable array.
+
+    ``angles`` is a column vector of angles, see `parker_weighting`.
+    All other parameters are taken from ``ray_trafo``, such that the
+    weights of a subset of angles are the corresponding part of the
+    full weighting.
     """
     # Note: Parameter names taken from WES2002
 
@@ -234,7 +222,6 @@ def parker_weighting(ray_trafo, q=0.25):
     src_radius = ray_trafo.geometry.src_radius
     det_radius = ray_trafo.geometry.det_radius
     ndim = ray_trafo.geometry.ndim
-    angles = ray_trafo.range.meshgrid[0]
     min_rot_angle = ray_trafo.geometry.motion_partition.min_pt
     alen = ray_trafo.geometry.motion_params.length
 
@@ -291,81 +278,96 @@ def parker_weighting(ray_trafo, q=0.25):
     S_sum -= S((beta - np.pi - 2 * delta - epsilon) / b(-alpha) + 0.5)
 
     scale = 0.5 * alen / np.pi
-    return ray_trafo.range.element(
-        np.broadcast_to(S_sum * scale, ray_trafo.range.shape))
+    return S_sum * scale
 
 
-def fbp_filter_op(ray_trafo, padding=True, filter_type='Ram-Lak',
-                  frequency_scaling=1.0):
-    """Create a filter operator for FBP from a `RayTransform`.
+def parker_weighting(ray_trafo, q=0.25):
+    """Create parker weighting for a `RayTransform`.
+
+    Parker weighting is a weighting function that ensures that oversampled
+    fan/cone beam data are weighted such that each line has unit weight. It is
+    useful in analytic reconstruction methods such as FBP to give a more
+    accurate result and can improve convergence rates for iterative methods.
+
+    See the article `Parker weights revisited`_ for more information.
 
     Parameters
     ----------
     ray_trafo : `RayTransform`
-        The ray transform (forward operator) whose approximate inverse should
-        be computed. Its geometry has to be any of the following
+        The ray transform for which to compute the weights.
+    q : float, optional
+        Parameter controlling the speed of the roll-off at the edges of the
+        weighting. 1.0 gives the classical Parker weighting, while smaller
+        values in general lead to lower noise but stronger discretization
+        artifacts.
 
-        `Parallel2DGeometry` : Exact reconstruction
+    Returns
+    -------
+    parker_weighting : ``ray_trafo.range`` element
 
-        `Parallel3dAxisGeometry` : Exact reconstruction
+    See Also
+    --------
+    fbp_op : Filtered back-projection operator from `RayTransform`
+    tam_danielson_window : Indicator function for helical data
+    FanFlatGeometry : Use case in 2d
+    ConeFlatGeometry : Use case in 3d (for pitch 0)
 
-        `FanFlatGeometry` : Approximate reconstruction, correct in limit of
-        fan angle = 0.
+    References
+    ----------
+    .. _Parker weights revisited: https://www.ncbi.nlm.nih.gov/pubmed/11929021
+    """
+    angles = ray_trafo.range.meshgrid[0]
+    return ray_trafo.range.element(
+        np.broadcast_to(_parker_array(ray_trafo, q, angles),
+                        ray_trafo.range.shape))
 
-        `ConeFlatGeometry`, pitch = 0 (circular) : Approximate reconstruction,
-        correct in the limit of fan angle = 0 and cone angle = 0.
 
-        `ConeFlatGeometry`, pitch > 0 (helical) : Very approximate unless a
-        `tam_danielson_window` is used. Accurate with the window.
-
-        Other geometries: Not supported
+def _fast_fft_size(n):
+    """Return the smallest ``m >= n`` of the form ``2**a * 3**b * 5**c``.
 
-    padding : bool, optional
-        If the data space should be zero padded. Without padding, the data may
-        be corrupted due to the circular convolution used. Using padding makes
-        the algorithm slower.
-    filter_type : string, optional
-        The type of filter to be used. The options are, approximate order from
-        most noise senstive to least noise sensitive: 'Ram-Lak', 'Shepp-Logan',
-        'Cosine', 'Hamming' and 'Hann'.
-    frequency_scaling : float, optional
-        Relative cutoff frequency for the filter.
-        The normalized frequencies are rescaled so that they fit into the range
-        [0, frequency_scaling]. Any frequency above ``frequency_scaling`` is
-        set to zero.
+    Examples
+    --------
+    >>> _fast_fft_size(353)
+    360
+    >>> _fast_fft_size(64)
+    64
+    """
+    best = 2 ** int(np.ceil(np.log2(n)))
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            # Smallest power of 2 such that the product is >= n
+            size = power35
+            while size < n:
+                size *= 2
+            best = min(best, size)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def _fbp_filter_kernel(ray_trafo, proj_space, padding, filter_type,
+                       frequency_scaling):
+    """Return the frequency response of the FBP filter on ``proj_space``.
 
     Returns
     -------
-    filter_op : `Operator`
-        Filtering operator for FBP based on ``ray_trafo``.
-
-    See Also
-    --------
-    tam_danielson_window : Windowing for helical data
+    kernel : `numpy.ndarray`
+        Filter values on the FFT frequency grid of the (padded) data,
+        with length 1 along the angle axis. For real ``proj_space``, the
+        last axis in ``axes`` is half-complex.
+    axes : tuple of int
+        Axes along which the filter acts.
+    padded_shape : tuple of int
+        Shape of the zero-padded data.
     """
-    impl = 'pyfftw' if PYFFTW_AVAILABLE else 'numpy'
     alen = ray_trafo.geometry.motion_params.length
 
     if ray_trafo.domain.ndim == 2:
-        # Define ramp filter
-        def fourier_filter(x):
-            abs_freq = np.abs(x[1])
-            norm_freq = abs_freq / np.max(abs_freq)
-            filt = _fbp_filter(norm_freq, filter_type, frequency_scaling)
-            scaling = 1 / (2 * alen)
-            return filt * abs_freq * scaling
-
-        # Define (padded) fourier transform
-        if padding:
-            # Define padding operator
-            ran_shp = (ray_trafo.range.shape[0],
-                       ray_trafo.range.shape[1] * 2 - 1)
-            resizing = ResizingOperator(ray_trafo.range, ran_shp=ran_shp)
-
-            fourier = FourierTransform(resizing.range, axes=1, impl=impl)
-            fourier = fourier * resizing
-        else:
-            fourier = FourierTransform(ray_trafo.range, axes=1, impl=impl)
+        rot_dir = np.array([1.0])
+        axes = (1,)
+        scale = 1.0
 
     elif ray_trafo.domain.ndim == 3:
         # Find the direction that the filter should be taken in
@@ -374,11 +376,11 @@ def fbp_filter_op(ray_trafo, padding=True, filter_type='Ram-Lak',
         # Find what axes should be used in the fourier transform
         used_axes = (rot_dir != 0)
         if used_axes[0] and not used_axes[1]:
-            axes = [1]
+            axes = (1,)
         elif not used_axes[0] and used_axes[1]:
-            axes = [2]
+            axes = (2,)
         else:
-            axes = [1, 2]
+            axes = (1, 2)
 
         # Add scaling for cone-beam case
         if hasattr(ray_trafo.geometry, 'src_radius'):
@@ -395,67 +397,339 @@ def fbp_filter_op(ray_trafo, padding=True, filter_type='Ram-Lak',
                 scale *= alen / (np.pi)
         else:
             scale = 1.0
-
-        # Define ramp filter
-        def fourier_filter(x):
-            # If axis is aligned to a coordinate axis, save some memory and
-            # time by using broadcasting
-            if not used_axes[0]:
-                abs_freq = np.abs(rot_dir[1] * x[2])
-            elif not used_axes[1]:
-                abs_freq = np.abs(rot_dir[0] * x[1])
-            else:
-                abs_freq = np.abs(rot_dir[0] * x[1] + rot_dir[1] * x[2])
-            norm_freq = abs_freq / np.max(abs_freq)
-            filt = _fbp_filter(norm_freq, filter_type, frequency_scaling)
-            scaling = scale / (2 * alen)
-            return filt * abs_freq * scaling
-
-        # Define (padded) fourier transform
-        if padding:
-            # Define padding operator
-            if used_axes[0]:
-                padded_shape_u = ray_trafo.range.shape[1] * 2 - 1
-            else:
-                padded_shape_u = ray_trafo.range.shape[1]
-
-            if used_axes[1]:
-                padded_shape_v = ray_trafo.range.shape[2] * 2 - 1
-            else:
-                padded_shape_v = ray_trafo.range.shape[2]
-
-            ran_shp = (ray_trafo.range.shape[0],
-                       padded_shape_u,
-                       padded_shape_v)
-            resizing = ResizingOperator(ray_trafo.range, ran_shp=ran_shp)
-
-            fourier = FourierTransform(resizing.range, axes=axes, impl=impl)
-            fourier = fourier * resizing
-        else:
-            fourier = FourierTransform(ray_trafo.range, axes=axes, impl=impl)
     else:
         raise NotImplementedError('FBP only implemented in 2d and 3d')
 
-    # Create ramp in the detector direction
-    ramp_function = fourier.range.element(fourier_filter)
+    # Size of the frequency grid of the filter. Without padding, the data
+    # may be corrupted due to the circular convolution.
+    grid_shape = list(proj_space.shape)
+    if padding:
+        for axis in axes:
+            grid_shape[axis] = 2 * grid_shape[axis] - 1
+
+    # The frequency grid along each axis is
+    # `-pi / d + k * 2 * pi / (n * d)`, k = 0, ..., n - 1, as for the
+    # `FourierTransform`. For real data, the last axis is half-complex.
+    halfcomplex = proj_space.is_real
+    freq_comb = 0
+    for axis in axes:
+        part = proj_space.partition.byaxis[axis]
+        if not part.is_uniform:
+            raise ValueError('FBP filter needs uniform sampling along axis '
+                             '{}'.format(axis))
+        n = grid_shape[axis]
+        if halfcomplex and axis == axes[-1]:
+            num_freqs = n // 2 + 1
+        else:
+            num_freqs = n
+        cell_side = part.cell_sides[0]
+        freq = -np.pi / cell_side + np.arange(num_freqs) * (
+            2 * np.pi / (n * cell_side))
+        bcast_shape = [1] * proj_space.ndim
+        bcast_shape[axis] = -1
+        freq_comb = freq_comb + rot_dir[axis - 1] * freq.reshape(bcast_shape)
+
+    # Ramp in the detector direction
+    abs_freq = np.abs(freq_comb)
+    norm_freq = abs_freq / np.max(abs_freq)
+    filt = _fbp_filter(norm_freq, filter_type, frequency_scaling)
+    ramp = filt * abs_freq * (scale / (2 * alen))
 
     weight = 1
-    if not ray_trafo.range.is_weighted:
+    if not proj_space.is_weighted:
         # Compensate for potentially unweighted range of the ray transform
-        weight *= ray_trafo.range.cell_volume
+        weight *= proj_space.cell_volume
 
     if not ray_trafo.domain.is_weighted:
         # Compensate for potentially unweighted domain of the ray transform
         weight /= ray_trafo.domain.cell_volume
 
-    ramp_function *= weight
+    ramp *= weight
+
+    # Convolution kernel in real space. Since the grid starts at `-pi / d`,
+    # the kernel at index `m` carries an extra factor `(-1) ** m`, and it
+    # is anti-periodic for odd grid sizes.
+    grid_sizes = [grid_shape[axis] for axis in axes]
+    if halfcomplex:
+        kernel_grid = np.fft.irfftn(ramp, s=grid_sizes, axes=axes)
+    else:
+        kernel_grid = np.fft.ifftn(ramp, axes=axes)
+
+    # Linear convolution of the data with the kernel at offsets
+    # `-(n - 1), ..., n - 1` via FFTs of a fast size of at least
+    # `2 * n - 1`. For even sizes without padding, the convolution is
+    # circular with size `n`.
+    padded_shape = list(proj_space.shape)
+    index = [np.zeros(1, dtype=int)] * proj_space.ndim
+    factor = 1
+    for axis in axes:
+        n = proj_space.shape[axis]
+        if padding or n % 2 == 1:
+            size = _fast_fft_size(2 * n - 1)
+        else:
+            size = n
+        padded_shape[axis] = size
+        offsets = np.arange(size)
+        offsets[offsets >= n] -= size
+        index[axis] = offsets % grid_shape[axis]
+        bcast_shape = [1] * proj_space.ndim
+        bcast_shape[axis] = -1
+        axis_factor = np.where(offsets % 2 == 0, 1.0, -1.0)
+        if size > n:
+            axis_factor[offsets < -(n - 1)] = 0
+        factor = factor * axis_factor.reshape(bcast_shape)
+
+    kernel = kernel_grid[np.ix_(*index)] * factor
+
+    # The kernel is even, hence its Fourier transform is real
+    padded_sizes = [padded_shape[axis] for axis in axes]
+    if halfcomplex:
+        kernel_ft = np.fft.rfftn(kernel.real, s=padded_sizes, axes=axes)
+    else:
+        kernel_ft = np.fft.fftn(kernel, axes=axes)
+
+    return kernel_ft.real, axes, tuple(padded_shape)
+
+
+def _fbp_filter_op(ray_trafo, proj_space, padding, filter_type,
+                   frequency_scaling, num_threads=None):
+    """Create the FBP filter for ``proj_space`` from a `RayTransform`.
+
+    The geometry parameters are taken from ``ray_trafo``, while the
+    filter acts on ``proj_space``, which can be the range of a subset of
+    contiguous angles of ``ray_trafo``. Since the filter acts along the
+    detector axes only, filtering the parts of the data separately gives
+    the same result as filtering the full data. See `fbp_filter_op` for
+    the other parameters.
+
+    The frequency response of the filter is stored in the
+    ``implementation_cache`` of the geometry for reuse.
+    """
+    cache = ray_trafo.geometry.implementation_cache
+    key = ('fbp_filter', proj_space, ray_trafo.domain, bool(padding),
+           filter_type, float(frequency_scaling))
+    cached = cache.get(key, None)
+    if cached is None:
+        cached = _fbp_filter_kernel(ray_trafo, proj_space, padding,
+                                    filter_type, frequency_scaling)
+        cache[key] = cached
+
+    kernel, axes, padded_shape = cached
+    return FbpFilterOperator(proj_space, kernel, axes, padded_shape,
+                             num_threads=num_threads)
+
+
+class FbpFilterOperator(Operator):
+
+    """Filtering of projection data along the detector axes with FFTs.
+
+    The data is zero-padded along the filtered ``axes``, transformed with
+    a (real-to-complex, if possible) FFT along these axes only,
+    multiplied with a given frequency response and transformed back.
+    Blocks of angles are processed in parallel by a thread pool.
+
+    Use `fbp_filter_op` to create the filter for FBP.
+    """
+
+    def __init__(self, space, kernel, axes, padded_shape, num_threads=None,
+                 impl=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        space : `DiscreteLp`
+            Domain and range of the operator. The first axis is the
+            angle axis.
+        kernel : `array-like`
+            Frequency response of the filter, broadcastable to the shape
+            of the FFT of the padded data, i.e., to the shape of
+            ``numpy.fft.rfftn(x, padded_shape[axes], axes)`` for
+            real ``space`` and ``numpy.fft.fftn`` otherwise. It must be
+            real and even, i.e., the filter is self-adjoint.
+        axes : sequence of int
+            Axes along which the filter acts, not including the angle
+            axis 0.
+        padded_shape : sequence of int
+            Shape of the zero-padded data, at least ``space.shape``.
+        num_threads : positive int, optional
+            Number of threads among which the angles are distributed.
+            Default: Number of CPUs
+        impl : {'numpy', 'pyfftw'}, optional
+            Backend for the FFTs. Default: ``'pyfftw'`` if available,
+            otherwise ``'numpy'``.
+        """
+        super(FbpFilterOperator, self).__init__(space, space, linear=True)
+        self.__kernel = np.asarray(kernel)
+        self.__axes = tuple(int(a) for a in axes)
+        self.__padded_shape = tuple(int(n) for n in padded_shape)
+        if 0 in self.axes:
+            raise ValueError('`axes` may not contain the angle axis 0')
+        if len(self.padded_shape) != space.ndim:
+            raise ValueError('`padded_shape` must have length {}, got {}'
+                             ''.format(space.ndim, len(self.padded_shape)))
+        if any(n < m for n, m in zip(self.padded_shape, space.shape)):
+            raise ValueError('`padded_shape` {} smaller than `space.shape` '
+                             '{}'.format(self.padded_shape, space.shape))
+
+        if num_threads is None:
+            num_threads = cpu_count()
+        self.__num_threads = int(num_threads)
+        if self.num_threads < 1:
+            raise ValueError('`num_threads` must be positive, got {}'
+                             ''.format(num_threads))
+
+        if impl is None:
+            impl = 'pyfftw' if PYFFTW_AVAILABLE else 'numpy'
+        impl, impl_in = str(impl).lower(), impl
+        if impl == 'numpy':
+            self.__fft_module = np.fft
+        elif impl == 'pyfftw' and PYFFTW_AVAILABLE:
+            import pyfftw.interfaces.numpy_fft
+            self.__fft_module = pyfftw.interfaces.numpy_fft
+        else:
+            raise ValueError('`impl` {!r} not understood or not available'
+                             ''.format(impl_in))
+        self.__impl = impl
+
+    @property
+    def kernel(self):
+        """Frequency response of the filter."""
+        return self.__kernel
+
+    @property
+    def axes(self):
+        """Axes along which the filter acts."""
+        return self.__axes
+
+    @property
+    def padded_shape(self):
+        """Shape of the zero-padded data."""
+        return self.__padded_shape
+
+    @property
+    def num_threads(self):
+        """Number of threads used for the filtering."""
+        return self.__num_threads
+
+    @property
+    def impl(self):
+        """Backend for the FFTs."""
+        return self.__impl
+
+    def _filter_block(self, x_arr, out, angles):
+        """Filter the data of a block of angles."""
+        fft = self.__fft_module
+        s = [self.padded_shape[a] for a in self.axes]
+        if self.domain.is_real:
+            x_ft = fft.rfftn(x_arr[angles], s=s, axes=self.axes)
+            x_ft *= self.kernel
+            result = fft.irfftn(x_ft, s=s, axes=self.axes)
+        else:
+            x_ft = fft.fftn(x_arr[angles], s=s, axes=self.axes)
+            x_ft *= self.kernel
+            result = fft.ifftn(x_ft, s=s, axes=self.axes)
+
+        # The data is padded at the end, hence the filtered data is at
+        # the beginning
+        crop = (slice(None),) + tuple(slice(0, n)
+                                      for n in self.domain.shape[1:])
+        out[angles] = result[crop]
+
+    def _call(self, x, out):
+        """Implement ``self(x, out)``."""
+        x_arr = x.asarray()
+        num_angles = self.domain.shape[0]
+        num_blocks = min(self.num_threads, num_angles)
+        stops = np.linspace(0, num_angles, num_blocks + 1).astype(int)
+        blocks = [slice(start, stop)
+                  for start, stop in zip(stops[:-1], stops[1:])]
+
+        if num_blocks == 1:
+            self._filter_block(x_arr, out, blocks[0])
+        else:
+            pool = ThreadPool(num_blocks)
+            try:
+                pool.map(lambda blk: self._filter_block(x_arr, out, blk),
+                         blocks)
+            finally:
+                pool.terminate()
+
+    @property
+    def adjoint(self):
+        """Adjoint of this operator, i.e., ``self``.
+
+        The filter is self-adjoint since its frequency response is real
+        and even.
+        """
+        return self
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({!r}, axes={}, padded_shape={}, num_threads={})'.format(
+            self.__class__.__name__, self.domain, self.axes,
+            self.padded_shape, self.num_threads)
+
+
+def fbp_filter_op(ray_trafo, padding=True, filter_type='Ram-Lak',
+                  frequency_scaling=1.0, num_threads=None):
+    """Create a filter operator for FBP from a `RayTransform`.
+
+    Parameters
+    ----------
+    ray_trafo : `RayTransform`
+        The ray transform (forward operator) whose approximate inverse should
+        be computed. Its geometry has to be any of the following
+
+        `Parallel2DGeometry` : Exact reconstruction
+
+        `Parallel3dAxisGeometry` : Exact reconstruction
+
+        `FanFlatGeometry` : Approximate reconstruction, correct in limit of
+        fan angle = 0.
+
+        `ConeFlatGeometry`, pitch = 0 (circular) : Approximate reconstruction,
+        correct in the limit of fan angle = 0 and cone angle = 0.
+
+        `ConeFlatGeometry`, pitch > 0 (helical) : Very approximate unless a
+        `tam_danielson_window` is used. Accurate with the window.
+
+        Other geometries: Not supported
+
+    padding : bool, optional
+        If the data space should be zero padded. Without padding, the data may
+        be corrupted due to the circular convolution used. Using padding makes
+        the algorithm slower.
+    filter_type : string, optional
+        The type of filter to be used. The options are, approximate order from
+        most noise senstive to least noise sensitive: 'Ram-Lak', 'Shepp-Logan',
+        'Cosine', 'Hamming' and 'Hann'.
+    frequency_scaling : float, optional
+        Relative cutoff frequency for the filter.
+        The normalized frequencies are rescaled so that they fit into the range
+        [0, frequency_scaling]. Any frequency above ``frequency_scaling`` is
+        set to zero.
+    num_threads : positive int, optional
+        Number of threads among which blocks of angles are distributed
+        for the filtering. Default: Number of CPUs
+
+    Returns
+    -------
+    filter_op : `FbpFilterOperator`
+        Filtering operator for FBP based on ``ray_trafo``. Its frequency
+        response is stored in the ``implementation_cache`` of the
+        geometry, hence repeated calls with the same parameters are
+        cheap.
 
-    # Create ramp filter via the convolution formula with fourier transforms
-    return fourier.inverse * ramp_function * fourier
+    See Also
+    --------
+    tam_danielson_window : Windowing for helical data
+    """
+    return _fbp_filter_op(ray_trafo, ray_trafo.range, padding, filter_type,
+                          frequency_scaling, num_threads)
 
 
 def fbp_op(ray_trafo, padding=True, filter_type='Ram-Lak',
-           frequency_scaling=1.0):
+           frequency_scaling=1.0, num_threads=None):
     """Create filtered back-projection operator from a `RayTransform`.
 
     The filtered back-projection is an approximate inverse to the ray
@@ -495,6 +769,9 @@ def fbp_op(ray_trafo, padding=True, filter_type='Ram-Lak',
         The normalized frequencies are rescaled so that they fit into the range
         [0, frequency_scaling]. Any frequency above ``frequency_scaling`` is
         set to zero.
+    num_threads : positive int, optional
+        Number of threads among which blocks of angles are distributed
+        for the filtering. Default: Number of CPUs
 
     Returns
     -------
@@ -506,7 +783,179 @@ def fbp_op(ray_trafo, padding=True, filter_type='Ram-Lak',
     tam_danielson_window : Windowing for helical data
     """
     return ray_trafo.adjoint * fbp_filter_op(ray_trafo, padding, filter_type,
-                                             frequency_scaling)
+                                             frequency_scaling, num_threads)
+
+
+def fbp_chunked(ray_trafo, proj_data, chunk_size=None, padding=True,
+                filter_type='Ram-Lak', frequency_scaling=1.0,
+                weighting=None, out=None):
+    """Compute the filtered back-projection in chunks of angles.
+
+    The result is the same as ``fbp_op(ray_trafo)(proj_data)``, possibly
+    after multiplication of the data with a ``weighting``. However, the
+    projections are read, weighted, filtered and back-projected in
+    chunks of ``chunk_size`` consecutive angles, and the results are
+    accumulated in the output volume. Hence, apart from the volume,
+    the memory requirement scales with ``chunk_size`` rather than with
+    the total number of angles, and the data can be streamed from disk.
+
+    Parameters
+    ----------
+    ray_trafo : `RayTransform`
+        The ray transform whose approximate inverse should be applied,
+        see `fbp_op` for supported geometries. Its geometry has to
+        support indexing with slices, see `RayTransform.subsets`.
+    proj_data : array-like or callable
+        The projection data. Supported are
+
+        - Objects that can be sliced along the first (angle) axis and
+          return array-likes of the corresponding shape, e.g.,
+          `numpy.ndarray`, `numpy.memmap` or ``ray_trafo.range``
+          elements. Only the current chunk is read for memory-mapped
+          arrays.
+        - Callables ``proj_data(start, stop)`` returning the projections
+          with angle indices ``start, ..., stop - 1``. They can be used
+          to wrap file readers, e.g., `FileReaderMRC` or the loader of
+          the Mayo datasets, see Examples.
+
+    chunk_size : positive int, optional
+        Number of angles processed at once. By default, the chunk size
+        is chosen such that each chunk contains about ``2 ** 24``
+        data points, i.e., 64 MB for single precision.
+    padding, filter_type, frequency_scaling :
+        Filter parameters, see `fbp_op`.
+    weighting : {None, 'parker', 'tam_danielson'} or array-like, optional
+        Weighting of the data before filtering. For the string options,
+        `parker_weighting` and `tam_danielson_window`, respectively, with
+        default parameters are computed for each chunk. An array-like
+        must be broadcastable to ``ray_trafo.range.shape``, it is then
+        sliced along the first axis if its length is larger than 1.
+        ``None`` means no weighting.
+    out : ``ray_trafo.domain`` element, optional
+        Element to which the result is written.
+
+    Returns
+    -------
+    out : ``ray_trafo.domain`` element
+        The reconstruction. If ``out`` was given, the returned object is
+        a reference to it.
+
+    See Also
+    --------
+    fbp_op : Filtered back-projection operator for in-memory data
+    RayTransform.subsets : Ray transforms for subsets of angles
+
+    Examples
+    --------
+    Reconstruction from an array, in 4 chunks of 5 angles:
+
+    >>> space = odl.uniform_discr([-1, -1], [1, 1], (20, 20))
+    >>> geometry = odl.tomo.parallel_beam_geometry(space, num_angles=20)
+    >>> ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+    >>> proj_data = ray_trafo(odl.phantom.shepp_logan(space))
+    >>> reco = fbp_chunked(ray_trafo, proj_data.asarray(), chunk_size=5)
+    >>> fbp = fbp_op(ray_trafo)
+    >>> reco.dist(fbp(proj_data)) / reco.norm() < 1e-5
+    True
+
+    Data from files can be read chunk by chunk with a memory-mapped
+    array, e.g., ``np.load(file_name, mmap_mode='r')``, or a callable.
+    For the Mayo datasets, this could be::
+
+        def read_chunk(start, stop):
+            _, data = load_projections(folder, indices=slice(start, stop))
+            return data
+    """
+    if out is None:
+        out = ray_trafo.domain.zero()
+    elif out not in ray_trafo.domain:
+        raise TypeError('`out` {!r} is not an element of `ray_trafo.domain` '
+                        '{!r}'.format(out, ray_trafo.domain))
+    else:
+        out.set_zero()
+
+    num_angles = ray_trafo.range.shape[0]
+    if chunk_size is None:
+        chunk_size = max(1, 2 ** 24 // int(np.prod(ray_trafo.range.shape[1:])))
+    chunk_size, chunk_size_in = int(chunk_size), chunk_size
+    if chunk_size != chunk_size_in or chunk_size <= 0:
+        raise ValueError('`chunk_size` must be a positive integer, got {!r}'
+                         ''.format(chunk_size_in))
+
+    if callable(proj_data):
+        read_chunk = proj_data
+    else:
+        if proj_data in ray_trafo.range:
+            proj_data = proj_data.asarray()
+        if np.shape(proj_data) != ray_trafo.range.shape:
+            raise ValueError('`proj_data` must have shape {}, got {}'
+                             ''.format(ray_trafo.range.shape,
+                                       np.shape(proj_data)))
+
+        def read_chunk(start, stop):
+            return proj_data[start:stop]
+
+    if weighting is None:
+        get_weights = None
+    elif is_string(weighting):
+        weighting, weighting_in = weighting.lower(), weighting
+        if weighting == 'parker':
+            angles = ray_trafo.range.meshgrid[0]
+
+            def get_weights(start, stop):
+                return _parker_array(ray_trafo, 0.25, angles[start:stop])
+
+        elif weighting == 'tam_danielson':
+            window = _tam_danielson_array(ray_trafo, 0.05, 1)
+
+            def get_weights(start, stop):
+                return window
+
+        else:
+            raise ValueError('`weighting` {!r} not understood'
+                             ''.format(weighting_in))
+    else:
+        weights = np.asarray(weighting)
+        try:
+            np.broadcast_to(weights, ray_trafo.range.shape)
+        except ValueError:
+            raise ValueError('`weighting` with shape {} cannot be broadcast '
+                             'to {}'.format(weights.shape,
+                                            ray_trafo.range.shape))
+        weights = weights.reshape(
+            (1,) * (ray_trafo.range.ndim - weights.ndim) + weights.shape)
+
+        def get_weights(start, stop):
+            return weights if len(weights) == 1 else weights[start:stop]
+
+    # Subsets of contiguous angles have at most two different sizes, hence
+    # filters are cached by space
+    filters = {}
+    tmp = ray_trafo.domain.element()
+    for start in range(0, num_angles, chunk_size):
+        stop = min(start + chunk_size, num_angles)
+        # Create the operator of each chunk only when it is needed, and
+        # without assembling the full system matrix for
+        # ``impl='sparse_matrix'``, so that only the back-end data of one
+        # chunk is held at a time
+        sub = ray_trafo._subset(slice(start, stop), use_parent_matrix=False)
+
+        chunk = read_chunk(start, stop)
+        if get_weights is not None:
+            chunk = np.multiply(chunk, get_weights(start, stop))
+        chunk = sub.range.element(chunk)
+
+        filter_op = filters.get(sub.range, None)
+        if filter_op is None:
+            filter_op = _fbp_filter_op(ray_trafo, sub.range, padding,
+                                       filter_type, frequency_scaling)
+            filters[sub.range] = filter_op
+
+        sub.adjoint(filter_op(chunk), out=tmp)
+        out += tmp
+        del sub, chunk
+
+    return out
 
 
 if __name__ == '__main__':
@@ -9,6 +9,8 @@
 """Backend for ASTRA using CPU."""
 
 from __future__ import print_function, division, absolute_import
+from builtins import object
+from multiprocessing import Lock
 import numpy as np
 try:
     import astra
@@ -23,7 +25,8 @@ from odl.tomo.geometry import Geometry
 from odl.util import writable_array
 
 
-__all__ = ('astra_cpu_forward_projector', 'astra_cpu_back_projector')
+__all__ = ('astra_cpu_forward_projector', 'astra_cpu_back_projector',
+           'AstraCpuProjectorImpl', 'AstraCpuBackProjectorImpl')
 
 
 # TODO: use context manager when creating data structures
@@ -210,6 +213,213 @@ def astra_cpu_back_projector(proj_data, geometry, reco_space, out=None):
     return out
 
 
+class AstraCpuImplBase(object):
+
+    """Base class for thin ASTRA CPU wrappers with persistent objects.
+
+    The ASTRA data, projector and algorithm objects are created once
+    and kept alive until `delete_ids` is called or the object is
+    garbage collected. The data objects are linked to two float32
+    arrays owned by this object, hence ASTRA does not allocate or copy
+    any data of its own during a call.
+    """
+
+    algo_id = None
+    vol_id = None
+    sino_id = None
+    proj_id = None
+
+    def __init__(self, geometry, reco_space, proj_space, direction):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        geometry : `Geometry`
+            Geometry defining the tomographic setup.
+        reco_space : `DiscreteLp`
+            Reconstruction space, the space of the volume data.
+        proj_space : `DiscreteLp`
+            Projection space, the space of the projection data.
+        direction : {'forward', 'backward'}
+            Direction of the ASTRA algorithm.
+        """
+        assert isinstance(geometry, Geometry)
+        assert isinstance(reco_space, DiscreteLp)
+        assert isinstance(proj_space, DiscreteLp)
+        if geometry.ndim != 2:
+            raise ValueError('ASTRA CPU back-end only supports 2d '
+                             'geometries, got `geometry.ndim` {}'
+                             ''.format(geometry.ndim))
+
+        self.geometry = geometry
+        self.reco_space = reco_space
+        self.proj_space = proj_space
+        self.direction = direction
+
+        self.create_ids()
+
+        # Create a mutually exclusive lock so that two callers cant use the
+        # same shared resource at the same time.
+        self._mutex = Lock()
+
+    def create_ids(self):
+        """Create ASTRA objects."""
+        if self.direction == 'forward':
+            interp_space = self.reco_space
+        else:
+            interp_space = self.proj_space
+        if not all(s == interp_space.interp_byaxis[0]
+                   for s in interp_space.interp_byaxis):
+            raise ValueError('interpolation must be the same in each '
+                             'dimension, got {}'.format(interp_space.interp))
+
+        self.vol_array = np.zeros(self.reco_space.shape, dtype='float32',
+                                  order='C')
+        self.sino_array = np.zeros(self.proj_space.shape, dtype='float32',
+                                   order='C')
+
+        vol_geom = astra_volume_geometry(self.reco_space)
+        proj_geom = astra_projection_geometry(self.geometry)
+        self.vol_id = astra_data(vol_geom, datatype='volume',
+                                 data=self.vol_array, allow_copy=False)
+        self.sino_id = astra_data(proj_geom, datatype='projection',
+                                  data=self.sino_array, allow_copy=False)
+        self.proj_id = astra_projector(interp_space.interp, vol_geom,
+                                       proj_geom, ndim=2, impl='cpu')
+        self.algo_id = astra_algorithm(self.direction, 2, self.vol_id,
+                                       self.sino_id, self.proj_id,
+                                       impl='cpu')
+
+    def delete_ids(self):
+        """Delete ASTRA objects.
+
+        After this, the object cannot be used anymore until `create_ids`
+        is called again.
+        """
+        if self.algo_id is not None:
+            astra.algorithm.delete(self.algo_id)
+            self.algo_id = None
+        if self.vol_id is not None:
+            astra.data2d.delete(self.vol_id)
+            self.vol_id = None
+        if self.sino_id is not None:
+            astra.data2d.delete(self.sino_id)
+            self.sino_id = None
+        if self.proj_id is not None:
+            astra.projector.delete(self.proj_id)
+            self.proj_id = None
+
+    def __del__(self):
+        """Delete ASTRA objects."""
+        self.delete_ids()
+
+
+class AstraCpuProjectorImpl(AstraCpuImplBase):
+
+    """Thin wrapper around ASTRA for repeated CPU forward projection."""
+
+    def __init__(self, geometry, reco_space, proj_space):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        geometry : `Geometry`
+            Geometry defining the tomographic setup.
+        reco_space : `DiscreteLp`
+            Reconstruction space, the space of the images to be forward
+            projected.
+        proj_space : `DiscreteLp`
+            Projection space, the space of the result.
+        """
+        super(AstraCpuProjectorImpl, self).__init__(
+            geometry, reco_space, proj_space, direction='forward')
+
+    def call_forward(self, vol_data, out=None):
+        """Run an ASTRA forward projection on the given data using the CPU.
+
+        Parameters
+        ----------
+        vol_data : `reco_space` element
+            Volume data to which the projector is applied.
+        out : `proj_space` element, optional
+            Element of the projection space to which the result is written.
+            If ``None``, an element in `proj_space` is created.
+
+        Returns
+        -------
+        out : ``proj_space`` element
+            Projection data resulting from the application of the
+            projector. If ``out`` was provided, the returned object is a
+            reference to it.
+        """
+        with self._mutex:
+            assert vol_data in self.reco_space
+            if out is not None:
+                assert out in self.proj_space
+            else:
+                out = self.proj_space.element()
+
+            self.vol_array[:] = vol_data.asarray()
+            astra.algorithm.run(self.algo_id)
+            out[:] = self.sino_array
+            return out
+
+
+class AstraCpuBackProjectorImpl(AstraCpuImplBase):
+
+    """Thin wrapper around ASTRA for repeated CPU back-projection."""
+
+    def __init__(self, geometry, reco_space, proj_space):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        geometry : `Geometry`
+            Geometry defining the tomographic setup.
+        reco_space : `DiscreteLp`
+            Reconstruction space, the space of the result.
+        proj_space : `DiscreteLp`
+            Projection space, the space of the data to be back-projected.
+        """
+        super(AstraCpuBackProjectorImpl, self).__init__(
+            geometry, reco_space, proj_space, direction='backward')
+
+    def call_backward(self, proj_data, out=None):
+        """Run an ASTRA back-projection on the given data using the CPU.
+
+        Parameters
+        ----------
+        proj_data : `proj_space` element
+            Projection data to which the back-projector is applied.
+        out : `reco_space` element, optional
+            Element of the reconstruction space to which the result is
+            written. If ``None``, an element in `reco_space` is created.
+
+        Returns
+        -------
+        out : ``reco_space`` element
+            Reconstruction data resulting from the application of the
+            back-projector. If ``out`` was provided, the returned object
+            is a reference to it.
+        """
+        with self._mutex:
+            assert proj_data in self.proj_space
+            if out is not None:
+                assert out in self.reco_space
+            else:
+                out = self.reco_space.element()
+
+            self.sino_array[:] = proj_data.asarray()
+            astra.algorithm.run(self.algo_id)
+            out[:] = self.vol_array
+
+            # Weight the adjoint by appropriate weights
+            scaling_factor = float(self.proj_space.weighting.const)
+            scaling_factor /= float(self.reco_space.weighting.const)
+            out *= scaling_factor
+            return out
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
@@ -268,11 +268,11 @@ def astra_conebeam_3d_geom_to_vec(geometry):
     vectors = np.zeros((angles.size, 12))
 
     # Source position
-    vectors[:, 0:3] = geometry.src_position(angles)
+    vectors[:, 0:3] = geometry.src_position_grid()
 
     # Center of detector in 3D space
     mid_pt = geometry.det_params.mid_pt
-    vectors[:, 3:6] = geometry.det_point_position(angles, mid_pt)
+    vectors[:, 3:6] = geometry.det_point_position_grid(mid_pt)
 
     # Vectors from detector pixel (0, 0) to (1, 0) and (0, 0) to (0, 1)
     # `det_axes` gives shape (N, 2, 3), swap to get (2, N, 3)
@@ -339,14 +339,12 @@ def astra_conebeam_2d_geom_to_vec(geometry):
     vectors = np.zeros((angles.size, 6))
 
     # Source position
-    src_pos = geometry.src_position(angles)
+    src_pos = geometry.src_position_grid()
     vectors[:, 0:2] = rot_minus_90.dot(src_pos.T).T  # dot along 2nd axis
 
     # Center of detector
     mid_pt = geometry.det_params.mid_pt
-    # Need to cast `mid_pt` to float since otherwise the empty axis is
-    # not removed
-    centers = geometry.det_point_position(angles, float(mid_pt))
+    centers = geometry.det_point_position_grid(mid_pt)
     vectors[:, 2:4] = rot_minus_90.dot(centers.T).T
 
     # Vector from detector pixel 0 to 1
@@ -396,11 +394,12 @@ def astra_parallel_3d_geom_to_vec(geometry):
 
     vectors = np.zeros((angles.shape[-1], 12))
 
-    # Ray direction = -(detector-to-source normal vector)
-    vectors[:, 0:3] = -geometry.det_to_src(angles, mid_pt)
+    # Ray direction = -(detector-to-source normal vector), with angles
+    # flattened to one axis for several motion parameters
+    vectors[:, 0:3] = -geometry.det_to_src_grid(mid_pt).reshape(-1, 3)
 
     # Center of the detector in 3D space
-    vectors[:, 3:6] = geometry.det_point_position(angles, mid_pt)
+    vectors[:, 3:6] = geometry.det_point_position_grid(mid_pt).reshape(-1, 3)
 
     # Vectors from detector pixel (0, 0) to (1, 0) and (0, 0) to (0, 1)
     # `det_axes` gives shape (N, 2, 3), swap to get (2, N, 3)
@@ -0,0 +1,385 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Ray transform in 2d and 3d using pure NumPy (Joseph's method).
+
+The projector implemented here traces straight lines through a uniformly
+discretized volume. For each ray, the coordinate axis with the largest
+absolute direction component is selected as "driving" axis, and the
+volume is sampled at the intersection of the ray with each slice
+perpendicular to that axis, using (bi)linear interpolation in the
+remaining axes. The contribution of each sample is weighted with the
+length of the ray segment within the slice.
+
+All computations are vectorized over blocks of rays, i.e., over a number
+of angles and all detector pixels at once. The same coefficients are used
+for forward and back-projection, hence the two are exactly adjoint to
+each other (up to the weighting of the spaces).
+"""
+
+from __future__ import print_function, division, absolute_import
+import numpy as np
+
+from odl.discr import DiscreteLp, DiscreteLpElement
+from odl.tomo.geometry import (
+    Geometry, DivergentBeamGeometry, ParallelBeamGeometry)
+
+
+__all__ = ('numpy_forward_projector', 'numpy_back_projector')
+
+
+# Maximum number of (ray, sample) pairs handled in one vectorized block.
+# This bounds the size of the temporary arrays to a few 10 MB.
+MAX_BLOCK_SIZE = 2 ** 20
+
+
+def numpy_check_geometry(geometry):
+    """Raise if ``geometry`` is not supported by the NumPy back-end."""
+    if not isinstance(geometry, (ParallelBeamGeometry,
+                                 DivergentBeamGeometry)):
+        raise TypeError("'numpy' back-end only supports parallel beam and "
+                        'divergent beam geometries, got {!r}'
+                        ''.format(geometry))
+    if geometry.motion_partition.ndim != 1:
+        raise ValueError("'numpy' back-end only supports geometries with "
+                         'a single motion parameter, got '
+                         '`motion_partition.ndim = {}`'
+                         ''.format(geometry.motion_partition.ndim))
+    if geometry.ndim not in (2, 3):
+        raise ValueError("'numpy' back-end only supports 2d and 3d "
+                         'geometries, got `ndim = {}`'.format(geometry.ndim))
+
+
+def ray_geometry(geometry, angle_slc=slice(None)):
+    """Return start points, directions and lengths of the rays.
+
+    Parameters
+    ----------
+    geometry : `Geometry`
+        Geometry defining the rays. Only geometries with one motion
+        parameter are supported.
+    angle_slc : slice, optional
+        Slice into `Geometry.angles` determining the angles for which
+        the rays are computed.
+
+    Returns
+    -------
+    starts : `numpy.ndarray`, shape ``(num_rays, ndim)``
+        Start points of the rays. For divergent beam geometries, these
+        are the source positions, otherwise the detector points.
+    dirs : `numpy.ndarray`, shape ``(num_rays, ndim)``
+        Unit vectors pointing along the rays.
+    lengths : `numpy.ndarray` or None
+        Distances from source to detector point, with shape
+        ``(num_rays,)``, or ``None`` for parallel beam geometries, in
+        which case the rays are infinite lines.
+
+    Notes
+    -----
+    The rays are ordered as the projection data, i.e., with angles
+    varying slowest.
+    """
+    angles = geometry.angles[angle_slc]
+    det_ndim = geometry.det_partition.ndim
+    ndim = geometry.ndim
+
+    # Angles vary along the first axis, detector parameters along the
+    # others, such that all vectors are computed in one broadcast
+    angles = angles.reshape((-1,) + (1,) * det_ndim)
+    det_mesh = tuple(p[None, ...] for p in geometry.det_grid.meshgrid)
+    if det_ndim == 1:
+        dparam = det_mesh[0]
+    else:
+        dparam = det_mesh
+
+    det_pts = geometry.det_point_position(angles, dparam)
+    shape = det_pts.shape
+    det_pts = det_pts.reshape(-1, ndim)
+
+    if isinstance(geometry, DivergentBeamGeometry):
+        src_pts = geometry.src_position(angles)
+        src_pts = np.broadcast_to(src_pts, shape).reshape(-1, ndim)
+        dirs = det_pts - src_pts
+        lengths = np.linalg.norm(dirs, axis=1)
+        dirs /= lengths[:, None]
+        return src_pts, dirs, lengths
+    else:
+        dirs = geometry.det_to_src(angles, dparam)
+        dirs = np.broadcast_to(dirs, shape).reshape(-1, ndim)
+        return det_pts, dirs, None
+
+
+def joseph_coefficients(starts, dirs, lengths, reco_space, axis):
+    """Return interpolation indices and weights for rays along ``axis``.
+
+    Parameters
+    ----------
+    starts, dirs : `numpy.ndarray`, shape ``(num_rays, ndim)``
+        Start points and unit direction vectors of the rays.
+    lengths : `numpy.ndarray` or None
+        If given, only the ray segments between the start points and
+        the points at these distances are considered.
+    reco_space : `DiscreteLp`
+        Uniformly discretized volume space.
+    axis : int
+        Driving axis, i.e., the volume is sampled at each slice
+        perpendicular to this axis. For accuracy, this should be the
+        axis with the largest absolute direction component for all rays.
+
+    Returns
+    -------
+    indices : `numpy.ndarray`, shape ``(num_rays, K)``
+        Flat (C order) indices into the volume padded with one cell of
+        zeros on each side in each axis, see `padded_shape`.
+    weights : `numpy.ndarray`, shape ``(num_rays, K)``
+        Weights belonging to ``indices``, such that the line integral
+        along a ray is the sum of ``weights * padded_vol.ravel()[indices]``.
+    """
+    shape = reco_space.shape
+    ndim = len(shape)
+    min_pt = reco_space.min_pt
+    cell_sides = reco_space.cell_sides
+    pad_shape = padded_shape(shape)
+    strides = np.cumprod((1,) + pad_shape[:0:-1])[::-1]
+    num_rays = starts.shape[0]
+    num_samples = shape[axis]
+    num_corners = 2 ** (ndim - 1)
+    samples = np.arange(num_samples, dtype=reco_space.real_dtype)
+
+    # Use the smallest possible data types to save memory bandwidth
+    dtype = reco_space.real_dtype
+    if np.prod(pad_shape) < np.iinfo('int32').max:
+        index_dtype = 'int32'
+    else:
+        index_dtype = 'int64'
+
+    # Rays are parametrized as `start + t * dir`, and the ray parameters
+    # at the slice midpoints along `axis` are `t = t0 + dt * samples`
+    dt = cell_sides[axis] / dirs[:, axis]
+    t0 = ((min_pt[axis] + 0.5 * cell_sides[axis] - starts[:, axis]) /
+          dirs[:, axis])
+
+    # Length of the ray segment within a slice, restricted to the part
+    # between source and detector if applicable
+    step = np.abs(dt)
+    weights = np.empty((num_rays, num_corners, num_samples), dtype=dtype)
+    if lengths is None:
+        weights[:, 0] = step[:, None]
+    else:
+        t = t0[:, None] + dt[:, None] * samples
+        weights[:, 0] = (t >= 0) & (t <= lengths[:, None])
+        weights[:, 0] *= step[:, None]
+        del t
+
+    indices = np.empty((num_rays, num_corners, num_samples),
+                       dtype=index_dtype)
+    indices[:, 0] = (np.arange(num_samples) + 1) * strides[axis]
+
+    # Linear interpolation in all other axes. Positions outside of the
+    # volume are clipped to the padding, which contributes zeros.
+    num_filled = 1
+    for i in range(ndim):
+        if i == axis:
+            continue
+
+        # Index space position, shifted by 1 due to padding
+        pos0 = ((starts[:, i] + t0 * dirs[:, i] - min_pt[i]) / cell_sides[i]
+                + 0.5).astype(dtype)
+        dpos = (dt * dirs[:, i] / cell_sides[i]).astype(dtype)
+        pos = pos0[:, None] + dpos[:, None] * samples
+        np.clip(pos, 0, shape[i] + 1, out=pos)
+
+        # Truncation is rounding down since `pos` is nonnegative
+        left = pos.astype(index_dtype)
+        np.minimum(left, shape[i], out=left)
+        pos -= left
+        left *= strides[i]
+
+        # Corners with right neighbor in axis `i` go to the second half
+        new_slc = slice(num_filled, 2 * num_filled)
+        old_slc = slice(0, num_filled)
+        weights[:, new_slc] = weights[:, old_slc] * pos[:, None]
+        weights[:, old_slc] -= weights[:, new_slc]
+        indices[:, old_slc] += left[:, None]
+        indices[:, new_slc] = indices[:, old_slc] + strides[i]
+        num_filled *= 2
+
+    return (indices.reshape(num_rays, -1), weights.reshape(num_rays, -1))
+
+
+def padded_shape(shape):
+    """Return the volume shape with one padding cell on each side."""
+    return tuple(n + 2 for n in shape)
+
+
+def joseph_blocks(geometry, reco_space):
+    """Generate the projection matrix in blocks of rays.
+
+    Parameters
+    ----------
+    geometry : `Geometry`
+        Geometry defining the rays.
+    reco_space : `DiscreteLp`
+        Uniformly discretized volume space.
+
+    Yields
+    ------
+    ray_indices : `numpy.ndarray`, shape ``(num_rays,)``
+        Flat (C order) indices of the rays in the projection data.
+    indices, weights : `numpy.ndarray`, shape ``(num_rays, K)``
+        Flat indices into the padded volume and corresponding weights,
+        see `joseph_coefficients`.
+    """
+    numpy_check_geometry(geometry)
+    if not reco_space.is_uniform:
+        raise ValueError('`reco_space` {!r} is not uniformly discretized'
+                         ''.format(reco_space))
+
+    num_angles = geometry.motion_partition.shape[0]
+    det_size = geometry.det_partition.size
+    samples_per_ray = max(reco_space.shape) * 2 ** (reco_space.ndim - 1)
+    rays_per_block = max(1, MAX_BLOCK_SIZE // samples_per_ray)
+    angles_per_block = max(1, rays_per_block // det_size)
+
+    for angle_start in range(0, num_angles, angles_per_block):
+        angle_slc = slice(angle_start, angle_start + angles_per_block)
+        starts, dirs, lengths = ray_geometry(geometry, angle_slc)
+        ray_offset = angle_start * det_size
+
+        # Group the rays by driving axis
+        driving_axis = np.argmax(np.abs(dirs), axis=1)
+        for axis in range(reco_space.ndim):
+            rays = np.flatnonzero(driving_axis == axis)
+            for i in range(0, rays.size, rays_per_block):
+                ray_idcs = rays[i:i + rays_per_block]
+                indices, weights = joseph_coefficients(
+                    starts[ray_idcs], dirs[ray_idcs],
+                    None if lengths is None else lengths[ray_idcs],
+                    reco_space, axis)
+                yield ray_offset + ray_idcs, indices, weights
+
+
+def numpy_forward_projector(vol_data, geometry, proj_space, out=None):
+    """Run a forward projection on the given data using NumPy.
+
+    Parameters
+    ----------
+    vol_data : `DiscreteLpElement`
+        Volume data to which the forward projector is applied.
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    proj_space : `DiscreteLp`
+        Space to which the calling operator maps.
+    out : ``proj_space`` element, optional
+        Element of the projection space to which the result is written. If
+        ``None``, an element in ``proj_space`` is created.
+
+    Returns
+    -------
+    out : ``proj_space`` element
+        Projection data resulting from the application of the projector.
+        If ``out`` was provided, the returned object is a reference to it.
+    """
+    if not isinstance(vol_data, DiscreteLpElement):
+        raise TypeError('volume data {!r} is not a `DiscreteLpElement` '
+                        'instance.'.format(vol_data))
+    if not isinstance(geometry, Geometry):
+        raise TypeError('geometry  {!r} is not a Geometry instance'
+                        ''.format(geometry))
+    if not isinstance(proj_space, DiscreteLp):
+        raise TypeError('`proj_space` {!r} is not a DiscreteLp '
+                        'instance.'.format(proj_space))
+    if vol_data.ndim != geometry.ndim:
+        raise ValueError('dimensions {} of volume data and {} of geometry '
+                         'do not match'
+                         ''.format(vol_data.ndim, geometry.ndim))
+    if out is None:
+        out = proj_space.element()
+    else:
+        if out not in proj_space:
+            raise TypeError('`out` {} is neither None nor a '
+                            'DiscreteLpElement instance'.format(out))
+
+    vol_arr = np.pad(vol_data.asarray(), 1, mode='constant').ravel()
+    proj_arr = np.empty(proj_space.size, dtype=proj_space.dtype)
+    for ray_idcs, indices, weights in joseph_blocks(geometry,
+                                                    vol_data.space):
+        proj_arr[ray_idcs] = np.einsum('ij,ij->i', weights, vol_arr[indices])
+
+    out[:] = proj_arr.reshape(proj_space.shape)
+    return out
+
+
+def numpy_back_projector(proj_data, geometry, reco_space, out=None):
+    """Run a back-projection on the given data using NumPy.
+
+    Parameters
+    ----------
+    proj_data : `DiscreteLpElement`
+        Projection data to which the back-projector is applied.
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    reco_space : `DiscreteLp`
+        Space to which the calling operator maps.
+    out : ``reco_space`` element, optional
+        Element of the reconstruction space to which the result is written.
+        If ``None``, an element in ``reco_space`` is created.
+
+    Returns
+    -------
+    out : ``reco_space`` element
+        Reconstruction data resulting from the application of the backward
+        projector. If ``out`` was provided, the returned object is a
+        reference to it.
+    """
+    if not isinstance(proj_data, DiscreteLpElement):
+        raise TypeError('projection data {!r} is not a DiscreteLpElement '
+                        'instance'.format(proj_data))
+    if not isinstance(geometry, Geometry):
+        raise TypeError('geometry  {!r} is not a Geometry instance'
+                        ''.format(geometry))
+    if not isinstance(reco_space, DiscreteLp):
+        raise TypeError('reconstruction space {!r} is not a DiscreteLp '
+                        'instance'.format(reco_space))
+    if reco_space.ndim != geometry.ndim:
+        raise ValueError('dimensions {} of reconstruction space and {} of '
+                         'geometry do not match'.format(
+                             reco_space.ndim, geometry.ndim))
+    if out is None:
+        out = reco_space.element()
+    else:
+        if out not in reco_space:
+            raise TypeError('`out` {} is neither None nor a '
+                            'DiscreteLpElement instance'.format(out))
+
+    proj_arr = proj_data.asarray().ravel()
+    pad_shape = padded_shape(reco_space.shape)
+    vol_arr = np.zeros(np.prod(pad_shape), dtype='float64')
+    for ray_idcs, indices, weights in joseph_blocks(geometry, reco_space):
+        if indices.size == 0:
+            continue
+        weights *= proj_arr[ray_idcs, None]
+        # Only accumulate over the range of voxels touched by the block
+        start, stop = indices.min(), indices.max() + 1
+        vol_arr[start:stop] += np.bincount(indices.ravel() - start,
+                                           weights.ravel(),
+                                           minlength=stop - start)
+
+    # Weight the adjoint by appropriate weights
+    scaling_factor = float(proj_data.space.weighting.const)
+    scaling_factor /= float(reco_space.weighting.const)
+
+    vol_arr = vol_arr.reshape(pad_shape)[(slice(1, -1),) * reco_space.ndim]
+    out[:] = vol_arr
+    out *= scaling_factor
+    return out
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -0,0 +1,325 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Ray transform using a precomputed sparse system matrix.
+
+The matrix is assembled once from the coefficients of the NumPy back-end
+(Joseph's method), after which forward and back-projection are single
+sparse matrix-vector products. Matrices are stored in
+`Geometry.implementation_cache` and can optionally be saved to and
+loaded from a cache directory.
+"""
+
+from __future__ import print_function, division, absolute_import
+import hashlib
+import os
+import numpy as np
+import scipy.sparse
+
+from odl.discr import DiscreteLp, DiscreteLpElement
+from odl.tomo.backends.numpy_ray import (
+    joseph_blocks, numpy_check_geometry, padded_shape, ray_geometry)
+from odl.tomo.geometry import Geometry
+
+
+__all__ = ('sparse_matrix_forward_projector', 'sparse_matrix_back_projector',
+           'ray_trafo_sparse_matrix')
+
+
+# Increase when the matrix assembly changes to invalidate old cache files
+_CACHE_FORMAT_VERSION = 1
+
+
+def sparse_matrix_cache_key(geometry, reco_space):
+    """Return a hash string identifying the system matrix.
+
+    The key is computed from the exact ray geometry and volume
+    discretization, hence it is stable across sessions and independent
+    of the (possibly abbreviated) string representations of the objects.
+
+    Parameters
+    ----------
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    reco_space : `DiscreteLp`
+        Uniformly discretized volume space.
+
+    Returns
+    -------
+    key : str
+        Hexadecimal SHA-1 hash.
+    """
+    sha = hashlib.sha1()
+    sha.update('odl_ray_trafo_v{}'.format(_CACHE_FORMAT_VERSION).encode())
+    sha.update(type(geometry).__name__.encode())
+    sha.update(np.asarray(reco_space.shape, dtype='int64').tobytes())
+    sha.update(np.asarray(reco_space.min_pt, dtype='float64').tobytes())
+    sha.update(np.asarray(reco_space.max_pt, dtype='float64').tobytes())
+    sha.update(np.dtype(reco_space.real_dtype).str.encode())
+    for arr in ray_geometry(geometry):
+        if arr is not None:
+            sha.update(np.ascontiguousarray(arr, dtype='float64').tobytes())
+    return sha.hexdigest()
+
+
+def _assemble_sparse_matrix(geometry, reco_space):
+    """Return the Joseph projection matrix as CSR matrix."""
+    vol_size = reco_space.size
+    proj_size = geometry.partition.size
+    dtype = reco_space.real_dtype
+
+    # Map indices of the padded volume to the original one, -1 for padding
+    pad_shape = padded_shape(reco_space.shape)
+    pad_to_vol = -np.ones(pad_shape, dtype='int64')
+    pad_to_vol[(slice(1, -1),) * reco_space.ndim] = np.arange(
+        vol_size).reshape(reco_space.shape)
+    pad_to_vol = pad_to_vol.ravel()
+
+    rows, cols, data = [], [], []
+    for ray_idcs, indices, weights in joseph_blocks(geometry, reco_space):
+        cols_blk = pad_to_vol[indices]
+        keep = (cols_blk >= 0) & (weights != 0)
+        rows_blk = np.broadcast_to(ray_idcs[:, None], indices.shape)
+        rows.append(rows_blk[keep])
+        cols.append(cols_blk[keep])
+        data.append(weights[keep])
+
+    matrix = scipy.sparse.coo_matrix(
+        (np.concatenate(data).astype(dtype, copy=False),
+         (np.concatenate(rows), np.concatenate(cols))),
+        shape=(proj_size, vol_size))
+    return matrix.tocsr()
+
+
+def _save_sparse_matrix(fname, matrix):
+    """Save a CSR matrix to ``fname`` in ``.npz`` format."""
+    # Write to a temporary file first to avoid corrupt files in case of
+    # concurrent access or interruption
+    tmp_fname = '{}.{}.tmp'.format(fname, os.getpid())
+    with open(tmp_fname, 'wb') as f:
+        np.savez(f, data=matrix.data, indices=matrix.indices,
+                 indptr=matrix.indptr, shape=np.array(matrix.shape))
+    os.rename(tmp_fname, fname)
+
+
+def _load_sparse_matrix(fname):
+    """Load a CSR matrix saved with `_save_sparse_matrix`."""
+    with np.load(fname) as npz:
+        return scipy.sparse.csr_matrix(
+            (npz['data'], npz['indices'], npz['indptr']),
+            shape=tuple(npz['shape']))
+
+
+def ray_trafo_sparse_matrix(geometry, reco_space, cache_dir=None):
+    """Return the sparse system matrix of the ray transform.
+
+    The matrix is looked up in ``geometry.implementation_cache``, then in
+    ``cache_dir`` (if given), and only assembled if it is found in
+    neither. New matrices are stored in both caches.
+
+    Parameters
+    ----------
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    reco_space : `DiscreteLp`
+        Uniformly discretized volume space.
+    cache_dir : str, optional
+        Directory in which the matrix is saved for reuse across sessions.
+        File names are derived from `sparse_matrix_cache_key`. The
+        directory is created if it does not exist.
+        Default: Don't save to disk.
+
+    Returns
+    -------
+    matrix : `scipy.sparse.csr_matrix`
+        Matrix of shape ``(geometry.partition.size, reco_space.size)``
+        mapping the flattened (C order) volume to the flattened
+        projection data. Its transpose (a CSC matrix, no copy) is the
+        unweighted back-projection.
+
+    Examples
+    --------
+    >>> space = odl.uniform_discr([-1, -1], [1, 1], (4, 4))
+    >>> geometry = odl.tomo.parallel_beam_geometry(space, num_angles=3)
+    >>> matrix = ray_trafo_sparse_matrix(geometry, space)
+    >>> matrix.shape
+    (21, 16)
+    >>> ray_trafo_sparse_matrix(geometry, space) is matrix  # cached
+    True
+    """
+    numpy_check_geometry(geometry)
+    reco_space = reco_space.real_space
+    cache = geometry.implementation_cache
+    mem_key = ('sparse_matrix', reco_space)
+    matrix = cache.get(mem_key, None)
+    if matrix is not None:
+        return matrix
+
+    fname = None
+    if cache_dir is not None:
+        key = sparse_matrix_cache_key(geometry, reco_space)
+        fname = os.path.join(cache_dir, 'odl_ray_trafo_{}.npz'.format(key))
+
+    if fname is not None and os.path.isfile(fname):
+        matrix = _load_sparse_matrix(fname)
+    else:
+        matrix = _assemble_sparse_matrix(geometry, reco_space)
+        if fname is not None:
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            _save_sparse_matrix(fname, matrix)
+
+    cache[mem_key] = matrix
+    return matrix
+
+
+def cache_sparse_matrix_subset(geometry, sub_geometry, reco_space,
+                               angle_indices, cache_dir=None):
+    """Store the rows of the matrix of ``geometry`` in ``sub_geometry``.
+
+    This avoids the assembly of the matrix for ``sub_geometry`` if it
+    is a subset of angles of ``geometry``, i.e.,
+    ``sub_geometry == geometry[angle_indices]``.
+
+    Parameters
+    ----------
+    geometry : `Geometry`
+        Geometry of the full system matrix.
+    sub_geometry : `Geometry`
+        Geometry in whose ``implementation_cache`` the rows are stored.
+    reco_space : `DiscreteLp`
+        Uniformly discretized volume space.
+    angle_indices : slice or sequence of int
+        Indices of the angles of ``sub_geometry`` in ``geometry``.
+    cache_dir : str, optional
+        Directory for saving and loading the full matrix, see
+        `ray_trafo_sparse_matrix`.
+
+    Returns
+    -------
+    matrix : `scipy.sparse.csr_matrix`
+        The matrix of ``sub_geometry``.
+    """
+    reco_space = reco_space.real_space
+    cache = sub_geometry.implementation_cache
+    mem_key = ('sparse_matrix', reco_space)
+    matrix = cache.get(mem_key, None)
+    if matrix is not None:
+        return matrix
+
+    full_matrix = ray_trafo_sparse_matrix(geometry, reco_space, cache_dir)
+    rows = np.arange(full_matrix.shape[0]).reshape(geometry.partition.shape)
+    matrix = full_matrix[rows[angle_indices].ravel()]
+    cache[mem_key] = matrix
+    return matrix
+
+
+def sparse_matrix_forward_projector(vol_data, geometry, proj_space, out=None,
+                                    cache_dir=None):
+    """Run a forward projection with the sparse system matrix.
+
+    Parameters
+    ----------
+    vol_data : `DiscreteLpElement`
+        Volume data to which the forward projector is applied.
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    proj_space : `DiscreteLp`
+        Space to which the calling operator maps.
+    out : ``proj_space`` element, optional
+        Element of the projection space to which the result is written. If
+        ``None``, an element in ``proj_space`` is created.
+    cache_dir : str, optional
+        Directory for saving and loading the matrix, see
+        `ray_trafo_sparse_matrix`.
+
+    Returns
+    -------
+    out : ``proj_space`` element
+        Projection data resulting from the application of the projector.
+        If ``out`` was provided, the returned object is a reference to it.
+    """
+    if not isinstance(vol_data, DiscreteLpElement):
+        raise TypeError('volume data {!r} is not a `DiscreteLpElement` '
+                        'instance.'.format(vol_data))
+    if not isinstance(geometry, Geometry):
+        raise TypeError('geometry  {!r} is not a Geometry instance'
+                        ''.format(geometry))
+    if not isinstance(proj_space, DiscreteLp):
+        raise TypeError('`proj_space` {!r} is not a DiscreteLp '
+                        'instance.'.format(proj_space))
+    if out is None:
+        out = proj_space.element()
+    else:
+        if out not in proj_space:
+            raise TypeError('`out` {} is neither None nor a '
+                            'DiscreteLpElement instance'.format(out))
+
+    matrix = ray_trafo_sparse_matrix(geometry, vol_data.space, cache_dir)
+    proj_arr = matrix.dot(vol_data.asarray().ravel())
+    out[:] = proj_arr.reshape(proj_space.shape)
+    return out
+
+
+def sparse_matrix_back_projector(proj_data, geometry, reco_space, out=None,
+                                 cache_dir=None):
+    """Run a back-projection with the sparse system matrix.
+
+    Parameters
+    ----------
+    proj_data : `DiscreteLpElement`
+        Projection data to which the back-projector is applied.
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    reco_space : `DiscreteLp`
+        Space to which the calling operator maps.
+    out : ``reco_space`` element, optional
+        Element of the reconstruction space to which the result is written.
+        If ``None``, an element in ``reco_space`` is created.
+    cache_dir : str, optional
+        Directory for saving and loading the matrix, see
+        `ray_trafo_sparse_matrix`.
+
+    Returns
+    -------
+    out : ``reco_space`` element
+        Reconstruction data resulting from the application of the backward
+        projector. If ``out`` was provided, the returned object is a
+        reference to it.
+    """
+    if not isinstance(proj_data, DiscreteLpElement):
+        raise TypeError('projection data {!r} is not a DiscreteLpElement '
+                        'instance'.format(proj_data))
+    if not isinstance(geometry, Geometry):
+        raise TypeError('geometry  {!r} is not a Geometry instance'
+                        ''.format(geometry))
+    if not isinstance(reco_space, DiscreteLp):
+        raise TypeError('reconstruction space {!r} is not a DiscreteLp '
+                        'instance'.format(reco_space))
+    if out is None:
+        out = reco_space.element()
+    else:
+        if out not in reco_space:
+            raise TypeError('`out` {} is neither None nor a '
+                            'DiscreteLpElement instance'.format(out))
+
+    matrix = ray_trafo_sparse_matrix(geometry, reco_space, cache_dir)
+    vol_arr = matrix.T.dot(proj_data.asarray().ravel())
+    out[:] = vol_arr.reshape(reco_space.shape)
+
+    # Weight the adjoint by appropriate weights
+    scaling_factor = float(proj_data.space.weighting.const)
+    scaling_factor /= float(reco_space.weighting.const)
+    out *= scaling_factor
+
+    return out
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
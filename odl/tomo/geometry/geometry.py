@@ -395,6 +395,151 @@ class Geometry(object):
 
         return det_pt_pos
 
+    def _grid_params(self, dparam=None, motion_only=False):
+        """Return motion and detector parameters for grid evaluation.
+
+        The parameters are sparse arrays that broadcast against each other
+        to ``motion_grid.shape + det_grid.shape`` if ``dparam`` is ``None``,
+        or to ``motion_grid.shape`` otherwise or if ``motion_only`` is
+        ``True``. They are given in the form expected by the vectorized
+        methods, i.e., as single array for 1D parameters and as tuple of
+        arrays otherwise.
+        """
+        if motion_only:
+            mparam = self.motion_grid.meshgrid
+            dparam = (None,)
+        elif dparam is None:
+            mesh = self.grid.meshgrid
+            mparam = mesh[:self.motion_partition.ndim]
+            dparam = mesh[self.motion_partition.ndim:]
+        else:
+            mparam = self.motion_grid.meshgrid
+            # Make the detector parameters broadcast with the motion grid
+            ndmin = self.motion_partition.ndim
+            dparam = tuple(np.array(p, dtype=float, ndmin=ndmin)
+                           for p in np.array(dparam, dtype=float, ndmin=1))
+
+        if self.motion_partition.ndim == 1:
+            mparam = mparam[0]
+        if self.det_partition.ndim == 1:
+            dparam = dparam[0]
+        return mparam, dparam
+
+    def _cached_grid_eval(self, name, dparam, func, motion_only=False):
+        """Return ``func(mparam, dparam)`` on the grid, memoized.
+
+        The result is stored in `implementation_cache` under a key
+        derived from ``name`` and ``dparam`` and made read-only.
+        """
+        if dparam is not None:
+            dparam = tuple(float(p) for p in np.array(dparam, ndmin=1))
+        key = ('grid_eval', name, dparam)
+        result = self.implementation_cache.get(key, None)
+        if result is None:
+            params = self._grid_params(dparam, motion_only)
+            result = np.asarray(func(*params))
+            result.flags.writeable = False
+            self.implementation_cache[key] = result
+        return result
+
+    def rotation_matrix_grid(self):
+        """Return the rotation matrices for all points of `motion_grid`.
+
+        The result is computed once and memoized in `implementation_cache`.
+
+        Returns
+        -------
+        rot : `numpy.ndarray`
+            Read-only array of shape
+            ``motion_grid.shape + (ndim, ndim)``, see `rotation_matrix`.
+
+        Examples
+        --------
+        >>> apart = odl.uniform_partition(0, np.pi, 10)
+        >>> dpart = odl.uniform_partition(-1, 1, 20)
+        >>> geom = odl.tomo.Parallel2dGeometry(apart, dpart)
+        >>> geom.rotation_matrix_grid().shape
+        (10, 2, 2)
+        """
+        return self._cached_grid_eval(
+            'rotation_matrix', None,
+            lambda mparam, dparam: self.rotation_matrix(mparam),
+            motion_only=True)
+
+    def det_point_position_grid(self, dparam=None):
+        """Return the detector points for all points of `motion_grid`.
+
+        This is `det_point_position` evaluated for all motion parameters
+        and detector parameters of the geometry in one vectorized call.
+        The result is computed once and memoized in `implementation_cache`.
+
+        Parameters
+        ----------
+        dparam : `array-like`, optional
+            Single detector parameter at which to evaluate, e.g.,
+            ``det_params.mid_pt``. For ``None``, all points of `det_grid`
+            are used.
+
+        Returns
+        -------
+        pos : `numpy.ndarray`
+            Read-only array of shape
+            ``motion_grid.shape + det_grid.shape + (ndim,)``, or
+            ``motion_grid.shape + (ndim,)`` if ``dparam`` is given.
+
+        Examples
+        --------
+        >>> apart = odl.uniform_partition(0, np.pi, 10)
+        >>> dpart = odl.uniform_partition(-1, 1, 20)
+        >>> geom = odl.tomo.Parallel2dGeometry(apart, dpart)
+        >>> geom.det_point_position_grid().shape
+        (10, 20, 2)
+        >>> pts = geom.det_point_position_grid(dparam=0)
+        >>> pts.shape
+        (10, 2)
+        >>> np.allclose(pts, geom.det_point_position(geom.angles, 0))
+        True
+        >>> geom.det_point_position_grid(dparam=0) is pts  # cached
+        True
+        """
+        return self._cached_grid_eval('det_point_position', dparam,
+                                      self.det_point_position)
+
+    def det_to_src_grid(self, dparam=None):
+        """Return the unit vectors from detector to source on the grid.
+
+        This is `det_to_src` evaluated for all motion parameters and
+        detector parameters of the geometry in one vectorized call. The
+        negative of this vector is the ray direction.
+        The result is computed once and memoized in `implementation_cache`.
+
+        Parameters
+        ----------
+        dparam : `array-like`, optional
+            Single detector parameter at which to evaluate, e.g.,
+            ``det_params.mid_pt``. For ``None``, all points of `det_grid`
+            are used.
+
+        Returns
+        -------
+        vec : `numpy.ndarray`
+            Read-only array of shape
+            ``motion_grid.shape + det_grid.shape + (ndim,)``, or
+            ``motion_grid.shape + (ndim,)`` if ``dparam`` is given.
+
+        Examples
+        --------
+        >>> apart = odl.uniform_partition(0, np.pi, 10)
+        >>> dpart = odl.uniform_partition([-1, -1], [1, 1], (20, 30))
+        >>> geom = odl.tomo.ConeFlatGeometry(apart, dpart, src_radius=5,
+        ...                                  det_radius=5)
+        >>> geom.det_to_src_grid().shape
+        (10, 20, 30, 3)
+        >>> geom.det_to_src_grid(dparam=[0, 0]).shape
+        (10, 3)
+        """
+        return self._cached_grid_eval('det_to_src', dparam, self.det_to_src)
+
     @property
     def implementation_cache(self):
         """Dictionary acting as a cache for this geometry.
@@ -554,6 +699,32 @@ class DivergentBeamGeometry(Geometry):
 
         return det_to_src
 
+    def src_position_grid(self):
+        """Return the source positions for all points of `motion_grid`.
+
+        The result is computed once and memoized in `implementation_cache`.
+
+        Returns
+        -------
+        pos : `numpy.ndarray`
+            Read-only array of shape ``motion_grid.shape + (ndim,)``, see
+            `src_position`.
+
+        Examples
+        --------
+        >>> apart = odl.uniform_partition(0, 2 * np.pi, 4)
+        >>> dpart = odl.uniform_partition(-1, 1, 20)
+        >>> geom = odl.tomo.FanFlatGeometry(apart, dpart, src_radius=2,
+        ...                                 det_radius=3)
+        >>> np.allclose(geom.src_position_grid(),
+        ...             geom.src_position(geom.angles))
+        True
+        """
+        return self._cached_grid_eval(
+            'src_position', None,
+            lambda mparam, dparam: self.src_position(mparam),
+            motion_only=True)
+
 
 class AxisOrientedGeometry(object):
 
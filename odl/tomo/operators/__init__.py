@@ -13,3 +13,6 @@ __all__ = ()
 
 from .ray_trafo import *
 __all__ += ray_trafo.__all__
+
+from .slab_ray_trafo import *
+__all__ += slab_ray_trafo.__all__
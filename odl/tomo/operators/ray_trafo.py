@@ -12,22 +12,29 @@ from __future__ import print_function, division, absolute_import
 import numpy as np
 import warnings
 
-from odl.discr import DiscreteLp
+from odl.discr import DiscreteLp, discr_sequence_space, uniform_discr
 from odl.operator import Operator
 from odl.space import FunctionSpace
 from odl.tomo.geometry import (
-    Geometry, Parallel2dGeometry, Parallel3dAxisGeometry)
+    Geometry, ParallelBeamGeometry, Parallel2dGeometry, Parallel3dAxisGeometry)
 from odl.space.weighting import ConstWeighting
 from odl.tomo.backends import (
     ASTRA_AVAILABLE, ASTRA_CUDA_AVAILABLE, SKIMAGE_AVAILABLE,
     astra_supports, ASTRA_VERSION,
-    astra_cpu_forward_projector, astra_cpu_back_projector,
+    AstraCpuProjectorImpl, AstraCpuBackProjectorImpl,
     AstraCudaProjectorImpl, AstraCudaBackProjectorImpl,
-    skimage_radon_forward, skimage_radon_back_projector)
+    skimage_radon_forward, skimage_radon_back_projector,
+    numpy_forward_projector, numpy_back_projector,
+    sparse_matrix_forward_projector, sparse_matrix_back_projector)
+from odl.tomo.backends.numpy_ray import numpy_check_geometry
+from odl.tomo.backends.sparse_matrix import cache_sparse_matrix_subset
+from odl.trafos import DiscreteFourierTransform
+from odl.util import NumpyRandomSeed
 
 
 ASTRA_CPU_AVAILABLE = ASTRA_AVAILABLE
-_SUPPORTED_IMPL = ('astra_cpu', 'astra_cuda', 'skimage')
+_SUPPORTED_IMPL = ('astra_cpu', 'astra_cuda', 'skimage', 'numpy',
+                   'sparse_matrix')
 _AVAILABLE_IMPLS = []
 if ASTRA_CPU_AVAILABLE:
     _AVAILABLE_IMPLS.append('astra_cpu')
@@ -35,9 +42,55 @@ if ASTRA_CUDA_AVAILABLE:
     _AVAILABLE_IMPLS.append('astra_cuda')
 if SKIMAGE_AVAILABLE:
     _AVAILABLE_IMPLS.append('skimage')
-
-
-__all__ = ('RayTransform', 'RayBackProjection')
+# The NumPy back-ends have no extra dependencies and are always available
+_AVAILABLE_IMPLS.extend(['numpy', 'sparse_matrix'])
+
+
+__all__ = ('RayTransform', 'RayBackProjection', 'RayTransformGram')
+
+
+def sub_space(space, partition):
+    """Return a space like ``space`` on a part of its partition.
+
+    The returned space has the same data type, interpolation, axis labels
+    and constant weighting as ``space``, such that inner products and
+    adjoints of operators restricted to parts of ``space`` add up to those
+    on ``space``.
+
+    Parameters
+    ----------
+    space : `DiscreteLp`
+        The space to restrict. It must be unweighted or have a
+        constant weighting.
+    partition : `RectPartition`
+        Partition of the new space, usually ``space.partition[indices]``.
+
+    Returns
+    -------
+    sub_space : `DiscreteLp`
+
+    Examples
+    --------
+    >>> space = odl.uniform_discr([0, 0], [1, 1], (4, 4))
+    >>> sub = sub_space(space, space.partition[:2, 1:])
+    >>> sub.shape
+    (2, 3)
+    >>> sub.weighting == space.weighting
+    True
+    """
+    if not space.is_weighted:
+        weighting = None
+    elif isinstance(space.weighting, ConstWeighting):
+        weighting = space.weighting
+    else:
+        raise NotImplementedError('weighting {!r} not supported'
+                                  ''.format(space.weighting))
+
+    tspace = space.tspace_type(partition.shape, weighting=weighting,
+                               dtype=space.dtype)
+    fspace = FunctionSpace(partition.set, out_dtype=space.dtype)
+    return DiscreteLp(fspace, partition, tspace, interp=space.interp,
+                      axis_labels=space.axis_labels)
 
 
 class RayTransformBase(Operator):
@@ -61,13 +114,21 @@ class RayTransformBase(Operator):
 
         Other Parameters
         ----------------
-        impl : {`None`, 'astra_cuda', 'astra_cpu', 'skimage'}, optional
+        impl : str, optional
             Implementation back-end for the transform. Supported back-ends:
 
             - ``'astra_cuda'``: ASTRA toolbox, using CUDA, 2D or 3D
             - ``'astra_cpu'``: ASTRA toolbox using CPU, only 2D
             - ``'skimage'``: scikit-image, only 2D parallel with square
               reconstruction space.
+            - ``'numpy'``: Pure NumPy implementation of Joseph's method,
+              2D or 3D parallel and divergent beam geometries with a
+              single angle parameter. No extra dependencies.
+            - ``'sparse_matrix'``: Same method and geometries as
+              ``'numpy'``, but the system matrix is computed once and
+              stored as a sparse matrix. Fast repeated evaluation at the
+              expense of memory, best suited for small and medium 2D
+              problems.
 
             For the default ``None``, the fastest available back-end is
             used.
@@ -86,6 +147,11 @@ class RayTransformBase(Operator):
             and on the CPU, since a full volume and a projection dataset
             are stored. That may be prohibitive in 3D.
             Default: True
+        cache_dir : str, optional
+            Directory in which the system matrix of the
+            ``'sparse_matrix'`` back-end is saved and from which it is
+            loaded if available. Ignored for other back-ends.
+            Default: Don't save to disk.
 
         Notes
         -----
@@ -114,10 +180,6 @@ class RayTransformBase(Operator):
                             '{!r}'.format(geometry))
 
         # Handle backend choice
-        if not _AVAILABLE_IMPLS:
-            raise RuntimeError('no ray transform back-end available; '
-                               'this requires 3rd party packages, please '
-                               'check the install docs')
         impl = kwargs.pop('impl', None)
         if impl is None:
             # Select fastest available
@@ -133,17 +195,12 @@ class RayTransformBase(Operator):
                         "This warning can be disabled by explicitly setting "
                         "`impl='astra_cpu'`.",
                         RuntimeWarning)
-            elif SKIMAGE_AVAILABLE:
+            elif (SKIMAGE_AVAILABLE and
+                  isinstance(geometry, Parallel2dGeometry) and
+                  reco_space.size < 256 ** 2):
                 impl = 'skimage'
-                if reco_space.size >= 256 ** 2:
-                    warnings.warn(
-                        "The best available backend ('skimage') may be too "
-                        "slow for volumes of this size. Consider using ASTRA. "
-                        "This warning can be disabled by explicitly setting "
-                        "`impl='skimage'`.",
-                        RuntimeWarning)
             else:
-                raise RuntimeError('bad impl')
+                impl = 'numpy'
         else:
             impl, impl_in = str(impl).lower(), impl
             if impl not in _SUPPORTED_IMPL:
@@ -167,18 +224,17 @@ class RayTransformBase(Operator):
                     not astra_supports('par3d_det_mid_pt_perp_to_axis')):
                 axis = geometry.axis
                 mid_pt = geometry.det_params.mid_pt
-                for i, angle in enumerate(geometry.angles):
-                    if abs(np.dot(axis,
-                                  geometry.det_to_src(angle, mid_pt))) < 1e-4:
-                        warnings.warn(
-                            'angle {}: detector midpoint normal {} is '
-                            'perpendicular to the geometry axis {} in '
-                            '`Parallel3dAxisGeometry`; this is broken in '
-                            'ASTRA v{}, please upgrade to v1.8 or later'
-                            ''.format(i, geometry.det_to_src(angle, mid_pt),
-                                      axis, ASTRA_VERSION),
-                            RuntimeWarning)
-                        break
+                normals = geometry.det_to_src_grid(mid_pt)
+                perp = np.abs(normals.dot(axis)) < 1e-4
+                if np.any(perp):
+                    i = int(np.argmax(perp))
+                    warnings.warn(
+                        'angle {}: detector midpoint normal {} is '
+                        'perpendicular to the geometry axis {} in '
+                        '`Parallel3dAxisGeometry`; this is broken in '
+                        'ASTRA v{}, please upgrade to v1.8 or later'
+                        ''.format(i, normals[i], axis, ASTRA_VERSION),
+                        RuntimeWarning)
 
         elif impl == 'skimage':
             if not isinstance(geometry, Parallel2dGeometry):
@@ -200,6 +256,12 @@ class RayTransformBase(Operator):
                 raise ValueError('`{}.extent` must have equal entries, '
                                  'got {}'.format(reco_name, extent))
 
+        elif impl in ('numpy', 'sparse_matrix'):
+            numpy_check_geometry(geometry)
+            if not reco_space.is_uniform:
+                raise ValueError('`{}` must be uniformly discretized for '
+                                 '`impl` {!r}'.format(reco_name, impl))
+
         if reco_space.ndim != geometry.ndim:
             raise ValueError('`{}.ndim` not equal to `geometry.ndim`: '
                              '{} != {}'.format(reco_name, reco_space.ndim,
@@ -347,13 +409,21 @@ class RayTransform(RayTransformBase):
 
         Other Parameters
         ----------------
-        impl : {`None`, 'astra_cuda', 'astra_cpu', 'skimage'}, optional
+        impl : str, optional
             Implementation back-end for the transform. Supported back-ends:
 
             - ``'astra_cuda'``: ASTRA toolbox, using CUDA, 2D or 3D
             - ``'astra_cpu'``: ASTRA toolbox using CPU, only 2D
             - ``'skimage'``: scikit-image, only 2D parallel with square
               reconstruction space.
+            - ``'numpy'``: Pure NumPy implementation of Joseph's method,
+              2D or 3D parallel and divergent beam geometries with a
+              single angle parameter. No extra dependencies.
+            - ``'sparse_matrix'``: Same method and geometries as
+              ``'numpy'``, but the system matrix is computed once and
+              stored as a sparse matrix. Fast repeated evaluation at the
+              expense of memory, best suited for small and medium 2D
+              problems.
 
             For the default ``None``, the fastest available back-end is
             used, tried in the above order.
@@ -371,6 +441,11 @@ class RayTransform(RayTransformBase):
             and on the CPU, since a full volume and a projection dataset
             are stored. That may be prohibitive in 3D.
             Default: True
+        cache_dir : str, optional
+            Directory in which the system matrix of the
+            ``'sparse_matrix'`` back-end is saved and from which it is
+            loaded if available. Ignored for other back-ends.
+            Default: Don't save to disk.
 
         Notes
         -----
@@ -382,36 +457,47 @@ class RayTransform(RayTransformBase):
             reco_space=domain, proj_space=range, geometry=geometry,
             variant='forward', **kwargs)
 
+        # Set for operators created by `subsets`
+        self._parent = None
+        self._angle_indices = None
+
     def _call_real(self, x_real, out_real):
         """Real-space forward projection for the current set-up.
 
-        This method also sets ``self._astra_projector`` for
-        ``impl='astra_cuda'`` and enabled cache.
+        This method also sets ``self._astra_wrapper`` for
+        ``impl='astra_cpu'`` or ``impl='astra_cuda'`` and enabled cache.
         """
         if self.impl.startswith('astra'):
             backend, data_impl = self.impl.split('_')
 
             if data_impl == 'cpu':
-                return astra_cpu_forward_projector(
-                    x_real, self.geometry, self.range.real_space, out_real)
-
+                wrapper_type = AstraCpuProjectorImpl
             elif data_impl == 'cuda':
-                if self._astra_wrapper is None:
-                    astra_wrapper = AstraCudaProjectorImpl(
-                        self.geometry, self.domain.real_space,
-                        self.range.real_space)
-                    if self.use_cache:
-                        self._astra_wrapper = astra_wrapper
-                else:
-                    astra_wrapper = self._astra_wrapper
-
-                return astra_wrapper.call_forward(x_real, out_real)
+                wrapper_type = AstraCudaProjectorImpl
             else:
                 # Should never happen
                 raise RuntimeError('bad `impl` {!r}'.format(self.impl))
+
+            if self._astra_wrapper is None:
+                astra_wrapper = wrapper_type(
+                    self.geometry, self.domain.real_space,
+                    self.range.real_space)
+                if self.use_cache:
+                    self._astra_wrapper = astra_wrapper
+            else:
+                astra_wrapper = self._astra_wrapper
+
+            return astra_wrapper.call_forward(x_real, out_real)
         elif self.impl == 'skimage':
             return skimage_radon_forward(x_real, self.geometry,
                                          self.range.real_space, out_real)
+        elif self.impl == 'numpy':
+            return numpy_forward_projector(x_real, self.geometry,
+                                           self.range.real_space, out_real)
+        elif self.impl == 'sparse_matrix':
+            return sparse_matrix_forward_projector(
+                x_real, self.geometry, self.range.real_space, out_real,
+                cache_dir=self._extra_kwargs.get('cache_dir', None))
         else:
             # Should never happen
             raise RuntimeError('bad `impl` {!r}'.format(self.impl))
@@ -435,6 +521,237 @@ class RayTransform(RayTransformBase):
                                           **kwargs)
         return self._adjoint
 
+    @property
+    def parent(self):
+        """Ray transform this operator is an angle subset of, or ``None``."""
+        return self._parent
+
+    @property
+    def angle_indices(self):
+        """Indices of the angles of `parent` used by this operator.
+
+        This is a `slice` or a list of integers for operators created
+        by `subsets`, and ``None`` otherwise.
+        """
+        return self._angle_indices
+
+    def subsets(self, n, order='interlaced', seed=None):
+        """Split this operator into ``n`` subsets of angles.
+
+        The returned operators only differ from ``self`` in their
+        geometries, which contain a subset of the angles, and their
+        ranges, which are the corresponding parts of ``self.range``. They
+        reuse the back-end and its cached data where possible. In
+        particular, for ``impl='sparse_matrix'``, the system matrices of
+        the subsets are taken from the rows of the full matrix.
+
+        The weighting of ``self.range`` is inherited, such that
+        ``sum(sub.range.inner(...))`` over all subsets equals the inner
+        product in ``self.range``, and the adjoints of the subsets add up
+        to the adjoint of ``self``.
+
+        Parameters
+        ----------
+        n : positive int
+            Number of subsets, at most the number of angles.
+        order : {'interlaced', 'contiguous', 'random'}, optional
+            Strategy for the assignment of angles to subsets:
+
+            - ``'interlaced'``: Subset ``i`` contains every ``n``-th angle,
+              starting at ``i``. This gives well-balanced subsets and is
+              usually the best choice for ordered-subset methods.
+            - ``'contiguous'``: Subset ``i`` contains the ``i``-th block of
+              consecutive angles.
+            - ``'random'``: Angles are assigned randomly, with subset
+              sizes as for the other variants.
+
+        seed : int, optional
+            Seed for the random number generator used for
+            ``order='random'``. Ignored otherwise.
+
+        Returns
+        -------
+        subsets : list of `RayTransform`
+            The subset operators, each with `parent` set to ``self``.
+            They can be passed directly to, e.g., `BroadcastOperator`
+            or `osmlem`.
+
+        See Also
+        --------
+        subset_data : Extract the data corresponding to a subset.
+
+        Notes
+        -----
+        For ``'interlaced'`` and ``'contiguous'``, the angles of each
+        subset are described by a `slice`, hence `subset_data` returns
+        views into the full data, and results written to those views
+        directly end up in the full sinogram. For ``'random'``, the
+        angles are described by lists of indices, and the data must
+        be copied.
+
+        Examples
+        --------
+        >>> space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))
+        >>> geometry = odl.tomo.parallel_beam_geometry(space, num_angles=6)
+        >>> ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+        >>> subsets = ray_trafo.subsets(3)
+        >>> [sub.angle_indices for sub in subsets]
+        [slice(0, None, 3), slice(1, None, 3), slice(2, None, 3)]
+        >>> [sub.range.shape for sub in subsets]
+        [(2, 17), (2, 17), (2, 17)]
+
+        Evaluating all subsets with results written into the full
+        sinogram:
+
+        >>> phantom = odl.phantom.shepp_logan(space)
+        >>> proj = ray_trafo.range.element()
+        >>> for sub in subsets:
+        ...     result = sub(phantom, out=sub.subset_data(proj))
+        >>> proj.dist(ray_trafo(phantom)) < 1e-5
+        True
+
+        Contiguous blocks of angles:
+
+        >>> subsets = ray_trafo.subsets(4, order='contiguous')
+        >>> [sub.angle_indices for sub in subsets[:2]]
+        [slice(0, 2, None), slice(2, 4, None)]
+        >>> [sub.range.shape[0] for sub in subsets]
+        [2, 2, 1, 1]
+        """
+        if self.geometry.motion_partition.ndim != 1:
+            raise ValueError('subsets only supported for geometries with a '
+                             'single angle parameter, got {}'
+                             ''.format(self.geometry.motion_partition.ndim))
+        if not hasattr(self.geometry, '__getitem__'):
+            raise TypeError('geometry of type {!r} does not support '
+                            'indexing'.format(type(self.geometry).__name__))
+
+        num_angles = self.geometry.motion_partition.size
+        n, n_in = int(n), n
+        if n != n_in or not 1 <= n <= num_angles:
+            raise ValueError('`n` must be an integer between 1 and {}, got '
+                             '{!r}'.format(num_angles, n_in))
+
+        order, order_in = str(order).lower(), order
+        if order == 'interlaced':
+            indices = [slice(i, None, n) for i in range(n)]
+        elif order in ('contiguous', 'random'):
+            sizes = np.full(n, num_angles // n, dtype=int)
+            sizes[:num_angles % n] += 1
+            stops = np.cumsum(sizes)
+            starts = stops - sizes
+            if order == 'contiguous':
+                indices = [slice(int(start), int(stop))
+                           for start, stop in zip(starts, stops)]
+            else:
+                with NumpyRandomSeed(seed):
+                    perm = np.random.permutation(num_angles)
+                indices = [sorted(int(i) for i in perm[start:stop])
+                           for start, stop in zip(starts, stops)]
+        else:
+            raise ValueError('`order` {!r} not understood'.format(order_in))
+
+        return [self._subset(idx) for idx in indices]
+
+    def _subset(self, idx, use_parent_matrix=True):
+        """Return the ray transform for the angles ``idx`` of ``self``.
+
+        Parameters
+        ----------
+        idx : slice or sequence of int
+            Indices of the angles of the subset.
+        use_parent_matrix : bool, optional
+            For ``impl='sparse_matrix'``, take the system matrix of the
+            subset from the rows of the full system matrix, which is
+            assembled if necessary. Otherwise, the subset assembles its
+            own matrix when it is first evaluated.
+        """
+        geometry = self.geometry[idx]
+        proj_space = sub_space(self.range, geometry.partition)
+
+        if self.impl == 'sparse_matrix' and use_parent_matrix:
+            cache_sparse_matrix_subset(
+                self.geometry, geometry, self.domain, idx,
+                cache_dir=self._extra_kwargs.get('cache_dir', None))
+
+        kwargs = self._extra_kwargs.copy()
+        kwargs['range'] = proj_space
+        sub = RayTransform(self.domain, geometry, impl=self.impl,
+                           use_cache=self.use_cache, **kwargs)
+        sub._parent = self
+        sub._angle_indices = idx
+        return sub
+
+    def gram(self, exact=False):
+        """Return the Gram operator ``A^* A`` of this ray transform.
+
+        For parallel beam geometries, ``A^* A`` is (up to discretization
+        effects) a convolution, which is applied much faster with FFTs
+        than by a forward and a back-projection, see `RayTransformGram`.
+        Otherwise, or if ``exact=True``, the composition
+        ``self.adjoint * self`` is returned.
+
+        Parameters
+        ----------
+        exact : bool, optional
+            If ``True``, always return the composition of the operators.
+
+        Returns
+        -------
+        gram : `Operator`
+            `RayTransformGram` or `OperatorComp` with `domain` and
+            `range` equal to ``self.domain``.
+
+        Examples
+        --------
+        >>> space = odl.uniform_discr([-1, -1], [1, 1], (20, 20))
+        >>> geometry = odl.tomo.parallel_beam_geometry(space)
+        >>> ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+        >>> gram = ray_trafo.gram()
+        >>> isinstance(gram, odl.tomo.RayTransformGram)
+        True
+        >>> gram.relative_error() < 0.05
+        True
+        """
+        if exact or not RayTransformGram.is_supported(self):
+            return self.adjoint * self
+        else:
+            return RayTransformGram(self)
+
+    def subset_data(self, proj_data):
+        """Return the part of ``proj_data`` corresponding to this subset.
+
+        Parameters
+        ----------
+        proj_data : `parent` ``.range`` `element-like`
+            Data for all angles of `parent`.
+
+        Returns
+        -------
+        subset_data : `range` element
+            Data for the angles in `angle_indices`. If these are given
+            by a `slice` and ``proj_data`` is a `parent` ``.range``
+            element, the result is a view, i.e., changes to it are
+            reflected in ``proj_data``. For operators without `parent`,
+            ``proj_data`` is returned as element of `range`.
+
+        Examples
+        --------
+        >>> space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))
+        >>> geometry = odl.tomo.parallel_beam_geometry(space, num_angles=6)
+        >>> ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+        >>> sub = ray_trafo.subsets(3)[1]
+        >>> proj = ray_trafo.range.zero()
+        >>> sub.subset_data(proj)[:] = 1
+        >>> proj.asarray()[:, 0]
+        array([ 0.,  1.,  0.,  0.,  1.,  0.])
+        """
+        if self.parent is None:
+            return self.range.element(proj_data)
+
+        proj_data = self.parent.range.element(proj_data)
+        return self.range.element(proj_data.asarray()[self.angle_indices])
+
 
 class RayBackProjection(RayTransformBase):
     """Adjoint of the discrete Ray transform between L^p spaces."""
@@ -453,16 +770,24 @@ class RayBackProjection(RayTransformBase):
 
         Other Parameters
         ----------------
-        impl : {`None`, 'astra_cuda', 'astra_cpu', 'skimage'}, optional
+        impl : str, optional
             Implementation back-end for the transform. Supported back-ends:
 
             - ``'astra_cuda'``: ASTRA toolbox, using CUDA, 2D or 3D
             - ``'astra_cpu'``: ASTRA toolbox using CPU, only 2D
             - ``'skimage'``: scikit-image, only 2D parallel with square
               reconstruction space.
+            - ``'numpy'``: Pure NumPy implementation of Joseph's method,
+              2D or 3D parallel and divergent beam geometries with a
+              single angle parameter. No extra dependencies.
+            - ``'sparse_matrix'``: Same method and geometries as
+              ``'numpy'``, but the system matrix is computed once and
+              stored as a sparse matrix. Fast repeated evaluation at the
+              expense of memory, best suited for small and medium 2D
+              problems.
 
             For the default ``None``, the fastest available back-end is
--           used, tried in the above order.
+            used, tried in the above order.
         interp : {'nearest', 'linear'}, optional
             Interpolation type for the discretization of the operator
             domain. This has no effect if ``domain`` is given explicitly.
@@ -477,6 +802,11 @@ class RayBackProjection(RayTransformBase):
             and on the CPU, since a full volume and a projection dataset
             are stored. That may be prohibitive in 3D.
             Default: True
+        cache_dir : str, optional
+            Directory in which the system matrix of the
+            ``'sparse_matrix'`` back-end is saved and from which it is
+            loaded if available. Ignored for other back-ends.
+            Default: Don't save to disk.
 
         Notes
         -----
@@ -491,34 +821,41 @@ class RayBackProjection(RayTransformBase):
     def _call_real(self, x_real, out_real):
         """Real-space back-projection for the current set-up.
 
-        This method also sets ``self._astra_backprojector`` for
-        ``impl='astra_cuda'`` and enabled cache.
+        This method also sets ``self._astra_wrapper`` for
+        ``impl='astra_cpu'`` or ``impl='astra_cuda'`` and enabled cache.
         """
         if self.impl.startswith('astra'):
             backend, data_impl = self.impl.split('_')
             if data_impl == 'cpu':
-                return astra_cpu_back_projector(x_real, self.geometry,
-                                                self.range.real_space,
-                                                out_real)
+                wrapper_type = AstraCpuBackProjectorImpl
             elif data_impl == 'cuda':
-                if self._astra_wrapper is None:
-                    astra_wrapper = AstraCudaBackProjectorImpl(
-                        self.geometry, self.range.real_space,
-                        self.domain.real_space)
-                    if self.use_cache:
-                        self._astra_wrapper = astra_wrapper
-                else:
-                    astra_wrapper = self._astra_wrapper
-
-                return astra_wrapper.call_backward(x_real, out_real)
+                wrapper_type = AstraCudaBackProjectorImpl
             else:
                 # Should never happen
                 raise RuntimeError('bad `impl` {!r}'.format(self.impl))
 
+            if self._astra_wrapper is None:
+                astra_wrapper = wrapper_type(
+                    self.geometry, self.range.real_space,
+                    self.domain.real_space)
+                if self.use_cache:
+                    self._astra_wrapper = astra_wrapper
+            else:
+                astra_wrapper = self._astra_wrapper
+
+            return astra_wrapper.call_backward(x_real, out_real)
+
         elif self.impl == 'skimage':
             return skimage_radon_back_projector(x_real, self.geometry,
                                                 self.range.real_space,
                                                 out_real)
+        elif self.impl == 'numpy':
+            return numpy_back_projector(x_real, self.geometry,
+                                        self.range.real_space, out_real)
+        elif self.impl == 'sparse_matrix':
+            return sparse_matrix_back_projector(
+                x_real, self.geometry, self.range.real_space, out_real,
+                cache_dir=self._extra_kwargs.get('cache_dir', None))
         else:
             # Should never happen
             raise RuntimeError('bad `impl` {!r}'.format(self.impl))
@@ -543,6 +880,182 @@ class RayBackProjection(RayTransformBase):
         return self._adjoint
 
 
+class RayTransformGram(Operator):
+
+    """Gram operator ``A^* A`` of a parallel beam ray transform ``A``.
+
+    For parallel beam geometries, ``A^* A`` is invariant under shifts
+    of the volume, i.e., a convolution with the point spread function
+    of the transform. This operator computes the point spread function
+    once, from an explicit forward and back-projection of a point on
+    a twice as large volume, and then applies ``A^* A`` as circular
+    convolution on the zero-padded volume using FFTs. The point spread
+    function is symmetrized, such that this operator is self-adjoint.
+
+    The result is in general not exactly equal to the composition of the
+    discrete operators since their discretization is not exactly shift
+    invariant. Use `relative_error` to check the accuracy for a given
+    setup.
+
+    See Also
+    --------
+    RayTransform.gram : Choose between this and the exact operator.
+    """
+
+    def __init__(self, ray_trafo, impl=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        ray_trafo : `RayTransform`
+            Ray transform whose Gram operator should be computed. It must
+            have a real and uniformly discretized domain and a
+            `ParallelBeamGeometry`.
+        impl : {'numpy', 'pyfftw'}, optional
+            Backend for the FFTs, see `DiscreteFourierTransform`.
+            ``None`` selects the fastest available backend.
+        """
+        if not isinstance(ray_trafo, RayTransform):
+            raise TypeError('`ray_trafo` must be a `RayTransform` instance, '
+                            'got {!r}'.format(ray_trafo))
+        if not self.is_supported(ray_trafo):
+            raise ValueError('`ray_trafo` {!r} not supported, need a '
+                             '`ParallelBeamGeometry` and a real and '
+                             'uniformly discretized domain'
+                             ''.format(ray_trafo))
+
+        super(RayTransformGram, self).__init__(
+            domain=ray_trafo.domain, range=ray_trafo.domain, linear=True)
+        self.__ray_trafo = ray_trafo
+
+        padded_space = discr_sequence_space(
+            [2 * n for n in self.domain.shape], dtype=self.domain.dtype)
+        self.__fft = DiscreteFourierTransform(padded_space, halfcomplex=True,
+                                              impl=impl)
+        self.__kernel_ft = None
+
+    @staticmethod
+    def is_supported(ray_trafo):
+        """Return ``True`` if the Gram operator can be computed with FFTs.
+
+        Parameters
+        ----------
+        ray_trafo : `RayTransform`
+            The ray transform to check.
+        """
+        return (isinstance(ray_trafo.geometry, ParallelBeamGeometry) and
+                ray_trafo.domain.is_uniform and
+                ray_trafo.domain.is_real and
+                ray_trafo.impl != 'skimage')
+
+    @property
+    def ray_trafo(self):
+        """The ray transform whose Gram operator this is."""
+        return self.__ray_trafo
+
+    @property
+    def kernel_ft(self):
+        """Fourier transform of the convolution kernel.
+
+        It is computed at first access and stored in the
+        ``implementation_cache`` of the geometry for reuse.
+        """
+        if self.__kernel_ft is not None:
+            return self.__kernel_ft
+
+        ray_trafo = self.ray_trafo
+        cache = ray_trafo.geometry.implementation_cache
+        key = ('gram_kernel_ft', ray_trafo.impl, self.domain)
+        kernel_ft = cache.get(key, None)
+        if kernel_ft is None:
+            kernel_ft = self.fft(self._kernel())
+            cache[key] = kernel_ft
+
+        self.__kernel_ft = kernel_ft
+        return kernel_ft
+
+    @property
+    def fft(self):
+        """Discrete Fourier transform on the zero-padded volume."""
+        return self.__fft
+
+    def _kernel(self):
+        """Return the point spread function in FFT ordering."""
+        # Volume with twice the size, aligned with the original grid, such
+        # that the point at index `shape` is the center point of the
+        # original volume
+        space = self.domain
+        shape = np.array(space.shape)
+        cell_sides = space.cell_sides
+        min_pt = space.min_pt + (shape // 2 - shape) * cell_sides
+        max_pt = min_pt + 2 * shape * cell_sides
+        kernel_space = uniform_discr(min_pt, max_pt, 2 * shape,
+                                     dtype=space.dtype)
+
+        # The sparse matrix back-end computes the same as the NumPy
+        # back-end, but would assemble and cache a large matrix
+        impl = self.ray_trafo.impl
+        if impl == 'sparse_matrix':
+            impl = 'numpy'
+        ray_trafo = RayTransform(kernel_space, self.ray_trafo.geometry,
+                                 impl=impl, use_cache=False)
+        point = kernel_space.zero()
+        point[tuple(shape)] = 1
+        psf = ray_trafo.adjoint(ray_trafo(point))
+
+        # Move the offset 0 to index 0 for circular convolution
+        kernel = np.fft.ifftshift(psf.asarray())
+
+        # Symmetrize since the Gram operator is self-adjoint, but the
+        # discretization of the point spread function is not exactly
+        # symmetric
+        ndim = kernel.ndim
+        kernel_flip = np.roll(kernel[(slice(None, None, -1),) * ndim], 1,
+                              axis=tuple(range(ndim)))
+        return (kernel + kernel_flip) / 2
+
+    def _call(self, x, out):
+        """Implement ``self(x, out)``."""
+        slc = tuple(slice(0, n) for n in self.domain.shape)
+        padded = self.fft.domain.zero()
+        padded[slc] = x
+        x_ft = self.fft(padded)
+        x_ft *= self.kernel_ft
+        result = self.fft.inverse(x_ft)
+        out[:] = result[slc]
+
+    @property
+    def adjoint(self):
+        """Adjoint of this operator, i.e., ``self``."""
+        return self
+
+    def relative_error(self, x=None):
+        """Return the relative difference to the explicit Gram operator.
+
+        Parameters
+        ----------
+        x : `domain` `element-like`, optional
+            Volume for which the error is computed.
+            Default: ``domain.one()``
+
+        Returns
+        -------
+        rel_err : float
+            The value ``||G(x) - A^* A(x)|| / ||A^* A(x)||``, where ``G``
+            is this operator and ``A`` the ray transform.
+        """
+        if x is None:
+            x = self.domain.one()
+        else:
+            x = self.domain.element(x)
+        exact = self.ray_trafo.adjoint(self.ray_trafo(x))
+        return exact.dist(self(x)) / exact.norm()
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({!r})'.format(self.__class__.__name__, self.ray_trafo)
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
@@ -0,0 +1,347 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Ray transform evaluated slab by slab for bounded memory."""
+
+from __future__ import print_function, division, absolute_import
+from multiprocessing.pool import ThreadPool
+import numpy as np
+
+from odl.operator import Operator
+from odl.tomo.geometry import DivergentBeamGeometry
+from odl.tomo.operators.ray_trafo import RayTransform, sub_space
+
+
+__all__ = ('SlabRayTransform',)
+
+
+def detector_bbox(geometry, min_pt, max_pt):
+    """Return the detector region hit by rays through a box.
+
+    Parameters
+    ----------
+    geometry : `Geometry`
+        3D geometry with a flat detector, i.e., with
+        ``det_point_position(angle, (u, v)) ==
+        det_refpoint(angle) + u * det_axes(angle)[0] +
+        v * det_axes(angle)[1]``, and a single angle parameter.
+    min_pt, max_pt : array-like
+        Corners of the box in world coordinates.
+
+    Returns
+    -------
+    det_min_pt, det_max_pt : `numpy.ndarray`
+        Minimum and maximum detector parameters of the intersections
+        of the rays through the box with the detector, over all angles.
+
+    Examples
+    --------
+    >>> apart = odl.uniform_partition(0, np.pi, 10)
+    >>> dpart = odl.uniform_partition([-2, -2], [2, 2], (10, 10))
+    >>> geometry = odl.tomo.Parallel3dAxisGeometry(apart, dpart)
+    >>> det_min, det_max = detector_bbox(geometry, [-1, -1, 0], [1, 1, 0.5])
+    >>> np.allclose(det_min[1], 0), np.allclose(det_max[1], 0.5)
+    (True, True)
+    """
+    min_pt = np.asarray(min_pt, dtype=float)
+    max_pt = np.asarray(max_pt, dtype=float)
+    # All 8 corners of the box, shape (8, 3). Flat detectors and straight
+    # rays map the box to the convex hull of the images of its corners.
+    corners = np.array([[(min_pt, max_pt)[i >> k & 1][k] for k in range(3)]
+                        for i in range(8)])
+
+    angles = geometry.angles
+    refpoints = geometry.det_refpoint(angles)[:, None, :]
+    axes = geometry.det_axes(angles)
+    normals = np.cross(axes[:, 0], axes[:, 1])[:, None, :]
+
+    if isinstance(geometry, DivergentBeamGeometry):
+        # Rays from the source through the corners
+        start = geometry.src_position(angles)[:, None, :]
+        direction = corners[None, :, :] - start
+    else:
+        # Rays through the corners along the beam direction
+        mid_pt = geometry.det_params.mid_pt
+        start = corners[None, :, :]
+        direction = geometry.det_to_src(angles, mid_pt)[:, None, :]
+
+    # Intersect with the detector planes, shape (num_angles, 8, 3)
+    dist = (np.sum((refpoints - start) * normals, axis=-1) /
+            np.sum(direction * normals, axis=-1))
+    points = start + dist[..., None] * direction - refpoints
+
+    det_params = np.einsum('acx,adx->acd', points, axes)
+    det_params = det_params.reshape(-1, 2)
+    return det_params.min(axis=0), det_params.max(axis=0)
+
+
+class SlabRayTransform(Operator):
+
+    """Ray transform of a 3D volume evaluated in slabs.
+
+    The reconstruction space is split into slabs of consecutive slices
+    along one axis. For each slab, the rows and columns of the detector
+    that are hit by rays through the slab are determined, and the
+    forward and back-projection are computed with a `RayTransform` on
+    the slab and this part of the detector. The results are accumulated
+    in the full projection data or volume, respectively.
+
+    Hence, the memory required by the back-end, e.g., for the ASTRA
+    buffers on the GPU, is bounded by the size of a slab and the
+    corresponding part of the data. The slab operators do not cache
+    back-end data between calls, regardless of ``ray_trafo.use_cache``.
+    The operator has the same `domain`, `range`, `geometry` and
+    `adjoint` as the ray transform it wraps, so it can be used in its
+    place, e.g., in `fbp_op` or the iterative solvers.
+
+    See Also
+    --------
+    RayTransform.subsets : Split a ray transform along the angles.
+    """
+
+    def __init__(self, ray_trafo, num_slabs, axis=2, num_threads=1):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        ray_trafo : `RayTransform`
+            3D ray transform to evaluate in slabs. Its geometry must
+            have a single angle parameter, a flat detector and support
+            indexing, e.g., `ConeFlatGeometry` or
+            `Parallel3dAxisGeometry`, and its domain must be uniformly
+            discretized. It is never evaluated itself.
+        num_slabs : positive int
+            Number of slabs, at most ``ray_trafo.domain.shape[axis]``.
+        axis : int, optional
+            Axis of the volume along which it is split. The default
+            ``2`` is the standard rotation axis, for which slabs are
+            seen by the smallest parts of the detector.
+        num_threads : positive int, optional
+            Number of slabs that are processed in parallel. Note that the
+            memory requirement grows accordingly.
+
+        Examples
+        --------
+        >>> space = odl.uniform_discr([-1, -1, -1], [1, 1, 1], (10, 10, 10))
+        >>> apart = odl.uniform_partition(0, 2 * np.pi, 18)
+        >>> dpart = odl.uniform_partition([-2, -2], [2, 2], (20, 20))
+        >>> geometry = odl.tomo.ConeFlatGeometry(apart, dpart, src_radius=5,
+        ...                                      det_radius=5)
+        >>> ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+        >>> slab_trafo = SlabRayTransform(ray_trafo, num_slabs=4)
+        >>> [sub.domain.shape for sub in slab_trafo.slab_ops]
+        [(10, 10, 3), (10, 10, 3), (10, 10, 2), (10, 10, 2)]
+        >>> x = odl.phantom.shepp_logan(space)
+        >>> slab_trafo(x).dist(ray_trafo(x)) < 1e-4
+        True
+        """
+        if not isinstance(ray_trafo, RayTransform):
+            raise TypeError('`ray_trafo` must be a `RayTransform` instance, '
+                            'got {!r}'.format(ray_trafo))
+        domain = ray_trafo.domain
+        geometry = ray_trafo.geometry
+        if domain.ndim != 3:
+            raise ValueError('`ray_trafo.domain` must be 3-dimensional, got '
+                             'ndim = {}'.format(domain.ndim))
+        if not domain.is_uniform:
+            raise ValueError('`ray_trafo.domain` must be uniformly '
+                             'discretized')
+        if (geometry.motion_partition.ndim != 1 or
+                not hasattr(geometry, '__getitem__')):
+            raise TypeError('geometry of type {!r} not supported'
+                            ''.format(type(geometry).__name__))
+
+        axis, axis_in = int(axis), axis
+        if axis != axis_in or not 0 <= axis < 3:
+            raise ValueError('`axis` must be 0, 1 or 2, got {!r}'
+                             ''.format(axis_in))
+        num_slices = domain.shape[axis]
+        num_slabs, num_slabs_in = int(num_slabs), num_slabs
+        if num_slabs != num_slabs_in or not 1 <= num_slabs <= num_slices:
+            raise ValueError('`num_slabs` must be an integer between 1 and '
+                             '{}, got {!r}'.format(num_slices, num_slabs_in))
+        num_threads, num_threads_in = int(num_threads), num_threads
+        if num_threads != num_threads_in or num_threads < 1:
+            raise ValueError('`num_threads` must be a positive integer, got '
+                             '{!r}'.format(num_threads_in))
+
+        super(SlabRayTransform, self).__init__(
+            domain=domain, range=ray_trafo.range, linear=True)
+        self.__ray_trafo = ray_trafo
+        self.__num_slabs = num_slabs
+        self.__axis = axis
+        self.__num_threads = num_threads
+
+        sizes = np.full(num_slabs, num_slices // num_slabs, dtype=int)
+        sizes[:num_slices % num_slabs] += 1
+        stops = np.cumsum(sizes)
+        starts = stops - sizes
+
+        det_part = geometry.det_partition
+        self.__slab_ops = []
+        self.__vol_indices = []
+        self.__proj_indices = []
+        for start, stop in zip(starts, stops):
+            vol_idx = [slice(None)] * 3
+            vol_idx[axis] = slice(int(start), int(stop))
+            vol_idx = tuple(vol_idx)
+            vol_part = domain.partition[vol_idx]
+
+            # Detector cells hit by the slab, with one extra cell on each
+            # side for the interpolation of the back-ends
+            det_min, det_max = detector_bbox(geometry, vol_part.min_pt,
+                                             vol_part.max_pt)
+            det_idx = []
+            for i in range(2):
+                bdry = det_part.cell_boundary_vecs[i]
+                first = np.searchsorted(bdry, det_min[i], side='right') - 2
+                last = np.searchsorted(bdry, det_max[i], side='left') + 1
+                first = min(max(first, 0), det_part.shape[i])
+                last = min(max(last, 0), det_part.shape[i])
+                det_idx.append(slice(int(first), int(last)))
+
+            if any(slc.start >= slc.stop for slc in det_idx):
+                # Slab is not seen by the detector
+                continue
+
+            proj_idx = (slice(None),) + tuple(det_idx)
+            sub_geometry = geometry[proj_idx]
+            kwargs = ray_trafo._extra_kwargs.copy()
+            kwargs['range'] = sub_space(ray_trafo.range,
+                                        sub_geometry.partition)
+            # No caching, so that back-end data is only held for the slabs
+            # currently processed
+            slab_op = RayTransform(sub_space(domain, vol_part), sub_geometry,
+                                   impl=ray_trafo.impl, use_cache=False,
+                                   **kwargs)
+
+            self.__slab_ops.append(slab_op)
+            self.__vol_indices.append(vol_idx)
+            self.__proj_indices.append(proj_idx)
+
+    @property
+    def ray_trafo(self):
+        """The ray transform evaluated by this operator."""
+        return self.__ray_trafo
+
+    @property
+    def geometry(self):
+        """Geometry of `ray_trafo`."""
+        return self.ray_trafo.geometry
+
+    @property
+    def impl(self):
+        """Back-end of `ray_trafo` and the slab operators."""
+        return self.ray_trafo.impl
+
+    @property
+    def num_slabs(self):
+        """Number of slabs into which the volume is split."""
+        return self.__num_slabs
+
+    @property
+    def axis(self):
+        """Axis of the volume along which it is split into slabs."""
+        return self.__axis
+
+    @property
+    def num_threads(self):
+        """Number of slabs that are processed in parallel."""
+        return self.__num_threads
+
+    @property
+    def slab_ops(self):
+        """Ray transforms of the slabs, without slabs not hit by any ray."""
+        return list(self.__slab_ops)
+
+    @property
+    def vol_indices(self):
+        """Indices of the slabs in the volume."""
+        return list(self.__vol_indices)
+
+    @property
+    def proj_indices(self):
+        """Indices of the projection data of the slab operators."""
+        return list(self.__proj_indices)
+
+    def _map_slabs(self, func):
+        """Return an iterator over ``func(i)`` for all slab indices ``i``.
+
+        With more than one thread, the values are computed in parallel and
+        returned in order.
+        """
+        indices = range(len(self.__slab_ops))
+        if self.num_threads == 1:
+            for i in indices:
+                yield func(i)
+        else:
+            pool = ThreadPool(self.num_threads)
+            try:
+                for result in pool.imap(func, indices):
+                    yield result
+            finally:
+                pool.terminate()
+
+    def _call(self, x, out):
+        """Implement ``self(x, out)``."""
+        def project(i):
+            slab_op = self.__slab_ops[i]
+            return slab_op(x[self.__vol_indices[i]])
+
+        out.set_zero()
+        for i, proj in enumerate(self._map_slabs(project)):
+            out[self.__proj_indices[i]] += proj.asarray()
+
+    @property
+    def adjoint(self):
+        """Adjoint of this operator, evaluated in slabs as well.
+
+        Returns
+        -------
+        adjoint : `Operator`
+        """
+        op = self
+        slab_ops = self.__slab_ops
+        vol_indices = self.__vol_indices
+        proj_indices = self.__proj_indices
+
+        class SlabRayBackProjection(Operator):
+
+            """Back-projection evaluated in slabs."""
+
+            def _call(self, y, out):
+                """Implement ``self(y, out)``."""
+                def back_project(i):
+                    return slab_ops[i].adjoint(y[proj_indices[i]])
+
+                out.set_zero()
+                for i, vol in enumerate(op._map_slabs(back_project)):
+                    out[vol_indices[i]] = vol
+
+            @property
+            def adjoint(self):
+                """Adjoint of this operator."""
+                return op
+
+            def __repr__(self):
+                """Return ``repr(self)``."""
+                return '{!r}.adjoint'.format(op)
+
+        return SlabRayBackProjection(domain=self.range, range=self.domain,
+                                     linear=True)
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({!r}, num_slabs={}, axis={}, num_threads={})'.format(
+            self.__class__.__name__, self.ray_trafo, self.num_slabs,
+            self.axis, self.num_threads)
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
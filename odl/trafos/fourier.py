@@ -212,13 +212,27 @@ class DiscreteFourierTransformBase(Operator):
         """
         raise NotImplementedError('abstract method')
 
-    def _call_numpy(self, x):
+    def _apply_batch(self, x, out):
+        """Implement ``out[i] <-- self(x[i])`` with one FFT call."""
+        if self.impl != 'numpy' or x.buffer is None or out.buffer is None:
+            super(DiscreteFourierTransformBase, self)._apply_batch(x, out)
+            return
+
+        # Transform axes shifted by the leading batch axis
+        batch_axes = tuple(axis + 1 for axis in self.axes)
+        out.buffer[:] = self._call_numpy(x.buffer, axes=batch_axes)
+
+    def _call_numpy(self, x, axes=None):
         """Return ``self(x)`` using numpy.
 
         Parameters
         ----------
         x : `numpy.ndarray`
             Input array to be transformed
+        axes : sequence of ints, optional
+            Axes of ``x`` along which the transform is taken, e.g.,
+            for arrays with additional axes. For ``None``, `axes`
+            is used.
 
         Returns
         -------
@@ -439,7 +453,7 @@ class DiscreteFourierTransform(DiscreteFourierTransformBase):
             inverse=False, domain=domain, range=range, axes=axes,
             sign=sign, halfcomplex=halfcomplex, impl=impl)
 
-    def _call_numpy(self, x):
+    def _call_numpy(self, x, axes=None):
         """Return ``self(x)`` using numpy.
 
         See Also
@@ -447,16 +461,18 @@ class DiscreteFourierTransform(DiscreteFourierTransformBase):
         DiscreteFourierTransformBase._call_numpy
         """
         assert isinstance(x, np.ndarray)
+        if axes is None:
+            axes = self.axes
 
         if self.halfcomplex:
-            return np.fft.rfftn(x, axes=self.axes)
+            return np.fft.rfftn(x, axes=axes)
         else:
             if self.sign == '-':
-                return np.fft.fftn(x, axes=self.axes)
+                return np.fft.fftn(x, axes=axes)
             else:
                 # Need to undo Numpy IFFT scaling
                 return (np.prod(np.take(self.domain.shape, self.axes)) *
-                        np.fft.ifftn(x, axes=self.axes))
+                        np.fft.ifftn(x, axes=axes))
 
     def _call_pyfftw(self, x, out, **kwargs):
         """Implement ``self(x[, out, **kwargs])`` using pyfftw.
@@ -590,26 +606,23 @@ class DiscreteFourierTransformInverse(DiscreteFourierTransformBase):
             inverse=True, domain=range, range=domain, axes=axes,
             sign=sign, halfcomplex=halfcomplex, impl=impl)
 
-    def _call_numpy(self, x):
+    def _call_numpy(self, x, axes=None):
         """Return ``self(x)`` using numpy.
 
-        Parameters
-        ----------
-        x : `numpy.ndarray`
-            Input array to be transformed
-
-        Returns
-        -------
-        out : `numpy.ndarray`
-            Result of the transform
+        See Also
+        --------
+        DiscreteFourierTransformBase._call_numpy
         """
+        if axes is None:
+            axes = self.axes
+
         if self.halfcomplex:
-            return np.fft.irfftn(x, axes=self.axes)
+            return np.fft.irfftn(x, axes=axes)
         else:
             if self.sign == '+':
-                return np.fft.ifftn(x, axes=self.axes)
+                return np.fft.ifftn(x, axes=axes)
             else:
-                return (np.fft.fftn(x, axes=self.axes) /
+                return (np.fft.fftn(x, axes=axes) /
                         np.prod(np.take(self.domain.shape, self.axes)))
 
     def _call_pyfftw(self, x, out, **kwargs):
@@ -898,6 +911,47 @@ class FourierTransformBase(Operator):
             # 0-overhead assignment if asarray() does not copy
             out[:] = self._call_pyfftw(x.asarray(), out.asarray(), **kwargs)
 
+    def _apply_batch(self, x, out):
+        """Implement ``out[i] <-- self(x[i])`` with one FFT call.
+
+        Pre- and post-processing multiply all inputs with the same
+        factors, which are computed only once by processing arrays of
+        ones.
+        """
+        if self.impl != 'numpy' or x.buffer is None or out.buffer is None:
+            super(FourierTransformBase, self)._apply_batch(x, out)
+            return
+
+        pre = self._preprocess(np.ones(self.domain.shape,
+                                       dtype=self.domain.dtype))
+        # Transform axes shifted by the leading batch axis
+        batch_axes = tuple(axis + 1 for axis in self.axes)
+        result = self._fft_numpy(x.buffer * pre, batch_axes)
+        post = np.ones(result.shape[1:], dtype=result.dtype)
+        result *= self._postprocess(post, out=post)
+
+        if self.range.field == RealNumbers():
+            out.buffer[:] = result.real
+        else:
+            out.buffer[:] = result
+
+    def _fft_numpy(self, x, axes):
+        """Return the FFT of ``x`` along ``axes``, without processing.
+
+        Parameters
+        ----------
+        x : `numpy.ndarray`
+            Pre-processed array to be transformed
+        axes : sequence of ints
+            Axes of ``x`` along which the FFT is taken
+
+        Returns
+        -------
+        out : `numpy.ndarray`
+            Result of the FFT
+        """
+        raise NotImplementedError('abstract method')
+
     def _call_numpy(self, x):
         """Return ``self(x)`` for numpy back-end.
 
@@ -1306,19 +1360,24 @@ class FourierTransform(FourierTransformBase):
         preproc = self._preprocess(x)
 
         # The actual call to the FFT library, out-of-place unfortunately
+        out = self._fft_numpy(preproc, self.axes)
+
+        # Post-processing accounting for shift, scaling and interpolation
+        self._postprocess(out, out=out)
+        return out
+
+    def _fft_numpy(self, x, axes):
+        """Return the FFT of ``x`` along ``axes``, without processing."""
         if self.halfcomplex:
-            out = np.fft.rfftn(preproc, axes=self.axes)
+            out = np.fft.rfftn(x, axes=axes)
         else:
             if self.sign == '-':
-                out = np.fft.fftn(preproc, axes=self.axes)
+                out = np.fft.fftn(x, axes=axes)
             else:
-                out = np.fft.ifftn(preproc, axes=self.axes)
+                out = np.fft.ifftn(x, axes=axes)
                 # Numpy's FFT normalizes by 1 / prod(shape[axes]), we
                 # need to undo that
                 out *= np.prod(np.take(self.domain.shape, self.axes))
-
-        # Post-processing accounting for shift, scaling and interpolation
-        self._postprocess(out, out=out)
         return out
 
     def _call_pyfftw(self, x, out, **kwargs):
@@ -1541,18 +1600,7 @@ class FourierTransformInverse(FourierTransformBase):
         preproc = self._preprocess(x)
 
         # The actual call to the FFT library
-        # Normalization by 1 / prod(shape[axes]) is done by Numpy's FFT if
-        # one of the "i" functions is used. For sign='-' we need to do it
-        # ourselves.
-        if self.halfcomplex:
-            s = np.asarray(self.range.shape)[list(self.axes)]
-            out = np.fft.irfftn(preproc, axes=self.axes, s=s)
-        else:
-            if self.sign == '-':
-                out = np.fft.fftn(preproc, axes=self.axes)
-                out /= np.prod(np.take(self.domain.shape, self.axes))
-            else:
-                out = np.fft.ifftn(preproc, axes=self.axes)
+        out = self._fft_numpy(preproc, self.axes)
 
         # Post-processing in IFT = pre-processing in FT (in-place)
         self._postprocess(out, out=out)
@@ -1564,6 +1612,22 @@ class FourierTransformInverse(FourierTransformBase):
         else:
             return out
 
+    def _fft_numpy(self, x, axes):
+        """Return the FFT of ``x`` along ``axes``, without processing."""
+        # Normalization by 1 / prod(shape[axes]) is done by Numpy's FFT if
+        # one of the "i" functions is used. For sign='-' we need to do it
+        # ourselves.
+        if self.halfcomplex:
+            s = np.asarray(self.range.shape)[list(self.axes)]
+            out = np.fft.irfftn(x, axes=axes, s=s)
+        else:
+            if self.sign == '-':
+                out = np.fft.fftn(x, axes=axes)
+                out /= np.prod(np.take(self.domain.shape, self.axes))
+            else:
+                out = np.fft.ifftn(x, axes=axes)
+        return out
+
     def _call_pyfftw(self, x, out, **kwargs):
         """Implement ``self(x[, out, **kwargs])`` for pyfftw back-end.
 
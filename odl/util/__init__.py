@@ -33,4 +33,10 @@ __all__ += numerics.__all__
 from .vectorization import *
 __all__ += vectorization.__all__
 
+from .parallel import *
+__all__ += parallel.__all__
+
+from .profiling import *
+__all__ += profiling.__all__
+
 from . import ufuncs
@@ -0,0 +1,315 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Utilities for parallel evaluation of blocked computations."""
+
+from __future__ import print_function, division, absolute_import
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import os
+import threading
+
+
+__all__ = ('num_threads', 'parallel_map', 'executor_map', 'pairwise_sum',
+           'blocked_reduce')
+
+
+# Minimum number of entries for which reductions are run in parallel,
+# below this size the overhead of the thread pool dominates
+THRESHOLD_PARALLEL = 2 ** 20
+
+# Supported values for the ``executor`` of `executor_map`
+EXECUTORS = (None, 'thread', 'process')
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+_WORKER_STATE = threading.local()
+
+_PROCESS_POOL = None
+_PROCESS_POOL_LOCK = threading.Lock()
+_IN_WORKER_PROCESS = False
+
+
+def num_threads():
+    """Return the default number of threads for parallel computations.
+
+    This is the value of the environment variable ``ODL_NUM_THREADS``
+    if set, otherwise the number of CPUs of the system.
+
+    Examples
+    --------
+    >>> num_threads() >= 1
+    True
+    """
+    nthreads = os.environ.get('ODL_NUM_THREADS', None)
+    if nthreads is None:
+        return multiprocessing.cpu_count()
+
+    nthreads, nthreads_in = int(nthreads), nthreads
+    if nthreads <= 0:
+        raise ValueError('`ODL_NUM_THREADS` must be a positive integer, '
+                         'got {!r}'.format(nthreads_in))
+    return nthreads
+
+
+def _thread_pool():
+    """Return the shared thread pool.
+
+    The pool is created with `num_threads` worker threads at the first
+    call and reused afterwards.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ThreadPool(num_threads())
+        return _POOL
+
+
+def _split(args, nparts):
+    """Split ``args`` into ``nparts`` consecutive chunks of similar size."""
+    size, rem = divmod(len(args), nparts)
+    chunks = []
+    start = 0
+    for i in range(nparts):
+        stop = start + size + (1 if i < rem else 0)
+        chunks.append(args[start:stop])
+        start = stop
+    return chunks
+
+
+def _map_chunk(func_and_chunk):
+    """Return ``[func(arg) for arg in chunk]``."""
+    func, chunk = func_and_chunk
+    return [func(arg) for arg in chunk]
+
+
+def _run_in_worker(func):
+    """Return a function evaluating ``func`` on a chunk of arguments.
+
+    The thread evaluating the chunk is marked as a worker.
+    """
+    def worker_func(chunk):
+        _WORKER_STATE.active = True
+        try:
+            return [func(arg) for arg in chunk]
+        finally:
+            _WORKER_STATE.active = False
+
+    return worker_func
+
+
+def parallel_map(func, args, nthreads=None):
+    """Return ``[func(arg) for arg in args]``, evaluated by several threads.
+
+    The evaluation is done in a shared pool of worker threads, which only
+    speeds up functions that release the global interpreter lock, like
+    most NumPy functions operating on large arrays. Calls from within a
+    worker thread, i.e., nested parallel maps, are evaluated serially.
+
+    The pool is created once with `num_threads` threads. To use fewer
+    threads, ``args`` is split into ``nthreads`` chunks, each of which is
+    evaluated by one worker.
+
+    Parameters
+    ----------
+    func : callable
+        Function to be evaluated for each entry in ``args``.
+    args : sequence
+        Arguments for which ``func`` is evaluated.
+    nthreads : positive int, optional
+        Number of threads to use, at most the size of the shared pool.
+        For ``None``, `num_threads` is used.
+
+    Returns
+    -------
+    results : list
+        Results of ``func`` in the order of ``args``.
+
+    Examples
+    --------
+    >>> parallel_map(lambda x: x ** 2, [1, 2, 3], nthreads=2)
+    [1, 4, 9]
+    """
+    args = list(args)
+    if nthreads is None:
+        nthreads = num_threads()
+    nthreads = min(int(nthreads), len(args))
+
+    if nthreads <= 1 or getattr(_WORKER_STATE, 'active', False):
+        return [func(arg) for arg in args]
+    else:
+        chunks = _split(args, nthreads)
+        results = _thread_pool().map(_run_in_worker(func), chunks)
+        return [res for chunk_res in results for res in chunk_res]
+
+
+def _mark_worker_process():
+    """Mark the current process as a worker of the process pool."""
+    global _IN_WORKER_PROCESS
+    _IN_WORKER_PROCESS = True
+
+
+def _process_pool():
+    """Return the shared process pool.
+
+    The pool is created with `num_threads` worker processes at the first
+    call and reused afterwards.
+    """
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None:
+            _PROCESS_POOL = multiprocessing.Pool(
+                num_threads(), initializer=_mark_worker_process)
+        return _PROCESS_POOL
+
+
+def executor_map(func, args, executor=None, max_workers=None):
+    """Return ``[func(arg) for arg in args]``, evaluated by an executor.
+
+    Parameters
+    ----------
+    func : callable
+        Function to be evaluated for each entry in ``args``.
+    args : sequence
+        Arguments for which ``func`` is evaluated.
+    executor : {None, 'thread', 'process'}, optional
+        How to evaluate the calls of ``func``:
+
+        - ``None``: One after the other in the calling thread.
+        - ``'thread'``: In a shared pool of worker threads, see
+          `parallel_map`.
+        - ``'process'``: In a shared pool of worker processes. Here,
+          ``func``, ``args`` and the results must be picklable, and
+          ``func`` works on copies of ``args``. Calls from within a
+          worker process are evaluated serially.
+
+    max_workers : positive int, optional
+        Number of threads or processes to use, at most the size of the
+        shared pool. For ``None``, `num_threads` is used.
+
+    Returns
+    -------
+    results : list
+        Results of ``func`` in the order of ``args``.
+
+    Examples
+    --------
+    >>> executor_map(abs, [-1, 2, -3], executor='thread', max_workers=2)
+    [1, 2, 3]
+    """
+    if executor not in EXECUTORS:
+        raise ValueError('`executor` must be one of {}, got {!r}'
+                         ''.format(EXECUTORS, executor))
+
+    args = list(args)
+    if max_workers is None:
+        max_workers = num_threads()
+    max_workers = min(int(max_workers), len(args))
+
+    if executor is None or max_workers <= 1:
+        return [func(arg) for arg in args]
+    elif executor == 'thread':
+        return parallel_map(func, args, max_workers)
+    elif _IN_WORKER_PROCESS:
+        return [func(arg) for arg in args]
+    else:
+        chunks = [(func, chunk) for chunk in _split(args, max_workers)]
+        results = _process_pool().map(_map_chunk, chunks)
+        return [res for chunk_res in results for res in chunk_res]
+
+
+def pairwise_sum(values):
+    """Return the sum of ``values``, computed by pairwise summation.
+
+    Compared to summing from left to right, the rounding error grows
+    only logarithmically with the number of summands.
+
+    Examples
+    --------
+    >>> pairwise_sum([0.1] * 10)
+    1.0
+    >>> pairwise_sum([])
+    0
+    """
+    values = list(values)
+    if not values:
+        return 0
+    while len(values) > 1:
+        paired = [values[i] + values[i + 1]
+                  for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0]
+
+
+def blocked_reduce(func, arrays, block_size, reduction='sum', nthreads=None):
+    """Return a reduction of ``func`` over blocks of flat arrays.
+
+    The arrays are partitioned into consecutive blocks of ``block_size``
+    entries, and ``func`` is evaluated on each block. Temporary arrays
+    created by ``func`` are hence at most of size ``block_size``. For
+    large arrays, the blocks are processed in parallel, see
+    `parallel_map`.
+
+    Parameters
+    ----------
+    func : callable
+        Function reducing blocks of ``arrays``, called as
+        ``func(*[arr[slc] for arr in arrays])`` for each block slice
+        ``slc``.
+    arrays : sequence of `numpy.ndarray`
+        One-dimensional arrays of equal size.
+    block_size : positive int
+        Number of entries per block.
+    reduction : {'sum', 'max'}, optional
+        Reduction applied to the results of ``func``. Sums are computed
+        with `pairwise_sum` for accuracy.
+    nthreads : positive int, optional
+        Number of threads to use for large arrays. For ``None``,
+        `num_threads` is used.
+
+    Returns
+    -------
+    result :
+        Reduction of the block results.
+
+    Examples
+    --------
+    >>> x = np.arange(10.0)
+    >>> blocked_reduce(np.sum, [x], block_size=3)
+    45.0
+    >>> blocked_reduce(lambda a, b: np.max(a - b), [x, x[::-1]],
+    ...                block_size=4, reduction='max')
+    9.0
+    """
+    reduction, reduction_in = str(reduction).lower(), reduction
+    if reduction not in ('sum', 'max'):
+        raise ValueError('`reduction` {!r} not understood'
+                         ''.format(reduction_in))
+
+    size = arrays[0].size
+    slices = [slice(start, min(start + block_size, size))
+              for start in range(0, size, block_size)]
+
+    def block_func(slc):
+        return func(*[arr[slc] for arr in arrays])
+
+    if size < THRESHOLD_PARALLEL:
+        nthreads = 1
+    results = parallel_map(block_func, slices, nthreads)
+
+    if reduction == 'sum':
+        return pairwise_sum(results)
+    else:
+        return max(results)
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -0,0 +1,257 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Profiling of operator evaluations."""
+
+from __future__ import print_function, division, absolute_import
+from builtins import object
+import threading
+from timeit import default_timer
+
+
+__all__ = ('profile',)
+
+
+# All active profilers, and the original `Operator.__call__` that is
+# replaced while any profiler is active
+_ACTIVE = []
+_ACTIVE_LOCK = threading.Lock()
+_ORIGINAL_CALL = None
+
+# Per-thread stack of running operator calls, used to compute the time
+# spent in an operator itself
+_CALL_STATE = threading.local()
+
+
+def _nbytes(x):
+    """Return the size of the data of ``x`` in bytes, or 0 if unknown."""
+    if hasattr(x, 'nbytes'):
+        return x.nbytes
+    elif hasattr(x, 'parts'):
+        return sum(_nbytes(xi) for xi in x.parts)
+    else:
+        return 0
+
+
+def _profiled_call(op, x, out=None, **kwargs):
+    """Replacement of `Operator.__call__` recording the call."""
+    stack = getattr(_CALL_STATE, 'stack', None)
+    if stack is None:
+        stack = _CALL_STATE.stack = []
+
+    # Accumulates the time spent in nested operator calls
+    nested_time = [0.0]
+    stack.append(nested_time)
+    start = default_timer()
+    try:
+        result = _ORIGINAL_CALL(op, x, out=out, **kwargs)
+    finally:
+        elapsed = default_timer() - start
+        stack.pop()
+        if stack:
+            stack[-1][0] += elapsed
+
+    nbytes = _nbytes(result) if out is None else 0
+    for profiler in list(_ACTIVE):
+        profiler._record(op, out is not None, elapsed,
+                         elapsed - nested_time[0], nbytes)
+    return result
+
+
+def _sub_operators(op):
+    """Return the operators that ``op`` is composed of."""
+    # Lazy import to improve `import odl` time
+    from odl.operator import (
+        BroadcastOperator, FunctionalLeftVectorMult, OperatorComp,
+        OperatorLeftScalarMult, OperatorLeftVectorMult, OperatorLinComb,
+        OperatorPointwiseProduct, OperatorRightScalarMult,
+        OperatorRightVectorMult, OperatorSum, OperatorVectorSum,
+        ProductSpaceOperator, ReductionOperator)
+
+    if isinstance(op, (OperatorSum, OperatorComp, OperatorPointwiseProduct)):
+        return [op.left, op.right]
+    elif isinstance(op, OperatorLinComb):
+        return list(op.operators)
+    elif isinstance(op, (BroadcastOperator, ReductionOperator)):
+        return [op.prod_op]
+    elif isinstance(op, ProductSpaceOperator):
+        return list(op.ops.data)
+    elif isinstance(op, FunctionalLeftVectorMult):
+        return [op.functional]
+    elif isinstance(op, (OperatorLeftScalarMult, OperatorRightScalarMult,
+                         OperatorVectorSum, OperatorLeftVectorMult,
+                         OperatorRightVectorMult)):
+        return [op.operator]
+    else:
+        return []
+
+
+class profile(object):
+
+    """Context manager recording statistics of operator calls.
+
+    Within this context, each call of an `Operator` is recorded per
+    operator instance, with
+
+    - ``'calls'``: the number of calls,
+    - ``'in_place'``: the number of calls with an ``out`` argument,
+    - ``'out_of_place'``: the number of calls without ``out``,
+    - ``'time'``: the wall time in seconds spent in the calls,
+    - ``'self_time'``: the part of ``'time'`` not spent in calls of
+      other operators,
+    - ``'nbytes'``: the number of bytes of newly created results.
+
+    The statistics are available through `stats`, and `report` prints
+    them along the structure of composed operators like `OperatorComp`,
+    `OperatorSum` and `ProductSpaceOperator`.
+
+    Profiling works by replacing ``Operator.__call__`` while a profiler
+    is active, so it costs nothing otherwise. Calls from all threads are
+    recorded.
+
+    Examples
+    --------
+    >>> space = odl.rn(3)
+    >>> op = odl.ScalingOperator(space, 2) + odl.IdentityOperator(space)
+    >>> with odl.util.profile(op) as prof:
+    ...     result = op([1, 2, 3])
+    >>> prof.stats(op.left)['calls']
+    1
+    >>> print(prof.report())
+    calls  in-place  time [ms]  self [ms]  alloc [kB]  operator
+        1         0  ...  OperatorSum
+        1         0  ...       0.024    ScalingOperator
+        1         0  ...       0.024    IdentityOperator
+    """
+
+    def __init__(self, op=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        op : `Operator`, optional
+            Operator whose structure is used by `report`. For ``None``,
+            the report covers all recorded operators.
+        """
+        self.__op = op
+        self.__records = {}
+        self.__lock = threading.Lock()
+
+    @property
+    def op(self):
+        """Operator whose structure is used by `report`, or ``None``."""
+        return self.__op
+
+    def __enter__(self):
+        """Start recording operator calls."""
+        global _ORIGINAL_CALL
+        # Lazy import to improve `import odl` time
+        from odl.operator import Operator
+
+        with _ACTIVE_LOCK:
+            if not _ACTIVE:
+                _ORIGINAL_CALL = Operator.__dict__['__call__']
+                Operator.__call__ = _profiled_call
+            _ACTIVE.append(self)
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Stop recording operator calls."""
+        # Lazy import to improve `import odl` time
+        from odl.operator import Operator
+
+        with _ACTIVE_LOCK:
+            _ACTIVE.remove(self)
+            if not _ACTIVE:
+                Operator.__call__ = _ORIGINAL_CALL
+
+    def _record(self, op, in_place, time, self_time, nbytes):
+        """Add a call of ``op`` to the statistics."""
+        with self.__lock:
+            if id(op) not in self.__records:
+                self.__records[id(op)] = (op, {
+                    'calls': 0, 'in_place': 0, 'out_of_place': 0,
+                    'time': 0.0, 'self_time': 0.0, 'nbytes': 0})
+            stats = self.__records[id(op)][1]
+            stats['calls'] += 1
+            stats['in_place' if in_place else 'out_of_place'] += 1
+            stats['time'] += time
+            stats['self_time'] += self_time
+            stats['nbytes'] += nbytes
+
+    @property
+    def operators(self):
+        """List of all recorded operators."""
+        with self.__lock:
+            return [op for op, _ in self.__records.values()]
+
+    def stats(self, op):
+        """Return the statistics of ``op`` as a dictionary.
+
+        All entries are 0 if ``op`` has not been called.
+        """
+        with self.__lock:
+            if id(op) in self.__records:
+                return dict(self.__records[id(op)][1])
+        return {'calls': 0, 'in_place': 0, 'out_of_place': 0,
+                'time': 0.0, 'self_time': 0.0, 'nbytes': 0}
+
+    def reset(self):
+        """Remove all recorded statistics."""
+        with self.__lock:
+            self.__records.clear()
+
+    def report(self):
+        """Return a table of the statistics as string.
+
+        The operators are listed along their structure, with the parts
+        of composed operators indented below them. Without `op`, all
+        recorded operators that are not part of other recorded
+        operators are listed at the top level.
+        """
+        if self.op is not None:
+            roots = [self.op]
+        else:
+            recorded = self.operators
+            parts = set(id(sub_op) for op in recorded
+                        for sub_op in _sub_operators(op))
+            roots = [op for op in recorded if id(op) not in parts]
+
+        lines = ['calls  in-place  time [ms]  self [ms]  alloc [kB]  '
+                 'operator']
+
+        def add_lines(op, depth, path):
+            stats = self.stats(op)
+            lines.append('{:>5}  {:>8}  {:>9.3f}  {:>9.3f}  {:>10.3f}  {}{}'
+                         ''.format(stats['calls'], stats['in_place'],
+                                   1e3 * stats['time'],
+                                   1e3 * stats['self_time'],
+                                   stats['nbytes'] / 1e3,
+                                   '  ' * depth, op.__class__.__name__))
+            # Guard against operators containing themselves
+            if id(op) in path:
+                return
+            for sub_op in _sub_operators(op):
+                add_lines(sub_op, depth + 1, path | {id(op)})
+
+        for op in roots:
+            add_lines(op, 0, frozenset())
+
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        if self.op is None:
+            return '{}()'.format(self.__class__.__name__)
+        else:
+            return '{}({!r})'.format(self.__class__.__name__, self.op)
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()